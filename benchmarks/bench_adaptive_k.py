@@ -0,0 +1,110 @@
+"""Adaptive k against fixed k: LLM calls and answer-quality proxies.
+
+Runs a set of questions through the graph over the synthetic vectorstore
+with the fake backends, once per retrieval setting (fixed k with similarity
+search, and the "adaptive" search type with max k and both cut methods),
+and reports per setting:
+
+- documents passed on per question (the k recorded in state)
+- LLM calls per question, and retrieval grader calls among them
+- precision: share of passed-on documents that are relevant (by the fake
+  grader's rule, so it matches what the grader keeps)
+- recall: relevant documents passed on, as a share of the relevant ones
+  among the top max k candidates
+- web search fallbacks (the grader found most documents irrelevant)
+- answer coverage: share of the question's content words found in the answer
+
+Example:
+    uv run python benchmarks/bench_adaptive_k.py --docs 300 --fixed-k 2,4,6,10 --max-k 10
+"""
+
+import argparse
+from typing import Any, Dict, List
+
+from harness import configure_fakes, run_metadata, write_results
+
+QUESTIONS = [
+    "What is agent memory?",
+    "How does chain-of-thought prompting work?",
+    "What are adversarial attacks on language models?",
+    "How do agents use tools for planning?",
+    "What is few-shot prompting?",
+    "How can jailbreak attacks be defended against?",
+    "How do agents use reflection and long-term memory?",
+    "What is self-consistency in prompting?",
+    "How does task decomposition help agent planning?",
+    "What are prompt injection attacks on llm tools?",
+]
+
+
+def run_setting(name: str, retrieval_config: Dict[str, Any], max_k: int) -> Dict[str, Any]:
+    """Run every question with one retrieval setting and average the proxies."""
+    from src.core.fakes import _is_relevant, content_words
+    from src.graph.runner import run_question
+    from src.ingestion import get_vectorstore
+
+    totals = {"k": 0.0, "llm_calls": 0.0, "grader_calls": 0.0, "precision": 0.0, "recall": 0.0,
+              "web_search": 0.0, "coverage": 0.0}
+    for question in QUESTIONS:
+        state = run_question(question, retrieval_config)
+        metrics = state["metrics"]
+        k = state.get("retrieval_k", 0)
+
+        candidates = get_vectorstore().similarity_search(question, k=max_k)
+        relevant = [_is_relevant(question, doc.page_content) for doc in candidates]
+        passed_on = relevant[:k]
+        wanted = set(content_words(question))
+        answer = set(content_words(state.get("generation", "")))
+
+        totals["k"] += k
+        totals["llm_calls"] += metrics["llm"]["llm_calls"]
+        totals["grader_calls"] += metrics["chains"].get("retrieval_grader", {}).get("llm_calls", 0)
+        totals["precision"] += sum(passed_on) / k if k else 0.0
+        totals["recall"] += sum(passed_on) / sum(relevant) if any(relevant) else 1.0
+        totals["web_search"] += bool(state.get("web_search"))
+        totals["coverage"] += len(wanted & answer) / len(wanted) if wanted else 0.0
+    return {"setting": name, "retrieval_config": retrieval_config,
+            **{key: value / len(QUESTIONS) for key, value in totals.items()}}
+
+
+def main() -> None:
+    """Compare fixed k settings with adaptive k."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=300, help="Synthetic documents in the vectorstore")
+    parser.add_argument("--fixed-k", default="2,4,6,10", help="Comma-separated fixed k values")
+    parser.add_argument("--max-k", type=int, default=10, help="Upper bound of adaptive k")
+    parser.add_argument("--min-k", type=int, default=2, help="Lower bound of adaptive k")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/adaptive-k-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    configure_fakes()
+
+    from src.core.fakes import seed_synthetic_vectorstore
+
+    seed_synthetic_vectorstore(args.docs)
+
+    settings = [(f"fixed k={k}", {"search_type": "similarity", "k": k})
+                for k in (int(value) for value in args.fixed_k.split(","))]
+    settings += [
+        (f"adaptive {method}", {"search_type": "adaptive", "k": args.max_k, "min_k": args.min_k,
+                                "adaptive_method": method})
+        for method in ("gap", "knee")
+    ]
+    runs: List[Dict[str, Any]] = [run_setting(name, config, args.max_k) for name, config in settings]
+
+    print(f"\n{'setting':<14} {'k':>5} {'llm':>6} {'grader':>7} {'prec':>6} {'recall':>7} {'web':>5} {'cover':>6}")
+    for run in runs:
+        print(f"{run['setting']:<14} {run['k']:>5.1f} {run['llm_calls']:>6.1f} {run['grader_calls']:>7.1f} "
+              f"{run['precision']:>6.2f} {run['recall']:>7.2f} {run['web_search']:>5.2f} {run['coverage']:>6.2f}")
+
+    results = {
+        "meta": run_metadata(benchmark="adaptive_k", docs=args.docs, questions=len(QUESTIONS),
+                             max_k=args.max_k, min_k=args.min_k),
+        "runs": runs,
+    }
+    path = write_results(results, args.output, prefix="adaptive-k")
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Cost of checkpointing graph runs, and what resuming a failed run saves.
+
+Runs the vectorstore happy path against the fake backends with
+CHECKPOINT_ENABLED=true (SQLite file in a temporary directory) and reports:
+
+- overhead: p50 latency of checkpointed runs vs. the same graph without a
+  checkpointer, interleaved in rounds
+- per node: checkpoint write time, writes and bytes per run, next to the
+  node's own wall time
+- resume: LLM calls of retrying a run whose generation failed, resumed from
+  its checkpoint vs. started over under a new request ID
+
+Example:
+    uv run python benchmarks/bench_checkpoint.py --iterations 200 --llm-latency 0.005
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List
+
+from harness import configure_fakes, run_metadata, write_results
+
+QUESTION = "What is agent memory?"
+
+
+def _run_plain() -> Dict[str, Any]:
+    """One run of the graph compiled without a checkpointer (same instrumentation as run_question)."""
+    from src.graph.builder import get_rag_app
+    from src.graph.runner import build_inputs
+    from src.observability import track_request
+
+    with track_request() as (request, config):
+        get_rag_app().invoke(build_inputs(QUESTION), config=config)
+    return request.summary()
+
+
+def _run_checkpointed() -> Dict[str, Any]:
+    from src.graph.runner import run_question
+
+    return run_question(QUESTION, request_id=uuid.uuid4().hex)["metrics"]
+
+
+def _timed(fn, iterations: int, latencies: List[float], summaries: List[Dict[str, Any]]) -> None:
+    for _ in range(iterations):
+        started = time.perf_counter()
+        summaries.append(fn())
+        latencies.append((time.perf_counter() - started) * 1000)
+
+
+def _per_node(summaries: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Average checkpoint writes, write ms and bytes per run, with the node's own ms."""
+    totals: Dict[str, Dict[str, float]] = {}
+    for summary in summaries:
+        for node, stats in summary["checkpoint"]["nodes"].items():
+            node_totals = totals.setdefault(node, {"writes": 0, "write_ms": 0.0, "bytes": 0, "node_ms": 0.0})
+            node_totals["writes"] += stats["writes"]
+            node_totals["write_ms"] += stats["ms"]
+            node_totals["bytes"] += stats["bytes"]
+            node_totals["node_ms"] += summary["nodes"].get(node, {}).get("ms", 0.0)
+    return {node: {key: value / len(summaries) for key, value in stats.items()} for node, stats in totals.items()}
+
+
+def _failed_then_retried(resume: bool) -> int:
+    """LLM calls of retrying a run whose first generation failed (resumed or started over)."""
+    from src.core.llm import get_llm
+    from src.graph.runner import run_question
+
+    generator = get_llm("generator")
+    generator.rate_limit_errors = generator.call_count + 1  # The next generation fails
+    request_id = uuid.uuid4().hex
+    try:
+        run_question(QUESTION, request_id=request_id)
+    except Exception:
+        pass
+    retry = run_question(QUESTION, request_id=request_id if resume else uuid.uuid4().hex)
+    assert retry["metrics"]["checkpoint"]["resumed"] == resume
+    return retry["metrics"]["llm"]["llm_calls"]
+
+
+def main() -> None:
+    """Measure checkpoint overhead and the LLM calls a resume saves."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200, help="Timed runs per variant")
+    parser.add_argument("--rounds", type=int, default=5, help="Interleaved rounds the runs are split into")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds per fake LLM call")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/checkpoint-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    checkpoint_dir = tempfile.mkdtemp(prefix="rag-bench-checkpoints-")
+    os.environ.update({
+        "CHECKPOINT_ENABLED": "true",
+        "CHECKPOINT_PATH": os.path.join(checkpoint_dir, "checkpoints.sqlite"),
+        # Injected generation failures must reach the runner instead of being retried
+        "RATE_LIMIT_ENABLED": "false",
+    })
+    configure_fakes(llm_latency=args.llm_latency)
+
+    from src.core.fakes import seed_synthetic_vectorstore
+    from src.core.stats import latency_summary
+
+    seed_synthetic_vectorstore()
+    _run_plain()
+    _run_checkpointed()  # Warm-up
+
+    latencies: Dict[str, List[float]] = {"plain": [], "checkpointed": []}
+    summaries: Dict[str, List[Dict[str, Any]]] = {"plain": [], "checkpointed": []}
+    per_round = max(1, args.iterations // args.rounds)
+    for _ in range(args.rounds):
+        _timed(_run_plain, per_round, latencies["plain"], summaries["plain"])
+        _timed(_run_checkpointed, per_round, latencies["checkpointed"], summaries["checkpointed"])
+
+    plain, checkpointed = latency_summary(latencies["plain"]), latency_summary(latencies["checkpointed"])
+    per_node = _per_node(summaries["checkpointed"])
+    resume = {"resumed_llm_calls": _failed_then_retried(resume=True), "restarted_llm_calls": _failed_then_retried(resume=False)}
+
+    results = {
+        "meta": run_metadata(benchmark="checkpoint", iterations=args.iterations, rounds=args.rounds,
+                             llm_latency=args.llm_latency),
+        "latency_ms": {"plain": plain, "checkpointed": checkpointed},
+        "overhead_p50_ms": checkpointed["p50"] - plain["p50"],
+        "per_node": per_node,
+        "resume": resume,
+    }
+
+    print(f"\n{'variant':<14} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, latency in results["latency_ms"].items():
+        print(f"{name:<14} {latency['p50']:>8.2f} {latency['p95']:>8.2f}")
+    print(f"overhead p50: {results['overhead_p50_ms']:+.2f} ms per run")
+
+    print(f"\n{'node':<16} {'writes':>7} {'write ms':>9} {'bytes':>9} {'node ms':>8}")
+    for node, stats in per_node.items():
+        print(f"{node:<16} {stats['writes']:>7.1f} {stats['write_ms']:>9.3f} {stats['bytes']:>9.0f} "
+              f"{stats['node_ms']:>8.2f}")
+
+    print(f"\nRetry after a failed generation: {resume['resumed_llm_calls']} LLM calls resumed, "
+          f"{resume['restarted_llm_calls']} started over")
+
+    path = write_results(results, args.output, prefix="checkpoint")
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
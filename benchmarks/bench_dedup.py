@@ -0,0 +1,136 @@
+"""Near-duplicate chunk elimination: chunk count, embedding requests and retrieval redundancy.
+
+Ingests a synthetic blog whose pages repeat navigation, citation and footer
+blocks (src/core/fakes.py: synthetic_site) with dedup off and at each
+threshold, using the fake embedding model. For each setting it reports:
+
+- chunks stored and near-duplicates removed
+- embedding requests, and the time spent on dedup and ingestion
+- redundant chunks in the top k of a question set (chunks nearly
+  duplicating a higher-ranked one, each a wasted grader call)
+- how much of the top k for topical questions is unchanged from dedup off
+
+Example:
+    uv run python benchmarks/bench_dedup.py --pages 200 --thresholds 0.7,0.85,0.95
+"""
+
+import argparse
+import tempfile
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+from harness import configure_fakes, run_metadata, write_results
+
+BOILERPLATE_QUESTIONS = [
+    "How should I cite the notes on agents?",
+    "Where is the archive of posts and the newsletter?",
+    "What license are the posts published under?",
+]
+TOPICAL_QUESTIONS = [
+    "What is agent memory and planning?",
+    "How does chain-of-thought prompting work?",
+    "How do jailbreak attacks use adversarial suffixes?",
+    "What is few-shot prompting with demonstrations?",
+]
+
+
+def _redundant(documents, threshold: float) -> int:
+    """Documents nearly duplicating a higher-ranked one."""
+    import numpy as np
+
+    from src.ingestion.dedup import minhash
+
+    signatures = [minhash(doc.page_content) for doc in documents]
+    return sum(
+        any(float(np.mean(signatures[i] == signatures[j])) >= threshold for j in range(i))
+        for i in range(1, len(signatures))
+    )
+
+
+def run_setting(chunks, threshold: Optional[float], k: int, persist_dir: str,
+                reference: Optional[Dict[str, List[str]]]) -> Dict[str, Any]:
+    """Deduplicate (unless threshold is None), embed and store the chunks, then query them."""
+    from langchain_chroma import Chroma
+
+    from src.core.fakes import FakeEmbeddings
+    from src.ingestion.dedup import deduplicate
+    from src.ingestion.embedding import embed_and_store
+
+    started = time.perf_counter()
+    kept, stats = deduplicate(chunks, threshold=threshold, mode="drop" if threshold is not None else "off")
+    dedup_seconds = time.perf_counter() - started
+
+    embeddings = FakeEmbeddings()
+    store = Chroma(collection_name=f"bench-{uuid.uuid4().hex[:8]}", embedding_function=embeddings,
+                   persist_directory=persist_dir)
+    embedding = embed_and_store(store, [doc.model_copy(deep=True) for doc in kept])
+    requests = embeddings.call_count
+
+    results = {question: store.similarity_search(question, k=k) for question in BOILERPLATE_QUESTIONS + TOPICAL_QUESTIONS}
+    redundant = sum(_redundant(docs, 0.85) for docs in results.values())
+    topical = {question: [doc.page_content for doc in results[question]] for question in TOPICAL_QUESTIONS}
+    unchanged = None
+    if reference is not None:
+        unchanged = sum(len(set(topical[q]) & set(reference[q])) for q in TOPICAL_QUESTIONS) / (k * len(TOPICAL_QUESTIONS))
+    store.delete_collection()
+    return {
+        "threshold": threshold,
+        "chunks_in": len(chunks),
+        "chunks_stored": len(kept),
+        "duplicates": stats.duplicates,
+        "reduction": stats.reduction,
+        "embedding_requests": requests,
+        "dedup_ms": dedup_seconds * 1000,
+        "ingest_ms": embedding.seconds * 1000,
+        "redundant_per_question": redundant / len(results),
+        "topical_unchanged": unchanged,
+        "_topical": topical,
+    }
+
+
+def main() -> None:
+    """Ingest the synthetic site without dedup and at each threshold."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=120, help="Pages of the synthetic site")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Characters per chunk")
+    parser.add_argument("--thresholds", default="0.7,0.85,0.95", help="Comma-separated Jaccard thresholds")
+    parser.add_argument("--k", type=int, default=6, help="Documents retrieved per question")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/dedup-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    configure_fakes()
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    from src.core.fakes import synthetic_site
+
+    chunks = RecursiveCharacterTextSplitter(chunk_size=args.chunk_size, chunk_overlap=0).split_documents(
+        synthetic_site(args.pages)
+    )
+    runs: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="rag-bench-dedup-") as persist_dir:
+        baseline = run_setting(chunks, None, args.k, persist_dir, None)
+        runs.append(baseline)
+        for threshold in (float(value) for value in args.thresholds.split(",")):
+            runs.append(run_setting(chunks, threshold, args.k, persist_dir, baseline["_topical"]))
+    for run in runs:
+        run.pop("_topical")
+
+    print(f"\n{'threshold':>9} {'chunks':>7} {'removed':>8} {'requests':>9} {'dedup ms':>9} "
+          f"{'redundant/q':>12} {'topical same':>13}")
+    for run in runs:
+        same = "-" if run["topical_unchanged"] is None else f"{run['topical_unchanged']:.2f}"
+        print(f"{'off' if run['threshold'] is None else run['threshold']:>9} {run['chunks_stored']:>7} "
+              f"{run['reduction']:>8.0%} {run['embedding_requests']:>9} {run['dedup_ms']:>9.1f} "
+              f"{run['redundant_per_question']:>12.2f} {same:>13}")
+
+    results = {
+        "meta": run_metadata(benchmark="dedup", pages=args.pages, chunk_size=args.chunk_size, k=args.k),
+        "runs": runs,
+    }
+    path = write_results(results, args.output, prefix="dedup")
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
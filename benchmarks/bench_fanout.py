@@ -0,0 +1,132 @@
+"""Router fan-out: how often it triggers and what it saves over the sequential fallback.
+
+Runs a question mix through the graph against the fake backends with
+ROUTER_FANOUT off (a wrong vectorstore route pays retrieve → grade → web
+search → generate in series) and with each threshold. The fake router is
+unsure (confidence 0.55) when a question has only one knowledge-base word.
+For each setting it reports:
+
+- end-to-end p50 / p95 latency of the mix and of the unsure questions
+- fan-out rate (share of routes fanned out)
+- web searches per question, and how many fanned-out results were used
+- web search time taken off the critical path (rag_router_fanout_saved_seconds_total)
+
+Example:
+    uv run python benchmarks/bench_fanout.py --iterations 20 --llm-latency 0.05 --search-latency 0.5
+"""
+
+import argparse
+import time
+from typing import Any, Dict, List, Optional
+
+from harness import configure_fakes, run_metadata, write_results
+
+# (question, unsure route): knowledge-base, web and ambiguous questions for the fake router
+QUESTIONS = [
+    ("What is agent memory and planning?", False),
+    ("How does chain-of-thought prompting work?", False),
+    ("What are the best places to visit in Indonesia?", False),
+    ("What is the capital of France?", False),
+    ("What tools do I need to fix a bike?", True),
+    ("How do I plan memory upgrades for a laptop?", True),
+]
+
+
+def run_setting(threshold: Optional[float], iterations: int, k: int) -> Dict[str, Any]:
+    """Run the mix with fan-out off (threshold None) or "auto" at the threshold."""
+    import dataclasses
+
+    from src.config.settings import settings
+    from src.core.stats import latency_summary
+    from src.graph import edges
+    from src.graph.edges import ROUTES
+    from src.graph.runner import run_question
+    from src.nodes.websearch import FANOUT_SAVED_SECONDS, FANOUT_WEB_RESULTS
+
+    if threshold is not None:
+        edges.settings = dataclasses.replace(settings, ROUTER_FANOUT_THRESHOLD=threshold)
+    config = {"k": k, "fanout": "off" if threshold is None else "auto"}
+    search_tool_calls = _search_calls()
+    before = {
+        "fanout": ROUTES.value(route="fanout"), "routes": sum(value for _, value in ROUTES.samples()),
+        "used": FANOUT_WEB_RESULTS.value(), "saved": FANOUT_SAVED_SECONDS.value(),
+    }
+    latencies: List[float] = []
+    unsure: List[float] = []
+    for _ in range(iterations):
+        for question, ambiguous in QUESTIONS:
+            started = time.perf_counter()
+            run_question(question, config)
+            elapsed = (time.perf_counter() - started) * 1000
+            latencies.append(elapsed)
+            if ambiguous:
+                unsure.append(elapsed)
+    edges.settings = settings
+
+    runs = iterations * len(QUESTIONS)
+    routes = sum(value for _, value in ROUTES.samples()) - before["routes"]
+    fanouts = ROUTES.value(route="fanout") - before["fanout"]
+    return {
+        "threshold": threshold,
+        "e2e_ms": latency_summary(latencies),
+        "unsure_e2e_ms": latency_summary(unsure),
+        "fanout_rate": fanouts / routes if routes else 0.0,
+        "web_searches_per_question": (_search_calls() - search_tool_calls) / runs,
+        "fanout_results_used": FANOUT_WEB_RESULTS.value() - before["used"],
+        "fanouts": fanouts,
+        "saved_ms_per_fanout": (FANOUT_SAVED_SECONDS.value() - before["saved"]) * 1000 / fanouts if fanouts else 0.0,
+    }
+
+
+def _search_calls() -> float:
+    """Web searches so far: prefetches plus web search nodes that did not reuse a prefetch."""
+    from src.graph.constants import PREFETCH_WEB_SEARCH, WEB_SEARCH
+    from src.nodes.websearch import FANOUT_WEB_RESULTS
+    from src.observability.instrumentation import NODE_SECONDS
+
+    return (NODE_SECONDS.count(node=WEB_SEARCH) + NODE_SECONDS.count(node=PREFETCH_WEB_SEARCH)
+            - FANOUT_WEB_RESULTS.value())
+
+
+def main() -> None:
+    """Run the mix with fan-out off and at each threshold."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10, help="Runs of the question mix per setting")
+    parser.add_argument("--thresholds", default="0.5,0.7,0.95", help="Comma-separated router confidence thresholds")
+    parser.add_argument("--llm-latency", type=float, default=0.02, help="Seconds per fake LLM call")
+    parser.add_argument("--embedding-latency", type=float, default=0.01, help="Seconds per fake embedding call")
+    parser.add_argument("--search-latency", type=float, default=0.3, help="Seconds per fake web search")
+    parser.add_argument("--k", type=int, default=6, help="Documents to retrieve")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/fanout-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    configure_fakes(args.llm_latency, args.embedding_latency, args.search_latency)
+    from src.core.fakes import seed_synthetic_vectorstore
+    from src.graph.runner import run_question
+
+    seed_synthetic_vectorstore()
+    run_question(QUESTIONS[0][0])  # Warm-up: opens the collection and fills lazy caches
+
+    runs = [run_setting(None, args.iterations, args.k)]
+    runs += [run_setting(float(value), args.iterations, args.k) for value in args.thresholds.split(",")]
+
+    print(f"\n{'threshold':>9} {'p50 ms':>8} {'p95 ms':>8} {'unsure p50':>11} {'fan-out':>8} "
+          f"{'searches/q':>11} {'used':>5} {'saved ms':>9}")
+    for run in runs:
+        print(f"{'off' if run['threshold'] is None else run['threshold']:>9} {run['e2e_ms']['p50']:>8.0f} "
+              f"{run['e2e_ms']['p95']:>8.0f} {run['unsure_e2e_ms']['p50']:>11.0f} {run['fanout_rate']:>8.0%} "
+              f"{run['web_searches_per_question']:>11.2f} {run['fanout_results_used']:>5.0f} "
+              f"{run['saved_ms_per_fanout']:>9.0f}")
+
+    results = {
+        "meta": run_metadata(benchmark="fanout", iterations=args.iterations, llm_latency=args.llm_latency,
+                             embedding_latency=args.embedding_latency, search_latency=args.search_latency,
+                             k=args.k, questions=[question for question, _ in QUESTIONS]),
+        "runs": runs,
+    }
+    path = write_results(results, args.output, prefix="fanout")
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Ingestion embedding throughput against batch size and concurrency.
+
+Embeds a synthetic corpus into a temporary Chroma collection with the fake
+embedding model (fixed latency per request, standing in for the provider's
+round trip) and reports embeddings/sec for each setting. Concurrency 1 is
+the former one-batch-after-another behaviour. The fake model's own hashing
+and Chroma's writes are CPU-bound, which caps the speed-up at high
+concurrency.
+
+Example:
+    uv run python benchmarks/bench_ingest_embedding.py --chunks 2000 --latency 0.2
+"""
+
+import argparse
+import tempfile
+import uuid
+from typing import Any, Dict, List
+
+from harness import configure_fakes, run_metadata, write_results
+
+
+def run_setting(chunks: int, latency: float, batch_size: int, concurrency: int, persist_dir: str) -> Dict[str, Any]:
+    """Embed `chunks` synthetic chunks into a fresh collection and return the throughput."""
+    from langchain_chroma import Chroma
+
+    from src.core.fakes import FakeEmbeddings, synthetic_corpus
+    from src.ingestion.embedding import embed_and_store
+
+    embeddings = FakeEmbeddings(latency=latency)
+    vectorstore = Chroma(
+        collection_name=f"bench-{uuid.uuid4().hex[:8]}",
+        embedding_function=embeddings,
+        persist_directory=persist_dir,
+    )
+    stats = embed_and_store(
+        vectorstore, synthetic_corpus(chunks, words_per_doc=60),
+        batch_size=batch_size, max_concurrency=concurrency,
+    )
+    vectorstore.delete_collection()
+    return {
+        "batch_size": batch_size,
+        "concurrency": concurrency,
+        "requests": embeddings.call_count,
+        "seconds": stats.seconds,
+        "embeddings_per_sec": stats.embeddings_per_sec,
+    }
+
+
+def main() -> None:
+    """Embed the corpus once per batch size and concurrency setting."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=2000, help="Synthetic chunks to embed")
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds per fake embedding request")
+    parser.add_argument("--batch-sizes", default="32,128", help="Comma-separated batch sizes")
+    parser.add_argument("--concurrency", default="1,2,4,8", help="Comma-separated batches in flight")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/ingest-embedding-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    configure_fakes(embedding_latency=args.latency)
+
+    batch_sizes = [int(value) for value in args.batch_sizes.split(",")]
+    concurrency = [int(value) for value in args.concurrency.split(",")]
+    runs: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="rag-bench-ingest-") as persist_dir:
+        for batch_size in batch_sizes:
+            for workers in concurrency:
+                runs.append(run_setting(args.chunks, args.latency, batch_size, workers, persist_dir))
+
+    print(f"\n{'batch':>6} {'workers':>8} {'requests':>9} {'seconds':>8} {'emb/sec':>9}")
+    for run in runs:
+        print(f"{run['batch_size']:>6} {run['concurrency']:>8} {run['requests']:>9} "
+              f"{run['seconds']:>8.2f} {run['embeddings_per_sec']:>9.0f}")
+
+    results = {
+        "meta": run_metadata(benchmark="ingest_embedding", chunks=args.chunks, latency=args.latency),
+        "runs": runs,
+    }
+    path = write_results(results, args.output, prefix="ingest-embedding")
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Local-corpus loading throughput (files/sec) against parser processes.
+
+Generates a corpus of Markdown, text and HTML files (a few of them larger
+than LOCAL_CORPUS_MMAP_MIN_KB, so they are read through a memory map) and
+times load_directory() for each worker count:
+
+- cold: empty file index, every file is read, hashed and parsed
+- unchanged: second run, every file is skipped on its mtime and size
+- touched: every mtime changed, every file is hashed but none parsed
+
+Only loading is timed; splitting and embedding are covered by
+bench_ingest_embedding.py. The speed-up from more processes is bounded by
+the CPU count (recorded in the results).
+
+Example:
+    uv run python benchmarks/bench_local_corpus.py --files 5000 --workers 1,4
+"""
+
+import argparse
+import os
+import random
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+from harness import configure_fakes, run_metadata, write_results
+
+
+def generate_corpus(root: Path, files: int, large_files: int, large_kb: int, seed: int = 0) -> int:
+    """Write a synthetic corpus spread over nested directories. Returns its size in bytes."""
+    from src.core.fakes import SYNTHETIC_TOPICS
+
+    rng = random.Random(seed)
+    topics = list(SYNTHETIC_TOPICS)
+    total = 0
+    for i in range(files):
+        topic = topics[i % len(topics)]
+        words = SYNTHETIC_TOPICS[topic]
+        paragraphs = [" ".join(rng.choices(words, k=60)) + "." for _ in range(rng.randint(3, 12))]
+        if i < large_files:
+            paragraphs *= max(1, large_kb * 1024 // len("\n\n".join(paragraphs)) + 1)
+        kind = ("md", "txt", "html")[i % 3]
+        if kind == "md":
+            text = f"# {topic} note {i}\n\n" + "\n\n".join(paragraphs)
+        elif kind == "txt":
+            text = "\n\n".join(paragraphs)
+        else:
+            body = "".join(f"<p>{paragraph}</p>" for paragraph in paragraphs)
+            text = f"<html><head><title>{topic} page {i}</title></head><body>{body}</body></html>"
+        path = root / topic / f"{i // 500:03d}" / f"doc-{i}.{kind}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        total += len(text)
+    return total
+
+
+def run_setting(root: Path, workers: int, index_dir: str) -> Dict[str, Any]:
+    """Cold, unchanged and touched loads of the corpus with a fresh file index."""
+    from src.ingestion.local import FileIndex, load_directory
+
+    index = FileIndex(os.path.join(index_dir, f"index-{workers}.sqlite"))
+    result: Dict[str, Any] = {"workers": workers}
+
+    load = load_directory(str(root), workers=workers, index=index)
+    index.record(load.states)
+    result["cold"] = {"files": load.files, "parsed": len(load.documents), "seconds": load.seconds,
+                      "files_per_sec": load.files_per_sec}
+
+    load = load_directory(str(root), workers=workers, index=index)
+    result["unchanged"] = {"files": load.files, "parsed": len(load.documents), "seconds": load.seconds,
+                           "files_per_sec": load.files_per_sec}
+
+    for path in root.rglob("doc-*"):
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    load = load_directory(str(root), workers=workers, index=index)
+    index.record(load.states)
+    result["touched"] = {"files": load.files, "parsed": len(load.documents), "rehashed": load.rehashed,
+                         "seconds": load.seconds, "files_per_sec": load.files_per_sec}
+    return result
+
+
+def main() -> None:
+    """Generate the corpus once and load it with each worker count."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=5000, help="Files in the generated corpus")
+    parser.add_argument("--large-files", type=int, default=20, help="Files above the memory-map threshold")
+    parser.add_argument("--large-kb", type=int, default=2048, help="Size of the large files in KB")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated parser process counts")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/local-corpus-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    configure_fakes()
+    workers = [int(value) for value in args.workers.split(",")]
+    runs: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="rag-bench-corpus-") as tmp:
+        root = Path(tmp, "corpus")
+        size = generate_corpus(root, args.files, args.large_files, args.large_kb)
+        print(f"Generated {args.files} files ({size / 2**20:.1f} MB), {os.cpu_count()} CPUs")
+        for count in workers:
+            runs.append(run_setting(root, count, tmp))
+
+    print(f"\n{'workers':>8} {'cold f/s':>10} {'unchanged f/s':>14} {'touched f/s':>12}")
+    for run in runs:
+        print(f"{run['workers']:>8} {run['cold']['files_per_sec']:>10.0f} "
+              f"{run['unchanged']['files_per_sec']:>14.0f} {run['touched']['files_per_sec']:>12.0f}")
+
+    results = {
+        "meta": run_metadata(benchmark="local_corpus", files=args.files, large_files=args.large_files,
+                             large_kb=args.large_kb, corpus_mb=size / 2**20, cpus=os.cpu_count()),
+        "runs": runs,
+    }
+    path = write_results(results, args.output, prefix="local-corpus")
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Per-request logging overhead of the graph under different logging setups.
+
+Runs the vectorstore happy path against the fake backends (no injected
+latency, so logging cost is not hidden behind model calls) with:
+
+- disabled: only warnings are logged
+- sync: the previous setup - console and DEBUG file handlers called inline
+- queue: the queue-based pipeline (JSON file, rotation) from setup_logger()
+- queue_sampled: the same with agentic_rag.nodes sampled at 10%
+
+Console output goes to /dev/null and files to a temporary directory.
+
+Example:
+    uv run python benchmarks/bench_logging.py --iterations 200
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+from harness import configure_fakes, run_metadata, write_results
+
+QUESTION = "What is agent memory?"
+
+
+def _sync_setup(log_dir: Path, devnull) -> None:
+    """Recreate the former synchronous setup (handlers called on the request thread)."""
+    from src.config.logging_config import stop_logging
+
+    stop_logging()
+    logger = logging.getLogger("agentic_rag")
+    logger.handlers.clear()
+    logger.setLevel(logging.INFO)
+    console = logging.StreamHandler(devnull)
+    console.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    file_handler = logging.FileHandler(log_dir / "sync.log", encoding="utf-8")
+    file_handler.setLevel(logging.DEBUG)
+    file_handler.setFormatter(logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s"
+    ))
+    logger.addHandler(console)
+    logger.addHandler(file_handler)
+
+
+def _disabled_setup(log_dir: Path, devnull) -> None:
+    from src.config import setup_logger
+
+    setup_logger(level=logging.WARNING, log_file=log_dir / "disabled.log", sampling={}, stream=devnull)
+
+
+def _queue_setup(log_dir: Path, devnull) -> None:
+    from src.config import setup_logger
+
+    setup_logger(log_file=log_dir / "queue.log", sampling={}, stream=devnull)
+
+
+def _queue_sampled_setup(log_dir: Path, devnull) -> None:
+    from src.config import setup_logger
+
+    setup_logger(log_file=log_dir / "queue_sampled.log", sampling={"agentic_rag.nodes": 0.1}, stream=devnull)
+
+
+VARIANTS: Dict[str, Callable[[Path, Any], None]] = {
+    "disabled": _disabled_setup,
+    "sync": _sync_setup,
+    "queue": _queue_setup,
+    "queue_sampled": _queue_sampled_setup,
+}
+
+
+def run_variant(name: str, iterations: int, log_dir: Path, devnull) -> Dict[str, Any]:
+    """Configure logging for a variant and time `iterations` graph runs (wall and process CPU time)."""
+    from src.config.logging_config import stop_logging
+    from src.graph.runner import run_question
+
+    VARIANTS[name](log_dir, devnull)
+    run_question(QUESTION)  # Warm-up
+
+    latencies = []
+    cpu_started = time.process_time()
+    for _ in range(iterations):
+        started = time.perf_counter()
+        run_question(QUESTION)
+        latencies.append((time.perf_counter() - started) * 1000)
+    stop_logging()  # Includes the listener thread's remaining work in the CPU time
+    cpu_ms = (time.process_time() - cpu_started) * 1000
+
+    logging.getLogger("agentic_rag").handlers.clear()
+    return {"latencies": latencies, "cpu_ms": cpu_ms}
+
+
+def main() -> None:
+    """Run every variant and print the overhead relative to disabled logging."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200, help="Timed runs per variant")
+    parser.add_argument("--rounds", type=int, default=5, help="Interleaved rounds the runs are split into")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/logging-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    configure_fakes()
+
+    from src.core.fakes import seed_synthetic_vectorstore
+
+    seed_synthetic_vectorstore()
+
+    from src.core.stats import latency_summary
+
+    results = {
+        "meta": run_metadata(benchmark="logging", iterations=args.iterations, rounds=args.rounds),
+        "variants": {},
+    }
+    latencies: Dict[str, List[float]] = {name: [] for name in VARIANTS}
+    cpu_ms: Dict[str, float] = {name: 0.0 for name in VARIANTS}
+    per_round = max(1, args.iterations // args.rounds)
+
+    with tempfile.TemporaryDirectory(prefix="rag-bench-logs-") as log_dir, open(os.devnull, "w") as devnull:
+        # Variants are interleaved in rounds so drift (CPU frequency, caches) affects them alike
+        for _ in range(args.rounds):
+            for name in VARIANTS:
+                run = run_variant(name, per_round, Path(log_dir), devnull)
+                latencies[name].extend(run["latencies"])
+                cpu_ms[name] += run["cpu_ms"]
+
+        runs = per_round * args.rounds
+        for name in VARIANTS:
+            log_file = Path(log_dir) / f"{name}.log"
+            lines = sum(1 for _ in log_file.open(encoding="utf-8")) if log_file.exists() else 0
+            results["variants"][name] = {
+                "latency_ms": latency_summary(latencies[name]),
+                "cpu_ms_per_request": cpu_ms[name] / runs,
+                "log_lines_per_request": lines / (runs + args.rounds),  # Warm-up runs log too
+            }
+
+    baseline = results["variants"]["disabled"]
+    print(f"\n{'variant':<16} {'p50 ms':>8} {'p95 ms':>8} {'+p50 ms':>8} {'CPU ms/req':>11} {'+CPU ms':>8} {'lines/req':>10}")
+    for name, result in results["variants"].items():
+        latency = result["latency_ms"]
+        result["overhead_p50_ms"] = latency["p50"] - baseline["latency_ms"]["p50"]
+        result["overhead_cpu_ms"] = result["cpu_ms_per_request"] - baseline["cpu_ms_per_request"]
+        print(f"{name:<16} {latency['p50']:>8.2f} {latency['p95']:>8.2f} {result['overhead_p50_ms']:>8.2f} "
+              f"{result['cpu_ms_per_request']:>11.2f} {result['overhead_cpu_ms']:>8.2f} "
+              f"{result['log_lines_per_request']:>10.1f}")
+
+    path = write_results(results, args.output, prefix="logging")
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Retrieval latency with and without the retrieval result cache.
+
+Runs retrieve_node over the synthetic vectorstore with the fake embedding
+model (fixed latency per request, standing in for the provider's round
+trip) for a skewed stream of questions, as resubmitted questions and the
+Gradio example buttons produce: a few questions make up most of the
+traffic. Reports per search type, cache off vs. on:
+
+- p50 / p95 retrieve latency, and the hit rate
+- embedding requests made
+- cache entries and estimated bytes per entry
+
+Example:
+    uv run python benchmarks/bench_retrieval_cache.py --queries 500 --embedding-latency 0.05
+"""
+
+import argparse
+import os
+import random
+import time
+from typing import Any, Dict, List
+
+from harness import configure_fakes, run_metadata, write_results
+
+QUESTIONS = [
+    "What is agent memory?",
+    "How does chain-of-thought prompting work?",
+    "What are adversarial attacks on language models?",
+    "How do agents use tools for planning?",
+    "What is few-shot prompting?",
+    "How can jailbreak attacks be defended against?",
+    "How do agents use reflection and long-term memory?",
+    "What is self-consistency in prompting?",
+    "How does task decomposition help agent planning?",
+    "What are prompt injection attacks on llm tools?",
+    "What is the react pattern for agents?",
+    "How are adversarial suffixes found?",
+]
+
+
+def question_stream(queries: int, seed: int = 0) -> List[str]:
+    """Zipf-like stream: the i-th question is asked with weight 1 / (i + 1)."""
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) for i in range(len(QUESTIONS))]
+    return rng.choices(QUESTIONS, weights=weights, k=queries)
+
+
+def run_setting(search_type: str, cache_enabled: bool, questions: List[str]) -> Dict[str, Any]:
+    """Run retrieve_node for every question and summarize latency and cache use."""
+    from src.core.llm import get_embeddings
+    from src.core.stats import latency_summary
+    from src.ingestion.retrieval_cache import RETRIEVAL_CACHE_LOOKUPS, get_retrieval_cache
+    from src.nodes.retrieve import retrieve_node
+
+    cache = get_retrieval_cache()
+    cache.clear()
+    embeddings = get_embeddings()
+    embedding_calls = embeddings.call_count
+    hits = RETRIEVAL_CACHE_LOOKUPS.value(result="hit")
+
+    samples = []
+    for question in questions:
+        if not cache_enabled:
+            cache.clear()  # Every lookup misses, as without the cache
+        started = time.perf_counter()
+        retrieve_node({"question": question, "retrieval_config": {"search_type": search_type}})
+        samples.append((time.perf_counter() - started) * 1000)
+
+    stats = cache.stats()
+    return {
+        "search_type": search_type,
+        "cache": cache_enabled,
+        "latency_ms": latency_summary(samples),
+        "hit_rate": (RETRIEVAL_CACHE_LOOKUPS.value(result="hit") - hits) / len(questions),
+        "embedding_calls": embeddings.call_count - embedding_calls,
+        "entries": stats["entries"],
+        "bytes_per_entry": stats["bytes"] / stats["entries"] if stats["entries"] else 0.0,
+    }
+
+
+def main() -> None:
+    """Compare retrieval with the cache off and on."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=1000, help="Synthetic documents in the vectorstore")
+    parser.add_argument("--queries", type=int, default=500, help="Questions in the stream")
+    parser.add_argument("--embedding-latency", type=float, default=0.05, help="Seconds per fake embedding request")
+    parser.add_argument("--search-types", default="mmr,similarity", help="Comma-separated search types")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/retrieval-cache-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    # The cache-off runs clear it before every question
+    os.environ["RETRIEVAL_CACHE_ENABLED"] = "true"
+    configure_fakes(embedding_latency=args.embedding_latency)
+
+    from src.core.fakes import seed_synthetic_vectorstore
+
+    seed_synthetic_vectorstore(args.docs)
+    questions = question_stream(args.queries)
+
+    runs = [
+        run_setting(search_type, cache_enabled, questions)
+        for search_type in args.search_types.split(",")
+        for cache_enabled in (False, True)
+    ]
+
+    print(f"\n{'search':<11} {'cache':>5} {'p50 ms':>8} {'p95 ms':>8} {'hits':>6} {'embeds':>7} {'B/entry':>8}")
+    for run in runs:
+        print(f"{run['search_type']:<11} {'on' if run['cache'] else 'off':>5} {run['latency_ms']['p50']:>8.2f} "
+              f"{run['latency_ms']['p95']:>8.2f} {run['hit_rate']:>6.2f} {run['embedding_calls']:>7} "
+              f"{run['bytes_per_entry']:>8.0f}")
+
+    results = {
+        "meta": run_metadata(benchmark="retrieval_cache", docs=args.docs, queries=args.queries,
+                             embedding_latency=args.embedding_latency),
+        "runs": runs,
+    }
+    path = write_results(results, args.output, prefix="retrieval-cache")
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
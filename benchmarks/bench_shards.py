@@ -0,0 +1,96 @@
+"""Query latency and rebuild time against the number of knowledge base shards.
+
+Builds the synthetic corpus into 1, 2, 4, ... shard collections (by content
+hash, for an even spread) in a temporary Chroma directory, with the fake
+embedding model, and reports for each shard count:
+
+- p50 / p95 latency of the scatter-gather retriever (similarity and MMR)
+- time to build all shards, and to rebuild a single shard
+
+Example:
+    uv run python benchmarks/bench_shards.py --docs 5000 --shards 1,2,4,8
+"""
+
+import argparse
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from harness import configure_fakes, run_metadata, write_results
+
+QUESTIONS = [
+    "What is agent memory?",
+    "How does chain-of-thought prompting work?",
+    "What are adversarial attacks on language models?",
+    "How do agents use tools for planning?",
+    "What is few-shot prompting?",
+    "How can jailbreak attacks be defended against?",
+]
+
+
+def run_shard_count(num_shards: int, docs, persist_dir: str, queries: int) -> Dict[str, Any]:
+    """Build the corpus into `num_shards` shards, then time queries and a single-shard rebuild."""
+    from src.core.stats import latency_summary
+    from src.ingestion.shards import ShardedRetriever, ingest_shards, open_shards, rebuild_shard
+
+    shards = open_shards(num_shards, persist_directory=persist_dir, collection_name=f"bench-{num_shards}")
+    started = time.perf_counter()
+    ingest_shards(docs, shards, shard_by="hash")
+    build_seconds = time.perf_counter() - started
+
+    latencies: Dict[str, Dict[str, float]] = {}
+    for search_type in ("similarity", "mmr"):
+        retriever = ShardedRetriever(shards=shards, search_type=search_type, k=6, fetch_k=20)
+        retriever.invoke(QUESTIONS[0])  # Warm-up
+        samples: List[float] = []
+        for i in range(queries):
+            query_started = time.perf_counter()
+            retriever.invoke(QUESTIONS[i % len(QUESTIONS)])
+            samples.append((time.perf_counter() - query_started) * 1000)
+        latencies[search_type] = latency_summary(samples)
+
+    started = time.perf_counter()
+    rebuild_shard(0, docs, shards, shard_by="hash")
+    rebuild_seconds = time.perf_counter() - started
+
+    return {
+        "shards": num_shards,
+        "chunks_per_shard": [shard._collection.count() for shard in shards],
+        "build_seconds": build_seconds,
+        "rebuild_one_shard_seconds": rebuild_seconds,
+        "latency_ms": latencies,
+    }
+
+
+def main() -> None:
+    """Run every shard count and print latency and rebuild time."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=5000, help="Synthetic chunks in the corpus")
+    parser.add_argument("--shards", default="1,2,4,8", help="Comma-separated shard counts")
+    parser.add_argument("--queries", type=int, default=200, help="Timed queries per search type")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/shards-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    configure_fakes()
+
+    from src.core.fakes import synthetic_corpus
+
+    docs = synthetic_corpus(args.docs, words_per_doc=60)
+    runs = []
+    with tempfile.TemporaryDirectory(prefix="rag-bench-shards-") as persist_dir:
+        for num_shards in (int(value) for value in args.shards.split(",")):
+            runs.append(run_shard_count(num_shards, docs, persist_dir, args.queries))
+
+    print(f"\n{'shards':>6} {'sim p50':>8} {'sim p95':>8} {'mmr p50':>8} {'mmr p95':>8} {'build s':>8} {'rebuild s':>10}")
+    for run in runs:
+        similarity, mmr = run["latency_ms"]["similarity"], run["latency_ms"]["mmr"]
+        print(f"{run['shards']:>6} {similarity['p50']:>8.2f} {similarity['p95']:>8.2f} {mmr['p50']:>8.2f} "
+              f"{mmr['p95']:>8.2f} {run['build_seconds']:>8.2f} {run['rebuild_one_shard_seconds']:>10.2f}")
+
+    results = {"meta": run_metadata(benchmark="shards", docs=args.docs, queries=args.queries), "runs": runs}
+    path = write_results(results, args.output, prefix="shards")
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
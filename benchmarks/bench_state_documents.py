@@ -0,0 +1,122 @@
+"""Per-request memory of documents in graph state: full copies vs. references.
+
+Runs a mix of knowledge-base and web search questions through the graph
+against the fake backends, once with full Documents in the state and once
+with STATE_DOCUMENT_REFS (references into the shared document store). The
+chunks are --chunk-words long. For each mode it reports:
+
+- retained: memory held per request by the final states of --requests
+  requests kept alive at once (as by in-flight requests or a checkpointer),
+  including the growth of the shared document store
+- update bytes: serialized size of the node updates of one request (what a
+  checkpointer writes, or a worker process sends back)
+- p50 latency of a request
+
+Example:
+    uv run python benchmarks/bench_state_documents.py --requests 200 --chunk-words 400
+"""
+
+import argparse
+import dataclasses
+import gc
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+from harness import configure_fakes, run_metadata, write_results
+
+QUESTIONS = [
+    "What is agent memory?",
+    "How does chain-of-thought prompting work?",
+    "What are adversarial attacks on language models?",
+    "How do agents use tools for planning?",
+    "What are the best places to visit in Indonesia?",
+]
+
+
+def run_mode(refs: bool, requests: int, k: int) -> Dict[str, Any]:
+    """Run the question mix with full documents or references in the state."""
+    from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+    from src.config.settings import settings
+    from src.core import document_store
+    from src.core.stats import latency_summary
+    from src.graph import get_rag_app
+    from src.graph.runner import build_inputs
+
+    document_store.settings = dataclasses.replace(settings, STATE_DOCUMENT_REFS=refs)
+    document_store.get_document_store().clear()
+    serde = JsonPlusSerializer(allowed_msgpack_modules=[("src.core.document_store", "DocumentRef")])
+    app = get_rag_app()
+    config = {"search_type": "similarity", "k": k}
+
+    update_bytes: List[int] = []
+    for question in QUESTIONS:
+        updates = list(app.stream(build_inputs(question, config)))
+        update_bytes.append(sum(len(serde.dumps_typed(update)[1]) for update in updates))
+
+    latencies = []
+    for i in range(requests):
+        started = time.perf_counter()
+        app.invoke(build_inputs(QUESTIONS[i % len(QUESTIONS)], config))
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    document_store.get_document_store().clear()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    states = [app.invoke(build_inputs(QUESTIONS[i % len(QUESTIONS)], config)) for i in range(requests)]
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    return {
+        "refs": refs,
+        "requests": requests,
+        "state_documents": sum(len(state["documents"]) for state in states) / requests,
+        "retained_kb_per_request": retained / requests / 1024,
+        "update_bytes_per_request": sum(update_bytes) / len(update_bytes),
+        "document_store_entries": len(document_store.get_document_store()),
+        "latency_ms": latency_summary(latencies),
+    }
+
+
+def main() -> None:
+    """Measure both modes over the same seeded vectorstore."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=100, help="Requests whose final states are kept alive")
+    parser.add_argument("--chunk-words", type=int, default=400, help="Words per synthetic chunk")
+    parser.add_argument("--chunks", type=int, default=60, help="Chunks in the vectorstore")
+    parser.add_argument("--k", type=int, default=6, help="Documents retrieved per question")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/state-documents-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    configure_fakes()
+    from src.core.fakes import synthetic_corpus
+    from src.ingestion import get_vectorstore
+    from src.ingestion.retrieval_cache import bump_version
+
+    vectorstore = get_vectorstore()
+    vectorstore.add_documents(synthetic_corpus(args.chunks, words_per_doc=args.chunk_words))
+    bump_version(vectorstore)
+
+    runs = [run_mode(refs, args.requests, args.k) for refs in (False, True)]
+
+    print(f"\n{'state':>10} {'docs/state':>11} {'retained KB/req':>16} {'update bytes/req':>17} "
+          f"{'store docs':>11} {'p50 ms':>8}")
+    for run in runs:
+        print(f"{'refs' if run['refs'] else 'full':>10} {run['state_documents']:>11.1f} "
+              f"{run['retained_kb_per_request']:>16.1f} {run['update_bytes_per_request']:>17.0f} "
+              f"{run['document_store_entries']:>11} {run['latency_ms']['p50']:>8.2f}")
+
+    results = {
+        "meta": run_metadata(benchmark="state_documents", requests=args.requests, chunk_words=args.chunk_words,
+                             chunks=args.chunks, k=args.k),
+        "runs": runs,
+    }
+    path = write_results(results, args.output, prefix="state-documents")
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Latency of the first questions after startup, with and without warm-up.
+
+Each setting runs in a fresh interpreter against the fake backends and the
+synthetic vectorstore (seeded beforehand), so nothing is built or loaded
+yet: with --warm-up the process first runs warm_up() (timed per step), then
+answers a few questions; without it the first question pays for building
+the models, chains and graph, opening the collection and loading the index.
+
+Example:
+    uv run python benchmarks/bench_warmup.py --questions 3 --embedding-latency 0.05
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Any, Dict
+
+from harness import PROJECT_ROOT, configure_fakes, run_metadata, write_results
+
+QUESTIONS = [
+    "How does chain-of-thought prompting work?",
+    "What are adversarial attacks on language models?",
+    "How do agents use tools for planning?",
+    "What is few-shot prompting?",
+]
+
+
+def child(warm: bool, questions: int) -> Dict[str, Any]:
+    """Run in the fresh interpreter: optional warm-up, then the first questions."""
+    started = time.perf_counter()
+    from src.graph import run_question, warm_up
+
+    import_ms = (time.perf_counter() - started) * 1000
+    steps = {}
+    warm_up_ms = 0.0
+    if warm:
+        started = time.perf_counter()
+        timings = warm_up()
+        warm_up_ms = (time.perf_counter() - started) * 1000
+        steps = {name: ms for name, ms in timings.items()
+                 if name in ("singletons", "vectorstore", "index", "connections", "retriever", "web_search_tool")}
+
+    latencies = []
+    for i in range(questions):
+        started = time.perf_counter()
+        run_question(QUESTIONS[i % len(QUESTIONS)])
+        latencies.append((time.perf_counter() - started) * 1000)
+    return {"warm_up": warm, "import_ms": import_ms, "warm_up_ms": warm_up_ms, "steps_ms": steps,
+            "question_ms": latencies}
+
+
+def main() -> None:
+    """Start a fresh process per setting and compare the first question latencies."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=3, help="Questions timed after startup")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds per fake LLM call")
+    parser.add_argument("--embedding-latency", type=float, default=0.05, help="Seconds per fake embedding call")
+    parser.add_argument("--child", choices=["cold", "warm"], help=argparse.SUPPRESS)
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/warmup-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    if args.child:
+        configure_fakes(llm_latency=args.llm_latency, embedding_latency=args.embedding_latency,
+                        persist_dir=os.environ["CHROMA_PERSIST_DIR"])
+        print(json.dumps(child(args.child == "warm", args.questions)))
+        return
+
+    persist_dir = configure_fakes(llm_latency=args.llm_latency, embedding_latency=args.embedding_latency)
+    from src.core.fakes import seed_synthetic_vectorstore
+
+    seed_synthetic_vectorstore()
+
+    runs = []
+    for setting in ("cold", "warm"):
+        result = subprocess.run(
+            [sys.executable, __file__, "--child", setting, "--questions", str(args.questions),
+             "--llm-latency", str(args.llm_latency), "--embedding-latency", str(args.embedding_latency)],
+            cwd=PROJECT_ROOT, env={**os.environ, "CHROMA_PERSIST_DIR": persist_dir},
+            capture_output=True, text=True, check=True,
+        )
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    for run in runs:
+        print(f"\n{'warm-up' if run['warm_up'] else 'no warm-up'}: import {run['import_ms']:.0f} ms, "
+              f"warm-up {run['warm_up_ms']:.0f} ms")
+        for step, ms in run["steps_ms"].items():
+            print(f"    {step:<16} {ms:8.1f} ms")
+        print("    questions      " + "  ".join(f"{ms:.1f}" for ms in run["question_ms"]) + " ms")
+
+    results = {
+        "meta": run_metadata(benchmark="warmup", questions=args.questions, llm_latency=args.llm_latency,
+                             embedding_latency=args.embedding_latency),
+        "runs": runs,
+    }
+    path = write_results(results, args.output, prefix="warmup")
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
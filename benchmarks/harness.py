@@ -0,0 +1,211 @@
+"""Shared harness for the offline benchmarks.
+
+Benchmarks run the real graph against the bundled fake LLM, embedding and
+web search stand-ins (src/core/fakes.py) over a synthetic vectorstore, so
+results are deterministic and need no API keys or network.
+
+configure_fakes() must run before anything from `src` is imported, because
+settings are read from the environment at import time.
+"""
+
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+
+# Add project root to path for direct script execution
+sys.path.insert(0, str(PROJECT_ROOT))
+
+
+def configure_fakes(
+    llm_latency: float = 0.0,
+    embedding_latency: float = 0.0,
+    search_latency: float = 0.0,
+    persist_dir: Optional[str] = None,
+    role_latency: Optional[Dict[str, float]] = None,
+    latency_jitter: float = 0.0,
+) -> str:
+    """
+    Point the application at the fake backends with the given injected latencies.
+
+    Args:
+        llm_latency: Seconds per fake LLM call.
+        embedding_latency: Seconds per fake embedding call.
+        search_latency: Seconds per fake web search.
+        persist_dir: Chroma directory for the synthetic vectorstore (temporary if None).
+        role_latency: Seconds per fake LLM call for specific model roles (e.g. {"router": 0.005}).
+        latency_jitter: Lognormal spread of every fake latency around its median (0 = fixed).
+
+    Returns:
+        The Chroma directory used.
+    """
+    persist_dir = persist_dir or tempfile.mkdtemp(prefix="rag-bench-chroma-")
+    os.environ.update({
+        "LLM_PROVIDER": "fake",
+        "FAKE_LLM_LATENCY": str(llm_latency),
+        "FAKE_EMBEDDING_LATENCY": str(embedding_latency),
+        "FAKE_SEARCH_LATENCY": str(search_latency),
+        "FAKE_LATENCY_JITTER": str(latency_jitter),
+        "CHROMA_PERSIST_DIR": persist_dir,
+        "USER_AGENT": os.environ.get("USER_AGENT", "LangGraph-Agentic-RAG-Bench/1.0"),
+        # Benchmarks measure the graph, not trace file writes (opt in with TRACE_ENABLED=true)
+        "TRACE_ENABLED": os.environ.get("TRACE_ENABLED", "false"),
+        # Repeated runs would otherwise be served from the response cache after the first one
+        "LLM_CACHE_ENABLED": os.environ.get("LLM_CACHE_ENABLED", "false"),
+        "RETRIEVAL_CACHE_ENABLED": os.environ.get("RETRIEVAL_CACHE_ENABLED", "false"),
+    })
+    for role, latency in (role_latency or {}).items():
+        os.environ[f"FAKE_LLM_LATENCY_{role.upper()}"] = str(latency)
+    # Keep application warnings (e.g. retry-loop notices) out of the report
+    logging.getLogger("agentic_rag").setLevel(logging.ERROR)
+    return persist_dir
+
+
+def git_commit() -> str:
+    """Short hash of the current commit, or "unknown" outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_metadata(**extra: Any) -> Dict[str, Any]:
+    """Metadata stored with every result file."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        **extra,
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (0 where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    return usage / (1024 * 1024) if sys.platform == "darwin" else usage / 1024
+
+
+def rss_mb(pid: Optional[int] = None) -> float:
+    """Current resident set size of a process (default: this one) in MB (0 where unsupported)."""
+    try:
+        with open(f"/proc/{pid or 'self'}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def measure_memory(fn: Callable[[], Any]) -> Dict[str, float]:
+    """Run fn under tracemalloc and return the peak traced allocation in MB."""
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"peak_traced_mb": peak / (1024 * 1024)}
+
+
+def make_graph_timer():
+    """Create a callback handler timing graph nodes and edge functions.
+
+    Node time is reported without the conditional edge that LangGraph runs
+    inside the node (edges are reported separately).
+    """
+    from langchain_core.callbacks import BaseCallbackHandler
+
+    from src.graph.edges import GENERATION_GRADERS, decide_to_generate, route_question
+
+    edge_names = {fn.__name__ for fn in (route_question, decide_to_generate, *GENERATION_GRADERS.values())}
+
+    class GraphTimer(BaseCallbackHandler):
+        def __init__(self):
+            self.nodes: Dict[str, List[float]] = {}
+            self.edges: Dict[str, List[float]] = {}
+            self.path: List[str] = []
+            self._runs: Dict[UUID, Dict[str, Any]] = {}
+            self._lock = threading.Lock()
+
+        def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+            name = kwargs.get("name")
+            node = (metadata or {}).get("langgraph_node")
+            if name in edge_names:
+                kind = "edge"
+            elif name and name == node and name != "__start__":
+                kind = "node"
+            else:
+                return
+            with self._lock:
+                self._runs[run_id] = {
+                    "kind": kind, "name": name, "parent": parent_run_id,
+                    "start": time.perf_counter(), "children": 0.0,
+                }
+
+        def on_chain_end(self, outputs, *, run_id, **kwargs):
+            self._finish(run_id)
+
+        def on_chain_error(self, error, *, run_id, **kwargs):
+            self._finish(run_id)
+
+        def _finish(self, run_id):
+            with self._lock:
+                run = self._runs.pop(run_id, None)
+                if run is None:
+                    return
+                elapsed = time.perf_counter() - run["start"]
+                if run["kind"] == "edge":
+                    self.edges.setdefault(run["name"], []).append(elapsed * 1000)
+                    if run["parent"] in self._runs:
+                        self._runs[run["parent"]]["children"] += elapsed
+                else:
+                    self.nodes.setdefault(run["name"], []).append((elapsed - run["children"]) * 1000)
+                    self.path.append(run["name"])
+
+    return GraphTimer()
+
+
+def write_results(results: Dict[str, Any], output: Optional[str], prefix: str) -> Path:
+    """Write results as JSON (to benchmarks/results/<prefix>-<commit>-<time>.json by default)."""
+    if output:
+        path = Path(output)
+    else:
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = RESULTS_DIR / f"{prefix}-{results['meta']['commit']}-{stamp}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    return path
+
+
+def compare_metric(name: str, old: float, new: float, threshold: float, lower_is_better: bool = True) -> str:
+    """Format a metric comparison line, flagging regressions beyond threshold (a fraction)."""
+    if old:
+        change = (new - old) / old
+    else:
+        change = 0.0 if not new else float("inf")
+    regressed = change > threshold if lower_is_better else change < -threshold
+    flag = "  << REGRESSION" if regressed else ""
+    return f"  {name:<28} {old:>10.2f} -> {new:>10.2f}  ({change:+.1%}){flag}"
@@ -0,0 +1,254 @@
+"""Concurrent-user load test of the frontend pipeline or the HTTP API.
+
+For each user count N, N virtual users run for --duration seconds. Each
+user repeatedly picks a question from the mix, sends it, waits for the
+complete answer, and then thinks for an exponentially distributed time
+(mean --think-time). Per level the tool reports:
+
+- throughput (answers/sec)
+- p50 / p95 / p99 latency
+- time to first update
+- error rate
+- peak RSS
+
+Targets:
+
+- frontend: the Gradio app's stream_response() in this process, against
+  the fake LLM, embedding and search backends with lognormal latencies
+  (median --*-latency, spread --latency-jitter) over the synthetic
+  vectorstore. At most --concurrency-limit answers run at once, like
+  Gradio's queue (UI_CONCURRENCY_LIMIT); queue wait counts as latency.
+  The first update is the first node update after the echoed question.
+- query / stream: POST /query or /stream of a running API (--url). Start it
+  with the fake backends first, e.g.
+  LLM_PROVIDER=fake FAKE_LLM_LATENCY=0.05 FAKE_LATENCY_JITTER=0.5 uv run python main.py --api.
+  The first update is the whole response for query and the first event
+  for stream. Peak RSS is the server's if --server-pid is given.
+
+Examples:
+    uv run python benchmarks/load_test.py --users 1,2,4,8,16 --duration 15
+    uv run python benchmarks/load_test.py --concurrency-limit 8 --slo-ms 3000
+    uv run python benchmarks/load_test.py --target stream --url http://127.0.0.1:8000 --server-pid 12345
+"""
+
+import argparse
+import logging
+import random
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from harness import configure_fakes, rss_mb, run_metadata, write_results
+
+# Knowledge-base questions (retrieval + grading + generation) and web search questions
+DEFAULT_QUESTIONS = [
+    "What is agent memory?",
+    "How does chain-of-thought prompting work?",
+    "What are adversarial attacks on language models?",
+    "How do agents use tools for planning?",
+    "What is few-shot prompting?",
+    "What are the best places to visit in Indonesia?",
+]
+
+# Sends a question; returns the perf_counter() time of the first update and whether it succeeded
+Sender = Callable[[str], Tuple[float, bool]]
+
+
+@dataclass
+class Sample:
+    """One answered (or failed) question."""
+
+    latency_ms: float
+    first_update_ms: float
+    ok: bool
+
+
+def frontend_sender(concurrency_limit: int) -> Sender:
+    """Drive stream_response() with the UI's default retrieval settings, gated like Gradio's queue."""
+    from src.frontend.app import stream_response
+
+    gate = threading.BoundedSemaphore(concurrency_limit) if concurrency_limit > 0 else None
+
+    def send(question: str) -> Tuple[float, bool]:
+        first = None
+        with gate or nullcontext():
+            updates = stream_response(question, "mmr", 6, 20, 0.5, 0.3, 2)
+            next(updates)  # The echoed question, before any work
+            answered = False
+            for chat_history, *_ in updates:
+                first = first or time.perf_counter()
+                if isinstance(chat_history, list) and chat_history and chat_history[-1].get("role") == "assistant":
+                    answered = True
+        return first or time.perf_counter(), answered
+
+    return send
+
+
+def http_sender(url: str, target: str, users: int) -> Sender:
+    """POST to /query or /stream of a running API."""
+    import httpx
+
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    client = httpx.Client(base_url=url, timeout=300, limits=limits)
+
+    def send(question: str) -> Tuple[float, bool]:
+        if target == "query":
+            response = client.post("/query", json={"question": question})
+            return time.perf_counter(), response.status_code == 200
+        first, ok = None, False
+        with client.stream("POST", "/stream", json={"question": question}) as response:
+            for line in response.iter_lines():
+                if line.startswith("event:"):
+                    first = first or time.perf_counter()
+                    event = line.split(":", 1)[1].strip()
+                    ok = event == "end" if event in ("end", "error") else ok
+        return first or time.perf_counter(), ok and response.status_code == 200
+
+    return send
+
+
+def run_level(send: Sender, users: int, duration: float, think_time: float, questions: List[str],
+              rss_pid: Optional[int] = None, seed: int = 0) -> Dict[str, Any]:
+    """Run `users` virtual users for `duration` seconds and summarize their samples."""
+    from src.core.stats import latency_summary
+
+    samples: List[Sample] = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+    running = threading.Event()
+    running.set()
+    peak_rss = [rss_mb(rss_pid)]
+
+    def sample_rss() -> None:
+        while running.is_set():
+            peak_rss[0] = max(peak_rss[0], rss_mb(rss_pid))
+            time.sleep(0.05)
+
+    def user(index: int) -> None:
+        rng = random.Random(seed * 1000 + index)
+        # Stagger the first questions over one think time, as real users don't arrive at once
+        time.sleep(rng.uniform(0, think_time) if think_time > 0 else 0)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                first, ok = send(rng.choice(questions))
+            except Exception:
+                first, ok = time.perf_counter(), False
+            finished = time.perf_counter()
+            with lock:
+                samples.append(Sample((finished - started) * 1000, (first - started) * 1000, ok))
+            if think_time > 0:
+                time.sleep(min(rng.expovariate(1 / think_time), max(0.0, deadline - time.perf_counter())))
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    started = time.perf_counter()
+    threads = [threading.Thread(target=user, args=(i,), name=f"vu-{i}") for i in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    running.clear()
+    sampler.join()
+
+    succeeded = [sample for sample in samples if sample.ok]
+    return {
+        "users": users,
+        "requests": len(samples),
+        "errors": len(samples) - len(succeeded),
+        "error_rate": (len(samples) - len(succeeded)) / len(samples) if samples else 0.0,
+        "throughput_rps": len(succeeded) / elapsed if elapsed else 0.0,
+        "latency_ms": latency_summary(sample.latency_ms for sample in succeeded),
+        "first_update_ms": latency_summary(sample.first_update_ms for sample in succeeded),
+        "peak_rss_mb": peak_rss[0],
+        "seconds": elapsed,
+    }
+
+
+def main() -> None:
+    """Sweep the number of virtual users and report throughput, latency, errors and memory per level."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", choices=["frontend", "query", "stream"], default="frontend")
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API base URL (query / stream)")
+    parser.add_argument("--users", default="1,2,4,8,16", help="Comma-separated virtual user counts")
+    parser.add_argument("--duration", type=float, default=15.0, help="Seconds per user count")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean seconds between a user's questions")
+    parser.add_argument("--questions", help="JSONL / CSV question mix (as for scripts/batch_run.py); "
+                                            "repeat a question to weight it")
+    parser.add_argument("--concurrency-limit", type=int, help="Answers at once for frontend "
+                                                              "(default: UI_CONCURRENCY_LIMIT, 0 = unlimited)")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Median seconds per fake LLM call")
+    parser.add_argument("--embedding-latency", type=float, default=0.02, help="Median seconds per fake embedding call")
+    parser.add_argument("--search-latency", type=float, default=0.1, help="Median seconds per fake web search")
+    parser.add_argument("--latency-jitter", type=float, default=0.5, help="Lognormal sigma of the fake latencies")
+    parser.add_argument("--server-pid", type=int, help="API process whose RSS to sample (query / stream)")
+    parser.add_argument("--slo-ms", type=float, default=0.0, help="p95 latency objective; reports the most users within it")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/load-test-<commit>-<time>.json)")
+    args = parser.parse_args()
+
+    configure_fakes(llm_latency=args.llm_latency, embedding_latency=args.embedding_latency,
+                    search_latency=args.search_latency, latency_jitter=args.latency_jitter)
+    from src.batch.runner import read_questions
+
+    # Importing src sets up the application logger at LOG_LEVEL; keep node logs out of the report
+    logging.getLogger("agentic_rag").setLevel(logging.ERROR)
+
+    questions = [row["question"] for row in read_questions(args.questions)] if args.questions else DEFAULT_QUESTIONS
+    user_counts = [int(value) for value in args.users.split(",")]
+
+    if args.target == "frontend":
+        from src.config.settings import settings
+        from src.core.fakes import seed_synthetic_vectorstore
+        from src.graph import warm_up
+
+        seed_synthetic_vectorstore()
+        warm_up()
+        limit = settings.UI_CONCURRENCY_LIMIT if args.concurrency_limit is None else args.concurrency_limit
+        senders = {users: frontend_sender(limit) for users in user_counts}
+        rss_pid = None
+    else:
+        limit = None
+        senders = {users: http_sender(args.url, args.target, users) for users in user_counts}
+        rss_pid = args.server_pid
+
+    levels = []
+    for users in user_counts:
+        level = run_level(senders[users], users, args.duration, args.think_time, questions, rss_pid)
+        levels.append(level)
+        print(f"{users:>4} users: {level['throughput_rps']:6.2f} answers/s, "
+              f"p95 {level['latency_ms']['p95']:8.0f} ms, errors {level['error_rate']:.1%}")
+
+    print(f"\n{'users':>5} {'req':>5} {'ans/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+          f"{'first p50':>10} {'first p95':>10} {'errors':>7} {'RSS MB':>7}")
+    for level in levels:
+        latency, first = level["latency_ms"], level["first_update_ms"]
+        print(f"{level['users']:>5} {level['requests']:>5} {level['throughput_rps']:>7.2f} {latency['p50']:>8.0f} "
+              f"{latency['p95']:>8.0f} {latency['p99']:>8.0f} {first['p50']:>10.0f} {first['p95']:>10.0f} "
+              f"{level['error_rate']:>7.1%} {level['peak_rss_mb']:>7.0f}")
+
+    max_users = None
+    if args.slo_ms:
+        within = [level["users"] for level in levels
+                  if level["latency_ms"]["p95"] <= args.slo_ms and level["error_rate"] == 0]
+        max_users = max(within) if within else 0
+        print(f"\nMost users with p95 <= {args.slo_ms:.0f} ms and no errors: {max_users}")
+
+    results = {
+        "meta": run_metadata(
+            benchmark="load_test", target=args.target, url=args.url if args.target != "frontend" else None,
+            duration=args.duration, think_time=args.think_time, questions=len(questions),
+            concurrency_limit=limit, llm_latency=args.llm_latency, embedding_latency=args.embedding_latency,
+            search_latency=args.search_latency, latency_jitter=args.latency_jitter, slo_ms=args.slo_ms,
+        ),
+        "levels": levels,
+        "max_users_within_slo": max_users,
+    }
+    path = write_results(results, args.output, prefix="load-test")
+    print(f"\nResults written to {path}")
+
+
+if __name__ == "__main__":
+    main()
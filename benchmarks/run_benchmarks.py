@@ -0,0 +1,246 @@
+"""Deterministic offline benchmark of the RAG graph.
+
+Runs the main routes of the graph against the fake LLM, embedding and web
+search stand-ins with configurable injected latency (optionally per model
+role) and records per-node, per-role and end-to-end latency, LLM call counts
+and memory, for each graph variant (full / balanced / fast). Results are
+saved as JSON so runs can be compared between commits.
+
+Examples:
+    uv run python benchmarks/run_benchmarks.py --iterations 20 --llm-latency 0.02
+    uv run python benchmarks/run_benchmarks.py --llm-latency 0.05 --role-latency router=0.01,retrieval_grader=0.01
+    uv run python benchmarks/run_benchmarks.py --variants full,fast --scenarios vectorstore_happy_path,retry_loop
+    uv run python benchmarks/run_benchmarks.py --compare benchmarks/results/graph-abc1234-....json
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Dict, List
+
+from harness import (
+    compare_metric,
+    configure_fakes,
+    make_graph_timer,
+    measure_memory,
+    peak_rss_mb,
+    run_metadata,
+    write_results,
+)
+
+# Questions are chosen for the fake model's deterministic rules (see src/core/fakes.py)
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    # Router → vectorstore, documents relevant → generate → useful
+    "vectorstore_happy_path": {"question": "What is agent memory?", "answer_failures": 0},
+    # Router → vectorstore, documents graded irrelevant → web search → generate
+    "web_search_fallback": {
+        "question": "agent quantum chromodynamics lattice", "answer_failures": 0, "retrieval_config": {"fanout": "off"},
+    },
+    # The same unsure route fanned out: retrieval + grading next to the web search → generate
+    "fanout_fallback": {
+        "question": "agent quantum chromodynamics lattice", "answer_failures": 0, "retrieval_config": {"fanout": "auto"},
+    },
+    # Answer grader rejects the first answer → generate again
+    "retry_loop": {"question": "What is agent memory?", "answer_failures": 1},
+}
+
+
+def run_scenario(name: str, spec: Dict[str, Any], iterations: int, retrieval_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one scenario (one warm-up run, then `iterations` timed runs)."""
+    from src.config.settings import MODEL_ROLES, settings
+    from src.core import get_embeddings, get_llm
+    from src.core.llm import ROLE_CHAINS
+    from src.core.stats import latency_summary
+    from src.graph.runner import run_question
+
+    llms = [get_llm(role) for role in MODEL_ROLES]
+    embeddings = get_embeddings()
+    get_llm("answer_grader").answer_failures = spec["answer_failures"]
+    retrieval_config = {**retrieval_config, **spec.get("retrieval_config", {})}
+
+    def run_once() -> Dict[str, Any]:
+        for llm in llms:
+            llm.reset()
+        timer = make_graph_timer()
+        embedding_calls = embeddings.call_count
+        started = time.perf_counter()
+        state = run_question(spec["question"], retrieval_config, config={"callbacks": [timer]})
+        return {
+            "e2e_ms": (time.perf_counter() - started) * 1000,
+            "timer": timer,
+            "chains": state["metrics"]["chains"],
+            "llm_calls": state["metrics"]["llm"]["llm_calls"],
+            "embedding_calls": embeddings.call_count - embedding_calls,
+        }
+
+    run_once()  # Warm-up: opens the collection and fills lazy caches
+
+    runs = [run_once() for _ in range(iterations)]
+    nodes: Dict[str, List[float]] = {}
+    edges: Dict[str, List[float]] = {}
+    for run in runs:
+        for node, values in run["timer"].nodes.items():
+            nodes.setdefault(node, []).extend(values)
+        for edge, values in run["timer"].edges.items():
+            edges.setdefault(edge, []).extend(values)
+
+    # Latency per model role (one sample per chain call; a run may call a chain several times)
+    roles: Dict[str, Dict[str, Any]] = {}
+    for role in MODEL_ROLES:
+        per_call = [
+            run["chains"][ROLE_CHAINS[role]]["ms"] / run["chains"][ROLE_CHAINS[role]]["calls"]
+            for run in runs if run["chains"].get(ROLE_CHAINS[role], {}).get("calls")
+        ]
+        calls = sum(run["chains"].get(ROLE_CHAINS[role], {}).get("calls", 0) for run in runs)
+        if per_call:
+            roles[role] = {
+                "model": settings.LLM_ROLES[role].model,
+                "calls_per_run": calls / len(runs),
+                "ms_per_call": latency_summary(per_call),
+            }
+
+    memory = measure_memory(run_once)
+
+    return {
+        "question": spec["question"],
+        "path": runs[-1]["timer"].path,
+        "iterations": iterations,
+        "e2e_ms": latency_summary(run["e2e_ms"] for run in runs),
+        "nodes_ms": {node: latency_summary(values) for node, values in nodes.items()},
+        "edges_ms": {edge: latency_summary(values) for edge, values in edges.items()},
+        "roles": roles,
+        "llm_calls": sum(run["llm_calls"] for run in runs) / len(runs),
+        "embedding_calls": sum(run["embedding_calls"] for run in runs) / len(runs),
+        "memory": memory,
+    }
+
+
+def result_name(scenario: str, variant: str) -> str:
+    """Result key of a scenario run with a graph variant ("full" keeps the plain name, for --compare)."""
+    return scenario if variant == "full" else f"{scenario}@{variant}"
+
+
+def print_variants(results: Dict[str, Any], names: List[str], variants: List[str]) -> None:
+    """Print LLM calls and latency of each scenario by graph variant."""
+    print(f"\n{'scenario':<24} {'variant':<9} {'LLM calls/run':>14} {'p50 ms':>8} {'p95 ms':>8}  path")
+    for name in names:
+        for variant in variants:
+            result = results[result_name(name, variant)]
+            print(f"{name:<24} {variant:<9} {result['llm_calls']:>14.1f} {result['e2e_ms']['p50']:>8.1f} "
+                  f"{result['e2e_ms']['p95']:>8.1f}  {' → '.join(result['path'])}")
+
+
+def print_scenario(name: str, result: Dict[str, Any]) -> None:
+    """Print a short report for one scenario."""
+    e2e = result["e2e_ms"]
+    print(f"\n{name}  ({' → '.join(result['path'])})")
+    print(f"  end-to-end ms   p50 {e2e['p50']:8.1f}  p95 {e2e['p95']:8.1f}  p99 {e2e['p99']:8.1f}")
+    for node, stats in result["nodes_ms"].items():
+        print(f"  node {node:<16}   mean {stats['mean']:7.1f} ms  (x{stats['count'] / result['iterations']:.1f}/run)")
+    for edge, stats in result["edges_ms"].items():
+        print(f"  edge {edge:<18} mean {stats['mean']:7.1f} ms")
+    for role, stats in result.get("roles", {}).items():
+        print(f"  role {role:<20} {stats['model']:<16} mean {stats['ms_per_call']['mean']:7.1f} ms/call "
+              f"(x{stats['calls_per_run']:.1f}/run)")
+    print(f"  LLM calls/run {result['llm_calls']:.1f} | embedding calls/run {result['embedding_calls']:.1f} "
+          f"| peak traced memory {result['memory']['peak_traced_mb']:.1f} MB")
+
+
+def compare_results(old: Dict[str, Any], new: Dict[str, Any], threshold: float) -> bool:
+    """Print a comparison against a previous result file. Returns True if anything regressed."""
+    print(f"\nComparison with {old['meta']['commit']} ({old['meta']['timestamp']}), threshold {threshold:.0%}")
+    regressed = False
+    for name, result in new["scenarios"].items():
+        previous = old["scenarios"].get(name)
+        if previous is None:
+            continue
+        print(f"{name}:")
+        lines = [
+            compare_metric("e2e p50 (ms)", previous["e2e_ms"]["p50"], result["e2e_ms"]["p50"], threshold),
+            compare_metric("e2e p95 (ms)", previous["e2e_ms"]["p95"], result["e2e_ms"]["p95"], threshold),
+            compare_metric("LLM calls/run", previous["llm_calls"], result["llm_calls"], threshold),
+            compare_metric("peak traced MB", previous["memory"]["peak_traced_mb"],
+                           result["memory"]["peak_traced_mb"], threshold),
+        ]
+        for line in lines:
+            print(line)
+            regressed |= line.endswith("REGRESSION")
+    return regressed
+
+
+def main() -> None:
+    """Parse arguments, run the scenarios and save the results."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=10, help="Timed runs per scenario")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated scenario names")
+    parser.add_argument("--variants", default="full,balanced,fast", help="Comma-separated graph variants")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds per fake LLM call")
+    parser.add_argument("--role-latency", default="",
+                        help="Fake LLM latency per role, e.g. router=0.005,generator=0.05 (overrides --llm-latency)")
+    parser.add_argument("--embedding-latency", type=float, default=0.0, help="Seconds per fake embedding call")
+    parser.add_argument("--search-latency", type=float, default=0.0, help="Seconds per fake web search")
+    parser.add_argument("--k", type=int, default=6, help="Documents to retrieve")
+    parser.add_argument("--corpus-size", type=int, default=60, help="Synthetic documents in the vectorstore")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/graph-<commit>-<time>.json)")
+    parser.add_argument("--compare", help="Previous result file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change flagged as regression")
+    args = parser.parse_args()
+
+    role_latency = {}
+    for part in filter(None, (part.strip() for part in args.role_latency.split(","))):
+        role, _, value = part.partition("=")
+        role_latency[role.strip()] = float(value)
+    configure_fakes(args.llm_latency, args.embedding_latency, args.search_latency, role_latency=role_latency)
+
+    from src.core.fakes import seed_synthetic_vectorstore
+
+    seed_synthetic_vectorstore(n_docs=args.corpus_size)
+
+    retrieval_config = {"k": args.k}
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = [name for name in names if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"Unknown scenarios: {', '.join(unknown)} (available: {', '.join(SCENARIOS)})")
+    from src.graph.constants import GRAPH_VARIANTS
+
+    variants = [variant.strip() for variant in args.variants.split(",") if variant.strip()]
+    unknown = [variant for variant in variants if variant not in GRAPH_VARIANTS]
+    if unknown:
+        parser.error(f"Unknown variants: {', '.join(unknown)} (available: {', '.join(GRAPH_VARIANTS)})")
+
+    results = {
+        "meta": run_metadata(
+            benchmark="graph",
+            iterations=args.iterations,
+            llm_latency=args.llm_latency,
+            role_latency=role_latency,
+            embedding_latency=args.embedding_latency,
+            search_latency=args.search_latency,
+            retrieval_config=retrieval_config,
+            corpus_size=args.corpus_size,
+            variants=variants,
+        ),
+        "scenarios": {},
+    }
+    for name in names:
+        for variant in variants:
+            key = result_name(name, variant)
+            config = {**retrieval_config, "variant": variant}
+            results["scenarios"][key] = run_scenario(key, SCENARIOS[name], args.iterations, config)
+            print_scenario(key, results["scenarios"][key])
+    if len(variants) > 1:
+        print_variants(results["scenarios"], names, variants)
+
+    results["meta"]["peak_rss_mb"] = peak_rss_mb()
+    path = write_results(results, args.output, prefix="graph")
+    print(f"\nPeak RSS {results['meta']['peak_rss_mb']:.0f} MB. Results written to {path}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            if compare_results(json.load(f), results, args.threshold):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,58 @@
 """Main entry point for the LangGraph Agentic RAG application."""
 
-import gradio as gr
+import argparse
 
 from src.config import setup_logger, logger_frontend
-from src.frontend import app, CUSTOM_CSS
 
 # Configure logging at startup - logs to terminal and logs/app.log
 setup_logger(name="agentic_rag", level=20)  # 20 = INFO level
 
 
-def main() -> None:
+def launch_ui() -> None:
     """Launch the Gradio frontend for the RAG application."""
+    import gradio as gr
+
+    from src.config.settings import settings
+    from src.frontend import app, CUSTOM_CSS
+    from src.graph import warm_up
+    from src.graph.warmup import mark_ready
+
     logger_frontend.info("=" * 60)
     logger_frontend.info("LangGraph Agentic RAG Application")
     logger_frontend.info("=" * 60)
     logger_frontend.info("Starting Gradio interface...")
     logger_frontend.info("Open your browser to the displayed URL")
     logger_frontend.info("Retrieval settings available in the sidebar")
+
+    # The UI starts listening only after warm-up, so an open port means ready
+    if settings.WARM_UP_ON_START:
+        warm_up()
+    else:
+        mark_ready()
     
     # Launch the Gradio app with theme and CSS (Gradio 6.0+ requirement)
+    app.queue(default_concurrency_limit=settings.UI_CONCURRENCY_LIMIT)
     app.launch(theme=gr.themes.Soft(), share=False, css=CUSTOM_CSS)
 
 
+def launch_api() -> None:
+    """Launch the headless HTTP API (/query, /stream, /batch)."""
+    from src.api import run_server
+
+    run_server()
+
+
+def main() -> None:
+    """Launch the Gradio frontend, or the HTTP API with --api."""
+    parser = argparse.ArgumentParser(description="LangGraph Agentic RAG")
+    parser.add_argument("--api", action="store_true", help="Serve the headless HTTP API instead of the Gradio UI")
+    args = parser.parse_args()
+
+    if args.api:
+        launch_api()
+    else:
+        launch_ui()
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,53 @@
+"""Script to run a file of questions through the RAG graph.
+
+Questions are read from JSONL or CSV (columns: question, optional id and
+retrieval_config), answered with bounded concurrency and appended to a JSONL
+output file as they finish. Re-running with the same output file resumes
+where the previous run stopped.
+
+Example:
+    uv run python scripts/batch_run.py questions.jsonl --output results.jsonl --concurrency 8
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add project root to path for direct script execution
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.batch import format_summary, read_questions, run_batch, summary_to_dict
+from src.config import setup_logger, logger_batch as logger
+
+# Configure logging at startup - logs to terminal and logs/app.log
+setup_logger(name="agentic_rag", level=20)  # 20 = INFO level
+
+
+def main() -> None:
+    """Run the batch and print the summary."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="Questions file (.jsonl or .csv)")
+    parser.add_argument("--output", "-o", required=True, help="Results file (.jsonl)")
+    parser.add_argument("--concurrency", "-c", type=int, default=4, help="Questions in flight (default: 4)")
+    parser.add_argument("--no-resume", action="store_true", help="Overwrite the output instead of resuming")
+    parser.add_argument("--summary-json", help="Also write the summary to this JSON file")
+    args = parser.parse_args()
+
+    rows = read_questions(args.input)
+    logger.info(f"Loaded {len(rows)} questions from {args.input}")
+
+    summary = run_batch(rows, args.output, concurrency=args.concurrency, resume=not args.no_resume)
+
+    logger.info("=" * 60)
+    for line in format_summary(summary).splitlines():
+        logger.info(line)
+    logger.info("=" * 60)
+
+    if args.summary_json:
+        with open(args.summary_json, "w", encoding="utf-8") as f:
+            json.dump(summary_to_dict(summary), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Script to measure HTTP API throughput and latency percentiles.
+
+Start the API with the bundled fake model stand-ins first, e.g.:
+    LLM_PROVIDER=fake FAKE_LLM_LATENCY=0.05 uv run python main.py --api
+
+Then run:
+    uv run python scripts/bench_api.py --requests 200 --concurrency 16
+"""
+
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+DEFAULT_QUESTIONS = [
+    "What is agent memory?",
+    "Can you explain concept of few-shot prompting?",
+    "What are best places to visit in Indonesia?",
+]
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def main() -> None:
+    """Fire concurrent /query requests and print throughput and latency percentiles."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="API base URL")
+    parser.add_argument("--requests", type=int, default=100, help="Total number of requests")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients")
+    args = parser.parse_args()
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    client = httpx.Client(base_url=args.url, timeout=120, limits=limits)
+
+    def send(i: int) -> tuple[float, bool]:
+        question = DEFAULT_QUESTIONS[i % len(DEFAULT_QUESTIONS)]
+        started = time.perf_counter()
+        try:
+            ok = client.post("/query", json={"question": question}).status_code == 200
+        except httpx.HTTPError:
+            ok = False
+        return time.perf_counter() - started, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(send, range(args.requests)))
+    elapsed = time.perf_counter() - started
+    client.close()
+
+    latencies = [latency * 1000 for latency, ok in results if ok]
+    errors = sum(1 for _, ok in results if not ok)
+    print(f"Requests:    {args.requests} (concurrency {args.concurrency}, errors {errors})")
+    print(f"Throughput:  {len(latencies) / elapsed:.1f} req/s")
+    print(f"Latency p50: {percentile(latencies, 50):.1f} ms")
+    print(f"Latency p95: {percentile(latencies, 95):.1f} ms")
+    print(f"Latency p99: {percentile(latencies, 99):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
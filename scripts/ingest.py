@@ -1,5 +1,6 @@
 """Script to ingest documents into the vector store."""
 
+import argparse
 import os
 import sys
 
@@ -8,60 +9,76 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.config import setup_logger, logger_ingestion as logger
 from src.config.settings import settings
-from src.ingestion import ingest_documents, load_documents, split_documents
+from src.ingestion import ingest_directory, ingest_sources, load_documents, rebuild_shard, split_documents
+from src.ingestion.vectorstore import DEFAULT_URLS
 
 # Configure logging at startup - logs to terminal and logs/app.log
 setup_logger(name="agentic_rag", level=20)  # 20 = INFO level
 
 
-def main() -> None:
-    """Run document ingestion and display chunk information."""
-    logger.info("Starting document ingestion...")
-    logger.info("=" * 60)
-    
-    # Load documents
+def rebuild(index: int) -> None:
+    """Re-embed the chunks of one shard (CHROMA_SHARDS > 1), leaving the other shards untouched."""
+    if not 0 <= index < settings.CHROMA_SHARDS:
+        raise SystemExit(f"--rebuild-shard must be between 0 and {settings.CHROMA_SHARDS - 1}")
+    stats = rebuild_shard(index, split_documents(load_documents()))
+    logger.info(f"Rebuilt shard {index}: {stats.chunks} chunks ({stats.embeddings_per_sec:.1f} embeddings/sec)")
+
+
+def preview(count: int = 5) -> None:
+    """Load and split the documents and display the first chunks (nothing is stored)."""
     docs = load_documents()
     logger.info(f"Loaded {len(docs)} documents from URLs")
-    
-    # Display document metadata
     for i, doc in enumerate(docs, 1):
         logger.info(f"\nDocument {i}:")
         logger.info(f"  Metadata: {doc.metadata}")
         logger.info(f"  Content length: {len(doc.page_content)} characters")
-    
-    # Split documents
+
     docs_split = split_documents(docs)
     logger.info(f"\nSplit into {len(docs_split)} chunks")
-    
-    # Display chunk information (first 5 chunks)
-    logger.info("\n" + "=" * 60)
-    logger.info("Displaying First 5 Chunks")
-    logger.info("=" * 60)
-    
-    for i, chunk in enumerate(docs_split[:5], 1):
+    for i, chunk in enumerate(docs_split[:count], 1):
         logger.info(f"\n{'─' * 60}")
         logger.info(f"CHUNK {i}/{len(docs_split)}")
         logger.info(f"{'─' * 60}")
-        
-        # Display metadata
         if chunk.metadata:
             logger.info(f"Metadata: {chunk.metadata}")
-        
-        # Display content preview
         content = chunk.page_content
         preview_length = 200
-        preview = content[:preview_length] + "..." if len(content) > preview_length else content
         logger.info(f"\nContent ({len(content)} chars):")
-        logger.info(preview)
-    
-    # Ingest into vector store
-    logger.info("\n" + "=" * 60)
-    logger.info("Ingesting into Vector Store")
+        logger.info(content[:preview_length] + "..." if len(content) > preview_length else content)
+
+
+def main() -> None:
+    """Run document ingestion, resuming an unfinished earlier run."""
+    parser = argparse.ArgumentParser(description="Ingest documents into the vector store")
+    parser.add_argument("--rebuild-shard", type=int, help="Only rebuild this shard (when CHROMA_SHARDS > 1)")
+    parser.add_argument("--fresh", action="store_true", help="Start over even if the previous run didn't finish")
+    parser.add_argument("--preview", action="store_true", help="Only display the first chunks, store nothing")
+    parser.add_argument("--dir", help="Ingest the HTML / Markdown / text files of this directory instead of the URLs")
+    parser.add_argument("--include", action="append", help="Glob of files to ingest with --dir (repeatable)")
+    parser.add_argument("--exclude", action="append", help="Glob of files to skip with --dir (repeatable)")
+    parser.add_argument("--workers", type=int, help="Parser processes for --dir (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="With --dir, re-ingest unchanged files too")
+    args = parser.parse_args()
+    if args.rebuild_shard is not None:
+        rebuild(args.rebuild_shard)
+        return
+    if args.preview:
+        preview()
+        return
+
+    logger.info("Starting document ingestion...")
     logger.info("=" * 60)
-    
-    vectorstore = ingest_documents()
+    if args.dir:
+        _, summary = ingest_directory(
+            args.dir, include=args.include, exclude=args.exclude, workers=args.workers, force=args.force
+        )
+    else:
+        summary = ingest_sources(DEFAULT_URLS, fresh=args.fresh)
     logger.info(f"Ingested documents into: {settings.CHROMA_PERSIST_DIR}")
     logger.info("=" * 60)
+    if summary.failed:
+        logger.warning(f"{len(summary.failed)} sources failed; run the script again to retry them")
+        sys.exit(1)
     logger.info("Done!")
 
 
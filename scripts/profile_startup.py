@@ -0,0 +1,106 @@
+"""Script to profile cold start: import time per module and init time per lazy singleton.
+
+Each entry point is imported in a fresh interpreter with `python -X importtime`
+to measure its total import time, the slowest modules and whether chat-side
+code (chains, graph) gets loaded. Then the lazy singletons (models, chains,
+compiled graph, web search tool) are built and the warm-up steps run with
+warm_up(), all timed.
+
+Examples:
+    uv run python scripts/profile_startup.py
+    uv run python scripts/profile_startup.py --modules src.ingestion --top 20
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Add project root to path for direct script execution
+sys.path.insert(0, PROJECT_ROOT)
+
+DEFAULT_MODULES = ["src.ingestion", "src.graph", "src.api.server", "src.frontend.app"]
+
+# Modules that only the question-answering side needs
+CHAT_MODULES = ("src.chains", "src.graph", "src.nodes")
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def profile_imports(module: str) -> Tuple[float, List[Tuple[str, float, float]]]:
+    """
+    Import a module in a fresh interpreter under -X importtime.
+
+    Returns:
+        (total import time in ms, [(module, self ms, cumulative ms), ...]).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    total_us = 0
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        rows.append((name, int(self_us) / 1000, int(cumulative_us) / 1000))
+        if len(indent) == 1:
+            total_us += int(cumulative_us)  # Top-level imports
+    return total_us / 1000, rows
+
+
+def by_package(rows: List[Tuple[str, float, float]]) -> Dict[str, float]:
+    """Sum self time per top-level package."""
+    totals: Dict[str, float] = {}
+    for name, self_ms, _ in rows:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0.0) + self_ms
+    return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+def main() -> None:
+    """Profile the imports of each entry point, then the warm-up."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", default=",".join(DEFAULT_MODULES), help="Comma-separated modules to import")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules / packages to show")
+    parser.add_argument("--no-warm-up", action="store_true", help="Only profile imports")
+    args = parser.parse_args()
+
+    for module in [name.strip() for name in args.modules.split(",") if name.strip()]:
+        total_ms, rows = profile_imports(module)
+        loaded = {name for name, _, _ in rows}
+        chat = sorted(name for name in loaded if name.startswith(CHAT_MODULES))
+        print(f"\nimport {module}: {total_ms:.0f} ms, {len(rows)} modules"
+              f"{', chat-side code loaded' if chat else ', no chat-side code'}")
+        print("  slowest packages (self time):")
+        for package, ms in list(by_package(rows).items())[:args.top]:
+            print(f"    {package:<32} {ms:8.1f} ms")
+        print("  slowest application modules (cumulative):")
+        app_modules: Dict[str, float] = {}
+        for name, _, cumulative_ms in rows:
+            if name.startswith("src"):
+                app_modules[name] = max(cumulative_ms, app_modules.get(name, 0.0))
+        for name, cumulative_ms in sorted(app_modules.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"    {name:<32} {cumulative_ms:8.1f} ms")
+
+    if args.no_warm_up:
+        return
+
+    from src.graph import warm_up
+
+    print("\nwarm-up (lazy singletons, then steps):")
+    for name, ms in warm_up().items():
+        print(f"    {name:<32} {ms:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
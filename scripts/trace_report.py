@@ -0,0 +1,64 @@
+"""Script to render a recorded request trace as a waterfall with critical-path hotspots.
+
+Traces are read from the local trace file (TRACE_FILE, default
+logs/traces.jsonl) and its rotated copies. Without a trace ID the most
+recent trace is shown; the trace ID of a request is returned under
+metrics.trace_id by the API and run_question.
+
+Examples:
+    uv run python scripts/trace_report.py
+    uv run python scripts/trace_report.py --list 20
+    uv run python scripts/trace_report.py 3f2c9a...
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime
+
+# Add project root to path for direct script execution
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.observability.trace_view import format_trace_report, list_traces, load_traces
+from src.observability.tracing import get_span_exporter
+
+
+def main() -> None:
+    """Print the trace list or the report of one trace."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("trace_id", nargs="?", help="Trace ID or prefix (default: most recent trace)")
+    parser.add_argument("--file", help="Trace file (default: TRACE_FILE and its rotated copies)")
+    parser.add_argument("--list", type=int, metavar="N", help="List the N most recent traces instead")
+    parser.add_argument("--width", type=int, default=40, help="Width of the waterfall bars")
+    parser.add_argument("--top", type=int, default=10, help="Number of hotspots to show")
+    args = parser.parse_args()
+
+    files = [args.file] if args.file else get_span_exporter().files()
+    if not files:
+        sys.exit("No trace files found (is TRACE_ENABLED set?)")
+    traces = load_traces(files)
+    if not traces:
+        sys.exit("No traces recorded yet")
+
+    rows = list_traces(traces)
+    if args.list:
+        for row in rows[:args.list]:
+            started = datetime.fromtimestamp(row["start"]).strftime("%Y-%m-%d %H:%M:%S")
+            errors = f"  {row['errors']} errors" if row["errors"] else ""
+            print(f"{row['trace_id']}  {started}  {row['duration_ms']:>9.1f} ms  "
+                  f"{row['spans']:>3} spans  {row['question'][:60]}{errors}")
+        return
+
+    if args.trace_id:
+        matches = [trace_id for trace_id in traces if trace_id.startswith(args.trace_id)]
+        if len(matches) != 1:
+            sys.exit(f"{'No' if not matches else 'Ambiguous'} trace matching {args.trace_id}")
+        trace_id = matches[0]
+    else:
+        trace_id = rows[0]["trace_id"]
+
+    print(format_trace_report(traces[trace_id], width=args.width, top=args.top))
+
+
+if __name__ == "__main__":
+    main()
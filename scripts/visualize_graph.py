@@ -6,10 +6,11 @@ import sys
 # Add project root to path for direct script execution
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.core import setup_logging
+from src.config import setup_logger
 from src.graph.builder import save_graph_visualization
 
-setup_logging("INFO")
+# Configure logging at startup - logs to terminal and logs/app.log
+setup_logger(name="agentic_rag", level=20)  # 20 = INFO level
 
 
 def main() -> None:
@@ -1,6 +1,14 @@
 """LangGraph Agentic RAG Application."""
 
-from src.graph import rag_app, build_graph
 
-__all__ = ["rag_app", "build_graph"]
+def __getattr__(name: str):
+    # Imported on first access so that using a subpackage (e.g. src.ingestion
+    # from scripts/ingest.py) does not load the chat side of the application
+    if name in ("rag_app", "build_graph"):
+        import src.graph
+
+        return getattr(src.graph, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
+
+__all__ = ["rag_app", "build_graph"]
@@ -0,0 +1,5 @@
+"""HTTP API module for the LangGraph Agentic RAG application."""
+
+from src.api.server import app, create_app, run_server
+
+__all__ = ["app", "create_app", "run_server"]
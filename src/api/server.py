@@ -0,0 +1,258 @@
+"""Headless HTTP API for the RAG graph: JSON queries, server-sent events and batches."""
+
+import asyncio
+import json
+import threading
+import time
+from contextlib import asynccontextmanager, closing
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import anyio
+from anyio import to_thread
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from src.config import logger_api as logger
+from src.config.settings import settings
+from src.graph.runner import run_question, serialize_documents, stream_question
+from src.graph.warmup import is_ready, mark_ready, readiness, warm_up
+from src.observability import registry
+
+
+class QueryRequest(BaseModel):
+    """A single question with optional retrieval settings."""
+
+    question: str = Field(..., min_length=1)
+    retrieval_config: Dict[str, Any] = Field(default_factory=dict)
+    # With CHECKPOINT_ENABLED=true, sending a failed request again with the same ID resumes it
+    request_id: Optional[str] = Field(default=None, max_length=128)
+
+
+class QueryResponse(BaseModel):
+    """Final answer for a question."""
+
+    question: str
+    generation: str
+    documents: List[Dict[str, Any]]
+    web_search: bool
+    latency_ms: float
+    metrics: Dict[str, Any] = Field(default_factory=dict)
+
+
+class BatchRequest(BaseModel):
+    """Several questions processed concurrently."""
+
+    questions: List[QueryRequest] = Field(..., min_length=1)
+
+
+class BatchItem(BaseModel):
+    """Result (or error) of one batch question."""
+
+    question: str
+    generation: Optional[str] = None
+    documents: List[Dict[str, Any]] = Field(default_factory=list)
+    web_search: bool = False
+    error: Optional[str] = None
+    latency_ms: float
+
+
+class BatchResponse(BaseModel):
+    """Results of a batch, in request order."""
+
+    results: List[BatchItem]
+    latency_ms: float
+
+
+def _format_sse(event: Dict[str, Any]) -> str:
+    """Format an event as a server-sent event frame."""
+    return f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+def _run_timed(
+    question: str, retrieval_config: Dict[str, Any], request_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """Run a question and return its final state and latency (in a worker thread)."""
+    started = time.perf_counter()
+    state = run_question(question, retrieval_config, request_id=request_id)
+    return {"state": state, "latency_ms": (time.perf_counter() - started) * 1000}
+
+
+async def _warm_up_in_background() -> None:
+    """Run warm-up in a worker thread while the server already answers /healthz and /readyz."""
+    await to_thread.run_sync(warm_up)
+    if is_ready():
+        logger.info(f"API ready (max concurrency per process: {settings.API_MAX_CONCURRENCY})")
+    else:
+        logger.error(f"Warm-up failed, /readyz stays 503: {readiness()['errors']}")
+
+
+def create_app() -> FastAPI:
+    """Create the FastAPI application sharing the compiled graph of this process."""
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Bounds the number of graph runs executing at once in this process
+        app.state.limiter = anyio.CapacityLimiter(settings.API_MAX_CONCURRENCY)
+        if settings.LLM_PROVIDER == "fake":
+            from src.core.fakes import seed_synthetic_vectorstore
+
+            await to_thread.run_sync(seed_synthetic_vectorstore)
+            logger.info("Fake backends enabled (synthetic vectorstore seeded)")
+        if settings.WARM_UP_ON_START:
+            # Warm up in the background: /healthz answers at once, /readyz once warm-up is done
+            app.state.warm_up_task = asyncio.create_task(_warm_up_in_background())
+        else:
+            mark_ready()
+            logger.info(f"API ready (max concurrency per process: {settings.API_MAX_CONCURRENCY})")
+        yield
+
+    app = FastAPI(title="LangGraph Agentic RAG API", lifespan=lifespan)
+
+    @app.middleware("http")
+    async def add_process_time(request: Request, call_next):
+        started = time.perf_counter()
+        response = await call_next(request)
+        response.headers["X-Process-Time-Ms"] = f"{(time.perf_counter() - started) * 1000:.1f}"
+        return response
+
+    @app.get("/healthz")
+    async def healthz() -> Dict[str, str]:
+        return {"status": "ok"}
+
+    @app.get("/readyz")
+    async def readyz() -> JSONResponse:
+        # For load balancers: 503 until warm-up has completed
+        status = readiness()
+        return JSONResponse(status, status_code=200 if status["ready"] else 503)
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    async def metrics() -> PlainTextResponse:
+        # Prometheus text exposition of the in-process node/chain/LLM metrics
+        return PlainTextResponse(registry.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+    @app.post("/query", response_model=QueryResponse)
+    async def query(body: QueryRequest, request: Request) -> QueryResponse:
+        try:
+            result = await to_thread.run_sync(
+                _run_timed, body.question, body.retrieval_config, body.request_id,
+                limiter=request.app.state.limiter,
+            )
+        except Exception as e:
+            logger.error(f"Query failed: {e}")
+            raise HTTPException(status_code=500, detail=str(e)) from e
+
+        state = result["state"]
+        return QueryResponse(
+            question=body.question,
+            generation=state.get("generation", ""),
+            documents=serialize_documents(state.get("documents") or []),
+            web_search=bool(state.get("web_search", False)),
+            latency_ms=result["latency_ms"],
+            metrics=state.get("metrics", {}),
+        )
+
+    @app.post("/stream")
+    async def stream(body: QueryRequest, request: Request) -> StreamingResponse:
+        return StreamingResponse(
+            _stream_events(body, request.app.state.limiter),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    @app.post("/batch", response_model=BatchResponse)
+    async def batch(body: BatchRequest, request: Request) -> BatchResponse:
+        if len(body.questions) > settings.API_MAX_BATCH_SIZE:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Batch too large ({len(body.questions)} > {settings.API_MAX_BATCH_SIZE})",
+            )
+
+        started = time.perf_counter()
+        limiter = request.app.state.limiter
+        results = await asyncio.gather(*(_run_batch_item(item, limiter) for item in body.questions))
+        return BatchResponse(results=results, latency_ms=(time.perf_counter() - started) * 1000)
+
+    return app
+
+
+async def _run_batch_item(item: QueryRequest, limiter: anyio.CapacityLimiter) -> BatchItem:
+    """Run one batch question, turning failures into an error item."""
+    started = time.perf_counter()
+    try:
+        result = await to_thread.run_sync(
+            _run_timed, item.question, item.retrieval_config, item.request_id, limiter=limiter
+        )
+    except Exception as e:
+        logger.error(f"Batch question failed: {e}")
+        return BatchItem(
+            question=item.question, error=str(e),
+            latency_ms=(time.perf_counter() - started) * 1000,
+        )
+
+    state = result["state"]
+    return BatchItem(
+        question=item.question,
+        generation=state.get("generation", ""),
+        documents=serialize_documents(state.get("documents") or []),
+        web_search=bool(state.get("web_search", False)),
+        latency_ms=result["latency_ms"],
+    )
+
+
+async def _stream_events(body: QueryRequest, limiter: anyio.CapacityLimiter) -> AsyncIterator[str]:
+    """
+    Run the graph in a worker thread and relay its events as server-sent events.
+
+    The whole run stays on one thread; events are handed to the event loop
+    through a queue so slow clients never block other requests. When the
+    client disconnects, the run stops at the next graph event and frees its
+    limiter slot instead of finishing for nobody.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    cancelled = threading.Event()
+
+    def produce() -> None:
+        try:
+            with closing(stream_question(body.question, body.retrieval_config, request_id=body.request_id)) as events:
+                for event in events:
+                    if cancelled.is_set():
+                        logger.info("Stream client disconnected, stopping the run")
+                        return
+                    loop.call_soon_threadsafe(queue.put_nowait, event)
+        except Exception as e:
+            logger.error(f"Stream failed: {e}")
+            loop.call_soon_threadsafe(queue.put_nowait, {"event": "error", "error": str(e)})
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    worker = asyncio.ensure_future(to_thread.run_sync(produce, limiter=limiter))
+    try:
+        while (event := await queue.get()) is not None:
+            yield _format_sse(event)
+    finally:
+        cancelled.set()
+        # Shielded: if this task is being cancelled, the worker still finishes (at its next event)
+        await asyncio.shield(worker)
+
+
+def run_server() -> None:
+    """Serve the API with uvicorn using the configured workers and keep-alive."""
+    import uvicorn
+
+    logger.info(
+        f"Starting API on {settings.API_HOST}:{settings.API_PORT} "
+        f"(workers={settings.API_WORKERS}, keep-alive={settings.API_KEEP_ALIVE}s)"
+    )
+    uvicorn.run(
+        "src.api.server:app",
+        host=settings.API_HOST,
+        port=settings.API_PORT,
+        workers=settings.API_WORKERS,
+        timeout_keep_alive=settings.API_KEEP_ALIVE,
+        log_level=settings.LOG_LEVEL.lower(),
+    )
+
+
+app = create_app()
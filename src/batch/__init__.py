@@ -0,0 +1,17 @@
+from src.batch.runner import (
+    BatchSummary,
+    format_summary,
+    load_completed_ids,
+    read_questions,
+    run_batch,
+    summary_to_dict,
+)
+
+__all__ = [
+    "BatchSummary",
+    "format_summary",
+    "load_completed_ids",
+    "read_questions",
+    "run_batch",
+    "summary_to_dict",
+]
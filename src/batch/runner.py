@@ -0,0 +1,216 @@
+"""Batch runner - pushes a file of questions through the graph with bounded concurrency."""
+
+import csv
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Set
+
+from src.config import logger_batch as logger
+from src.core.stats import latency_summary
+from src.graph.runner import run_question
+
+
+@dataclass
+class BatchSummary:
+    """Aggregate results of a batch run."""
+
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    wall_seconds: float = 0.0
+    throughput: float = 0.0  # Questions per second
+    latency_ms: Dict[str, float] = field(default_factory=dict)
+    llm_calls_per_question: float = 0.0
+
+
+def read_questions(path: str | Path) -> List[Dict[str, Any]]:
+    """
+    Read questions from a JSONL or CSV file.
+
+    Each row needs a "question" and may have an "id" and a "retrieval_config"
+    (a dict in JSONL, a JSON string in CSV). Rows without an id get their
+    1-based row number, which keeps ids stable between runs for resuming.
+
+    Args:
+        path: Path to a .jsonl or .csv file.
+
+    Returns:
+        List of rows with id, question and retrieval_config.
+    """
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8") as f:
+            raw_rows = list(csv.DictReader(f))
+    else:
+        with path.open(encoding="utf-8") as f:
+            raw_rows = [json.loads(line) for line in f if line.strip()]
+
+    rows = []
+    for number, raw in enumerate(raw_rows, 1):
+        question = (raw.get("question") or "").strip()
+        if not question:
+            logger.warning(f"Skipping row {number}: no question")
+            continue
+
+        retrieval_config = raw.get("retrieval_config") or {}
+        if isinstance(retrieval_config, str):
+            retrieval_config = json.loads(retrieval_config)
+
+        rows.append({
+            "id": str(raw.get("id") or number),
+            "question": question,
+            "retrieval_config": retrieval_config,
+        })
+    return rows
+
+
+def load_completed_ids(output_path: str | Path) -> Set[str]:
+    """
+    Collect ids already answered successfully in a (possibly partial) output file.
+
+    Failed rows are ignored so they are retried. Unreadable lines (a line
+    truncated by an interrupted run) and records without an id are skipped
+    with a warning.
+    """
+    output_path = Path(output_path)
+    if not output_path.exists():
+        return set()
+
+    completed = set()
+    with output_path.open(encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"Skipping unreadable line {number} of {output_path}")
+                continue
+            if not isinstance(record, dict) or record.get("id") is None:
+                logger.warning(f"Skipping line {number} of {output_path}: no id")
+                continue
+            if not record.get("error"):
+                completed.add(str(record["id"]))
+    return completed
+
+
+def _run_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one question and build its output record (executed in a worker thread)."""
+    started = time.perf_counter()
+    record: Dict[str, Any] = {
+        "id": row["id"],
+        "question": row["question"],
+        "retrieval_config": row["retrieval_config"],
+    }
+    try:
+        state = run_question(row["question"], row["retrieval_config"])
+        record.update({
+            "generation": state.get("generation", ""),
+            "web_search": bool(state.get("web_search", False)),
+            "sources": sorted({doc.metadata.get("source", "unknown") for doc in state.get("documents") or []}),
+            "error": None,
+            # Counted per chain by the run's InstrumentationHandler
+            "llm_calls": state["metrics"]["llm"]["llm_calls"],
+        })
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+
+    record["latency_ms"] = (time.perf_counter() - started) * 1000
+    return record
+
+
+def _bounded_map(rows: Iterable[Dict[str, Any]], concurrency: int) -> Iterator[Dict[str, Any]]:
+    """Run rows with at most `concurrency` in flight, yielding records as they finish."""
+    rows = iter(rows)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        pending: Set[Future] = set()
+        for row in rows:
+            pending.add(pool.submit(_run_row, row))
+            if len(pending) >= concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        for future in wait(pending).done:
+            yield future.result()
+
+
+def run_batch(
+    rows: List[Dict[str, Any]],
+    output_path: str | Path,
+    concurrency: int = 4,
+    resume: bool = True,
+) -> BatchSummary:
+    """
+    Run questions through the graph and append results to a JSONL file as they finish.
+
+    Args:
+        rows: Rows from read_questions().
+        output_path: JSONL output file (appended to when resuming).
+        concurrency: Maximum number of questions in flight.
+        resume: Skip rows already answered successfully in output_path.
+
+    Returns:
+        BatchSummary with throughput, latency percentiles and LLM calls per question.
+    """
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    completed_ids = load_completed_ids(output_path) if resume else set()
+    todo = [row for row in rows if row["id"] not in completed_ids]
+    summary = BatchSummary(total=len(rows), skipped=len(rows) - len(todo))
+    if summary.skipped:
+        logger.info(f"Resuming: {summary.skipped} questions already answered")
+
+    latencies: List[float] = []
+    llm_calls = 0
+    started = time.perf_counter()
+
+    with output_path.open("a" if resume else "w", encoding="utf-8") as out:
+        # Terminate a line truncated by an interrupted run before appending
+        if resume and out.tell() > 0 and not output_path.read_bytes().endswith(b"\n"):
+            out.write("\n")
+
+        for record in _bounded_map(todo, max(1, concurrency)):
+            out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            out.flush()
+
+            if record["error"]:
+                summary.failed += 1
+                logger.warning(f"Question {record['id']} failed: {record['error']}")
+            else:
+                summary.completed += 1
+                latencies.append(record["latency_ms"])
+                llm_calls += record["llm_calls"]
+
+            done = summary.completed + summary.failed
+            if done % 50 == 0:
+                logger.info(f"Progress: {done}/{len(todo)} questions")
+
+    summary.wall_seconds = time.perf_counter() - started
+    summary.throughput = summary.completed / summary.wall_seconds if summary.wall_seconds else 0.0
+    summary.latency_ms = latency_summary(latencies)
+    summary.llm_calls_per_question = llm_calls / summary.completed if summary.completed else 0.0
+    return summary
+
+
+def format_summary(summary: BatchSummary) -> str:
+    """Format a batch summary for the terminal."""
+    latency = summary.latency_ms
+    return "\n".join([
+        f"Questions:      {summary.total} total, {summary.completed} completed, "
+        f"{summary.failed} failed, {summary.skipped} skipped (resumed)",
+        f"Wall time:      {summary.wall_seconds:.1f} s",
+        f"Throughput:     {summary.throughput:.2f} questions/s",
+        f"Latency (ms):   p50 {latency.get('p50', 0):.0f} | p95 {latency.get('p95', 0):.0f} "
+        f"| p99 {latency.get('p99', 0):.0f} | max {latency.get('max', 0):.0f}",
+        f"LLM calls/q:    {summary.llm_calls_per_question:.2f}",
+    ])
+
+
+def summary_to_dict(summary: BatchSummary) -> Dict[str, Any]:
+    """Convert a batch summary to a JSON-serializable dict."""
+    return asdict(summary)
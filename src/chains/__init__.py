@@ -1,23 +1,43 @@
-from src.chains.generation import generation_chain
-from src.chains.router import question_router, RouterQuery
+from src.chains.generation import get_generation_chain
+from src.chains.router import get_question_router, RouterQuery
 from src.chains.graders import (
-    answer_grader,
+    get_answer_grader,
     AnswerGrader,
-    hallucination_grader,
+    get_hallucination_grader,
     HallucinationGrader,
-    retrieval_grader,
+    get_retrieval_grader,
     GradeDocuments,
 )
 
+# Chains are built on first use; the old module attributes resolve through the getters
+_LAZY_CHAINS = {
+    "generation_chain": get_generation_chain,
+    "question_router": get_question_router,
+    "answer_grader": get_answer_grader,
+    "hallucination_grader": get_hallucination_grader,
+    "retrieval_grader": get_retrieval_grader,
+}
+
+
+def __getattr__(name: str):
+    if name in _LAZY_CHAINS:
+        return _LAZY_CHAINS[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 __all__ = [
     "generation_chain",
+    "get_generation_chain",
     "question_router",
+    "get_question_router",
     "RouterQuery",
     "answer_grader",
+    "get_answer_grader",
     "AnswerGrader",
     "hallucination_grader",
+    "get_hallucination_grader",
     "HallucinationGrader",
     "retrieval_grader",
+    "get_retrieval_grader",
     "GradeDocuments",
 ]
-
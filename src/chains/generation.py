@@ -2,22 +2,30 @@
 
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnableSequence
+from langchain_core.runnables import Runnable
 
 from src.config.prompts import Prompts
-from src.core.llm import get_llm
+from src.core.lazy import Lazy
+from src.core.llm import get_llm, limit_calls
+from src.observability import name_chain
 
+# Tag attached to the generation LLM call so streamed answer tokens can be told
+# apart from grader and router output
+GENERATION_TAG = "generation"
 
-def _build_generation_chain() -> RunnableSequence:
+
+def _build_generation_chain() -> Runnable:
     """Build the generation chain."""
-    llm = get_llm()
+    llm = get_llm("generator")
 
     prompt = ChatPromptTemplate.from_template(Prompts.GENERATION_TEMPLATE)
     prompt = prompt.partial(
         additional_instructions=Prompts.GENERATION_ADDITIONAL_INSTRUCTIONS
     )
 
-    return prompt | llm | StrOutputParser()
+    llm = limit_calls(llm.with_config(tags=[GENERATION_TAG]), "generator")
+    chain = prompt | llm | StrOutputParser()
+    return name_chain(chain, "generation")
 
 
-generation_chain = _build_generation_chain()
+get_generation_chain = Lazy("generation_chain", _build_generation_chain)
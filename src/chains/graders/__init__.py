@@ -1,13 +1,12 @@
-from src.chains.graders.answer import answer_grader, AnswerGrader
-from src.chains.graders.hallucination import hallucination_grader, HallucinationGrader
-from src.chains.graders.retrieval import retrieval_grader, GradeDocuments
+from src.chains.graders.answer import get_answer_grader, AnswerGrader
+from src.chains.graders.hallucination import get_hallucination_grader, HallucinationGrader
+from src.chains.graders.retrieval import get_retrieval_grader, GradeDocuments
 
 __all__ = [
-    "answer_grader",
+    "get_answer_grader",
     "AnswerGrader",
-    "hallucination_grader",
+    "get_hallucination_grader",
     "HallucinationGrader",
-    "retrieval_grader",
+    "get_retrieval_grader",
     "GradeDocuments",
 ]
-
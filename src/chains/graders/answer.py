@@ -1,11 +1,14 @@
 """Answer grader chain - assesses if generation addresses the question."""
 
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnableSequence
+from langchain_core.runnables import Runnable
 from pydantic import BaseModel, Field
 
 from src.config.prompts import Prompts
-from src.core.llm import get_llm
+from src.core.lazy import Lazy
+from src.core.llm import get_llm, limit_calls
+from src.core.response_cache import cached_structured_chain
+from src.observability import name_chain
 
 
 class AnswerGrader(BaseModel):
@@ -16,10 +19,10 @@ class AnswerGrader(BaseModel):
     )
 
 
-def _build_answer_grader() -> RunnableSequence:
+def _build_answer_grader() -> Runnable:
     """Build the answer grader chain."""
-    llm = get_llm()
-    structured_llm = llm.with_structured_output(AnswerGrader)
+    llm = get_llm("answer_grader")
+    structured_llm = limit_calls(llm.with_structured_output(AnswerGrader), "answer_grader")
 
     prompt = ChatPromptTemplate.from_messages(
         [
@@ -28,8 +31,13 @@ def _build_answer_grader() -> RunnableSequence:
         ]
     )
 
-    return prompt | structured_llm
-
+    # A rejected answer is generated again, usually word for word at temperature 0; a stored
+    # rejection would be replayed for it, and the retry loop would never end
+    chain = cached_structured_chain(
+        prompt, structured_llm, AnswerGrader, "answer_grader", "answer_grader",
+        store_if=lambda score: score.binary_score,
+    )
+    return name_chain(chain, "answer_grader")
 
-answer_grader = _build_answer_grader()
 
+get_answer_grader = Lazy("answer_grader", _build_answer_grader)
@@ -1,11 +1,14 @@
 """Hallucination grader chain - checks if generation is grounded in facts."""
 
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnableSequence
+from langchain_core.runnables import Runnable
 from pydantic import BaseModel, Field
 
 from src.config.prompts import Prompts
-from src.core.llm import get_llm
+from src.core.lazy import Lazy
+from src.core.llm import get_llm, limit_calls
+from src.core.response_cache import cached_structured_chain
+from src.observability import name_chain
 
 
 class HallucinationGrader(BaseModel):
@@ -14,12 +17,18 @@ class HallucinationGrader(BaseModel):
     binary_score: bool = Field(
         description="Answer is grounded in the facts: True if yes, False if no"
     )
+    confidence: float = Field(
+        ...,
+        ge=0.0,
+        le=1.0,
+        description="Confidence in the score, from 0 (a guess) to 1 (certain)",
+    )
 
 
-def _build_hallucination_grader() -> RunnableSequence:
+def _build_hallucination_grader() -> Runnable:
     """Build the hallucination grader chain."""
-    llm = get_llm()
-    structured_llm = llm.with_structured_output(HallucinationGrader)
+    llm = get_llm("hallucination_grader")
+    structured_llm = limit_calls(llm.with_structured_output(HallucinationGrader), "hallucination_grader")
 
     prompt = ChatPromptTemplate.from_messages(
         [
@@ -28,8 +37,8 @@ def _build_hallucination_grader() -> RunnableSequence:
         ]
     )
 
-    return prompt | structured_llm
-
+    chain = cached_structured_chain(prompt, structured_llm, HallucinationGrader, "hallucination_grader", "hallucination_grader")
+    return name_chain(chain, "hallucination_grader")
 
-hallucination_grader = _build_hallucination_grader()
 
+get_hallucination_grader = Lazy("hallucination_grader", _build_hallucination_grader)
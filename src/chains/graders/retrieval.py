@@ -1,11 +1,14 @@
 """Retrieval grader chain - checks document relevance to question."""
 
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnableSequence
+from langchain_core.runnables import Runnable
 from pydantic import BaseModel, Field
 
 from src.config.prompts import Prompts
-from src.core.llm import get_llm
+from src.core.lazy import Lazy
+from src.core.llm import get_llm, limit_calls
+from src.core.response_cache import cached_structured_chain
+from src.observability import name_chain
 
 
 class GradeDocuments(BaseModel):
@@ -16,10 +19,10 @@ class GradeDocuments(BaseModel):
     )
 
 
-def _build_retrieval_grader() -> RunnableSequence:
+def _build_retrieval_grader() -> Runnable:
     """Build the retrieval grader chain."""
-    llm = get_llm()
-    structured_llm = llm.with_structured_output(GradeDocuments)
+    llm = get_llm("retrieval_grader")
+    structured_llm = limit_calls(llm.with_structured_output(GradeDocuments), "retrieval_grader")
 
     prompt = ChatPromptTemplate.from_messages(
         [
@@ -28,8 +31,8 @@ def _build_retrieval_grader() -> RunnableSequence:
         ]
     )
 
-    return prompt | structured_llm
+    chain = cached_structured_chain(prompt, structured_llm, GradeDocuments, "retrieval_grader", "retrieval_grader")
+    return name_chain(chain, "retrieval_grader")
 
 
-retrieval_grader = _build_retrieval_grader()
-
+get_retrieval_grader = Lazy("retrieval_grader", _build_retrieval_grader)
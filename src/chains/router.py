@@ -3,11 +3,14 @@
 from typing import Literal
 
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.runnables import RunnableSequence
+from langchain_core.runnables import Runnable
 from pydantic import BaseModel, Field
 
 from src.config.prompts import Prompts
-from src.core.llm import get_llm
+from src.core.lazy import Lazy
+from src.core.llm import get_llm, limit_calls
+from src.core.response_cache import cached_structured_chain
+from src.observability import name_chain
 
 
 class RouterQuery(BaseModel):
@@ -17,12 +20,18 @@ class RouterQuery(BaseModel):
         ...,
         description="Given a user question, route to web search or vectorstore.",
     )
+    confidence: float = Field(
+        ...,
+        ge=0.0,
+        le=1.0,
+        description="Confidence in the chosen datasource, from 0 (a guess) to 1 (certain).",
+    )
 
 
-def _build_router() -> RunnableSequence:
+def _build_router() -> Runnable:
     """Build the question router chain."""
-    llm = get_llm()
-    structured_llm = llm.with_structured_output(RouterQuery)
+    llm = get_llm("router")
+    structured_llm = limit_calls(llm.with_structured_output(RouterQuery), "router")
 
     prompt = ChatPromptTemplate.from_messages(
         [
@@ -31,7 +40,8 @@ def _build_router() -> RunnableSequence:
         ]
     )
 
-    return prompt | structured_llm
+    chain = cached_structured_chain(prompt, structured_llm, RouterQuery, "question_router", "router")
+    return name_chain(chain, "question_router")
 
 
-question_router = _build_router()
+get_question_router = Lazy("question_router", _build_router)
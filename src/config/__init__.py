@@ -8,7 +8,9 @@ from src.config.logging_config import (
     logger_chains,
     logger_core,
     logger_frontend,
-    logger_ingestion
+    logger_ingestion,
+    logger_api,
+    logger_batch,
 )
 
 __all__ = [
@@ -21,5 +23,7 @@ __all__ = [
     "logger_chains",
     "logger_core",
     "logger_frontend",
-    "logger_ingestion"
+    "logger_ingestion",
+    "logger_api",
+    "logger_batch",
 ]
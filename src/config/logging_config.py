@@ -1,8 +1,26 @@
-"""Centralized logging configuration for the LangGraph Agentic RAG application."""
+"""Centralized logging configuration for the LangGraph Agentic RAG application.
 
+Application code only puts records on an in-memory queue (QueueHandler);
+a background QueueListener thread formats them in batches and does the
+console and file I/O, so request threads never block on disk writes. The log file is
+rotated by size and written as one JSON object per line. High-volume
+loggers can be sampled (LOG_SAMPLING) before their records reach the queue;
+warnings and errors are never sampled.
+"""
+
+import atexit
+import collections
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
+from typing import Dict, Optional, TextIO
+
+from src.config.settings import settings
 
 # Get project root (parent of src directory)
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -10,58 +28,225 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 # Default log file location - logs/app.log in project root
 DEFAULT_LOG_FILE = PROJECT_ROOT / 'logs' / 'app.log'
 
+# Attributes every LogRecord has; anything else was passed with `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime', 'taskName'}
+
+# The running listener of each configured logger, by logger name
+_listeners: Dict[str, logging.handlers.QueueListener] = {}
+_listener_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line (fields passed with `extra=` included)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(record.created)) + f'.{int(record.msecs):03d}Z',
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'function': record.funcName,
+            'line': record.lineno,
+            'thread': record.threadName,
+        }
+        for key in record.__dict__.keys() - _RECORD_ATTRIBUTES:
+            entry[key] = record.__dict__[key]
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _StructuredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps the traceback separate from the message.
+
+    The message is merged with its arguments and the traceback rendered to
+    text in the calling thread (both may reference objects that change
+    later), but unlike the stock QueueHandler the traceback is not appended
+    to the message, so the JSON formatter can keep it in its own field.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Shallow copy so other handlers still see the original record
+        prepared = logging.LogRecord.__new__(logging.LogRecord)
+        prepared.__dict__.update(record.__dict__)
+        record = prepared
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _BatchingQueueListener(logging.handlers.QueueListener):
+    """QueueListener that takes records off the queue in batches.
+
+    After a record arrives the listener waits `interval` seconds and then
+    drains everything queued meanwhile, so a burst of log lines costs one
+    wake-up of the listener thread instead of one per line (every wake-up
+    competes with the request threads for the GIL). Only dequeue(), the
+    documented extension point, is overridden: the drained records are
+    handed out one by one from a local buffer, the stop sentinel included.
+    """
+
+    def __init__(self, log_queue, *handlers, interval: float = 0.05, respect_handler_level: bool = False):
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.interval = interval
+        self._batch: collections.deque = collections.deque()
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        if not self._batch:
+            self._batch.append(self.queue.get(block))
+            time.sleep(self.interval)
+            try:
+                while True:
+                    self._batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                pass
+        return self._batch.popleft()
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of the records below WARNING for selected loggers.
+
+    Sampling is deterministic: with rate 0.1 every tenth record of that
+    logger passes. A rate applies to the logger and its children; the most
+    specific configured name wins.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = {name: max(0.0, min(1.0, rate)) for name, rate in rates.items()}
+        self._credit: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _rate_for(self, name: str) -> Optional[str]:
+        while name:
+            if name in self.rates:
+                return name
+            name = name.rpartition('.')[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = self._rate_for(record.name)
+        if key is None:
+            return True
+        with self._lock:
+            credit = self._credit.get(key, 1.0) + self.rates[key]
+            keep = credit >= 1.0
+            self._credit[key] = credit - 1.0 if keep else credit
+        return keep
+
+
+def parse_sampling(spec: str) -> Dict[str, float]:
+    """Parse a sampling spec like "agentic_rag.nodes=0.1,agentic_rag.frontend=0.5"."""
+    rates = {}
+    for part in spec.split(','):
+        if '=' in part:
+            name, rate = part.split('=', 1)
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+def stop_logging(name: Optional[str] = None) -> None:
+    """Flush queued records and stop the background listener of a logger (of every logger by default)."""
+    with _listener_lock:
+        names = list(_listeners) if name is None else [name]
+        listeners = [_listeners.pop(key) for key in names if key in _listeners]
+    for listener in listeners:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+atexit.register(stop_logging)
+
+
+def setup_logger(
+    name: str = "agentic_rag",
+    log_file: str = None,
+    level: int = logging.INFO,
+    sampling: Optional[Dict[str, float]] = None,
+    stream: Optional[TextIO] = None,
+) -> logging.Logger:
+    """Setup centralized, non-blocking logging for the application.
+
+    Each configured logger gets its own queue and listener thread; calling
+    this again for the same name replaces them, other loggers keep theirs.
 
-def setup_logger(name: str = "agentic_rag", log_file: str = None, level: int = logging.INFO) -> logging.Logger:
-    """Setup centralized logging for the application.
-    
     Args:
         name: Logger name (default: "agentic_rag")
-        log_file: Optional log file path. If None, only console logging is enabled.
-                 Defaults to DEFAULT_LOG_FILE if not specified.
+        log_file: Optional log file path. False disables file logging.
+                 Defaults to LOG_FILE / DEFAULT_LOG_FILE if not specified.
         level: Logging level (default: logging.INFO)
-    
+        sampling: Sampling rate per logger name (default: parsed from LOG_SAMPLING)
+        stream: Console stream (default: sys.stdout)
+
     Returns:
         Configured logger instance
     """
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
-    # Remove existing handlers to avoid duplicates
+
+    # Remove existing handlers to avoid duplicates (and stop this logger's previous listener)
     logger.handlers.clear()
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
+    stop_logging(name)
+
+    # Console handler (human-readable)
+    console_handler = logging.StreamHandler(stream or sys.stdout)
     console_handler.setLevel(level)
     console_formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     console_handler.setFormatter(console_formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler (optional)
+    handlers = [console_handler]
+
+    # File handler (optional): JSON lines, rotated by size
     if log_file is not False:  # False means explicitly disable file logging
-        log_path = Path(log_file) if log_file else DEFAULT_LOG_FILE
+        log_path = Path(log_file or settings.LOG_FILE or DEFAULT_LOG_FILE)
         log_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        file_handler = logging.FileHandler(log_path, encoding='utf-8')
-        file_handler.setLevel(logging.DEBUG)
-        file_formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
+
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_path,
+            maxBytes=settings.LOG_MAX_BYTES,
+            backupCount=settings.LOG_BACKUP_COUNT,
+            encoding='utf-8',
         )
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
-    
+        file_handler.setLevel(logging.DEBUG)
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+
+    # Request threads only enqueue; the listener thread formats and writes
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = _StructuredQueueHandler(log_queue)
+    rates = parse_sampling(settings.LOG_SAMPLING) if sampling is None else sampling
+    if rates:
+        queue_handler.addFilter(SamplingFilter(rates))
+    logger.addHandler(queue_handler)
+
+    listener = _BatchingQueueListener(
+        log_queue, *handlers, interval=settings.LOG_BATCH_INTERVAL, respect_handler_level=True
+    )
+    listener.start()
+    with _listener_lock:
+        _listeners[name] = listener
+
     return logger
 
 
 def get_logger(name: str = None) -> logging.Logger:
     """Get an existing logger or create a new one with default settings.
-    
+
     Args:
         name: Logger name. If None, returns the root 'agentic_rag' logger.
-    
+
     Returns:
         Logger instance
     """
@@ -77,3 +262,5 @@ logger_chains = get_logger("chains")
 logger_core = get_logger("core")
 logger_frontend = get_logger("frontend")
 logger_ingestion = get_logger("ingestion")
+logger_api = get_logger("api")
+logger_batch = get_logger("batch")
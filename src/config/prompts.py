@@ -7,7 +7,8 @@ class Prompts:
     # Router prompts
     ROUTER_SYSTEM = """You are an expert at routing a user question to a vectorstore or web search.
 The vectorstore contains documents related to agents, prompt engineering, and adversarial attacks.
-Use the vectorstore for questions on these topics. For all else, use web-search."""
+Use the vectorstore for questions on these topics. For all else, use web-search.
+Also give your confidence in the choice, from 0 (a guess) to 1 (certain)."""
 
     # Retrieval grader prompts
     RETRIEVAL_GRADER_SYSTEM = """You are a grader assessing relevance of a retrieved document to a user question.
@@ -22,7 +23,8 @@ If the answer does not address / resolve the question, give a score of 'no'."""
 
     # Hallucination grader prompts
     HALLUCINATION_GRADER_SYSTEM = """You are a grader assessing whether an LLM generation is grounded in / supported by a set of retrieved facts.
-Give a binary score 'yes' or 'no'. 'Yes' means that the answer is grounded in / supported by the set of facts."""
+Give a binary score 'yes' or 'no'. 'Yes' means that the answer is grounded in / supported by the set of facts.
+Also give your confidence in the score, from 0 (a guess) to 1 (certain)."""
 
     # Generation prompts
     GENERATION_TEMPLATE = """You are an assistant for question-answering tasks. Use the following pieces of retrieved context to answer the question. If you don't know the answer, just say that you don't know. Use three sentences maximum and keep the answer concise.
@@ -1,9 +1,60 @@
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Dict
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Model roles - each chain gets its own model configuration and client
+MODEL_ROLES = ("router", "retrieval_grader", "hallucination_grader", "answer_grader", "generator")
+
+
+@dataclass(frozen=True)
+class ModelRoleConfig:
+    """Model settings of one role (0 means provider default / unlimited)."""
+
+    model: str
+    timeout: float
+    max_tokens: int
+    max_concurrency: int
+    priority: int  # Rate limiter lane, lower goes first
+
+
+def _load_model_roles() -> Dict[str, ModelRoleConfig]:
+    """
+    Read per-role model settings, e.g. ROUTER_MODEL, ROUTER_TIMEOUT,
+    ROUTER_MAX_TOKENS, ROUTER_MAX_CONCURRENCY.
+
+    Unset values fall back to LLM_MODEL / LLM_TIMEOUT / LLM_MAX_TOKENS /
+    LLM_MAX_CONCURRENCY, except that the router and graders (short structured
+    yes/no outputs) default to shorter timeouts and a small token cap.
+    <ROLE>_PRIORITY orders the rate limiter's queue: user-facing generation (0)
+    goes before routing (1) and grading (2).
+    """
+    priorities = {"generator": 0, "router": 1}
+    roles = {}
+    for role in MODEL_ROLES:
+        prefix = role.upper()
+        structured = role != "generator"
+        roles[role] = ModelRoleConfig(
+            model=os.getenv(f"{prefix}_MODEL") or os.getenv("LLM_MODEL", "gpt-4.1-mini"),
+            timeout=float(os.getenv(f"{prefix}_TIMEOUT") or os.getenv("LLM_TIMEOUT", "20" if structured else "60")),
+            max_tokens=int(os.getenv(f"{prefix}_MAX_TOKENS") or os.getenv("LLM_MAX_TOKENS", "256" if structured else "0")),
+            max_concurrency=int(os.getenv(f"{prefix}_MAX_CONCURRENCY") or os.getenv("LLM_MAX_CONCURRENCY", "0")),
+            priority=int(os.getenv(f"{prefix}_PRIORITY", str(priorities.get(role, 2)))),
+        )
+    return roles
+
+
+def _load_fake_role_latency() -> Dict[str, float]:
+    """Per-role fake LLM latency overrides, e.g. FAKE_LLM_LATENCY_ROUTER=0.005."""
+    latencies = {}
+    for role in MODEL_ROLES:
+        value = os.getenv(f"FAKE_LLM_LATENCY_{role.upper()}")
+        if value:
+            latencies[role] = float(value)
+    return latencies
+
 
 @dataclass(frozen=True)
 class Settings:
@@ -14,22 +65,150 @@ class Settings:
     TAVILY_API_KEY: str = os.getenv("TAVILY_API_KEY", "")
 
     # Model Configuration
-    LLM_MODEL: str = "gpt-4.1-mini"
+    # "openai" for the real models, "fake" for the bundled offline stand-ins
+    # (deterministic LLM, embeddings and web search, see src/core/fakes.py)
+    LLM_PROVIDER: str = os.getenv("LLM_PROVIDER", "openai")
+    LLM_MODEL: str = os.getenv("LLM_MODEL", "gpt-4.1-mini")  # Default for every role
     EMBEDDING_MODEL: str = "text-embedding-3-small"
     LLM_TEMPERATURE: float = 0
+    # Model, timeout, max tokens and concurrency limit per role (see _load_model_roles)
+    LLM_ROLES: Dict[str, ModelRoleConfig] = field(default_factory=_load_model_roles)
+
+    # Process-wide rate limiting of model calls: token-bucket budgets (0 = none),
+    # adaptive (AIMD) concurrency between MIN and MAX in flight, retries of 429s
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    LLM_RPM: int = int(os.getenv("LLM_RPM", "0"))
+    LLM_TPM: int = int(os.getenv("LLM_TPM", "0"))
+    EMBEDDING_RPM: int = int(os.getenv("EMBEDDING_RPM", "0"))
+    EMBEDDING_TPM: int = int(os.getenv("EMBEDDING_TPM", "0"))
+    RATE_LIMIT_MAX_IN_FLIGHT: int = int(os.getenv("RATE_LIMIT_MAX_IN_FLIGHT", "32"))
+    RATE_LIMIT_MIN_IN_FLIGHT: int = int(os.getenv("RATE_LIMIT_MIN_IN_FLIGHT", "1"))
+    RATE_LIMIT_LATENCY_TARGET: float = float(os.getenv("RATE_LIMIT_LATENCY_TARGET", "0"))  # Seconds, 0 = off
+    RATE_LIMIT_MAX_RETRIES: int = int(os.getenv("RATE_LIMIT_MAX_RETRIES", "5"))
+
+    # Shared HTTP connection pools (OpenAI, embeddings, Tavily, web loader)
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+    HTTP_MAX_KEEPALIVE: int = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))  # Idle connections kept open
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))  # Seconds
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+    HTTP_READ_TIMEOUT: float = float(os.getenv("HTTP_READ_TIMEOUT", "60"))
+    HTTP2: bool = os.getenv("HTTP2", "false").lower() == "true"  # Needs the h2 package
+
+    # Persistent exact-match cache of router / grader results (SQLite, shared by worker processes);
+    # off by default with the fake backends, so test and benchmark runs don't share results
+    LLM_CACHE_ENABLED: bool = os.getenv(
+        "LLM_CACHE_ENABLED", "false" if os.getenv("LLM_PROVIDER") == "fake" else "true"
+    ).lower() == "true"
+    LLM_CACHE_PATH: str = os.getenv("LLM_CACHE_PATH", "cache/llm_responses.sqlite")
+    LLM_CACHE_MAX_MB: float = float(os.getenv("LLM_CACHE_MAX_MB", "100"))
+    # Chains whose results are cached (comma-separated chain names)
+    LLM_CACHE_CHAINS: str = os.getenv(
+        "LLM_CACHE_CHAINS", "question_router,retrieval_grader,hallucination_grader,answer_grader"
+    )
+
+    # In-process cache of retrieval results (document IDs), invalidated when ingestion changes the collection
+    RETRIEVAL_CACHE_ENABLED: bool = os.getenv("RETRIEVAL_CACHE_ENABLED", "true").lower() == "true"
+    RETRIEVAL_CACHE_MAX_MB: float = float(os.getenv("RETRIEVAL_CACHE_MAX_MB", "16"))
 
     # Vector Store Configuration
     CHROMA_COLLECTION_NAME: str = "rag-chroma"
-    CHROMA_PERSIST_DIR: str = "vector_store/.chroma_db"
+    CHROMA_PERSIST_DIR: str = os.getenv(
+        "CHROMA_PERSIST_DIR",
+        "vector_store/.chroma_fake" if os.getenv("LLM_PROVIDER") == "fake" else "vector_store/.chroma_db",
+    )
+    # Shards of the knowledge base (1 = the single CHROMA_COLLECTION_NAME collection)
+    CHROMA_SHARDS: int = int(os.getenv("CHROMA_SHARDS", "1"))
+    CHROMA_SHARD_BY: str = os.getenv("CHROMA_SHARD_BY", "source")  # "source" or "hash" (of the content)
+
+    # Ingestion: chunks per embedding request, batches in flight, retries per failed batch
+    INGEST_EMBED_BATCH_SIZE: int = int(os.getenv("INGEST_EMBED_BATCH_SIZE", "64"))
+    INGEST_EMBED_CONCURRENCY: int = int(os.getenv("INGEST_EMBED_CONCURRENCY", "4"))
+    INGEST_EMBED_MAX_RETRIES: int = int(os.getenv("INGEST_EMBED_MAX_RETRIES", "3"))
+    # Resumable ingestion: progress manifest and retries per failed source fetch
+    INGEST_MANIFEST_PATH: str = os.getenv("INGEST_MANIFEST_PATH", "cache/ingest_manifest.sqlite")
+    INGEST_LOAD_MAX_RETRIES: int = int(os.getenv("INGEST_LOAD_MAX_RETRIES", "2"))
+    # Near-duplicate chunks: "drop", "merge" (record the duplicate's source on the kept chunk) or "off",
+    # and the estimated Jaccard similarity of word shingles from which chunks are duplicates
+    INGEST_DEDUP: str = os.getenv("INGEST_DEDUP", "drop")
+    INGEST_DEDUP_THRESHOLD: float = float(os.getenv("INGEST_DEDUP_THRESHOLD", "0.85"))
+    # Local corpus ingestion: comma-separated globs, parser processes (0 = one per CPU),
+    # memory-mapped reads from this size up, the index of file mtimes / hashes and the
+    # progress manifest (kept apart from the URL ingestion's)
+    LOCAL_CORPUS_INCLUDE: str = os.getenv(
+        "LOCAL_CORPUS_INCLUDE", "**/*.md,**/*.markdown,**/*.txt,**/*.html,**/*.htm"
+    )
+    LOCAL_CORPUS_EXCLUDE: str = os.getenv("LOCAL_CORPUS_EXCLUDE", "")
+    LOCAL_CORPUS_WORKERS: int = int(os.getenv("LOCAL_CORPUS_WORKERS", "0"))
+    LOCAL_CORPUS_MMAP_MIN_KB: int = int(os.getenv("LOCAL_CORPUS_MMAP_MIN_KB", "1024"))
+    LOCAL_CORPUS_INDEX_PATH: str = os.getenv("LOCAL_CORPUS_INDEX_PATH", "cache/local_corpus.sqlite")
+    LOCAL_CORPUS_MANIFEST_PATH: str = os.getenv(
+        "LOCAL_CORPUS_MANIFEST_PATH", "cache/local_corpus_manifest.sqlite"
+    )
 
     # Web Search Configuration
     TAVILY_MAX_RESULTS: int = 2
+    # Router fan-out: routes below this confidence run retrieval and web search in parallel
+    # ("auto"; "off" never fans out, "always" fans out every route; per request: retrieval_config["fanout"])
+    ROUTER_FANOUT: str = os.getenv("ROUTER_FANOUT", "auto")
+    ROUTER_FANOUT_THRESHOLD: float = float(os.getenv("ROUTER_FANOUT_THRESHOLD", "0.7"))
+    # Graph variant: "full" grades every answer twice, "balanced" skips the answer grader when the
+    # hallucination grader is confident, "fast" skips both when retrieval was clearly relevant
+    # (per request: retrieval_config["variant"])
+    GRAPH_VARIANT: str = os.getenv("GRAPH_VARIANT", "full")
+    BALANCED_MIN_GROUNDED_CONFIDENCE: float = float(os.getenv("BALANCED_MIN_GROUNDED_CONFIDENCE", "0.8"))
+    FAST_MIN_RELEVANCE: float = float(os.getenv("FAST_MIN_RELEVANCE", "0.8"))
+
+    # Fake Backends (only used when LLM_PROVIDER=fake), latencies in seconds
+    FAKE_LLM_LATENCY: float = float(os.getenv("FAKE_LLM_LATENCY", "0"))
+    FAKE_EMBEDDING_LATENCY: float = float(os.getenv("FAKE_EMBEDDING_LATENCY", "0"))
+    FAKE_SEARCH_LATENCY: float = float(os.getenv("FAKE_SEARCH_LATENCY", "0"))
+    FAKE_LLM_ROLE_LATENCY: Dict[str, float] = field(default_factory=_load_fake_role_latency)
+    # Spread of the fake latencies: sigma of a lognormal whose median is the latency (0 = fixed)
+    FAKE_LATENCY_JITTER: float = float(os.getenv("FAKE_LATENCY_JITTER", "0"))
+
+    # Graph state: documents as references into a shared document store instead of full copies
+    STATE_DOCUMENT_REFS: bool = os.getenv("STATE_DOCUMENT_REFS", "false").lower() == "true"
+    DOCUMENT_STORE_MAX_ENTRIES: int = int(os.getenv("DOCUMENT_STORE_MAX_ENTRIES", "50000"))
+
+    # Gradio UI: questions answered at once per replica (further ones wait in Gradio's queue)
+    UI_CONCURRENCY_LIMIT: int = int(os.getenv("UI_CONCURRENCY_LIMIT", "1"))
+
+    # HTTP API
+    API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
+    API_PORT: int = int(os.getenv("API_PORT", "8000"))
+    API_WORKERS: int = int(os.getenv("API_WORKERS", "1"))  # Server processes
+    API_MAX_CONCURRENCY: int = int(os.getenv("API_MAX_CONCURRENCY", "8"))  # Graph runs per process
+    API_KEEP_ALIVE: int = int(os.getenv("API_KEEP_ALIVE", "30"))  # Seconds
+    API_MAX_BATCH_SIZE: int = int(os.getenv("API_MAX_BATCH_SIZE", "100"))
+
+    # Startup: build models, chains and the graph before serving instead of on the first request
+    WARM_UP_ON_START: bool = os.getenv("WARM_UP_ON_START", "true").lower() == "true"
+    # Popular questions (JSONL / CSV, as for scripts/batch_run.py) run through the graph during warm-up
+    WARM_UP_QUESTIONS_PATH: str = os.getenv("WARM_UP_QUESTIONS_PATH", "")
+    WARM_UP_QUESTIONS_MAX: int = int(os.getenv("WARM_UP_QUESTIONS_MAX", "20"))
+
+    # Tracing (spans of every question written to a local, rotated JSONL file)
+    TRACE_ENABLED: bool = os.getenv("TRACE_ENABLED", "true").lower() == "true"
+    TRACE_FILE: str = os.getenv("TRACE_FILE", "logs/traces.jsonl")
+    TRACE_MAX_BYTES: int = int(os.getenv("TRACE_MAX_BYTES", str(10 * 1024 * 1024)))
+    TRACE_BACKUP_COUNT: int = int(os.getenv("TRACE_BACKUP_COUNT", "5"))
+
+    # Checkpointing of graph runs by request ID, so a failed run resumes from its last completed node
+    CHECKPOINT_ENABLED: bool = os.getenv("CHECKPOINT_ENABLED", "false").lower() == "true"
+    CHECKPOINT_PATH: str = os.getenv("CHECKPOINT_PATH", "cache/checkpoints.sqlite")
+    CHECKPOINT_TTL_HOURS: float = float(os.getenv("CHECKPOINT_TTL_HOURS", "24"))  # 0 keeps everything
 
     # Graph Output
     GRAPH_OUTPUT_PATH: str = "data/complete_rag_graph.png"
 
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FILE: str = os.getenv("LOG_FILE", "")  # Default: logs/app.log in the project root
+    LOG_MAX_BYTES: int = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+    LOG_BACKUP_COUNT: int = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+    LOG_BATCH_INTERVAL: float = float(os.getenv("LOG_BATCH_INTERVAL", "0.05"))  # Seconds records may wait
+    # Fraction of sub-WARNING records kept per logger, e.g. "agentic_rag.nodes=0.1"
+    LOG_SAMPLING: str = os.getenv("LOG_SAMPLING", "")
 
 
 settings = Settings()
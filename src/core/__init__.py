@@ -1,5 +1,6 @@
 from src.core.state import GraphState
 from src.core.llm import get_llm, get_embeddings
+from src.core.tools import get_web_search_tool
 from src.config import logger_core as logger
 
-__all__ = ["GraphState", "get_llm", "get_embeddings", "logger"]
+__all__ = ["GraphState", "get_llm", "get_embeddings", "get_web_search_tool", "logger"]
@@ -0,0 +1,176 @@
+"""Compact document references in graph state, resolved from a shared document store.
+
+By default GraphState["documents"] holds full Document objects, and every
+retrieval, checkpoint and serialized update carries their text. With
+STATE_DOCUMENT_REFS=true the nodes store each document once in the
+process-wide DocumentStore and put only a DocumentRef (its ID) in the state.
+Concurrent requests retrieving the same chunks then share one copy, and
+checkpoints hold IDs instead of text. Documents are resolved only where
+their text is needed (grading, generation, the final response).
+
+Chunks are keyed by their vectorstore ID. Other documents (web search
+results) are keyed by a hash of their source and text. Stored documents are
+never modified. If a chunk is retrieved again with different text (it was
+re-ingested), its entry is replaced. Least recently used entries are
+evicted above DOCUMENT_STORE_MAX_ENTRIES. Evicted chunks (or chunks
+referenced by a checkpoint from another process) are read back from the
+vectorstore. Other evicted documents can't be recovered and are left out
+with a warning.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+from langchain_core.documents import Document
+
+from src.config import logger_core as logger
+from src.config.settings import settings
+from src.core.lazy import Lazy
+from src.observability.metrics import registry
+
+DOCUMENT_STORE_ENTRIES = registry.gauge("rag_document_store_entries", "Documents held by the shared document store")
+DOCUMENT_STORE_MISSES = registry.counter(
+    "rag_document_store_misses_total", "Document references not found in the document store, by outcome"
+)
+
+
+@dataclass(frozen=True)
+class DocumentRef:
+    """Reference to a document in the DocumentStore (its position in the list is its rank)."""
+
+    id: str
+
+
+StateDocument = Union[Document, DocumentRef]
+
+
+def document_key(document: Document) -> str:
+    """Store key of a document: its vectorstore ID, or a hash of its source and text."""
+    if document.id:
+        return document.id
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(document.metadata.get("source", "")).encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(document.page_content.encode("utf-8"))
+    return f"content:{digest.hexdigest()}"
+
+
+class DocumentStore:
+    """
+    Thread-safe LRU map of document keys to read-only Documents.
+
+    Args:
+        max_entries: Documents kept before the least recently used are evicted.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._documents: "OrderedDict[str, Document]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, document: Document) -> DocumentRef:
+        """Store a document (unless an identical one is stored) and return its reference."""
+        key = document_key(document)
+        with self._lock:
+            stored = self._documents.get(key)
+            if stored is None or stored.page_content != document.page_content:
+                self._documents[key] = document
+                while len(self._documents) > self.max_entries:
+                    self._documents.popitem(last=False)
+            else:
+                self._documents.move_to_end(key)
+            DOCUMENT_STORE_ENTRIES.set(len(self._documents))
+        return DocumentRef(key)
+
+    def get(self, key: str) -> Optional[Document]:
+        """The stored document, or None if it was never stored or has been evicted."""
+        with self._lock:
+            document = self._documents.get(key)
+            if document is not None:
+                self._documents.move_to_end(key)
+            return document
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def clear(self) -> None:
+        """Drop every document."""
+        with self._lock:
+            self._documents.clear()
+            DOCUMENT_STORE_ENTRIES.set(0)
+
+
+get_document_store = Lazy("document_store", lambda: DocumentStore(settings.DOCUMENT_STORE_MAX_ENTRIES))
+
+
+def to_state(documents: Sequence[Document]) -> List[StateDocument]:
+    """
+    Documents as they are put in the graph state.
+
+    Args:
+        documents: Retrieved or generated documents.
+
+    Returns:
+        References to the stored documents with STATE_DOCUMENT_REFS=true, otherwise the documents.
+    """
+    if not settings.STATE_DOCUMENT_REFS:
+        return list(documents)
+    store = get_document_store()
+    return [store.put(document) for document in documents]
+
+
+def _load_chunks(keys: List[str]) -> Dict[str, Document]:
+    """Read chunks back from the vectorstore by ID (those that are gone are left out)."""
+    from src.ingestion.retrieval_cache import default_stores, documents_by_id
+
+    stores = default_stores()
+    documents = documents_by_id(stores, keys)
+    if documents is not None:
+        return dict(zip(keys, documents))
+    found = {}
+    for key in keys:
+        documents = documents_by_id(stores, [key])
+        if documents:
+            found[key] = documents[0]
+    return found
+
+
+def resolve_documents(documents: Optional[Sequence[StateDocument]]) -> List[Document]:
+    """
+    Documents of a graph state, with references resolved from the document store.
+
+    Args:
+        documents: State documents (Documents, DocumentRefs or a mix).
+
+    Returns:
+        The documents in order; unresolvable references are left out.
+    """
+    if not documents:
+        return []
+    if not any(isinstance(document, DocumentRef) for document in documents):
+        return list(documents)
+
+    store = get_document_store()
+    resolved: List[Optional[Document]] = [
+        store.get(document.id) if isinstance(document, DocumentRef) else document for document in documents
+    ]
+    missing = [
+        document.id for document, found in zip(documents, resolved)
+        if found is None and not document.id.startswith("content:")
+    ]
+    loaded = _load_chunks(missing) if missing else {}
+    result = []
+    for document, found in zip(documents, resolved):
+        if found is None:
+            found = loaded.get(document.id)
+            if found is None:
+                DOCUMENT_STORE_MISSES.inc(outcome="lost")
+                logger.warning(f"Document {document.id} is no longer in the document store; leaving it out")
+                continue
+            DOCUMENT_STORE_MISSES.inc(outcome="reloaded")
+            store.put(found)
+        result.append(found)
+    return result
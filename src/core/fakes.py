@@ -0,0 +1,465 @@
+"""Deterministic offline stand-ins for the LLM, embedding model and web search.
+
+Selected with LLM_PROVIDER=fake. They never touch the network, give the same
+answer for the same input and can inject latency, which makes them suitable
+for the HTTP API, benchmarks and load tests without API keys.
+"""
+
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Type
+
+from langchain_core.callbacks import CallbackManagerForLLMRun, CallbackManagerForToolRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import Runnable, RunnableLambda
+from langchain_core.tools import BaseTool
+from pydantic import BaseModel, PrivateAttr
+
+# Words that send a question to the vectorstore (mirrors Prompts.ROUTER_SYSTEM topics)
+ROUTER_KEYWORDS = {
+    "agent", "agents", "memory", "planning", "tool", "tools", "prompt", "prompting",
+    "prompts", "few-shot", "chain-of-thought", "adversarial", "attack", "attacks",
+    "jailbreak", "jailbreaking", "llm", "llms",
+}
+
+STOPWORDS = {
+    "what", "which", "when", "where", "who", "whom", "whose", "why", "how", "the", "and",
+    "for", "are", "is", "was", "were", "can", "you", "your", "explain", "concept", "does",
+    "that", "this", "with", "from", "into", "about", "there", "their", "have", "has",
+    "of", "to", "in", "on", "a", "an", "it", "its", "be", "do", "me", "tell", "give",
+    "definition", "describe", "some", "best",
+}
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9\-]*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokenizer shared by the fake models."""
+    return _WORD_RE.findall(text.lower())
+
+
+def content_words(text: str) -> List[str]:
+    """Tokens of a text without stopwords and very short words."""
+    return [word for word in tokenize(text) if len(word) > 2 and word not in STOPWORDS]
+
+
+def _count_tokens(text: str) -> int:
+    """Approximate token count (one token per word) used for usage metadata."""
+    return len(text.split())
+
+
+_jitter_rng = random.Random(0)
+
+
+def _sleep(latency: float, jitter: float = 0.0) -> None:
+    """Sleep for `latency`, or for a lognormal draw with that median and sigma `jitter`."""
+    if latency > 0:
+        time.sleep(latency * _jitter_rng.lognormvariate(0.0, jitter) if jitter > 0 else latency)
+
+
+class FakeRateLimitError(Exception):
+    """Rate-limit error of the fake model, shaped like the provider's (HTTP 429, retry-after)."""
+
+    status_code = 429
+
+    def __init__(self, message: str = "Rate limit reached (fake)", retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class FakeChatModel(BaseChatModel):
+    """Deterministic chat model that imitates the chains of this application.
+
+    Plain calls return an extractive answer built from the "Context:" section of
+    the prompt. Structured output calls are answered with simple rules:
+
+    - RouterQuery: vectorstore if the question mentions a knowledge-base topic,
+      with confidence 0.9 for two or more topic words and 0.55 for one (e.g.
+      "tools" in a question about bikes); websearch with confidence 0.85
+    - GradeDocuments: "yes" if at least half of the question's content words
+      appear in the document
+    - HallucinationGrader: always grounded, with the share of the generation's
+      content words found in the facts as confidence
+    - AnswerGrader: "no" for the first `answer_failures` calls per question,
+      which drives the graph's retry loop
+
+    Each call sleeps `latency`, spread lognormally by `latency_jitter` if set.
+
+    To exercise rate limiting, the model raises FakeRateLimitError for its
+    first `rate_limit_errors` calls and whenever more than `max_concurrent`
+    calls are in flight (0 = no limit).
+    """
+
+    model_name: str = "fake-chat"
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+    answer_failures: int = 0
+    rate_limit_errors: int = 0
+    max_concurrent: int = 0
+    retry_after: Optional[float] = None
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _call_count: int = PrivateAttr(default=0)
+    _in_flight: int = PrivateAttr(default=0)
+    _rate_limited: int = PrivateAttr(default=0)
+    _answer_attempts: Dict[str, int] = PrivateAttr(default_factory=dict)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model_name": self.model_name}
+
+    @property
+    def call_count(self) -> int:
+        """Number of model calls served so far."""
+        return self._call_count
+
+    @property
+    def rate_limited_count(self) -> int:
+        """Number of calls rejected with FakeRateLimitError so far."""
+        return self._rate_limited
+
+    def reset(self) -> None:
+        """Reset call counters and retry-loop state."""
+        with self._lock:
+            self._call_count = 0
+            self._rate_limited = 0
+            self._answer_attempts.clear()
+
+    def with_structured_output(self, schema: Type[BaseModel], **kwargs: Any) -> Runnable:
+        """Return a runnable producing `schema` instances, like ChatOpenAI does."""
+        bound = self.bind(structured_output=schema.__name__)
+
+        def parse(message: AIMessage) -> BaseModel:
+            return schema.model_validate_json(message.content)
+
+        return bound | RunnableLambda(parse, name=f"Parse{schema.__name__}")
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text = self._respond(messages, kwargs.get("structured_output"))
+        message = AIMessage(content=text, usage_metadata=self._usage(messages, text))
+        return ChatResult(
+            generations=[ChatGeneration(message=message)],
+            llm_output={"model_name": self.model_name},
+        )
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        text = self._respond(messages, kwargs.get("structured_output"))
+        pieces = re.findall(r"\S+\s*", text) or [text]
+        for i, piece in enumerate(pieces):
+            usage = self._usage(messages, text) if i == len(pieces) - 1 else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece, usage_metadata=usage))
+            if run_manager:
+                run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+
+    def _usage(self, messages: List[BaseMessage], text: str) -> Dict[str, int]:
+        input_tokens = sum(_count_tokens(str(message.content)) for message in messages)
+        output_tokens = _count_tokens(text)
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+        }
+
+    def _respond(self, messages: List[BaseMessage], structured_output: Optional[str]) -> str:
+        with self._lock:
+            self._call_count += 1
+            if self._call_count <= self.rate_limit_errors or (
+                self.max_concurrent and self._in_flight >= self.max_concurrent
+            ):
+                self._rate_limited += 1
+                raise FakeRateLimitError(retry_after=self.retry_after)
+            self._in_flight += 1
+        try:
+            _sleep(self.latency, self.latency_jitter)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+        prompt = "\n".join(str(message.content) for message in messages)
+        human = str(messages[-1].content) if messages else ""
+
+        if structured_output == "RouterQuery":
+            matches = len(set(tokenize(human)) & ROUTER_KEYWORDS)
+            if matches:
+                return json.dumps({"datasource": "vectorstore", "confidence": 0.9 if matches > 1 else 0.55})
+            return json.dumps({"datasource": "websearch", "confidence": 0.85})
+        if structured_output == "GradeDocuments":
+            document, _, question = human.partition("User question:")
+            return json.dumps({"binary_score": "yes" if _is_relevant(question, document) else "no"})
+        if structured_output == "HallucinationGrader":
+            facts, _, generation = human.partition("LLM generation:")
+            return json.dumps({"binary_score": True, "confidence": _grounded_share(facts, generation)})
+        if structured_output == "AnswerGrader":
+            question = human.split("LLM generation:", 1)[0]
+            with self._lock:
+                attempts = self._answer_attempts.get(question, 0) + 1
+                self._answer_attempts[question] = attempts
+            return json.dumps({"binary_score": attempts > self.answer_failures})
+
+        return _extractive_answer(prompt)
+
+
+def _grounded_share(facts: str, generation: str) -> float:
+    """Fake grounding confidence: share of the generation's content words that occur in the facts."""
+    words = content_words(generation)
+    if not words:
+        return 1.0
+    known = set(tokenize(facts))
+    return round(sum(word in known for word in words) / len(words), 2)
+
+
+def _is_relevant(question: str, document: str) -> bool:
+    """Fake relevance rule: at least half of the question's content words occur in the document."""
+    wanted = set(content_words(question))
+    if not wanted:
+        return False
+    present = set(tokenize(document))
+    return len(wanted & present) / len(wanted) >= 0.5
+
+
+def _extractive_answer(prompt: str) -> str:
+    """Build a short answer from the first sentences of the prompt's context."""
+    context = prompt.split("Context:", 1)[-1]
+    context = context.split("Additional Instructions:", 1)[0]
+    lines = [line.strip() for line in context.splitlines()]
+    text = " ".join(
+        line.removeprefix("Content:").strip() for line in lines
+        if line and not line.startswith(("[Document", "Source:", "Title:", "==="))
+    )
+    if not text:
+        return "I don't know."
+    sentences = re.split(r"(?<=[.!?])\s+", text)
+    return " ".join(sentences[:2])[:600]
+
+
+class FakeEmbeddings(Embeddings):
+    """Hashed bag-of-words embeddings: texts sharing words get similar vectors.
+
+    Vectors are L2-normalised so Chroma's default relevance scores stay in [0, 1].
+    """
+
+    def __init__(self, size: int = 256, latency: float = 0.0, latency_jitter: float = 0.0):
+        self.size = size
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.call_count = 0
+        self._lock = threading.Lock()
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.size
+        for word in tokenize(text):
+            digest = hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest()
+            index = int.from_bytes(digest[:4], "little") % self.size
+            sign = 1.0 if digest[4] & 1 else -1.0
+            vector[index] += sign
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [value / norm for value in vector]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            self.call_count += 1
+        _sleep(self.latency, self.latency_jitter)
+        return [self._embed(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        with self._lock:
+            self.call_count += 1
+        _sleep(self.latency, self.latency_jitter)
+        return self._embed(text)
+
+
+class FakeWebSearch(BaseTool):
+    """Offline stand-in for TavilySearch returning the same result shape."""
+
+    name: str = "tavily_search"
+    description: str = "Fake web search returning deterministic results."
+    max_results: int = 2
+    latency: float = 0.0
+    latency_jitter: float = 0.0
+
+    def _run(
+        self,
+        query: str,
+        run_manager: Optional[CallbackManagerForToolRun] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        _sleep(self.latency, self.latency_jitter)
+        results = []
+        for i in range(1, self.max_results + 1):
+            results.append({
+                "url": f"https://example.com/search/{i}",
+                "title": f"Result {i} for {query}",
+                "content": f"{query.rstrip('?')} is covered by web result {i}. "
+                           f"It explains {query.rstrip('?').lower()} in general terms.",
+                "score": round(1.0 - i * 0.1, 2),
+            })
+        return {"query": query, "results": results}
+
+
+# Vocabulary for the synthetic knowledge base (same topics as the real one)
+SYNTHETIC_TOPICS = {
+    "agents": [
+        "agent", "memory", "planning", "reflection", "tool", "use", "short-term", "long-term",
+        "retrieval", "task", "decomposition", "subgoal", "react", "action", "observation",
+    ],
+    "prompt-engineering": [
+        "prompt", "prompting", "few-shot", "zero-shot", "chain-of-thought", "instruction",
+        "example", "demonstration", "reasoning", "self-consistency", "template", "output",
+    ],
+    "adversarial-attacks": [
+        "adversarial", "attack", "jailbreak", "token", "gradient", "suffix", "robustness",
+        "red-teaming", "safety", "perturbation", "defense", "model",
+    ],
+}
+
+
+def synthetic_corpus(n_docs: int = 60, words_per_doc: int = 120, seed: int = 0) -> List[Document]:
+    """
+    Generate a deterministic synthetic knowledge base.
+
+    Args:
+        n_docs: Number of documents, spread evenly over SYNTHETIC_TOPICS
+        words_per_doc: Approximate document length in words
+        seed: Random seed
+
+    Returns:
+        List of Documents with source and title metadata.
+    """
+    rng = random.Random(seed)
+    topics = list(SYNTHETIC_TOPICS)
+    docs = []
+    for i in range(n_docs):
+        topic = topics[i % len(topics)]
+        vocabulary = SYNTHETIC_TOPICS[topic]
+        sentences = []
+        while sum(len(sentence.split()) for sentence in sentences) < words_per_doc:
+            words = rng.sample(vocabulary, k=min(6, len(vocabulary)))
+            sentences.append(f"The {words[0]} {words[1]} relates to {' and '.join(words[2:])}.")
+        docs.append(Document(
+            page_content=" ".join(sentences),
+            metadata={
+                "source": f"synthetic://{topic}/{i}",
+                "title": f"Synthetic {topic.replace('-', ' ')} document {i}",
+            },
+        ))
+    return docs
+
+
+# Boilerplate repeated on every page of the synthetic site ({page} / {topic} vary per page)
+SITE_NAVIGATION = (
+    "Home Posts Archive Search Tags FAQ About. Notes on machine learning research: language models, "
+    "autonomous agents, prompting techniques and the safety of large models. Subscribe to the newsletter "
+    "or follow the feed to get new posts. Table of contents for this page is in the sidebar. Post {page}."
+)
+SITE_CITATION = (
+    "Citation. Please cite this work as: Weng, Lilian. Synthetic notes on {topic}, part {page}. "
+    "Lil'Log. Or use the BibTeX entry: @article{{weng-synthetic, title = synthetic notes, author = "
+    "Weng Lilian, journal = lilianweng.github.io, year = 2024}}. References are listed below in the order "
+    "they appear in the text, and the full bibliography of the blog is available on the archive page."
+)
+SITE_FOOTER = (
+    "Copyright 2024 Lil'Log. Powered by Hugo and PaperMod. All posts are licensed under a Creative Commons "
+    "attribution license unless otherwise noted. Comments and corrections are welcome by email; thanks to "
+    "all readers who reported typos and broken links on earlier posts. Back to top of page {page}."
+)
+
+
+def synthetic_site(n_pages: int = 30, words_per_page: int = 240, seed: int = 0) -> List[Document]:
+    """
+    Generate pages of a synthetic blog: topical paragraphs between repeated navigation, citation and footer blocks.
+
+    Paragraphs are separated by blank lines, so a paragraph splitter turns
+    every boilerplate block into a near-duplicate chunk (they differ only in
+    the page number and topic).
+
+    Args:
+        n_pages: Number of pages, spread evenly over SYNTHETIC_TOPICS
+        words_per_page: Approximate length of the topical content in words
+        seed: Random seed
+
+    Returns:
+        List of page Documents with source and title metadata.
+    """
+    pages = []
+    for doc in synthetic_corpus(n_pages, words_per_doc=words_per_page, seed=seed):
+        topic, page = doc.metadata["source"].removeprefix("synthetic://").split("/")
+        sentences = doc.page_content.split(". ")
+        paragraphs = [". ".join(sentences[i:i + 8]) for i in range(0, len(sentences), 8)]
+        blocks = [SITE_NAVIGATION, *paragraphs, SITE_CITATION, SITE_FOOTER]
+        pages.append(Document(
+            page_content="\n\n".join(block.format(page=page, topic=topic.replace("-", " ")) for block in blocks),
+            metadata={"source": f"https://synthetic.blog/{topic}/{page}", "title": doc.metadata["title"]},
+        ))
+    return pages
+
+
+def seed_synthetic_vectorstore(
+    n_docs: int = 60,
+    persist_directory: Optional[str] = None,
+    collection_name: Optional[str] = None,
+    embeddings: Optional[Embeddings] = None,
+):
+    """
+    Populate a Chroma collection with the synthetic corpus if it is empty.
+
+    Args:
+        n_docs: Number of synthetic documents to add
+        persist_directory: Chroma directory. Defaults to settings.CHROMA_PERSIST_DIR.
+        collection_name: Collection name. Defaults to settings.CHROMA_COLLECTION_NAME.
+        embeddings: Embedding model. Defaults to get_embeddings().
+
+    Returns:
+        The Chroma vector store instance (the shard collections if CHROMA_SHARDS > 1).
+    """
+    from langchain_chroma import Chroma
+
+    from src.config.settings import settings
+    from src.ingestion import get_shards, get_vectorstore, ingest_shards
+    from src.ingestion.retrieval_cache import bump_version
+
+    defaults = persist_directory is None and collection_name is None and embeddings is None
+    if defaults and settings.CHROMA_SHARDS > 1:
+        shards = get_shards()
+        if not any(shard.get(limit=1)["ids"] for shard in shards):
+            ingest_shards(synthetic_corpus(n_docs), shards)
+        return shards
+    if defaults:
+        vectorstore = get_vectorstore()
+    else:
+        from src.core.llm import get_embeddings
+
+        vectorstore = Chroma(
+            collection_name=collection_name or settings.CHROMA_COLLECTION_NAME,
+            embedding_function=embeddings or get_embeddings(),
+            persist_directory=persist_directory or settings.CHROMA_PERSIST_DIR,
+        )
+    if not vectorstore.get(limit=1)["ids"]:
+        vectorstore.add_documents(synthetic_corpus(n_docs))
+        bump_version(vectorstore)
+    return vectorstore
@@ -0,0 +1,216 @@
+"""Shared, pooled HTTP clients for every outbound API call.
+
+ChatOpenAI and OpenAIEmbeddings get the shared httpx clients (sync and
+async), the Tavily search tool posts through them as well, and the
+ingestion's WebBaseLoader uses a shared requests session. Connections are
+kept alive and reused across calls, so TLS handshakes are paid once per
+connection instead of once per call. Pool size, timeouts, keep-alive and
+HTTP/2 are configured centrally (HTTP_* settings).
+
+Connection reuse is exported per client as rag_http_requests_total and
+rag_http_connections_opened_total (reused = requests - opened).
+"""
+
+import os
+import threading
+from typing import Any, Dict, Optional, Sequence
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.config import logger_core as logger
+from src.config.settings import settings
+from src.core.lazy import Lazy
+from src.observability.metrics import registry
+
+HTTP_REQUESTS = registry.counter("rag_http_requests_total", "Outbound HTTP requests by client")
+HTTP_CONNECTIONS = registry.counter("rag_http_connections_opened_total", "New outbound connections by client")
+HTTP_TLS_HANDSHAKES = registry.counter("rag_http_tls_handshakes_total", "TLS handshakes by client")
+
+
+def _http2_enabled() -> bool:
+    """HTTP/2 if configured and the h2 package is installed."""
+    if not settings.HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("HTTP2=true but the h2 package is not installed, using HTTP/1.1")
+        return False
+    return True
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(settings.HTTP_READ_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT)
+
+
+def _record_trace(client: str, event: str) -> None:
+    """Count connection events reported by httpcore's trace extension."""
+    if event == "connection.connect_tcp.complete":
+        HTTP_CONNECTIONS.inc(client=client)
+    elif event == "connection.start_tls.complete":
+        HTTP_TLS_HANDSHAKES.inc(client=client)
+
+
+def build_http_client(name: str = "httpx", **kwargs: Any) -> httpx.Client:
+    """
+    Build a pooled sync client with the configured limits, timeouts and stats.
+
+    Args:
+        name: Client label of the connection metrics.
+        **kwargs: Overrides passed to httpx.Client.
+    """
+    def trace(event: str, info: Dict[str, Any]) -> None:
+        _record_trace(name, event)
+
+    def on_request(request: httpx.Request) -> None:
+        HTTP_REQUESTS.inc(client=name)
+        request.extensions["trace"] = trace
+
+    options = {"limits": _limits(), "timeout": _timeout(), "http2": _http2_enabled()}
+    options.update(kwargs)
+    return httpx.Client(event_hooks={"request": [on_request]}, **options)
+
+
+def build_async_http_client(name: str = "httpx_async", **kwargs: Any) -> httpx.AsyncClient:
+    """Async counterpart of build_http_client()."""
+    async def trace(event: str, info: Dict[str, Any]) -> None:
+        _record_trace(name, event)
+
+    async def on_request(request: httpx.Request) -> None:
+        HTTP_REQUESTS.inc(client=name)
+        request.extensions["trace"] = trace
+
+    options = {"limits": _limits(), "timeout": _timeout(), "http2": _http2_enabled()}
+    options.update(kwargs)
+    return httpx.AsyncClient(event_hooks={"request": [on_request]}, **options)
+
+
+class _CountingAdapter(HTTPAdapter):
+    """requests adapter that reports new connections of its urllib3 pools."""
+
+    def __init__(self, name: str, **kwargs: Any):
+        self.name = name
+        self._opened = 0
+        self._lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        HTTP_REQUESTS.inc(client=self.name)
+        response = super().send(request, **kwargs)
+        pools = self.poolmanager.pools
+        with pools.lock:
+            opened = sum(pools[key].num_connections for key in pools.keys())
+        with self._lock:
+            new, self._opened = opened - self._opened, max(opened, self._opened)
+        if new > 0:
+            HTTP_CONNECTIONS.inc(new, client=self.name)
+        return response
+
+
+def build_requests_session(name: str = "requests") -> requests.Session:
+    """A requests session with a pooled, counting adapter (for libraries built on requests)."""
+    from langchain_community.document_loaders.web_base import default_header_template
+
+    session = requests.Session()
+    adapter = _CountingAdapter(
+        name,
+        pool_connections=settings.HTTP_MAX_KEEPALIVE,
+        pool_maxsize=settings.HTTP_MAX_KEEPALIVE,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(default_header_template)
+    session.headers["User-Agent"] = os.environ.get("USER_AGENT", "LangGraph-Agentic-RAG/1.0")
+    return session
+
+
+# Process-wide clients, built on first use
+get_http_client = Lazy("http_client", build_http_client)
+get_async_http_client = Lazy("async_http_client", build_async_http_client)
+get_requests_session = Lazy("requests_session", build_requests_session)
+
+
+def prime_connections(urls: Sequence[str]) -> int:
+    """
+    Open a pooled connection to each URL's host ahead of the first API call (one HEAD request each).
+
+    The response status doesn't matter; the connection stays in the shared
+    pool for the calls that follow. Unreachable hosts are logged and skipped.
+
+    Returns:
+        Number of hosts that answered.
+    """
+    client = get_http_client()
+    reached = 0
+    for url in urls:
+        try:
+            client.head(url)
+            reached += 1
+        except httpx.HTTPError as e:
+            logger.warning(f"Could not open a connection to {url}: {e}")
+    return reached
+
+
+def connection_stats() -> Dict[str, Dict[str, float]]:
+    """Requests, new connections, TLS handshakes and reuse ratio per client since start."""
+    stats: Dict[str, Dict[str, float]] = {}
+    for key, value in HTTP_REQUESTS.samples():
+        client = dict(key).get("client", "")
+        opened = HTTP_CONNECTIONS.value(client=client)
+        stats[client] = {
+            "requests": value,
+            "connections_opened": opened,
+            "tls_handshakes": HTTP_TLS_HANDSHAKES.value(client=client),
+            "reuse_ratio": 1.0 - opened / value if value else 0.0,
+        }
+    return stats
+
+
+def tavily_api_wrapper(api_key: str, api_base_url: Optional[str] = None):
+    """
+    Tavily API wrapper that posts through the shared clients instead of per-call connections.
+
+    langchain-tavily has no public hook for a session, so this overrides its
+    private wrapper's request methods and rebuilds their request. The package
+    is pinned exactly, and tests/test_http.py compares both requests so a
+    release that changes them fails the tests instead of the searches.
+    """
+    from langchain_tavily._utilities import TAVILY_API_URL, TavilySearchAPIWrapper
+
+    class PooledTavilySearchAPIWrapper(TavilySearchAPIWrapper):
+        def _request(self, query: str, kwargs: Dict[str, Any]):
+            params = {key: value for key, value in {"query": query, **kwargs}.items() if value is not None}
+            headers = {
+                "Authorization": f"Bearer {self.tavily_api_key.get_secret_value()}",
+                "Content-Type": "application/json",
+                "X-Client-Source": "langchain-tavily",
+            }
+            return f"{self.api_base_url or TAVILY_API_URL}/search", params, headers
+
+        @staticmethod
+        def _result(response: httpx.Response) -> Dict[str, Any]:
+            if response.status_code != 200:
+                detail = response.json().get("detail", {})
+                error_message = detail.get("error") if isinstance(detail, dict) else "Unknown error"
+                raise ValueError(f"Error {response.status_code}: {error_message}")
+            return response.json()
+
+        def raw_results(self, query: str, **kwargs: Any) -> Dict[str, Any]:
+            url, params, headers = self._request(query, kwargs)
+            return self._result(get_http_client().post(url, json=params, headers=headers))
+
+        async def raw_results_async(self, query: str, **kwargs: Any) -> Dict[str, Any]:
+            url, params, headers = self._request(query, kwargs)
+            return self._result(await get_async_http_client().post(url, json=params, headers=headers))
+
+    return PooledTavilySearchAPIWrapper(tavily_api_key=api_key, api_base_url=api_base_url)
@@ -0,0 +1,65 @@
+"""Lazy, thread-safe singletons for expensive objects (chains, models, the compiled graph)."""
+
+import threading
+import time
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+from src.config import logger_core as logger
+
+T = TypeVar("T")
+
+# Every lazy singleton by name, so they can be warmed up and profiled together
+_registry: Dict[str, "Lazy"] = {}
+
+
+class Lazy(Generic[T]):
+    """
+    Build a value on first use, exactly once, even when first used from several threads.
+
+    Calling the instance returns the value. The build time is recorded for
+    startup profiling (see init_timings()).
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self.name = name
+        self._factory = factory
+        self._value: Optional[T] = None
+        self._built = False
+        self._lock = threading.Lock()
+        self.init_seconds: Optional[float] = None
+        _registry[name] = self
+
+    def __call__(self) -> T:
+        if not self._built:
+            with self._lock:
+                if not self._built:
+                    started = time.perf_counter()
+                    self._value = self._factory()
+                    self.init_seconds = time.perf_counter() - started
+                    self._built = True
+                    logger.debug(f"Initialized {self.name} in {self.init_seconds * 1000:.1f} ms")
+        return self._value
+
+    @property
+    def initialized(self) -> bool:
+        return self._built
+
+    def reset(self) -> None:
+        """Drop the value so the next call builds it again."""
+        with self._lock:
+            self._value = None
+            self._built = False
+            self.init_seconds = None
+
+
+def registered() -> Dict[str, Lazy]:
+    """All lazy singletons defined so far (modules register theirs on import)."""
+    return dict(_registry)
+
+
+def init_timings() -> Dict[str, Optional[float]]:
+    """Build time in ms of each lazy singleton (None if not built yet)."""
+    return {
+        name: None if item.init_seconds is None else item.init_seconds * 1000
+        for name, item in _registry.items()
+    }
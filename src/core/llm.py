@@ -1,27 +1,205 @@
-"""Centralized LLM and embedding model instances."""
+"""Centralized LLM and embedding model instances.
 
-from functools import lru_cache
+Every model role (router, the three graders, the generator) has its own
+model settings (settings.LLM_ROLES) and its own cached client, so
+latency-critical grading can run on a smaller, faster model than answer
+generation. All calls go through the process-wide rate limiter
+(src/core/rate_limit.py), which also does the retries.
+"""
 
-from langchain_openai import ChatOpenAI, OpenAIEmbeddings
+import threading
+import time
+from functools import partial
+from typing import Any, Dict, Iterator, Optional
 
-from src.config.settings import settings
+from langchain_core.embeddings import Embeddings
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_core.runnables.config import run_in_executor
 
+from src.config.settings import MODEL_ROLES, ModelRoleConfig, settings
+from src.core.http import get_async_http_client, get_http_client
+from src.core.lazy import Lazy
+from src.core.rate_limit import (
+    RateLimitedEmbeddings,
+    estimate_tokens,
+    get_embedding_limiter,
+    get_llm_limiter,
+    is_rate_limit_error,
+    is_transient_error,
+)
+
+DEFAULT_ROLE = "generator"
+
+# Name of the chain (see name_chain) that uses each role
+ROLE_CHAINS = {
+    "router": "question_router",
+    "retrieval_grader": "retrieval_grader",
+    "hallucination_grader": "hallucination_grader",
+    "answer_grader": "answer_grader",
+    "generator": "generation",
+}
+
+
+def _build_llm(role: str) -> BaseChatModel:
+    """Build the LLM instance of a role."""
+    config = settings.LLM_ROLES[role]
+    if settings.LLM_PROVIDER == "fake":
+        from src.core.fakes import FakeChatModel
+
+        return FakeChatModel(
+            latency=settings.FAKE_LLM_ROLE_LATENCY.get(role, settings.FAKE_LLM_LATENCY),
+            latency_jitter=settings.FAKE_LATENCY_JITTER,
+        )
+
+    from langchain_openai import ChatOpenAI
 
-@lru_cache(maxsize=1)
-def get_llm() -> ChatOpenAI:
-    """Get the default LLM instance (cached)."""
     return ChatOpenAI(
-        model=settings.LLM_MODEL,
+        model=config.model,
         temperature=settings.LLM_TEMPERATURE,
         api_key=settings.OPENAI_API_KEY,
+        timeout=config.timeout or None,
+        max_tokens=config.max_tokens or None,
+        http_client=get_http_client(),
+        http_async_client=get_async_http_client(),
+        # Retries (and their backoff) are coordinated by the rate limiter instead
+        **({"max_retries": 0} if settings.RATE_LIMIT_ENABLED else {}),
     )
 
 
-@lru_cache(maxsize=1)
-def get_embeddings() -> OpenAIEmbeddings:
-    """Get the embedding model instance (cached)."""
-    return OpenAIEmbeddings(
-        model=settings.EMBEDDING_MODEL,
-        api_key=settings.OPENAI_API_KEY,
-    )
+def _build_embeddings() -> Embeddings:
+    """Build the embedding model instance (rate limited unless RATE_LIMIT_ENABLED=false)."""
+    if settings.LLM_PROVIDER == "fake":
+        from src.core.fakes import FakeEmbeddings
+
+        embeddings = FakeEmbeddings(latency=settings.FAKE_EMBEDDING_LATENCY, latency_jitter=settings.FAKE_LATENCY_JITTER)
+    else:
+        from langchain_openai import OpenAIEmbeddings
+
+        embeddings = OpenAIEmbeddings(
+            model=settings.EMBEDDING_MODEL,
+            api_key=settings.OPENAI_API_KEY,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client(),
+            **({"max_retries": 0} if settings.RATE_LIMIT_ENABLED else {}),
+        )
+
+    limiter = get_embedding_limiter()
+    return embeddings if limiter is None else RateLimitedEmbeddings(embeddings, limiter)
+
+
+# One client per role, built on first use
+_llms: Dict[str, Lazy[BaseChatModel]] = {
+    role: Lazy(f"llm.{role}", partial(_build_llm, role)) for role in MODEL_ROLES
+}
+
+
+def _build_semaphores(roles: Dict[str, ModelRoleConfig]) -> Dict[str, threading.BoundedSemaphore]:
+    """Concurrency limit per role (only roles with max_concurrency > 0)."""
+    return {
+        role: threading.BoundedSemaphore(config.max_concurrency)
+        for role, config in roles.items()
+        if config.max_concurrency > 0
+    }
+
+
+# Shared by every chain of a role
+_semaphores = _build_semaphores(settings.LLM_ROLES)
+
+
+def get_llm(role: str = DEFAULT_ROLE) -> BaseChatModel:
+    """
+    Get the cached LLM client of a model role.
+
+    Args:
+        role: One of MODEL_ROLES (default: "generator").
+
+    Raises:
+        ValueError: If the role is unknown.
+    """
+    try:
+        return _llms[role]()
+    except KeyError:
+        raise ValueError(f"Unknown model role {role!r} (expected one of {', '.join(MODEL_ROLES)})") from None
+
+
+def _usage_tokens(result: Any) -> Optional[int]:
+    """Total tokens reported with a model result (None for parsed structured output)."""
+    usage = getattr(result, "usage_metadata", None)
+    return usage.get("total_tokens") if usage else None
+
+
+class _LimitedCalls(Runnable):
+    """Run a model runnable under the role's concurrency limit and the rate limiter.
+
+    Transparent to callbacks and tracing: the wrapped runnable gets the
+    caller's config unchanged and no extra run is recorded.
+
+    invoke() retries through the rate limiter. stream() holds the same slot
+    for the whole stream but is not retried (chunks already handed out cannot
+    be taken back). The limits are thread-based, so ainvoke() runs invoke()
+    in the executor, and astream() / batch() build on ainvoke() / invoke().
+    """
+
+    def __init__(self, bound: Runnable, role: str):
+        self.bound = bound
+        self.role = role
+        self.semaphore = _semaphores.get(role)
+        self.config = settings.LLM_ROLES[role]
+
+    def _tokens(self, input: Any) -> int:
+        return estimate_tokens(input) + (self.config.max_tokens or 256)
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        limiter = get_llm_limiter()
+        if self.semaphore is not None:
+            self.semaphore.acquire()
+        try:
+            if limiter is None:
+                return self.bound.invoke(input, config, **kwargs)
+            return limiter.call(
+                lambda: self.bound.invoke(input, config, **kwargs),
+                tokens=self._tokens(input),
+                priority=self.config.priority,
+                lane=self.role,
+                usage=_usage_tokens,
+            )
+        finally:
+            if self.semaphore is not None:
+                self.semaphore.release()
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Any:
+        return await run_in_executor(config, self.invoke, input, config, **kwargs)
+
+    def stream(self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any) -> Iterator[Any]:
+        limiter = get_llm_limiter()
+        tokens = self._tokens(input)
+        if self.semaphore is not None:
+            self.semaphore.acquire()
+        try:
+            if limiter is None:
+                yield from self.bound.stream(input, config, **kwargs)
+                return
+
+            limiter.acquire(tokens, self.config.priority, self.role)
+            started = time.monotonic()
+            outcome = "failed"
+            try:
+                yield from self.bound.stream(input, config, **kwargs)
+                outcome = "ok"
+            except Exception as e:
+                outcome = "rate_limited" if is_rate_limit_error(e) else "error" if is_transient_error(e) else "failed"
+                raise
+            finally:
+                limiter.release(time.monotonic() - started, outcome, tokens)
+        finally:
+            if self.semaphore is not None:
+                self.semaphore.release()
+
+
+def limit_calls(runnable: Runnable, role: str) -> Runnable:
+    """Apply the role's max_concurrency, the rate limiter and its retries to a model runnable."""
+    return _LimitedCalls(runnable, role)
+
 
+get_embeddings = Lazy("embeddings", _build_embeddings)
@@ -1,10 +1,14 @@
-"""Logging configuration for the RAG application."""
+"""Logging configuration for the RAG application.
+
+Kept for compatibility: logging is configured in src/config/logging_config.py,
+this module only forwards to it.
+"""
 
 import logging
-import sys
 
-# Create logger
-logger = logging.getLogger("rag")
+from src.config.logging_config import get_logger, setup_logger
+
+logger = get_logger()
 
 
 def setup_logging(level: str = "INFO") -> None:
@@ -14,20 +18,4 @@ def setup_logging(level: str = "INFO") -> None:
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR)
     """
-    logger.setLevel(getattr(logging, level.upper()))
-    
-    # Only add handler if not already configured
-    if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setFormatter(
-            logging.Formatter(
-                "%(asctime)s | %(levelname)-8s | %(message)s",
-                datefmt="%H:%M:%S"
-            )
-        )
-        logger.addHandler(handler)
-
-
-# Auto-setup with INFO level (can be overridden)
-setup_logging()
-
+    setup_logger(level=getattr(logging, level.upper()))
@@ -0,0 +1,366 @@
+"""Process-wide rate limiting and adaptive concurrency for model calls.
+
+Every LLM call (and, with a separate limiter, every embedding call) passes
+through an AdaptiveLimiter before it reaches the provider:
+
+- token buckets keep requests and tokens per minute within the budgets
+  (LLM_RPM / LLM_TPM, EMBEDDING_RPM / EMBEDDING_TPM)
+- the number of calls in flight is adapted with AIMD: +1 per limit's worth
+  of successful calls, halved on a rate-limit (429) response, reduced by 10%
+  when a call is slower than RATE_LIMIT_LATENCY_TARGET
+- waiting calls are served by priority lane, so user-facing generation goes
+  before routing and background grading
+- rate-limit responses pause the whole process for the provider's
+  retry-after (or an exponential backoff) and the call is retried
+
+Queue wait is exported as rag_llm_queue_wait_seconds{limiter,lane}.
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Any, Callable, List, Optional, TypeVar
+
+from langchain_core.embeddings import Embeddings
+
+from src.config import logger_core as logger
+from src.config.settings import settings
+from src.core.lazy import Lazy
+from src.observability.metrics import registry
+
+T = TypeVar("T")
+
+QUEUE_WAIT = registry.histogram("rag_llm_queue_wait_seconds", "Time model calls waited for the rate limiter")
+RATE_LIMITED = registry.counter("rag_llm_rate_limited_total", "Rate-limit (429) responses by limiter and lane")
+RETRIES = registry.counter("rag_llm_retries_total", "Model calls retried by the rate limiter")
+CONCURRENCY_LIMIT = registry.gauge("rag_llm_concurrency_limit", "Current adaptive concurrency limit")
+IN_FLIGHT = registry.gauge("rag_llm_in_flight", "Model calls in flight")
+
+# Longest backoff between retries (seconds)
+MAX_BACKOFF = 30.0
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """True for provider rate-limit errors (HTTP 429)."""
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status == 429 or type(error).__name__ == "RateLimitError"
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """True for errors worth retrying besides rate limits (server errors, timeouts, dropped connections)."""
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return (isinstance(status, int) and status >= 500) or type(error).__name__ in {
+        "APIConnectionError", "APITimeoutError", "InternalServerError",
+    }
+
+
+def retry_after(error: BaseException) -> Optional[float]:
+    """Seconds to wait as requested by the provider (retry-after header), if any."""
+    value = getattr(error, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(error, "response", None), "headers", None) or {}
+        value = headers.get("retry-after")
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Budget refilled continuously at `per_minute` units per minute.
+
+    Holds at most one minute's worth, so a burst can use a full minute of
+    budget at once. Not thread-safe on its own (the limiter holds its lock).
+    """
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` is available (requests larger than the capacity wait for a full bucket)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.tokens -= amount
+
+    def adjust(self, amount: float) -> None:
+        """Correct an earlier estimate (positive: used more than reserved)."""
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class AdaptiveLimiter:
+    """
+    Token-bucket budgets, AIMD concurrency and priority lanes for one provider quota.
+
+    Args:
+        name: Label of the limiter's metrics.
+        rpm: Requests per minute (0 = unlimited).
+        tpm: Tokens per minute (0 = unlimited).
+        max_concurrency: Ceiling (and starting value) of the concurrency limit.
+        min_concurrency: Floor of the concurrency limit.
+        latency_target: Calls slower than this (seconds) reduce the limit (0 = off).
+        max_retries: Retries of rate-limited or transient failures per call.
+        backoff: First retry delay in seconds when the provider sends no retry-after.
+        decrease_cooldown: Minimum seconds between two decreases (one burst of 429s halves once).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rpm: int = 0,
+        tpm: int = 0,
+        max_concurrency: int = 32,
+        min_concurrency: int = 1,
+        latency_target: float = 0.0,
+        max_retries: int = 5,
+        backoff: float = 0.5,
+        decrease_cooldown: float = 1.0,
+    ):
+        self.name = name
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.latency_target = latency_target
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.decrease_cooldown = decrease_cooldown
+
+        self._limit = float(self.max_concurrency)
+        self._in_flight = 0
+        self._waiting: List[tuple] = []  # Heap of (priority, sequence) tickets
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+        CONCURRENCY_LIMIT.set(self._limit, limiter=name)
+
+    @property
+    def limit(self) -> int:
+        """Current concurrency limit."""
+        return max(self.min_concurrency, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _delay(self, tokens: int, now: float) -> float:
+        """Seconds until a call of `tokens` may start (0 if now)."""
+        delay = self._paused_until - now
+        if self.requests:
+            delay = max(delay, self.requests.wait_time(1, now))
+        if self.tokens and tokens:
+            delay = max(delay, self.tokens.wait_time(tokens, now))
+        return delay
+
+    def acquire(self, tokens: int = 0, priority: int = 0, lane: str = "default") -> float:
+        """
+        Wait for a slot and budget, by priority then arrival order.
+
+        Returns:
+            Seconds spent waiting.
+        """
+        ticket = (priority, next(self._sequence))
+        started = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    timeout = None
+                    if self._waiting[0] is ticket and self._in_flight < self.limit:
+                        now = time.monotonic()
+                        timeout = self._delay(tokens, now)
+                        if timeout <= 0:
+                            heapq.heappop(self._waiting)
+                            if self.requests:
+                                self.requests.consume(1, now)
+                            if self.tokens and tokens:
+                                self.tokens.consume(tokens, now)
+                            self._in_flight += 1
+                            break
+                    self._cond.wait(timeout)
+            except BaseException:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                raise
+            finally:
+                # The next ticket may now be at the head of the queue
+                self._cond.notify_all()
+
+        waited = time.monotonic() - started
+        QUEUE_WAIT.observe(waited, limiter=self.name, lane=lane)
+        IN_FLIGHT.set(self._in_flight, limiter=self.name)
+        return waited
+
+    def release(self, latency: float, outcome: str = "ok", tokens_reserved: int = 0,
+                tokens_used: Optional[int] = None) -> None:
+        """
+        Free a slot and adapt the concurrency limit.
+
+        Args:
+            latency: Seconds the call took.
+            outcome: "ok", "rate_limited", "error" (overload: timeout, server error)
+                or "failed" (not an overload signal, the limit is left alone).
+            tokens_reserved: Tokens estimated at acquire().
+            tokens_used: Actual tokens, if known (corrects the token bucket).
+        """
+        with self._cond:
+            self._in_flight -= 1
+            if self.tokens and tokens_used is not None:
+                self.tokens.adjust(tokens_used - tokens_reserved)
+            now = time.monotonic()
+            if outcome == "rate_limited":
+                self._decrease(0.5, now)
+            elif outcome == "error" or (self.latency_target and latency > self.latency_target):
+                self._decrease(0.9, now)
+            elif outcome == "ok":
+                self._limit = min(float(self.max_concurrency), self._limit + 1.0 / self._limit)
+            self._cond.notify_all()
+        CONCURRENCY_LIMIT.set(self.limit, limiter=self.name)
+        IN_FLIGHT.set(self._in_flight, limiter=self.name)
+
+    def _decrease(self, factor: float, now: float) -> None:
+        if now - self._last_decrease >= self.decrease_cooldown:
+            self._limit = max(float(self.min_concurrency), self._limit * factor)
+            self._last_decrease = now
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every call of this limiter for `seconds`."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    def call(self, fn: Callable[[], T], tokens: int = 0, priority: int = 0, lane: str = "default",
+             usage: Optional[Callable[[T], Optional[int]]] = None) -> T:
+        """
+        Run `fn` under the limiter, retrying rate-limited and transient failures.
+
+        Args:
+            fn: The model call.
+            tokens: Estimated tokens of the call (for the TPM budget).
+            priority: Lane priority, lower goes first.
+            lane: Label of the queue-wait metric.
+            usage: Extracts the actual token count from the result, if available.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire(tokens, priority, lane)
+            started = time.monotonic()
+            try:
+                result = fn()
+            except Exception as e:
+                latency = time.monotonic() - started
+                if is_rate_limit_error(e):
+                    self.release(latency, "rate_limited", tokens)
+                    RATE_LIMITED.inc(limiter=self.name, lane=lane)
+                elif is_transient_error(e):
+                    self.release(latency, "error", tokens)
+                else:
+                    self.release(latency, "failed", tokens)
+                    raise
+                if attempt == self.max_retries:
+                    raise
+
+                delay = retry_after(e)
+                if delay is None:
+                    delay = min(MAX_BACKOFF, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+                if is_rate_limit_error(e):
+                    self.pause(delay)  # Everyone waits, not just this call
+                else:
+                    time.sleep(delay)
+                RETRIES.inc(limiter=self.name, lane=lane)
+                logger.warning(
+                    f"{self.name} call in lane {lane} failed ({type(e).__name__}), retry {attempt + 1}/"
+                    f"{self.max_retries} in {delay:.2f}s (concurrency limit {self.limit})"
+                )
+                continue
+
+            self.release(time.monotonic() - started, "ok", tokens, usage(result) if usage else None)
+            return result
+        raise AssertionError("unreachable")
+
+
+def estimate_tokens(value: Any) -> int:
+    """Rough token count of a prompt (about four characters per token)."""
+    text = value.to_string() if hasattr(value, "to_string") else str(value)
+    return len(text) // 4 + 1
+
+
+def _build_llm_limiter() -> Optional[AdaptiveLimiter]:
+    if not settings.RATE_LIMIT_ENABLED:
+        return None
+    return AdaptiveLimiter(
+        "llm",
+        rpm=settings.LLM_RPM,
+        tpm=settings.LLM_TPM,
+        max_concurrency=settings.RATE_LIMIT_MAX_IN_FLIGHT,
+        min_concurrency=settings.RATE_LIMIT_MIN_IN_FLIGHT,
+        latency_target=settings.RATE_LIMIT_LATENCY_TARGET,
+        max_retries=settings.RATE_LIMIT_MAX_RETRIES,
+    )
+
+
+def _build_embedding_limiter() -> Optional[AdaptiveLimiter]:
+    if not settings.RATE_LIMIT_ENABLED:
+        return None
+    return AdaptiveLimiter(
+        "embeddings",
+        rpm=settings.EMBEDDING_RPM,
+        tpm=settings.EMBEDDING_TPM,
+        max_concurrency=settings.RATE_LIMIT_MAX_IN_FLIGHT,
+        min_concurrency=settings.RATE_LIMIT_MIN_IN_FLIGHT,
+        max_retries=settings.RATE_LIMIT_MAX_RETRIES,
+    )
+
+
+# One limiter per provider quota and process (None when RATE_LIMIT_ENABLED=false)
+get_llm_limiter = Lazy("llm_limiter", _build_llm_limiter)
+get_embedding_limiter = Lazy("embedding_limiter", _build_embedding_limiter)
+
+
+class RateLimitedEmbeddings(Embeddings):
+    """Embeddings routed through a limiter.
+
+    Query embeddings (on the request path) get priority over document
+    embeddings (ingestion). Other attributes are those of the wrapped model.
+    """
+
+    QUERY_PRIORITY = 1
+    DOCUMENTS_PRIORITY = 3
+
+    def __init__(self, embeddings: Embeddings, limiter: AdaptiveLimiter):
+        self.embeddings = embeddings
+        self.limiter = limiter
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.limiter.call(
+            lambda: self.embeddings.embed_documents(texts),
+            tokens=sum(len(text) for text in texts) // 4 + 1,
+            priority=self.DOCUMENTS_PRIORITY,
+            lane="embed_documents",
+        )
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.limiter.call(
+            lambda: self.embeddings.embed_query(text),
+            tokens=len(text) // 4 + 1,
+            priority=self.QUERY_PRIORITY,
+            lane="embed_query",
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ("embeddings", "limiter"):  # Not set yet (e.g. during unpickling)
+            raise AttributeError(name)
+        return getattr(self.embeddings, name)
@@ -0,0 +1,278 @@
+"""Persistent exact-match response cache for the structured-output chains.
+
+With LLM_TEMPERATURE = 0 the router and the graders are deterministic
+functions of their prompt, so a result can be reused whenever the same model
+sees the same prompt template with the same inputs. Results are stored in a
+SQLite file (WAL mode, busy timeout) that every worker process can share.
+Once the stored results exceed LLM_CACHE_MAX_MB the least recently used
+entries are evicted.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Type
+
+from langchain_core.documents import Document
+from langchain_core.load import dumpd
+from langchain_core.prompts import BasePromptTemplate
+from langchain_core.runnables import Runnable, RunnableConfig
+from langchain_core.runnables.config import patch_config
+from pydantic import BaseModel, ValidationError
+
+from src.config import logger_core as logger
+from src.config.settings import settings
+from src.core.lazy import Lazy
+from src.observability.instrumentation import record_cache_hit, request_from_config
+from src.observability.metrics import registry
+
+CACHE_LOOKUPS = registry.counter("rag_llm_cache_lookups_total", "Response cache lookups by chain and result")
+CACHE_EVICTIONS = registry.counter("rag_llm_cache_evictions_total", "Response cache entries evicted")
+
+# Last-access times are only rewritten when older than this (seconds), so hits
+# rarely need the write lock
+ACCESS_RESOLUTION = 60.0
+
+# The size cap is checked every N writes per process
+EVICT_CHECK_EVERY = 50
+
+# Eviction frees space down to this fraction of the cap
+EVICT_TARGET = 0.9
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS responses (
+        key TEXT PRIMARY KEY,
+        chain TEXT NOT NULL,
+        value TEXT NOT NULL,
+        size INTEGER NOT NULL,
+        created REAL NOT NULL,
+        accessed REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)",
+)
+
+
+class ResponseCache:
+    """
+    Key-value store of serialized chain results in a SQLite file.
+
+    Safe to use from several threads (one connection per thread) and from
+    several processes (SQLite locking; writers wait up to `busy_timeout`).
+    Database errors are logged and treated as misses, so a broken cache file
+    never fails a request.
+    """
+
+    def __init__(self, path: str, max_bytes: int, busy_timeout: float = 10.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+        conn = self._connection()
+        for statement in _SCHEMA:
+            conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection (reopened after a fork)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Stored value for a key, or None."""
+        try:
+            conn = self._connection()
+            row = conn.execute("SELECT value, accessed FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[1] > ACCESS_RESOLUTION:
+                conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+            return row[0]
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache read failed: {e}")
+            return None
+
+    def put(self, key: str, chain: str, value: str) -> None:
+        """Store a value, evicting old entries when the size cap is exceeded."""
+        now = time.time()
+        try:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO responses (key, chain, value, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, chain, value, len(key) + len(value.encode("utf-8")), now, now),
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache write failed: {e}")
+            return
+
+        with self._lock:
+            self._writes += 1
+            check = self._writes % EVICT_CHECK_EVERY == 0
+        if check:
+            self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache is below the cap. Returns the count."""
+        conn = self._connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+                keys = []
+                if total > self.max_bytes:
+                    excess = total - self.max_bytes * EVICT_TARGET
+                    for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+                        if excess <= 0:
+                            break
+                        keys.append((key,))
+                        excess -= size
+                    conn.executemany("DELETE FROM responses WHERE key = ?", keys)
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            logger.warning(f"Response cache eviction failed: {e}")
+            return 0
+
+        if keys:
+            CACHE_EVICTIONS.inc(len(keys))
+            logger.info(f"Response cache evicted {len(keys)} entries ({total / 1e6:.1f} MB stored)")
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        """Entries and stored bytes, overall and per chain."""
+        rows = self._connection().execute(
+            "SELECT chain, COUNT(*), COALESCE(SUM(size), 0) FROM responses GROUP BY chain"
+        ).fetchall()
+        chains = {chain: {"entries": entries, "bytes": size} for chain, entries, size in rows}
+        return {
+            "entries": sum(stats["entries"] for stats in chains.values()),
+            "bytes": sum(stats["bytes"] for stats in chains.values()),
+            "max_bytes": self.max_bytes,
+            "chains": chains,
+        }
+
+    def clear(self) -> None:
+        """Delete every entry."""
+        self._connection().execute("DELETE FROM responses")
+
+
+def _build_response_cache() -> Optional[ResponseCache]:
+    """Open the response cache (None when disabled)."""
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    return ResponseCache(settings.LLM_CACHE_PATH, int(settings.LLM_CACHE_MAX_MB * 1024 * 1024))
+
+
+get_response_cache = Lazy("response_cache", _build_response_cache)
+
+
+def template_hash(prompt: BasePromptTemplate) -> str:
+    """Hash of a prompt template's definition (changes whenever the prompt text does)."""
+    payload = json.dumps(dumpd(prompt), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _canonical(value: Any) -> Any:
+    """JSON form of non-JSON inputs with a stable key order (Chroma returns metadata in any order)."""
+    if isinstance(value, Document):
+        return {"page_content": value.page_content, "metadata": value.metadata}
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    return str(value)
+
+
+def cache_key(chain: str, model: str, prompt_hash: str, inputs: Dict[str, Any]) -> str:
+    """Cache key of one chain call: model, prompt template hash and inputs."""
+    payload = json.dumps([chain, model, prompt_hash, inputs], sort_keys=True, default=_canonical, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _CachedChain(Runnable):
+    """Prompt | structured LLM chain that reuses cached results.
+
+    A hit skips the model call; the chain run is still recorded (under the
+    chain's run name) so timings and traces show the fast path. Results for
+    which `store_if` returns False are returned but not stored.
+    """
+
+    def __init__(
+        self,
+        prompt: BasePromptTemplate,
+        llm: Runnable,
+        schema: Type[BaseModel],
+        chain: str,
+        model: str,
+        store_if: Optional[Callable[[BaseModel], bool]] = None,
+    ):
+        self.bound = prompt | llm
+        self.schema = schema
+        self.chain = chain
+        self.model = model
+        self.store_if = store_if
+        self.prompt_hash = template_hash(prompt)
+
+    def invoke(self, input: Dict[str, Any], config: Optional[RunnableConfig] = None, **kwargs: Any) -> BaseModel:
+        return self._call_with_config(self._invoke, input, config, **kwargs)
+
+    def _invoke(self, input: Dict[str, Any], run_manager, config: RunnableConfig) -> BaseModel:
+        cache = get_response_cache()
+        key = cache_key(self.chain, self.model, self.prompt_hash, input)
+
+        value = cache.get(key)
+        if value is not None:
+            try:
+                result = self.schema.model_validate_json(value)
+            except ValidationError:
+                pass  # Schema changed since the entry was written; overwrite it below
+            else:
+                CACHE_LOOKUPS.inc(chain=self.chain, result="hit")
+                record_cache_hit(self.chain, request=request_from_config(config))
+                return result
+
+        CACHE_LOOKUPS.inc(chain=self.chain, result="miss")
+        result = self.bound.invoke(input, patch_config(config, callbacks=run_manager.get_child()))
+        if self.store_if is None or self.store_if(result):
+            cache.put(key, self.chain, result.model_dump_json())
+        return result
+
+
+def cached_structured_chain(
+    prompt: BasePromptTemplate,
+    llm: Runnable,
+    schema: Type[BaseModel],
+    chain: str,
+    role: str,
+    store_if: Optional[Callable[[BaseModel], bool]] = None,
+) -> Runnable:
+    """
+    Build `prompt | llm`, backed by the response cache if it is enabled for this chain.
+
+    Args:
+        prompt: Prompt template of the chain.
+        llm: Model with structured output producing `schema`.
+        schema: Pydantic model returned by the chain.
+        chain: Chain name (as passed to name_chain), matched against LLM_CACHE_CHAINS.
+        role: Model role of the chain; its model is part of the cache key.
+        store_if: Only results for which this returns True are stored (default: all).
+    """
+    enabled = {name.strip() for name in settings.LLM_CACHE_CHAINS.split(",")}
+    if not settings.LLM_CACHE_ENABLED or chain not in enabled:
+        return prompt | llm
+    model = f"{settings.LLM_PROVIDER}:{settings.LLM_ROLES[role].model}"
+    return _CachedChain(prompt, llm, schema, chain, model, store_if)
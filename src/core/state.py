@@ -1,7 +1,6 @@
-import operator
-from typing import Annotated, Any, Dict, List, TypedDict
+from typing import Any, Dict, List, TypedDict
 
-from langchain_core.documents import Document
+from src.core.document_store import StateDocument
 
 
 class GraphState(TypedDict):
@@ -12,13 +11,27 @@ class GraphState(TypedDict):
         question: The user's question
         generation: The LLM's generated response
         web_search: Flag indicating whether to perform web search
-        documents: List of retrieved/relevant documents
+        documents: Retrieved/relevant documents (Documents, or DocumentRefs with
+            STATE_DOCUMENT_REFS=true; read them with resolve_documents()).
+            Each update replaces the list.
         retrieval_config: Configuration for document retrieval (search type, k, etc.)
+        retrieval_k: Number of documents the retriever passed on (chosen per question by "adaptive")
+        web_documents: Web search results fetched in parallel with retrieval (low-confidence
+            routes), used instead of searching again if web search is needed
+        web_search_seconds: How long that parallel web search took
+        retrieval_seconds: How long retrieval and grading took next to it
+        relevance: Share of the retrieved documents graded relevant (lets the "fast"
+            graph variant skip grading the generation)
     """
 
     question: str
     generation: str
     web_search: bool
-    documents: Annotated[List[Document], operator.add]
+    documents: List[StateDocument]
     retrieval_config: Dict[str, Any]
+    retrieval_k: int
+    web_documents: List[StateDocument]
+    web_search_seconds: float
+    retrieval_seconds: float
+    relevance: float
 
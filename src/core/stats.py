@@ -0,0 +1,36 @@
+"""Small statistics helpers for latency reporting."""
+
+from typing import Dict, Iterable
+
+
+def percentile(values: Iterable[float], pct: float) -> float:
+    """
+    Nearest-rank percentile.
+
+    Args:
+        values: Sample values.
+        pct: Percentile between 0 and 100.
+
+    Returns:
+        The percentile value, or 0.0 for an empty sample.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, min(len(ordered), int(-(-pct * len(ordered) // 100))))
+    return ordered[rank - 1]
+
+
+def latency_summary(values: Iterable[float]) -> Dict[str, float]:
+    """Summarize latencies as count, mean, p50, p95, p99 and max."""
+    values = list(values)
+    if not values:
+        return {"count": 0, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
@@ -0,0 +1,55 @@
+"""Centralized external tool instances."""
+
+import threading
+from functools import partial
+from typing import Dict
+
+from langchain_core.tools import BaseTool
+
+from src.config.settings import settings
+from src.core.lazy import Lazy
+
+# Distinct max_results values (from retrieval configs) kept as separate tools
+MAX_WEB_SEARCH_TOOLS = 8
+
+
+def _build_web_search_tool(max_results: int) -> BaseTool:
+    if settings.LLM_PROVIDER == "fake":
+        from src.core.fakes import FakeWebSearch
+
+        return FakeWebSearch(
+            max_results=max_results, latency=settings.FAKE_SEARCH_LATENCY, latency_jitter=settings.FAKE_LATENCY_JITTER
+        )
+
+    from langchain_tavily import TavilySearch
+
+    from src.core.http import tavily_api_wrapper
+
+    # Posts through the shared connection pool instead of a new connection per search
+    return TavilySearch(
+        max_results=max_results,
+        api_wrapper=tavily_api_wrapper(settings.TAVILY_API_KEY),
+    )
+
+
+# One tool per max_results value; the default one is known up front so warm-up builds it
+_web_search_tools: Dict[int, Lazy[BaseTool]] = {
+    settings.TAVILY_MAX_RESULTS: Lazy("web_search_tool", partial(_build_web_search_tool, settings.TAVILY_MAX_RESULTS)),
+}
+_web_search_tools_lock = threading.Lock()
+
+
+def get_web_search_tool(max_results: int = settings.TAVILY_MAX_RESULTS) -> BaseTool:
+    """Get the web search tool for a given number of results (cached per value)."""
+    tool = _web_search_tools.get(max_results)
+    if tool is None:
+        with _web_search_tools_lock:
+            tool = _web_search_tools.get(max_results)
+            if tool is None:
+                if len(_web_search_tools) >= MAX_WEB_SEARCH_TOOLS:
+                    # Unusual values beyond the cap get a throwaway tool instead of growing the cache
+                    return _build_web_search_tool(max_results)
+                tool = _web_search_tools[max_results] = Lazy(
+                    f"web_search_tool.{max_results}", partial(_build_web_search_tool, max_results)
+                )
+    return tool()
@@ -1,13 +1,25 @@
 """Gradio frontend for the LangGraph Agentic RAG application."""
 
+import json
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
 import gradio as gr
 
 from src.config import setup_logger, logger_frontend
-from src.graph import rag_app
+from src.core.document_store import resolve_documents
+from src.graph import get_graph_variant, select_variant
+from src.observability import track_request
 
 # Configure logging at module level
 setup_logger(name="agentic_rag", level=20)  # 20 = INFO level
 
+# Characters of document content shown in the documents panel before truncation
+DOC_PREVIEW_CHARS = 1500
+
+NO_DOCUMENTS_HTML = "<p>No documents retrieved</p>"
+
 # Custom CSS for document display (passed to launch() in Gradio 6.0+)
 CUSTOM_CSS = """
 .documents-container details.doc-detail {
@@ -53,37 +65,173 @@ CUSTOM_CSS = """
 """
 
 
-def format_documents_html(documents):
-    """Format documents as HTML with expandable accordions."""
-    if not documents:
-        return "<p>No documents retrieved</p>"
+def escape_html(text: str) -> str:
+    """Escape HTML special characters for display inside the documents panel."""
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def render_document_html(index: int, doc: Dict[str, Any]) -> str:
+    """
+    Render the HTML fragment for a single document.
     
-    html = f"<p><strong>Total documents retrieved: {len(documents)}</strong></p>\n"
+    Long content is truncated to DOC_PREVIEW_CHARS; the full text is only sent
+    to the browser when the document is opened in the full document viewer.
     
-    for i, doc in enumerate(documents, 1):
-        source = doc.get("source", "unknown")
-        title = doc.get("title", "N/A")
-        content = doc.get("content", "")
-        
-        # Escape HTML special characters in content
-        content_escaped = content.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
-        
-        # Format source for display (shorten if URL)
-        source_display = source if len(source) <= 60 else source[:57] + "..."
+    Args:
+        index: 1-based position of the document in the panel
+        doc: Document data dict with source, title and content
         
-        html += f"""
+    Returns:
+        HTML fragment for the document accordion
+    """
+    source = doc.get("source", "unknown")
+    title = doc.get("title", "N/A")
+    content = doc.get("content", "")
+    
+    preview = content[:DOC_PREVIEW_CHARS]
+    remaining = len(content) - len(preview)
+    more_note = ""
+    if remaining > 0:
+        more_note = (
+            f"\n    <p><em>… {remaining} more characters. "
+            f"Open Document {index} in the full document viewer to read everything.</em></p>"
+        )
+    
+    # Format source for display (shorten if URL)
+    source_display = source if len(source) <= 60 else source[:57] + "..."
+    
+    return f"""
 <details class="doc-detail">
-    <summary class="doc-summary">📄 Document {i}: {source_display}</summary>
+    <summary class="doc-summary">📄 Document {index}: {source_display}</summary>
     <div class="doc-body">
         <p><strong>Title:</strong> {title[:80]}...</p>
         <p><strong>Source:</strong> {source}</p>
         <p><strong>Content:</strong></p>
-        <pre class="doc-pre">{content_escaped}</pre>
+        <pre class="doc-pre">{escape_html(preview)}</pre>{more_note}
     </div>
 </details>
 """
+
+
+def format_documents_html(documents):
+    """Format documents as HTML with expandable accordions.
     
-    return html
+    Fragments already rendered for a document (cached under its "html" key)
+    are reused instead of being escaped and rebuilt on every update.
+    """
+    if not documents:
+        return NO_DOCUMENTS_HTML
+    
+    fragments = []
+    for i, doc in enumerate(documents, 1):
+        if "html" not in doc:
+            doc["html"] = render_document_html(i, doc)
+        fragments.append(doc["html"])
+    
+    header = f"<p><strong>Total documents retrieved: {len(documents)}</strong></p>\n"
+    return header + "".join(fragments)
+
+
+def document_choices(documents: List[Dict[str, Any]]) -> List[str]:
+    """Build the full document viewer dropdown labels."""
+    return [f"Document {i}: {doc.get('source', 'unknown')[:60]}" for i, doc in enumerate(documents, 1)]
+
+
+def show_full_document(choice: str | None, documents: List[Dict[str, Any]]) -> str:
+    """
+    Return the full content of the document selected in the viewer.
+    
+    Args:
+        choice: Selected dropdown label ("Document N: source")
+        documents: Documents of the last request (held in session state)
+        
+    Returns:
+        Full document content, or an empty string if nothing is selected
+    """
+    if not choice or not documents:
+        return ""
+    try:
+        index = int(choice.split(":", 1)[0].removeprefix("Document ").strip())
+    except ValueError:
+        return ""
+    if not 1 <= index <= len(documents):
+        return ""
+    return documents[index - 1].get("content", "")
+
+
+def _payload_size(value: Any) -> int:
+    """Approximate the number of bytes Gradio sends for an output value."""
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+@dataclass
+class RenderStats:
+    """Per-request rendering statistics for the streaming frontend."""
+
+    updates: int = 0
+    skipped: int = 0
+    payload_bytes: int = 0
+    render_seconds: float = 0.0
+
+
+class _IncrementalRenderer:
+    """Tracks what the browser already shows and only emits changed outputs.
+    
+    Unchanged components are sent as gr.skip() so a node update that only
+    touches the status panel does not resend the chat history or the
+    documents panel. Updates where nothing visible changed are dropped.
+    A final render always sends every output, so the browser ends up with
+    the complete state of the request.
+    """
+    
+    def __init__(self):
+        self.stats = RenderStats()
+        self._last_chat = None
+        self._last_status = None
+        self._docs_rendered = -1
+        self._docs_html = NO_DOCUMENTS_HTML
+    
+    def render(self, chat_history, status_text, documents, final: bool = False):
+        """Return the output tuple for this update, or None if nothing changed."""
+        started = time.perf_counter()
+        
+        chat_key = [dict(message) for message in chat_history]
+        chat_out = chat_key if final or chat_key != self._last_chat else gr.skip()
+        status_out = status_text if final or status_text != self._last_status else gr.skip()
+        
+        if len(documents) != self._docs_rendered:
+            self._docs_html = format_documents_html(documents)
+            self._docs_rendered = len(documents)
+            docs_out = self._docs_html
+            selector_out = gr.update(choices=document_choices(documents), value=None)
+            state_out = list(documents)
+        elif final:
+            # Same documents: keep the viewer's selection
+            docs_out = self._docs_html
+            selector_out = gr.update(choices=document_choices(documents))
+            state_out = list(documents)
+        else:
+            docs_out = selector_out = state_out = gr.skip()
+        
+        self.stats.render_seconds += time.perf_counter() - started
+        
+        changed = [out for out in (chat_out, status_out, docs_out) if not _is_skip(out)]
+        if not changed:
+            self.stats.skipped += 1
+            return None
+        
+        self._last_chat = chat_key
+        self._last_status = status_text
+        self.stats.updates += 1
+        self.stats.payload_bytes += sum(_payload_size(out) for out in changed)
+        return chat_out, status_out, docs_out, selector_out, state_out
+
+
+def _is_skip(value: Any) -> bool:
+    """Check whether an output value is a gr.skip() placeholder."""
+    return isinstance(value, dict) and value == {"__type__": "update"}
 
 
 def stream_response(question: str, search_type: str, k_documents: float, 
@@ -101,22 +249,26 @@ def stream_response(question: str, search_type: str, k_documents: float,
         relevance_threshold: Minimum relevance score threshold
         
     Yields:
-        Tuple of (chat_history, status_text, documents_html)
+        Tuple of (chat_history, status_text, documents_html, document_selector, documents_state).
+        Outputs that did not change since the previous update are gr.skip().
     """
     chat_history = []
     status_updates = []
     all_documents = []
     seen_document_hashes = set()
+    renderer = _IncrementalRenderer()
     
     # Add retrieval configuration to status
     config_msg = f"⚙️ Retrieval: {search_type.upper()} | k={k_documents}"
+    if search_type == "adaptive":
+        config_msg = f"⚙️ Retrieval: ADAPTIVE | k≤{k_documents}"
     if search_type == "mmr":
         config_msg += f" | fetch_k={fetch_k} | λ={lambda_diversity:.1f}"
     status_updates.append(config_msg)
     
     # Add user message
     chat_history.append({"role": "user", "content": question})
-    yield chat_history, "\n".join(status_updates), "<p>No documents retrieved</p>"
+    yield renderer.render(chat_history, "\n".join(status_updates), all_documents, final=True)
     
     logger_frontend.info(f"User question received: {question}")
     logger_frontend.info(f"Retrieval config: type={search_type}, k={k_documents}, fetch_k={fetch_k}, lambda={lambda_diversity}")
@@ -146,75 +298,87 @@ def stream_response(question: str, search_type: str, k_documents: float,
     
     # Stream through the graph
     full_response = ""
-    for chunk in rag_app.stream(input={"question": question, "retrieval_config": retrieval_config}):
-        for node, update in chunk.items():
-            status_msg = f"▶ Processing node: {node}"
-            status_updates.append(status_msg)
-            logger_frontend.info(f"Processing node: {node}")
+    with track_request() as (request_metrics, run_config):
+        app = get_graph_variant(select_variant(retrieval_config))
+        for chunk in app.stream(input={"question": question, "retrieval_config": retrieval_config},
+                                config=run_config):
+            for node, update in chunk.items():
+                status_msg = f"▶ Processing node: {node}"
+                status_updates.append(status_msg)
+                logger_frontend.info(f"Processing node: {node}")
             
-            # Handle documents
-            if "documents" in update:
-                docs = update["documents"]
-                if docs:
-                    logger_frontend.info(f"Retrieved {len(docs)} documents from {node}")
-                    # Store detailed document information with deduplication
-                    for i, doc in enumerate(docs, 1):
-                        source = doc.metadata.get("source", "unknown")
-                        title = doc.metadata.get("title", "N/A")
-                        content = doc.page_content
+                # Handle documents
+                if "documents" in update:
+                    docs = resolve_documents(update["documents"])
+                    if docs:
+                        logger_frontend.info(f"Retrieved {len(docs)} documents from {node}")
+                        # Store detailed document information with deduplication
+                        for i, doc in enumerate(docs, 1):
+                            source = doc.metadata.get("source", "unknown")
+                            title = doc.metadata.get("title", "N/A")
+                            content = doc.page_content
                         
-                        # Create hash for deduplication (based on content + source)
-                        doc_hash = hash((content[:200], source))
+                            # Create hash for deduplication (based on content + source)
+                            doc_hash = hash((content[:200], source))
                         
-                        if doc_hash not in seen_document_hashes:
-                            seen_document_hashes.add(doc_hash)
+                            if doc_hash not in seen_document_hashes:
+                                seen_document_hashes.add(doc_hash)
                             
-                            doc_data = {
-                                "id": f"doc_{len(all_documents) + 1}",
-                                "source": source,
-                                "title": title,
-                                "content": content,
-                                "metadata": doc.metadata
-                            }
-                            all_documents.append(doc_data)
-                            logger_frontend.debug(f"Added document {len(all_documents)}: {source}")
+                                doc_data = {
+                                    "id": f"doc_{len(all_documents) + 1}",
+                                    "source": source,
+                                    "title": title,
+                                    "content": content,
+                                    "metadata": doc.metadata
+                                }
+                                all_documents.append(doc_data)
+                                logger_frontend.debug(f"Added document {len(all_documents)}: {source}")
             
-            # Handle web search flag
-            if "web_search" in update:
-                if update["web_search"]:
-                    status_msg = "🔍 Web search enabled"
-                    status_updates.append(status_msg)
-                    logger_frontend.info("Web search enabled")
-                else:
-                    status_msg = "📚 Using vector store only"
-                    status_updates.append(status_msg)
-                    logger_frontend.info("Using vector store only")
+                # Adaptive retrieval reports how many documents it kept
+                if "retrieval_k" in update and search_type == "adaptive":
+                    status_updates.append(f"✓ Adaptive k: {update['retrieval_k']} documents")
             
-            # Handle generation
-            if "generation" in update:
-                full_response = update["generation"]
-                # Update chat history with assistant response
-                if chat_history and chat_history[-1].get("role") == "assistant":
-                    chat_history[-1]["content"] = full_response
-                else:
-                    chat_history.append({"role": "assistant", "content": full_response})
-                logger_frontend.info("Response generated successfully")
+                # Handle web search flag
+                if "web_search" in update:
+                    if update["web_search"]:
+                        status_msg = "🔍 Web search enabled"
+                        status_updates.append(status_msg)
+                        logger_frontend.info("Web search enabled")
+                    else:
+                        status_msg = "📚 Using vector store only"
+                        status_updates.append(status_msg)
+                        logger_frontend.info("Using vector store only")
             
-            # Yield current state
-            status_text = "\n".join(status_updates[-10:])
-            docs_html = format_documents_html(all_documents)
-            yield chat_history, status_text, docs_html
+                # Handle generation
+                if "generation" in update:
+                    full_response = update["generation"]
+                    # Update chat history with assistant response
+                    if chat_history and chat_history[-1].get("role") == "assistant":
+                        chat_history[-1]["content"] = full_response
+                    else:
+                        chat_history.append({"role": "assistant", "content": full_response})
+                    logger_frontend.info("Response generated successfully")
+            
+                # Yield current state (skipped when nothing visible changed)
+                outputs = renderer.render(chat_history, "\n".join(status_updates[-10:]), all_documents)
+                if outputs is not None:
+                    yield outputs
     
-    logger_frontend.info("RAG processing pipeline complete")
+    summary = request_metrics.summary()
+    logger_frontend.info(
+        f"RAG processing pipeline complete in {summary['total_ms']:.0f} ms "
+        f"({summary['llm']['llm_calls']} LLM calls, {summary['llm']['prompt_tokens']} prompt / "
+        f"{summary['llm']['completion_tokens']} completion tokens)"
+    )
     # Final yield with complete status
     status_text = "\n".join(status_updates) if status_updates else "✅ Complete"
-    docs_html = format_documents_html(all_documents)
-    yield chat_history, status_text, docs_html
+    yield renderer.render(chat_history, status_text, all_documents, final=True)
     
-    # Final yield with complete status
-    status_text = "\n".join(status_updates) if status_updates else "✅ Complete"
-    docs_html = format_documents_html(all_documents)
-    yield chat_history, status_text, docs_html
+    stats = renderer.stats
+    logger_frontend.info(
+        f"Render stats: {stats.updates} updates ({stats.skipped} skipped), "
+        f"{stats.payload_bytes} payload bytes, {stats.render_seconds * 1000:.1f} ms rendering"
+    )
 
 
 def create_interface() -> gr.Blocks:
@@ -228,10 +392,10 @@ def create_interface() -> gr.Blocks:
             
             # Search type selection
             search_type = gr.Dropdown(
-                choices=["mmr", "similarity"],
+                choices=["mmr", "similarity", "adaptive"],
                 value="mmr",
                 label="Search Method",
-                info="MMR: Diverse results | Similarity: Top matches only"
+                info="MMR: Diverse results | Similarity: Top matches only | Adaptive: up to k, cut where relevance drops"
             )
             
             # Number of documents to retrieve
@@ -349,24 +513,47 @@ def create_interface() -> gr.Blocks:
                     value="No documents retrieved",
                     elem_classes=["documents-container"]
                 )
-                gr.Markdown("*Click on any document to expand and see full content*")
+                gr.Markdown("*Click on any document to expand and see a preview of its content*")
+                
+                # Full document viewer: full text is only sent when a document is selected
+                documents_state = gr.State([])
+                with gr.Accordion("Full Document Viewer", open=False):
+                    document_selector = gr.Dropdown(
+                        choices=[],
+                        label="Document",
+                        info="Select a document to load its full content"
+                    )
+                    full_document = gr.Textbox(
+                        label="Full Content",
+                        lines=12,
+                        max_lines=30,
+                        interactive=False
+                    )
         
         # Event handlers
+        stream_outputs = [chatbot, status_text, documents_html, document_selector, documents_state]
+        
         submit_btn.click(
             fn=stream_response,
             inputs=[question_input, search_type, k_documents, fetch_k, lambda_diversity, relevance_threshold, max_web_results],
-            outputs=[chatbot, status_text, documents_html]
+            outputs=stream_outputs
         )
         
         question_input.submit(
             fn=stream_response,
             inputs=[question_input, search_type, k_documents, fetch_k, lambda_diversity, relevance_threshold, max_web_results],
-            outputs=[chatbot, status_text, documents_html]
+            outputs=stream_outputs
+        )
+        
+        document_selector.change(
+            fn=show_full_document,
+            inputs=[document_selector, documents_state],
+            outputs=full_document
         )
         
         clear_btn.click(
-            fn=lambda: ([], "", "No documents retrieved"),
-            outputs=[chatbot, status_text, documents_html]
+            fn=lambda: ([], "", "No documents retrieved", gr.update(choices=[], value=None), [], ""),
+            outputs=[*stream_outputs, full_document]
         )
     
     return app
@@ -1,4 +1,22 @@
-from src.graph.builder import build_graph, rag_app
+from src.graph.builder import build_graph, get_graph_variant, get_rag_app, select_variant
+from src.graph.runner import run_question, stream_question
+from src.graph.warmup import warm_up
 
-__all__ = ["build_graph", "rag_app"]
 
+def __getattr__(name: str):
+    # The compiled graph is built on first access
+    if name == "rag_app":
+        return get_rag_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "build_graph",
+    "get_graph_variant",
+    "get_rag_app",
+    "rag_app",
+    "run_question",
+    "select_variant",
+    "stream_question",
+    "warm_up",
+]
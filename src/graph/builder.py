@@ -1,46 +1,99 @@
 """Graph builder - constructs the RAG workflow graph."""
 
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from langchain_core.runnables import RunnableConfig
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, START, StateGraph
 
 from src.config.settings import settings
-from src.core import logger
+from src.config import logger_graph as logger
+from src.core.lazy import Lazy
 from src.core.state import GraphState
+from src.graph.checkpoint import get_checkpointer
 from src.graph.constants import (
     GENERATE,
     GRADE_DOCUMENTS,
+    PREFETCH_WEB_SEARCH,
     RETRIEVE,
+    RETRIEVE_AND_GRADE,
     WEB_SEARCH,
     DECISION_USEFUL,
     DECISION_NOT_USEFUL,
     DECISION_NOT_SUPPORTED,
     DECISION_WEBSEARCH,
     DECISION_VECTORSTORE,
+    DECISION_FANOUT,
+    DECISION_PREFETCH,
+    GRAPH_VARIANTS,
+    VARIANT_FULL,
 )
-from src.graph.edges import decide_to_generate, grade_generation, route_question
-from src.nodes import generate_node, grade_documents_node, retrieve_node, web_search_node
+from src.graph.edges import GENERATION_GRADERS, decide_to_generate, route_question
+from src.nodes import generate_node, grade_documents_node, prefetch_web_search_node, retrieve_node, web_search_node
+from src.observability import instrument_edge, instrument_node
+
+
+def _retrieve_and_grade(retrieve: Callable, grade: Callable) -> Callable:
+    """
+    Retrieval followed by grading as one node, the vectorstore branch of a router fan-out.
+
+    LangGraph runs parallel branches step by step, so grading as a node of its
+    own would wait for the web search branch. As one node it overlaps with the
+    search, which takes the search off the critical path when its results are
+    needed. Both steps are still timed under their own names.
+    """
+
+    def retrieve_and_grade(state: GraphState, config: RunnableConfig) -> Dict[str, Any]:
+        started = time.perf_counter()
+        retrieved = retrieve(state, config)
+        graded = grade({**state, **retrieved}, config)
+        return {**retrieved, **graded, "retrieval_seconds": time.perf_counter() - started}
+
+    return retrieve_and_grade
 
 
-def build_graph() -> StateGraph:
+def build_graph(checkpointer: Optional[BaseCheckpointSaver] = None, variant: str = VARIANT_FULL) -> StateGraph:
     """
     Build the RAG workflow graph.
 
+    The variants differ only in how a generation is graded: "full" runs the
+    hallucination and answer graders, "balanced" skips the answer grader when
+    the hallucination grader is confident, and "fast" also skips the
+    hallucination grader when nearly all retrieved documents were relevant.
+
+    Args:
+        checkpointer: Optional checkpoint saver; runs are then checkpointed
+            after every step and can be resumed by thread ID.
+        variant: Graph variant, one of GRAPH_VARIANTS.
+
     Returns:
         Compiled StateGraph ready for execution.
     """
+    if variant not in GRAPH_VARIANTS:
+        raise ValueError(f"Unknown graph variant {variant!r}, expected one of {GRAPH_VARIANTS}")
     graph = StateGraph(GraphState)
 
-    # Add nodes
-    graph.add_node(RETRIEVE, retrieve_node)
-    graph.add_node(GRADE_DOCUMENTS, grade_documents_node)
-    graph.add_node(GENERATE, generate_node)
-    graph.add_node(WEB_SEARCH, web_search_node)
+    # Add nodes (wrapped to record their wall time)
+    graph.add_node(RETRIEVE, instrument_node(RETRIEVE, retrieve_node))
+    graph.add_node(GRADE_DOCUMENTS, instrument_node(GRADE_DOCUMENTS, grade_documents_node))
+    graph.add_node(GENERATE, instrument_node(GENERATE, generate_node))
+    graph.add_node(WEB_SEARCH, instrument_node(WEB_SEARCH, web_search_node))
+    graph.add_node(PREFETCH_WEB_SEARCH, instrument_node(PREFETCH_WEB_SEARCH, prefetch_web_search_node))
+    graph.add_node(RETRIEVE_AND_GRADE, _retrieve_and_grade(
+        instrument_node(RETRIEVE, retrieve_node), instrument_node(GRADE_DOCUMENTS, grade_documents_node)
+    ))
 
-    # Set conditional entry point (router)
+    # Set conditional entry point (router); low-confidence routes fan out to
+    # retrieve-and-grade and a web search in parallel
     graph.set_conditional_entry_point(
-        path=route_question,
+        path=instrument_edge(route_question),
         path_map={
             DECISION_WEBSEARCH: WEB_SEARCH,
             DECISION_VECTORSTORE: RETRIEVE,
+            DECISION_FANOUT: RETRIEVE_AND_GRADE,
+            DECISION_PREFETCH: PREFETCH_WEB_SEARCH,
         },
     )
 
@@ -48,20 +101,22 @@ def build_graph() -> StateGraph:
     graph.add_edge(RETRIEVE, GRADE_DOCUMENTS)
     graph.add_edge(WEB_SEARCH, GENERATE)
 
-    # Conditional edge: grade documents -> generate or web search
-    graph.add_conditional_edges(
-        source=GRADE_DOCUMENTS,
-        path=decide_to_generate,
-        path_map={
-            WEB_SEARCH: WEB_SEARCH,
-            GENERATE: GENERATE,
-        },
-    )
+    # Conditional edge: grade documents -> generate or web search (which uses the
+    # fan-out's web results if there are any; the prefetch branch itself ends there)
+    for source in (GRADE_DOCUMENTS, RETRIEVE_AND_GRADE):
+        graph.add_conditional_edges(
+            source=source,
+            path=instrument_edge(decide_to_generate),
+            path_map={
+                WEB_SEARCH: WEB_SEARCH,
+                GENERATE: GENERATE,
+            },
+        )
 
-    # Conditional edge: generate -> end, retry, or web search
+    # Conditional edge: generate -> end, retry, or web search (graded as the variant says)
     graph.add_conditional_edges(
         source=GENERATE,
-        path=grade_generation,
+        path=instrument_edge(GENERATION_GRADERS[variant]),
         path_map={
             DECISION_USEFUL: END,
             DECISION_NOT_USEFUL: GENERATE,
@@ -69,15 +124,66 @@ def build_graph() -> StateGraph:
         },
     )
 
-    return graph.compile()
+    return graph.compile(checkpointer=checkpointer)
+
+
+# Shared compiled graph ("full" variant), built on first use
+get_rag_app = Lazy("rag_app", build_graph)
 
 
-# Pre-built graph instance
-rag_app = build_graph()
+def _build_checkpointed_graph(variant: str = VARIANT_FULL) -> StateGraph:
+    """The graph checkpointed by request ID, or the shared graph if CHECKPOINT_ENABLED=false."""
+    checkpointer = get_checkpointer()
+    if checkpointer is None:
+        return _APPS[variant]()
+    return build_graph(checkpointer, variant)
+
+
+# Used by the runner, which passes the request ID as the thread ID
+get_checkpointed_rag_app = Lazy("rag_app_checkpointed", _build_checkpointed_graph)
+
+# Compiled graph of each variant, plain and checkpointed
+_APPS: Dict[str, Lazy] = {VARIANT_FULL: get_rag_app}
+_CHECKPOINTED_APPS: Dict[str, Lazy] = {VARIANT_FULL: get_checkpointed_rag_app}
+for _variant in GRAPH_VARIANTS[1:]:
+    _APPS[_variant] = Lazy(f"rag_app_{_variant}", lambda variant=_variant: build_graph(variant=variant))
+    _CHECKPOINTED_APPS[_variant] = Lazy(
+        f"rag_app_checkpointed_{_variant}", lambda variant=_variant: _build_checkpointed_graph(variant)
+    )
+
+
+def select_variant(retrieval_config: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    Graph variant of a request: retrieval_config["variant"], defaulting to GRAPH_VARIANT.
+
+    Raises:
+        ValueError: If the variant is unknown.
+    """
+    variant = (retrieval_config or {}).get("variant") or settings.GRAPH_VARIANT
+    if variant not in GRAPH_VARIANTS:
+        raise ValueError(f"Unknown graph variant {variant!r}, expected one of {GRAPH_VARIANTS}")
+    return variant
+
+
+def get_graph_variant(variant: str = VARIANT_FULL, checkpointed: bool = False) -> StateGraph:
+    """
+    The shared compiled graph of a variant, built on first use.
+
+    Args:
+        variant: Graph variant, one of GRAPH_VARIANTS.
+        checkpointed: The graph checkpointed by request ID (see get_checkpointed_rag_app).
+
+    Returns:
+        Compiled StateGraph of the variant.
+    """
+    apps = _CHECKPOINTED_APPS if checkpointed else _APPS
+    if variant not in apps:
+        raise ValueError(f"Unknown graph variant {variant!r}, expected one of {GRAPH_VARIANTS}")
+    return apps[variant]()
 
 
 def save_graph_visualization(output_path: str | None = None) -> None:
     """Save the graph visualization to a PNG file."""
     path = output_path or settings.GRAPH_OUTPUT_PATH
-    rag_app.get_graph().draw_mermaid_png(output_file_path=path)
+    get_rag_app().get_graph().draw_mermaid_png(output_file_path=path)
     logger.info(f"Graph saved to: {path}")
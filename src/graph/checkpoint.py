@@ -0,0 +1,233 @@
+"""SQLite checkpointing for resumable graph runs.
+
+With CHECKPOINT_ENABLED=true the graph is compiled with this saver and every
+run is checkpointed after each step under its request ID (the LangGraph
+thread ID). If a run fails after retrieval and grading have succeeded,
+running it again with the same request ID resumes from the last completed
+node instead of starting over at the router.
+
+Storage is langgraph-checkpoint-sqlite's SqliteSaver on a local file (WAL
+mode, busy timeout) shared by all worker processes. On top of it, threads
+whose last checkpoint is older than CHECKPOINT_TTL_HOURS are pruned
+automatically, and write overhead is exported per node as
+rag_checkpoint_write_seconds and rag_checkpoint_write_bytes_total, and per
+run in the "checkpoint" section of the request metrics.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata, get_checkpoint_id
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from src.config import logger_graph as logger
+from src.config.settings import settings
+from src.core.lazy import Lazy
+from src.observability.metrics import registry
+
+CHECKPOINT_WRITE_SECONDS = registry.histogram(
+    "rag_checkpoint_write_seconds", "Checkpoint write time by node and operation (writes/checkpoint)"
+)
+CHECKPOINT_WRITE_BYTES = registry.counter("rag_checkpoint_write_bytes_total", "Checkpoint bytes written by node")
+CHECKPOINTS_PRUNED = registry.counter("rag_checkpoint_threads_pruned_total", "Expired checkpoint threads deleted")
+
+# versions_seen key LangGraph updates when a run is resumed (not a node)
+_RESUME_KEY = "__interrupt__"
+
+# Expired threads are pruned every N checkpoints per process (and on start)
+PRUNE_EVERY = 200
+
+# Last checkpoint time per thread, for pruning (SqliteSaver's tables have no timestamps)
+_THREADS_SCHEMA = "CREATE TABLE IF NOT EXISTS checkpoint_threads (thread_id TEXT PRIMARY KEY, updated REAL NOT NULL)"
+
+
+def _task_node(task_path: str) -> str:
+    """Node name of a task path such as "~__pregel_pull, retrieve"."""
+    return task_path.rsplit(",", 1)[-1].strip() or "unknown"
+
+
+def _empty_write_stats() -> Dict[str, float]:
+    return {"writes": 0, "ms": 0.0, "bytes": 0}
+
+
+class SqliteCheckpointSaver(SqliteSaver):
+    """
+    SqliteSaver with per-node write overhead and pruning of expired threads.
+
+    Safe to use from several threads (SqliteSaver serializes access to its
+    connection) and from several processes (SQLite locking; writers wait up
+    to `busy_timeout`).
+
+    Args:
+        path: Database file (created with its directory).
+        ttl_seconds: Threads idle for longer are pruned (0 disables pruning).
+        busy_timeout: Seconds to wait for another writer's lock.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 0.0, busy_timeout: float = 10.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=busy_timeout, check_same_thread=False)
+        # Graph state may hold document references (STATE_DOCUMENT_REFS); allow loading them
+        serde = JsonPlusSerializer(allowed_msgpack_modules=[("src.core.document_store", "DocumentRef")])
+        super().__init__(conn, serde=serde)
+        self.ttl_seconds = ttl_seconds
+        self._stats_lock = threading.Lock()
+        self._puts = 0
+        self._versions_seen: Dict[str, Dict[str, Any]] = {}
+        self._stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+        with self.cursor() as cur:
+            cur.execute(_THREADS_SCHEMA)
+        self.prune_expired()
+
+    # -- write overhead --------------------------------------------------
+
+    def _record(self, thread_id: str, nodes: Sequence[str], op: str, seconds: float, size: int) -> None:
+        """Attribute a write (split evenly across the nodes of the step) to its thread and nodes."""
+        share = 1.0 / max(len(nodes), 1)
+        with self._stats_lock:
+            thread_stats = self._stats.setdefault(thread_id, {})
+            for node in nodes:
+                CHECKPOINT_WRITE_SECONDS.observe(seconds * share, node=node, op=op)
+                CHECKPOINT_WRITE_BYTES.inc(int(size * share), node=node)
+                stats = thread_stats.setdefault(node, _empty_write_stats())
+                stats["writes"] += 1
+                stats["ms"] += seconds * share * 1000
+                stats["bytes"] += int(size * share)
+
+    def pop_stats(self, thread_id: str) -> Dict[str, Dict[str, float]]:
+        """Write overhead per node recorded for a thread since the last call."""
+        with self._stats_lock:
+            self._versions_seen.pop(thread_id, None)
+            return self._stats.pop(thread_id, {})
+
+    # -- SqliteSaver -----------------------------------------------------
+
+    def put(
+        self,
+        config: RunnableConfig,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ) -> RunnableConfig:
+        """Store a checkpoint, record its size and time per node and the thread's activity."""
+        started = time.perf_counter()
+        saved = super().put(config, checkpoint, metadata, new_versions)
+        thread_id = str(saved["configurable"]["thread_id"])
+        with self.cursor() as cur:
+            cur.execute("INSERT OR REPLACE INTO checkpoint_threads VALUES (?, ?)", (thread_id, time.time()))
+            size = cur.execute(
+                "SELECT LENGTH(checkpoint) + LENGTH(metadata) FROM checkpoints "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ?",
+                (thread_id, saved["configurable"]["checkpoint_ns"], checkpoint["id"]),
+            ).fetchone()[0]
+
+        # The nodes of the step are those whose versions_seen changed (puts of a thread are
+        # sequential, unlike put_writes which LangGraph issues from background threads)
+        seen = checkpoint["versions_seen"]
+        with self._stats_lock:
+            previous = self._versions_seen.get(thread_id)
+            self._versions_seen[thread_id] = seen
+        if previous is None:
+            previous = self._parent_versions_seen(config)
+        nodes = [
+            node for node, versions in seen.items() if previous.get(node) != versions and node != _RESUME_KEY
+        ] or ["__input__"]
+        self._record(thread_id, nodes, "checkpoint", time.perf_counter() - started, size)
+        self._maybe_prune()
+        return saved
+
+    def put_writes(
+        self,
+        config: RunnableConfig,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        """Store the writes of a finished task and record their size and time for its node."""
+        started = time.perf_counter()
+        super().put_writes(config, writes, task_id, task_path)
+        with self.cursor(transaction=False) as cur:
+            size = cur.execute(
+                "SELECT COALESCE(SUM(LENGTH(value)), 0) FROM writes "
+                "WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id = ? AND task_id = ?",
+                (
+                    str(config["configurable"]["thread_id"]),
+                    str(config["configurable"]["checkpoint_ns"]),
+                    str(config["configurable"]["checkpoint_id"]),
+                    task_id,
+                ),
+            ).fetchone()[0]
+        self._record(
+            str(config["configurable"]["thread_id"]), [_task_node(task_path)], "writes",
+            time.perf_counter() - started, size,
+        )
+
+    def _parent_versions_seen(self, config: RunnableConfig) -> Dict[str, Any]:
+        """versions_seen of the checkpoint a put continues from (first put of a resumed run)."""
+        if not get_checkpoint_id(config):
+            return {}
+        parent = self.get_tuple(config)
+        return {} if parent is None else parent.checkpoint["versions_seen"]
+
+    def delete_thread(self, thread_id: str) -> None:
+        """Delete all checkpoints and writes of a thread."""
+        super().delete_thread(thread_id)
+        with self.cursor() as cur:
+            cur.execute("DELETE FROM checkpoint_threads WHERE thread_id = ?", (str(thread_id),))
+
+    # -- pruning ---------------------------------------------------------
+
+    def _maybe_prune(self) -> None:
+        with self._stats_lock:
+            self._puts += 1
+            due = self._puts % PRUNE_EVERY == 0
+        if due:
+            self.prune_expired()
+
+    def prune_expired(self, max_age: Optional[float] = None) -> int:
+        """
+        Delete the threads whose latest checkpoint is older than max_age seconds.
+
+        Args:
+            max_age: Age limit (default: the saver's ttl_seconds; 0 keeps everything).
+
+        Returns:
+            Number of threads deleted.
+        """
+        max_age = self.ttl_seconds if max_age is None else max_age
+        if max_age <= 0:
+            return 0
+        try:
+            with self.cursor() as cur:
+                expired = [
+                    row[0]
+                    for row in cur.execute(
+                        "SELECT thread_id FROM checkpoint_threads WHERE updated < ?", (time.time() - max_age,)
+                    ).fetchall()
+                ]
+            for thread_id in expired:
+                self.delete_thread(thread_id)
+        except sqlite3.Error as e:
+            logger.warning(f"Checkpoint pruning failed: {e}")
+            return 0
+        if expired:
+            CHECKPOINTS_PRUNED.inc(len(expired))
+            logger.info(f"Pruned {len(expired)} expired checkpoint threads")
+        return len(expired)
+
+
+def _build_checkpointer() -> Optional[SqliteCheckpointSaver]:
+    """The configured checkpoint saver, or None if CHECKPOINT_ENABLED=false."""
+    if not settings.CHECKPOINT_ENABLED:
+        return None
+    logger.info(f"Checkpointing graph runs to {settings.CHECKPOINT_PATH}")
+    return SqliteCheckpointSaver(settings.CHECKPOINT_PATH, ttl_seconds=settings.CHECKPOINT_TTL_HOURS * 3600)
+
+
+get_checkpointer = Lazy("checkpointer", _build_checkpointer)
@@ -5,6 +5,8 @@ RETRIEVE = "retrieve"
 GRADE_DOCUMENTS = "grade_documents"
 GENERATE = "generate"
 WEB_SEARCH = "web_search"
+PREFETCH_WEB_SEARCH = "prefetch_web_search"
+RETRIEVE_AND_GRADE = "retrieve_and_grade"
 
 # Edge decision values
 DECISION_USEFUL = "useful"
@@ -12,4 +14,15 @@ DECISION_NOT_USEFUL = "not_useful"
 DECISION_NOT_SUPPORTED = "not_supported"
 DECISION_WEBSEARCH = "websearch"
 DECISION_VECTORSTORE = "vectorstore"
+DECISION_FANOUT = "fanout"
+DECISION_PREFETCH = "prefetch"
+
+# Router fan-out modes
+FANOUT_MODES = ("auto", "off", "always")
+
+# Graph variants, from the most to the fewest quality checks
+VARIANT_FULL = "full"
+VARIANT_BALANCED = "balanced"
+VARIANT_FAST = "fast"
+GRAPH_VARIANTS = (VARIANT_FULL, VARIANT_BALANCED, VARIANT_FAST)
 
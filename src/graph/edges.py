@@ -1,7 +1,11 @@
 """Conditional edge functions for the RAG graph."""
 
-from src.chains import answer_grader, hallucination_grader, question_router, RouterQuery
-from src.core import logger
+from typing import List, Union
+
+from src.chains import get_answer_grader, get_hallucination_grader, get_question_router, RouterQuery
+from src.config import logger_graph as logger
+from src.config.settings import settings
+from src.core.document_store import resolve_documents
 from src.core.state import GraphState
 from src.graph.constants import (
     GENERATE,
@@ -11,28 +15,59 @@ from src.graph.constants import (
     DECISION_NOT_SUPPORTED,
     DECISION_WEBSEARCH,
     DECISION_VECTORSTORE,
+    DECISION_FANOUT,
+    DECISION_PREFETCH,
+    FANOUT_MODES,
+    VARIANT_FULL,
+    VARIANT_BALANCED,
+    VARIANT_FAST,
+)
+from src.observability.metrics import registry
+
+ROUTES = registry.counter("rag_router_routes_total", "Routed questions by route (vectorstore, websearch, fanout)")
+ROUTER_CONFIDENCE = registry.histogram(
+    "rag_router_confidence", "Router confidence in its choice", buckets=(0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0)
+)
+GRADERS_SKIPPED = registry.counter(
+    "rag_generation_graders_skipped_total", "Generation grader calls skipped by graph variant and grader"
 )
 
 
-def route_question(state: GraphState) -> str:
+def route_question(state: GraphState) -> Union[str, List[str]]:
     """
     Route the initial question to vectorstore or web search.
 
+    When the router is unsure (confidence below ROUTER_FANOUT_THRESHOLD, with
+    fan-out "auto"), retrieval with grading and a web search run in parallel
+    instead. The documents are graded as on the vectorstore route, and if web
+    search is needed its results are already there. The fan-out mode is read from
+    retrieval_config["fanout"], defaulting to ROUTER_FANOUT.
+
     Args:
-        state: Current graph state with question.
+        state: Current graph state with question and optional retrieval_config.
 
     Returns:
-        Route decision: 'vectorstore' or 'websearch'.
+        Route decision: 'vectorstore', 'websearch', or both branches ['fanout', 'prefetch'].
     """
     logger.debug("Routing question...")
 
     question = state["question"]
-    source: RouterQuery = question_router.invoke({"question": question})
-
+    fanout = (state.get("retrieval_config") or {}).get("fanout", settings.ROUTER_FANOUT)
+    if fanout not in FANOUT_MODES:
+        raise ValueError(f"Unknown fan-out mode {fanout!r}, expected one of {FANOUT_MODES}")
+    source: RouterQuery = get_question_router().invoke({"question": question})
+    ROUTER_CONFIDENCE.observe(source.confidence)
+
+    if fanout == "always" or (fanout == "auto" and source.confidence < settings.ROUTER_FANOUT_THRESHOLD):
+        ROUTES.inc(route="fanout")
+        logger.info(f"Route → Vectorstore + Web Search (confidence {source.confidence:.2f} for {source.datasource})")
+        return [DECISION_FANOUT, DECISION_PREFETCH]
     if source.datasource == "websearch":
+        ROUTES.inc(route="websearch")
         logger.info("Route → Web Search")
         return DECISION_WEBSEARCH
     else:
+        ROUTES.inc(route="vectorstore")
         logger.info("Route → Vectorstore")
         return DECISION_VECTORSTORE
 
@@ -57,32 +92,37 @@ def decide_to_generate(state: GraphState) -> str:
         return GENERATE
 
 
-def grade_generation(state: GraphState) -> str:
-    """
-    Grade the generation for hallucination and answer quality.
-
-    Args:
-        state: Current graph state with question, documents, and generation.
+def _grade_generation(state: GraphState, variant: str) -> str:
+    """Grade the generation with the quality checks of a graph variant (see grade_generation())."""
+    relevance = state.get("relevance") or 0.0
+    if variant == VARIANT_FAST and relevance >= settings.FAST_MIN_RELEVANCE:
+        # Nearly every retrieved document was relevant: the answer is accepted unchecked
+        GRADERS_SKIPPED.inc(variant=variant, grader="hallucination_grader")
+        GRADERS_SKIPPED.inc(variant=variant, grader="answer_grader")
+        logger.info(f"Generation ✓ Accepted without grading (relevance {relevance:.2f})")
+        return DECISION_USEFUL
 
-    Returns:
-        Decision: 'useful', 'not_useful', or 'not_supported'.
-    """
     logger.debug("Checking for hallucinations...")
 
     question = state["question"]
-    documents = state["documents"]
+    documents = resolve_documents(state["documents"])
     generation = state["generation"]
 
     # Check if generation is grounded in documents
-    hallucination_score = hallucination_grader.invoke(
+    hallucination_score = get_hallucination_grader().invoke(
         {"documents": documents, "generation": generation}
     )
 
     if hallucination_score.binary_score:
         logger.debug("Generation grounded in documents")
 
+        if variant != VARIANT_FULL and hallucination_score.confidence >= settings.BALANCED_MIN_GROUNDED_CONFIDENCE:
+            GRADERS_SKIPPED.inc(variant=variant, grader="answer_grader")
+            logger.info(f"Generation ✓ Grounded (confidence {hallucination_score.confidence:.2f}), not graded further")
+            return DECISION_USEFUL
+
         # Check if generation addresses the question
-        answer_score = answer_grader.invoke(
+        answer_score = get_answer_grader().invoke(
             {"question": question, "generation": generation}
         )
 
@@ -95,3 +135,56 @@ def grade_generation(state: GraphState) -> str:
     else:
         logger.warning("Generation not grounded → Web Search")
         return DECISION_NOT_SUPPORTED
+
+
+def grade_generation(state: GraphState) -> str:
+    """
+    Grade the generation for hallucination and answer quality.
+
+    Args:
+        state: Current graph state with question, documents, and generation.
+
+    Returns:
+        Decision: 'useful', 'not_useful', or 'not_supported'.
+    """
+    return _grade_generation(state, VARIANT_FULL)
+
+
+def grade_generation_balanced(state: GraphState) -> str:
+    """
+    Grade the generation, skipping the answer grader when it is confidently grounded.
+
+    The answer is accepted once the hallucination grader finds it grounded with
+    at least BALANCED_MIN_GROUNDED_CONFIDENCE.
+
+    Args:
+        state: Current graph state with question, documents, and generation.
+
+    Returns:
+        Decision: 'useful', 'not_useful', or 'not_supported'.
+    """
+    return _grade_generation(state, VARIANT_BALANCED)
+
+
+def grade_generation_fast(state: GraphState) -> str:
+    """
+    Accept the generation ungraded when retrieval was clearly relevant, else grade it as "balanced".
+
+    Retrieval counts as clearly relevant when at least FAST_MIN_RELEVANCE of the
+    retrieved documents were graded relevant. Web search answers are always graded.
+
+    Args:
+        state: Current graph state with question, documents, generation and relevance.
+
+    Returns:
+        Decision: 'useful', 'not_useful', or 'not_supported'.
+    """
+    return _grade_generation(state, VARIANT_FAST)
+
+
+# Generation check of each graph variant
+GENERATION_GRADERS = {
+    VARIANT_FULL: grade_generation,
+    VARIANT_BALANCED: grade_generation_balanced,
+    VARIANT_FAST: grade_generation_fast,
+}
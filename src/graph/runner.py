@@ -0,0 +1,204 @@
+"""Graph runner - shared entry points for running questions through the RAG graph."""
+
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.chains.generation import GENERATION_TAG
+from src.config import logger_graph as logger
+from src.config.settings import settings
+from src.core.document_store import StateDocument, resolve_documents
+from src.graph.builder import get_graph_variant, select_variant
+from src.graph.checkpoint import get_checkpointer
+from src.observability import registry, track_request
+
+CHECKPOINT_RESUMES = registry.counter("rag_checkpoint_resumes_total", "Graph runs resumed from a checkpoint")
+
+
+def build_inputs(question: str, retrieval_config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Build the graph input for a question.
+
+    Args:
+        question: The user's question.
+        retrieval_config: Optional retrieval settings (search_type, k, fetch_k, ...).
+
+    Returns:
+        Graph input state.
+    """
+    return {"question": question, "retrieval_config": dict(retrieval_config or {})}
+
+
+def serialize_documents(documents: List[StateDocument]) -> List[Dict[str, Any]]:
+    """Convert documents (or references to them) into JSON-serializable dicts."""
+    return [
+        {
+            "source": doc.metadata.get("source", "unknown"),
+            "title": doc.metadata.get("title", "N/A"),
+            "content": doc.page_content,
+            "metadata": doc.metadata,
+        }
+        for doc in resolve_documents(documents)
+    ]
+
+
+def serialize_update(update: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a node update into a JSON-serializable dict."""
+    serialized = dict(update)
+    if "documents" in serialized:
+        serialized["documents"] = serialize_documents(serialized["documents"] or [])
+    return serialized
+
+
+class _Run:
+    """Graph, input and config of one run, plus its checkpoint details."""
+
+    def __init__(self, app: Any, inputs: Optional[Dict[str, Any]], config: Dict[str, Any]):
+        self.app = app
+        self.inputs = inputs
+        self.config = config
+        self.request_id: Optional[str] = None
+        self.resumed_from: Dict[str, Any] = {}
+        self.checkpoint: Optional[Dict[str, Any]] = None
+
+
+@contextmanager
+def _prepare_run(
+    question: str,
+    retrieval_config: Optional[Dict[str, Any]],
+    config: Dict[str, Any],
+    request_id: Optional[str],
+) -> Iterator[_Run]:
+    """
+    Choose the graph and input of a run.
+
+    The graph is the compiled variant chosen by retrieval_config["variant"]
+    (default GRAPH_VARIANT).
+    With CHECKPOINT_ENABLED=true the run is checkpointed under its request ID
+    (generated if not given). If that request has an unfinished checkpoint for
+    the same question the run resumes from it; otherwise it starts over. The
+    checkpoints are deleted once the run completes, and kept if it fails or
+    is cancelled so a retry can resume.
+    """
+    inputs = build_inputs(question, retrieval_config)
+    variant = select_variant(retrieval_config)
+    if not settings.CHECKPOINT_ENABLED:
+        yield _Run(get_graph_variant(variant), inputs, config)
+        return
+
+    request_id = request_id or uuid.uuid4().hex
+    checkpointer = get_checkpointer()
+    run = _Run(
+        get_graph_variant(variant, checkpointed=True),
+        inputs,
+        {**config, "configurable": {**config.get("configurable", {}), "thread_id": request_id}},
+    )
+    run.request_id = request_id
+
+    snapshot = run.app.get_state(run.config)
+    if snapshot.next and snapshot.values.get("question") == question:
+        run.inputs = None
+        run.resumed_from = dict(snapshot.values)
+        CHECKPOINT_RESUMES.inc()
+        logger.info(f"Resuming request {request_id} at {', '.join(snapshot.next)}")
+    elif snapshot.values:
+        # Finished, or a different question under a reused ID
+        checkpointer.delete_thread(request_id)
+
+    try:
+        yield run
+    finally:
+        run.checkpoint = {
+            "request_id": request_id,
+            "resumed": run.inputs is None,
+            "nodes": checkpointer.pop_stats(request_id),
+        }
+    checkpointer.delete_thread(request_id)
+
+
+def run_question(
+    question: str,
+    retrieval_config: Optional[Dict[str, Any]] = None,
+    config: Optional[Dict[str, Any]] = None,
+    request_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run a question through the graph and return the final state.
+
+    Args:
+        question: The user's question.
+        retrieval_config: Optional retrieval settings.
+        config: Optional LangChain RunnableConfig (callbacks, tags, ...).
+        request_id: Checkpoint key (only used with CHECKPOINT_ENABLED=true);
+            running a failed request again with its ID resumes it.
+
+    Returns:
+        Final graph state (with resolved documents), with the request's instrumentation
+        summary under "metrics" (and its checkpoint write overhead under metrics["checkpoint"]).
+    """
+    logger.debug(f"Running question: {question[:50]}...")
+    with track_request(config) as (request, config):
+        with _prepare_run(question, retrieval_config, config, request_id) as run:
+            state = run.app.invoke(run.inputs, config=run.config)
+    metrics = request.summary()
+    if run.checkpoint is not None:
+        metrics["checkpoint"] = run.checkpoint
+    if "documents" in state:
+        state = {**state, "documents": resolve_documents(state["documents"])}
+    return {**state, "metrics": metrics}
+
+
+def stream_question(
+    question: str,
+    retrieval_config: Optional[Dict[str, Any]] = None,
+    config: Optional[Dict[str, Any]] = None,
+    tokens: bool = True,
+    request_id: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream node updates (and optionally answer tokens) for a question.
+
+    Args:
+        question: The user's question.
+        retrieval_config: Optional retrieval settings.
+        config: Optional LangChain RunnableConfig.
+        tokens: Also emit the answer tokens of the generation chain.
+        request_id: Checkpoint key (see run_question()).
+
+    Yields:
+        Events of the form {"event": "node", "node": ..., "update": ...},
+        {"event": "token", "content": ...} and finally
+        {"event": "end", "generation": ..., "documents": [...], "metrics": {...}}.
+    """
+    stream_mode = ["updates", "messages"] if tokens else ["updates"]
+
+    with track_request(config) as (request, config), _prepare_run(
+        question, retrieval_config, config, request_id
+    ) as run:
+        # A resumed run only streams the remaining nodes
+        generation: str = run.resumed_from.get("generation") or ""
+        documents: List[StateDocument] = run.resumed_from.get("documents") or []
+        for mode, data in run.app.stream(run.inputs, config=run.config, stream_mode=stream_mode):
+            if mode == "messages":
+                message, metadata = data
+                if GENERATION_TAG in metadata.get("tags", []) and message.content:
+                    yield {"event": "token", "content": message.content}
+                continue
+
+            for node, update in data.items():
+                update = update or {}
+                if "generation" in update:
+                    generation = update["generation"]
+                if update.get("documents"):
+                    documents = update["documents"]
+                yield {"event": "node", "node": node, "update": serialize_update(update)}
+
+    metrics = request.summary()
+    if run.checkpoint is not None:
+        metrics["checkpoint"] = run.checkpoint
+    yield {
+        "event": "end",
+        "generation": generation,
+        "documents": serialize_documents(documents),
+        "metrics": metrics,
+    }
@@ -0,0 +1,189 @@
+"""Warm-up hook - prepares everything the first request would otherwise initialize, and tracks readiness.
+
+warm_up() runs these steps, logging the time of each:
+
+1. singletons: the lazily built models, chains, HTTP clients, caches and compiled graph
+2. vectorstore: open the collection (or shards)
+3. index: load the vector index into memory with a query by a stored vector
+4. connections: open pooled connections to the OpenAI and Tavily APIs
+5. retriever: run a synthetic question through the retriever (embedding + search)
+6. popular_questions: optionally run the questions in WARM_UP_QUESTIONS_PATH through
+   the graph, filling the response and retrieval caches
+7. web_search_tool
+
+The process reports ready (is_ready(), /readyz in the API) once every step
+but the popular questions has succeeded.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.config import logger_graph as logger
+from src.config.settings import settings
+from src.core.lazy import registered
+from src.core.tools import get_web_search_tool
+from src.observability.metrics import registry
+
+# Imported for its side effect of registering the chains and the graph
+import src.graph.builder  # noqa: F401
+
+READY = registry.gauge("rag_ready", "1 once warm-up has completed and the process accepts traffic")
+WARM_UP_STEP_SECONDS = registry.gauge("rag_warm_up_step_seconds", "Duration of the last warm-up by step")
+
+# Synthetic question used to exercise the retriever
+WARM_UP_QUERY = "What is agent memory?"
+
+# Steps whose failure doesn't keep the process from becoming ready
+OPTIONAL_STEPS = ("popular_questions",)
+
+_ready = threading.Event()
+_lock = threading.Lock()
+_status: Dict[str, Any] = {"state": "starting", "steps_ms": {}, "errors": {}}
+
+
+def is_ready() -> bool:
+    """Whether warm-up has completed (or was skipped) and the process should receive traffic."""
+    return _ready.is_set()
+
+
+def readiness() -> Dict[str, Any]:
+    """Readiness flag, warm-up state ("starting", "warming_up", "ready", "failed"), step times and errors."""
+    with _lock:
+        return {
+            "ready": _ready.is_set(),
+            "state": _status["state"],
+            "steps_ms": dict(_status["steps_ms"]),
+            "errors": dict(_status["errors"]),
+        }
+
+
+def mark_ready() -> None:
+    """Report ready without warming up (WARM_UP_ON_START=false)."""
+    with _lock:
+        _status["state"] = "ready"
+    _ready.set()
+    READY.set(1)
+
+
+def _stores() -> List[Any]:
+    from src.ingestion import get_shards, get_vectorstore
+
+    return get_shards() if settings.CHROMA_SHARDS > 1 else [get_vectorstore()]
+
+
+def _open_vectorstore() -> None:
+    counts = [store._collection.count() for store in _stores()]
+    logger.info(f"Vector store open: {sum(counts)} chunks in {len(counts)} collection(s)")
+
+
+def _load_index() -> None:
+    for store in _stores():
+        stored = store._collection.get(limit=1, include=["embeddings"])
+        if len(stored["embeddings"]):
+            store._collection.query(query_embeddings=[stored["embeddings"][0]], n_results=1, include=[])
+
+
+def _prime_connections() -> None:
+    if settings.LLM_PROVIDER == "fake":
+        return
+    from src.core.http import prime_connections
+
+    urls = [os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")]
+    if settings.TAVILY_API_KEY:
+        from langchain_tavily._utilities import TAVILY_API_URL
+
+        urls.append(TAVILY_API_URL)
+    prime_connections(urls)
+
+
+def _run_retriever() -> None:
+    from src.ingestion import get_retriever
+
+    get_retriever().invoke(WARM_UP_QUERY)
+
+
+def _run_popular_questions(path: str) -> None:
+    from src.batch.runner import read_questions
+    from src.graph.runner import run_question
+
+    rows = read_questions(path)[:settings.WARM_UP_QUESTIONS_MAX]
+    failed = 0
+    for row in rows:
+        try:
+            run_question(row["question"], row["retrieval_config"])
+        except Exception as e:
+            failed += 1
+            logger.warning(f"Warm-up question {row['id']} failed: {e}")
+    logger.info(f"Ran {len(rows) - failed} of {len(rows)} popular questions from {path}")
+    if failed == len(rows) and rows:
+        raise RuntimeError(f"All {failed} warm-up questions failed")
+
+
+def _step(name: str, fn: Callable[[], Any], timings: Dict[str, float], errors: Dict[str, str]) -> None:
+    """Run one warm-up step, recording its time or its error."""
+    started = time.perf_counter()
+    try:
+        fn()
+    except Exception as e:
+        errors[name] = f"{type(e).__name__}: {e}"
+        logger.error(f"Warm-up step {name} failed: {e}")
+    ms = (time.perf_counter() - started) * 1000
+    timings[name] = ms
+    WARM_UP_STEP_SECONDS.set(ms / 1000, step=name)
+    logger.info(f"Warm-up step {name}: {ms:.0f} ms")
+
+
+def warm_up(questions_path: Optional[str] = None) -> Dict[str, float]:
+    """
+    Prepare the process for traffic: build singletons, open and load the vector index,
+    prime connections and run a synthetic (and optionally popular) questions.
+
+    Safe to call more than once and from several threads; items that are
+    already built cost nothing. Marks the process ready if every required
+    step succeeded, and not ready otherwise.
+
+    Args:
+        questions_path: JSONL / CSV of popular questions to pre-run (default: WARM_UP_QUESTIONS_PATH).
+
+    Returns:
+        Milliseconds spent on each lazy singleton and each step during this call.
+    """
+    with _lock:
+        _status["state"] = "warming_up"
+    timings: Dict[str, float] = {}
+    errors: Dict[str, str] = {}
+    started = time.perf_counter()
+
+    def build_singletons() -> None:
+        for name, item in registered().items():
+            item_started = time.perf_counter()
+            item()
+            timings[name] = (time.perf_counter() - item_started) * 1000
+
+    _step("singletons", build_singletons, timings, errors)
+    _step("vectorstore", _open_vectorstore, timings, errors)
+    _step("index", _load_index, timings, errors)
+    _step("connections", _prime_connections, timings, errors)
+    _step("retriever", _run_retriever, timings, errors)
+    questions_path = questions_path or settings.WARM_UP_QUESTIONS_PATH
+    if questions_path:
+        _step("popular_questions", lambda: _run_popular_questions(questions_path), timings, errors)
+    _step("web_search_tool", get_web_search_tool, timings, errors)
+
+    failed = [name for name in errors if name not in OPTIONAL_STEPS]
+    with _lock:
+        _status.update(state="failed" if failed else "ready", steps_ms=dict(timings), errors=dict(errors))
+    # A repeated warm-up reports its own outcome (still ready while it runs)
+    if failed:
+        _ready.clear()
+    else:
+        _ready.set()
+    READY.set(0 if failed else 1)
+
+    logger.info(
+        f"Warm-up {'failed (' + ', '.join(failed) + ')' if failed else 'complete'} in "
+        f"{(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+    return timings
@@ -1,9 +1,44 @@
+from src.ingestion.adaptive import AdaptiveRetriever, select_k
+from src.ingestion.dedup import Deduplicator, deduplicate
+from src.ingestion.embedding import EmbeddingStats, embed_and_store
+from src.ingestion.local import FileIndex, ingest_directory, load_directory
+from src.ingestion.manifest import IngestManifest
+from src.ingestion.pipeline import IngestionSummary, format_summary, ingest_sources
+from src.ingestion.retrieval_cache import bump_version, cached_retrieve, get_retrieval_cache
+from src.ingestion.shards import ShardedRetriever, get_shards, ingest_shards, rebuild_shard
 from src.ingestion.vectorstore import (
     get_retriever,
+    get_vectorstore,
     ingest_documents,
     load_documents,
     split_documents,
 )
 
-__all__ = ["get_retriever", "ingest_documents", "load_documents", "split_documents"]
+__all__ = [
+    "AdaptiveRetriever",
+    "select_k",
+    "Deduplicator",
+    "deduplicate",
+    "EmbeddingStats",
+    "embed_and_store",
+    "FileIndex",
+    "ingest_directory",
+    "load_directory",
+    "IngestManifest",
+    "IngestionSummary",
+    "format_summary",
+    "ingest_sources",
+    "bump_version",
+    "cached_retrieve",
+    "get_retrieval_cache",
+    "ShardedRetriever",
+    "get_shards",
+    "ingest_shards",
+    "rebuild_shard",
+    "get_retriever",
+    "get_vectorstore",
+    "ingest_documents",
+    "load_documents",
+    "split_documents",
+]
 
@@ -0,0 +1,93 @@
+"""Adaptive k: pass on only as many documents as the score distribution supports.
+
+The "adaptive" search type fetches up to max_k candidates with their
+distances and cuts the list where relevance falls off:
+
+- gap (default): at the largest drop between consecutive candidates, if
+  that drop is at least twice the average one (otherwise the scores decline
+  evenly and all max_k candidates are kept)
+- knee: at the point of maximum curvature (the candidate farthest from the
+  straight line between the best and the worst score)
+
+The cut is bounded by min_k and max_k. Every document passed on costs a
+grader call and generation tokens, so a question whose top two chunks stand
+out gets two documents instead of a fixed six.
+"""
+
+from typing import Any, Callable, List, Sequence, Tuple
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+ADAPTIVE_METHODS = ("gap", "knee")
+
+# A drop counts as a gap when it is at least this multiple of the average drop
+GAP_FACTOR = 2.0
+
+# Minimum (normalized) distance of the knee below the chord; flatter curves keep max_k
+KNEE_MIN_DISTANCE = 0.05
+
+
+def _gap_cut(scores: Sequence[float], min_k: int) -> int:
+    n = len(scores)
+    average = (scores[0] - scores[-1]) / (n - 1)
+    drops = [(scores[i - 1] - scores[i], i) for i in range(min_k, n)]
+    drop, cut = max(drops)
+    return cut if average > 0 and drop >= GAP_FACTOR * average else n
+
+
+def _knee_cut(scores: Sequence[float], min_k: int) -> int:
+    n = len(scores)
+    span = scores[0] - scores[-1]
+    if span <= 0:
+        return n
+    # Normalized curve from (0, 1) to (1, 0); the knee lies farthest below the chord,
+    # and the candidates before it are kept
+    distances = [((1 - i / (n - 1)) - (scores[i] - scores[-1]) / span, i) for i in range(min_k, n - 1)]
+    if not distances:
+        return n
+    distance, knee = max(distances)
+    return knee if distance >= KNEE_MIN_DISTANCE else n
+
+
+def select_k(scores: Sequence[float], min_k: int = 2, max_k: int = 10, method: str = "gap") -> int:
+    """
+    Choose how many of the ranked candidates to keep.
+
+    Args:
+        scores: Similarity of the candidates, best first (higher is better).
+        min_k: Keep at least this many (if available).
+        max_k: Keep at most this many.
+        method: "gap" or "knee".
+
+    Returns:
+        Number of candidates to keep.
+
+    Raises:
+        ValueError: If the method is unknown.
+    """
+    if method not in ADAPTIVE_METHODS:
+        raise ValueError(f"Unknown adaptive method {method!r} (expected one of {', '.join(ADAPTIVE_METHODS)})")
+    scores = list(scores)[:max_k]
+    min_k = max(1, min(min_k, max_k))
+    if len(scores) <= min_k:
+        return len(scores)
+    return _gap_cut(scores, min_k) if method == "gap" else _knee_cut(scores, min_k)
+
+
+class AdaptiveRetriever(BaseRetriever):
+    """Retriever returning between min_k and max_k documents, cut by select_k()."""
+
+    search: Callable[[str, int], List[Tuple[Document, float]]]
+    """Returns up to k (document, distance) pairs, nearest first."""
+    min_k: int = 2
+    max_k: int = 10
+    method: str = "gap"
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun, **kwargs: Any
+    ) -> List[Document]:
+        candidates = self.search(query, self.max_k)
+        k = select_k([-distance for _, distance in candidates], self.min_k, self.max_k, self.method)
+        return [document for document, _ in candidates[:k]]
@@ -0,0 +1,188 @@
+"""Near-duplicate chunk elimination at ingestion time (MinHash + LSH).
+
+Pages from the same site repeat navigation, footers and citation blocks, so
+many chunks are near-copies of one another. Each chunk gets a MinHash
+signature over its word shingles. Locality-sensitive hashing (bands of the
+signature) finds the earlier chunks it may duplicate, and the signatures
+then estimate the Jaccard similarity. A chunk at or above
+INGEST_DEDUP_THRESHOLD of an earlier one is not embedded. INGEST_DEDUP sets
+what happens to it:
+
+- drop: it is discarded
+- merge: it is discarded, and its source is added to the kept chunk's
+  `duplicate_sources` metadata (with a `duplicates` count)
+- off: no deduplication
+
+The first occurrence (in ingestion order) is kept, so results are
+deterministic.
+"""
+
+import re
+import zlib
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from src.config.settings import settings
+from src.observability.metrics import registry
+
+DEDUP_MODES = ("off", "drop", "merge")
+SHINGLE_WORDS = 3
+
+# Universal hashing (a * x + b) mod p over 32-bit shingle hashes; a * x + b stays below 2**64
+_PRIME = np.uint64(4294967311)
+_MAX_HASH = 1 << 32
+
+_WORD_RE = re.compile(r"\w+")
+
+INGEST_DUPLICATES = registry.counter("rag_ingest_duplicates_total", "Near-duplicate chunks removed during ingestion")
+
+
+@dataclass
+class DedupStats:
+    """Chunks seen and near-duplicates removed by a Deduplicator."""
+
+    chunks: int = 0
+    duplicates: int = 0
+
+    @property
+    def reduction(self) -> float:
+        return self.duplicates / self.chunks if self.chunks else 0.0
+
+
+@lru_cache(maxsize=8)
+def _permutations(num_perm: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    return (
+        rng.integers(1, _MAX_HASH, size=num_perm, dtype=np.uint64),
+        rng.integers(0, _MAX_HASH, size=num_perm, dtype=np.uint64),
+    )
+
+
+def lsh_bands(num_perm: int, threshold: float, recall: float = 0.95) -> Tuple[int, int]:
+    """
+    Bands and rows per band that find a pair at the threshold with at least the given probability.
+
+    Two chunks with Jaccard similarity s share at least one band with
+    probability 1 - (1 - s**rows)**bands. Of the layouts reaching `recall`
+    at the threshold, the one with the most rows (fewest dissimilar
+    candidates to verify) is used.
+    """
+    options = [(bands, num_perm // bands) for bands in range(1, num_perm + 1) if num_perm % bands == 0]
+    found = [(bands, rows) for bands, rows in options if 1 - (1 - threshold ** rows) ** bands >= recall]
+    return max(found, key=lambda option: option[1]) if found else (num_perm, 1)
+
+
+def minhash(text: str, num_perm: int = 128, seed: int = 1) -> np.ndarray:
+    """MinHash signature of a text's lowercase word shingles."""
+    words = _WORD_RE.findall(text.lower())
+    shingles = {" ".join(words[i:i + SHINGLE_WORDS]) for i in range(max(1, len(words) - SHINGLE_WORDS + 1))}
+    hashes = np.fromiter((zlib.crc32(shingle.encode()) for shingle in shingles), dtype=np.uint64, count=len(shingles))
+    a, b = _permutations(num_perm, seed)
+    return ((np.outer(a, hashes) + b[:, None]) % _PRIME).min(axis=1)
+
+
+class Deduplicator:
+    """
+    Removes chunks that nearly duplicate a chunk seen earlier by the same instance.
+
+    Keep one instance for a whole ingestion run, so duplicates are found
+    across sources and batches.
+
+    Args:
+        threshold: Estimated Jaccard similarity from which a chunk is a duplicate (default: INGEST_DEDUP_THRESHOLD).
+        mode: "drop", "merge" or "off" (default: INGEST_DEDUP).
+        num_perm: Signature length (more is more precise and slower).
+    """
+
+    def __init__(self, threshold: Optional[float] = None, mode: Optional[str] = None, num_perm: int = 128):
+        self.threshold = settings.INGEST_DEDUP_THRESHOLD if threshold is None else threshold
+        self.mode = mode or settings.INGEST_DEDUP
+        if self.mode not in DEDUP_MODES:
+            raise ValueError(f"Unknown dedup mode {self.mode!r}, expected one of {DEDUP_MODES}")
+        self.num_perm = num_perm
+        self.bands, self.rows = lsh_bands(num_perm, self.threshold)
+        self.stats = DedupStats()
+        self.merged: Dict[int, Document] = {}  # Kept chunks whose metadata changed, by position
+        self._kept: List[Optional[Document]] = []  # Only needed (and held) for merging
+        self._signatures: List[np.ndarray] = []
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def _match(self, signature: np.ndarray, keys: List[bytes]) -> int:
+        """Position of the most similar kept chunk at or above the threshold, or -1."""
+        best, best_similarity = -1, self.threshold
+        seen = set()
+        for band, key in enumerate(keys):
+            for index in self._buckets[band].get(key, ()):
+                if index in seen:
+                    continue
+                seen.add(index)
+                similarity = float(np.mean(self._signatures[index] == signature))
+                if similarity >= best_similarity:
+                    best, best_similarity = index, similarity
+        return best
+
+    def _merge(self, kept: Document, duplicate: Document) -> None:
+        source = duplicate.metadata.get("source")
+        sources = [s for s in (kept.metadata.get("duplicate_sources") or "").split(",") if s]
+        if source and source != kept.metadata.get("source") and source not in sources:
+            sources.append(source)
+            kept.metadata["duplicate_sources"] = ",".join(sources)
+        kept.metadata["duplicates"] = kept.metadata.get("duplicates", 0) + 1
+
+    def filter(self, chunks: Sequence[Document]) -> List[Document]:
+        """
+        Keep the chunks that don't nearly duplicate an earlier one.
+
+        Args:
+            chunks: Chunks in ingestion order.
+
+        Returns:
+            The kept chunks (the same objects, in order).
+        """
+        if self.mode == "off":
+            return list(chunks)
+        kept = []
+        for chunk in chunks:
+            self.stats.chunks += 1
+            signature = minhash(chunk.page_content, self.num_perm)
+            keys = self._band_keys(signature)
+            index = self._match(signature, keys)
+            if index >= 0:
+                self.stats.duplicates += 1
+                INGEST_DUPLICATES.inc()
+                if self.mode == "merge":
+                    self._merge(self._kept[index], chunk)
+                    self.merged[index] = self._kept[index]
+                continue
+            index = len(self._kept)
+            self._kept.append(chunk if self.mode == "merge" else None)
+            self._signatures.append(signature)
+            for band, key in enumerate(keys):
+                self._buckets[band].setdefault(key, []).append(index)
+            kept.append(chunk)
+        return kept
+
+
+def deduplicate(
+    chunks: Sequence[Document], threshold: Optional[float] = None, mode: Optional[str] = None
+) -> Tuple[List[Document], DedupStats]:
+    """
+    Remove near-duplicate chunks from one batch of chunks.
+
+    Args:
+        chunks: Chunks in ingestion order.
+        threshold: Estimated Jaccard similarity from which a chunk is a duplicate (default: INGEST_DEDUP_THRESHOLD).
+        mode: "drop", "merge" or "off" (default: INGEST_DEDUP).
+
+    Returns:
+        The kept chunks and the dedup stats.
+    """
+    dedup = Deduplicator(threshold, mode)
+    return dedup.filter(chunks), dedup.stats
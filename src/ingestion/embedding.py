@@ -0,0 +1,138 @@
+"""Concurrent, batched embedding of chunks during ingestion.
+
+Chunks are split into batches of INGEST_EMBED_BATCH_SIZE and up to
+INGEST_EMBED_CONCURRENCY batches are embedded and written at once (the
+shared rate limiter still applies). Each batch goes through the vector
+store's own add_documents(), so it is stored as soon as it is embedded: a
+large corpus is never held in memory as vectors and a late failure doesn't
+discard the batches already done. A failed batch is retried on its own, up
+to INGEST_EMBED_MAX_RETRIES times, unless the failure was already retried
+below it (rate limits, and with the rate limiter also transient errors).
+"""
+
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from src.config import logger_ingestion as logger
+from src.config.settings import settings
+from src.core.rate_limit import RateLimitedEmbeddings, is_rate_limit_error, is_transient_error
+from src.ingestion.retrieval_cache import bump_version
+from src.observability.metrics import registry
+
+INGEST_EMBEDDINGS = registry.counter("rag_ingest_embeddings_total", "Chunks embedded and stored during ingestion")
+INGEST_BATCH_SECONDS = registry.histogram("rag_ingest_batch_seconds", "Embedding and write time of ingestion batches")
+INGEST_BATCH_RETRIES = registry.counter("rag_ingest_batch_retries_total", "Retried ingestion embedding batches")
+
+
+@dataclass
+class EmbeddingStats:
+    """Outcome of an embed_and_store() call."""
+
+    chunks: int = 0
+    batches: int = 0
+    retries: int = 0
+    failed_batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def embeddings_per_sec(self) -> float:
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+
+def _retried_below(embeddings: Optional[Embeddings], error: BaseException) -> bool:
+    """Whether the failure was already retried by the rate limiter or the provider client."""
+    if is_rate_limit_error(error):
+        return True
+    return isinstance(embeddings, RateLimitedEmbeddings) and is_transient_error(error)
+
+
+def _store_batch(
+    vectorstore: Chroma, documents: Sequence[Document], max_retries: int, backoff: float
+) -> Tuple[int, Optional[BaseException]]:
+    """Embed and write one batch, retrying it alone on failure. Returns (retries, final error or None)."""
+    # IDs are fixed up front so a retry overwrites whatever an attempt already wrote
+    ids = [doc.id or str(uuid.uuid4()) for doc in documents]
+    for attempt in range(max_retries + 1):
+        started = time.perf_counter()
+        try:
+            vectorstore.add_documents(list(documents), ids=ids)
+            INGEST_BATCH_SECONDS.observe(time.perf_counter() - started)
+            return attempt, None
+        except Exception as e:
+            if attempt == max_retries or _retried_below(vectorstore.embeddings, e):
+                return attempt, e
+            INGEST_BATCH_RETRIES.inc()
+            delay = backoff * 2 ** attempt
+            logger.warning(f"Embedding batch of {len(documents)} failed ({e}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+    raise AssertionError("unreachable")
+
+
+def embed_and_store(
+    vectorstore: Chroma,
+    documents: Sequence[Document],
+    batch_size: Optional[int] = None,
+    max_concurrency: Optional[int] = None,
+    max_retries: Optional[int] = None,
+    backoff: float = 0.5,
+) -> EmbeddingStats:
+    """
+    Embed chunks in concurrent batches and write each batch to the vector store as it completes.
+
+    Args:
+        vectorstore: Target collection (its embedding function embeds the chunks).
+        documents: Chunks to embed (a chunk's `id`, if set, is its vector store ID).
+        batch_size: Chunks per embedding request (default: INGEST_EMBED_BATCH_SIZE).
+        max_concurrency: Batches in flight (default: INGEST_EMBED_CONCURRENCY).
+        max_retries: Retries per failed batch (default: INGEST_EMBED_MAX_RETRIES).
+        backoff: Seconds before the first retry, doubled for each further one.
+
+    Returns:
+        Chunks, batches, retries and embeddings per second.
+
+    Raises:
+        RuntimeError: If a batch still fails after its retries (the other batches are stored).
+    """
+    batch_size = batch_size or settings.INGEST_EMBED_BATCH_SIZE
+    max_concurrency = max_concurrency or settings.INGEST_EMBED_CONCURRENCY
+    max_retries = settings.INGEST_EMBED_MAX_RETRIES if max_retries is None else max_retries
+
+    batches = [documents[i:i + batch_size] for i in range(0, len(documents), batch_size)]
+    stats = EmbeddingStats(batches=len(batches))
+    errors: List[BaseException] = []
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="ingest-embed") as executor:
+        futures = {executor.submit(_store_batch, vectorstore, batch, max_retries, backoff): batch for batch in batches}
+        for future in as_completed(futures):
+            batch = futures[future]
+            retries, error = future.result()
+            stats.retries += retries
+            if error is not None:
+                logger.error(f"Embedding batch of {len(batch)} chunks failed after {retries} retries: {error}")
+                stats.failed_batches += 1
+                errors.append(error)
+                continue
+            stats.chunks += len(batch)
+            INGEST_EMBEDDINGS.inc(len(batch))
+
+    stats.seconds = time.perf_counter() - started
+    if stats.chunks:
+        bump_version(vectorstore)
+    logger.info(
+        f"Embedded {stats.chunks} chunks in {stats.batches} batches in {stats.seconds:.2f}s "
+        f"({stats.embeddings_per_sec:.1f} embeddings/sec, {stats.retries} retries)"
+    )
+    if errors:
+        raise RuntimeError(
+            f"{stats.failed_batches} of {stats.batches} embedding batches failed "
+            f"({stats.chunks} chunks stored)"
+        ) from errors[-1]
+    return stats
@@ -0,0 +1,434 @@
+"""Ingestion of a local corpus of HTML, Markdown and text files.
+
+Files under a directory are selected with glob patterns (LOCAL_CORPUS_INCLUDE /
+LOCAL_CORPUS_EXCLUDE) and parsed in a process pool. Files from
+LOCAL_CORPUS_MMAP_MIN_KB up are read through a memory map, so they are
+hashed without an extra copy. A file index (LOCAL_CORPUS_INDEX_PATH)
+remembers each file's mtime, size, content hash and chunk count from the
+last run. Files are handled as follows:
+
+- same mtime and size: skipped without being read
+- new mtime, same content: skipped after hashing
+- changed or new: parsed into one Document, with the file path as source
+
+The documents go through split_documents() / ingest_sources() like web pages,
+with their own progress manifest (LOCAL_CORPUS_MANIFEST_PATH).
+"""
+
+import hashlib
+import mmap
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+
+from src.config import logger_ingestion as logger
+from src.config.settings import settings
+from src.ingestion.manifest import IngestManifest
+from src.ingestion.pipeline import IngestionSummary, Splitter, chunk_id, ingest_sources, target_stores
+from src.ingestion.retrieval_cache import bump_version
+
+HTML_SUFFIXES = {".html", ".htm"}
+MARKDOWN_SUFFIXES = {".md", ".markdown"}
+
+
+@dataclass
+class FileState:
+    """What the file index knows about a file."""
+
+    path: str
+    mtime_ns: int
+    size: int
+    sha256: str
+    chunks: int = 0
+
+    @property
+    def source_id(self) -> str:
+        """Ingestion source identifier: the path plus a content version, so edits get new chunk IDs."""
+        return f"{self.path}@{self.sha256[:16]}"
+
+
+@dataclass
+class ParsedFile:
+    """Result of parsing one file in a worker (text is None if the content is unchanged)."""
+
+    path: str
+    sha256: str
+    text: Optional[str] = None
+    title: Optional[str] = None
+
+
+@dataclass
+class LocalLoad:
+    """Outcome of a load_directory() call."""
+
+    files: int = 0  # Matched by the glob patterns
+    documents: List[Document] = field(default_factory=list)  # New and changed files
+    states: List[FileState] = field(default_factory=list)  # To record once the documents are stored
+    previous: Dict[str, FileState] = field(default_factory=dict)  # Earlier state of changed files
+    removed: List[FileState] = field(default_factory=list)  # Indexed files that are gone
+    unchanged: int = 0  # Same mtime and size
+    rehashed: int = 0  # New mtime, same content
+    seconds: float = 0.0
+
+    @property
+    def files_per_sec(self) -> float:
+        return self.files / self.seconds if self.seconds else 0.0
+
+
+class FileIndex:
+    """
+    mtime, size, hash and chunk count of each ingested file, in a SQLite file.
+
+    Args:
+        path: Database file (created with its directory).
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, "
+            "sha256 TEXT NOT NULL, chunks INTEGER NOT NULL DEFAULT 0)"
+        )
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def states(self, root: Optional[str] = None) -> Dict[str, FileState]:
+        """Indexed files (under root, if given) by path."""
+        query, params = "SELECT path, mtime_ns, size, sha256, chunks FROM files", ()
+        if root is not None:
+            query, params = query + " WHERE path LIKE ? ESCAPE '\\'", (_like_prefix(root),)
+        return {row[0]: FileState(*row) for row in self._connection().execute(query, params)}
+
+    def record(self, states: Iterable[FileState]) -> None:
+        """Store the states of ingested files."""
+        conn = self._connection()
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT OR REPLACE INTO files (path, mtime_ns, size, sha256, chunks) VALUES (?, ?, ?, ?, ?)",
+            [(s.path, s.mtime_ns, s.size, s.sha256, s.chunks) for s in states],
+        )
+        conn.execute("COMMIT")
+
+    def forget(self, paths: Iterable[str]) -> None:
+        """Drop files from the index."""
+        conn = self._connection()
+        conn.execute("BEGIN")
+        conn.executemany("DELETE FROM files WHERE path = ?", [(path,) for path in paths])
+        conn.execute("COMMIT")
+
+
+def _like_prefix(root: str) -> str:
+    """LIKE pattern matching the paths under a directory."""
+    prefix = root.rstrip(os.sep) + os.sep
+    return prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def _patterns(value: Optional[Sequence[str]], default: str) -> List[str]:
+    """Glob patterns from an argument or a comma-separated setting."""
+    if value is None:
+        value = default.split(",")
+    return [pattern.strip() for pattern in value if pattern.strip()]
+
+
+@lru_cache(maxsize=128)
+def _glob_regex(pattern: str) -> "re.Pattern[str]":
+    """Compile a glob: "*", "?" and "[...]" stay within a directory, "**/" spans any number of them."""
+    parts, i = [], 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            parts.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            parts.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            parts.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            parts.append("[^/]")
+            i += 1
+        elif pattern[i] == "[" and "]" in pattern[i + 1:]:
+            end = pattern.index("]", i + 2 if pattern[i + 1:i + 2] in ("!", "]") else i + 1)
+            body = pattern[i + 1:end]
+            parts.append("[" + ("^" + body[1:] if body.startswith("!") else body) + "]")
+            i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return re.compile("".join(parts) + r"\Z")
+
+
+def _matches(relative: str, patterns: Sequence[str]) -> bool:
+    """Whether a relative POSIX path matches any of the globs."""
+    return any(_glob_regex(pattern).match(relative) for pattern in patterns)
+
+
+def scan(root: str, include: Optional[Sequence[str]] = None, exclude: Optional[Sequence[str]] = None) -> List[Path]:
+    """
+    Files under a directory matching the include patterns and none of the exclude patterns.
+
+    Args:
+        root: Directory to walk.
+        include: Glob patterns relative to root (default: LOCAL_CORPUS_INCLUDE).
+        exclude: Glob patterns relative to root (default: LOCAL_CORPUS_EXCLUDE).
+
+    Returns:
+        Matching file paths, sorted.
+    """
+    include = _patterns(include, settings.LOCAL_CORPUS_INCLUDE)
+    exclude = _patterns(exclude, settings.LOCAL_CORPUS_EXCLUDE)
+    root_path = Path(root)
+    files = []
+    for directory, _, names in os.walk(root_path):
+        for name in names:
+            path = Path(directory, name)
+            relative = path.relative_to(root_path).as_posix()
+            if _matches(relative, include) and not _matches(relative, exclude):
+                files.append(path)
+    return sorted(files)
+
+
+def _html_text(html: str) -> Tuple[str, Optional[str]]:
+    """Visible text and title of an HTML page."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    title = soup.title.get_text(strip=True) if soup.title else None
+    for tag in soup(["script", "style", "noscript"]):
+        tag.decompose()
+    return soup.get_text("\n", strip=True), title
+
+
+def _markdown_title(text: str) -> Optional[str]:
+    """The first level-1 heading of a Markdown file."""
+    for line in text.splitlines():
+        if line.startswith("# "):
+            return line[2:].strip()
+    return None
+
+
+def parse_file(path: str, known_sha256: Optional[str] = None, mmap_min_bytes: int = 1 << 20) -> ParsedFile:
+    """
+    Hash a file and, unless its content is known_sha256, extract its text (runs in the worker processes).
+
+    Args:
+        path: File to parse.
+        known_sha256: Hash from the last run; an equal hash skips decoding and parsing.
+        mmap_min_bytes: Files at least this large are read through a memory map.
+
+    Returns:
+        The hash, plus text and title if the content changed.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size >= mmap_min_bytes and size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                sha256 = hashlib.sha256(data).hexdigest()
+                if sha256 == known_sha256:
+                    return ParsedFile(path, sha256)
+                text = str(data, "utf-8", "replace")
+        else:
+            raw = f.read()
+            sha256 = hashlib.sha256(raw).hexdigest()
+            if sha256 == known_sha256:
+                return ParsedFile(path, sha256)
+            text = raw.decode("utf-8", "replace")
+
+    suffix = Path(path).suffix.lower()
+    if suffix in HTML_SUFFIXES:
+        text, title = _html_text(text)
+    elif suffix in MARKDOWN_SUFFIXES:
+        title = _markdown_title(text)
+    else:
+        title = None
+    return ParsedFile(path, sha256, text, title or Path(path).stem)
+
+
+def _pool_context() -> multiprocessing.context.BaseContext:
+    """
+    Start workers from a fork server that has this module loaded.
+
+    Forking the (multi-threaded) ingesting process itself could deadlock the
+    children, and spawning would import the application in every worker.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def _parse_all(jobs: List[Tuple[str, Optional[str]]], workers: int, mmap_min_bytes: int) -> List[ParsedFile]:
+    """Parse files in a process pool (in this process for a single worker)."""
+    if workers <= 1 or len(jobs) <= 1:
+        return [parse_file(path, known, mmap_min_bytes) for path, known in jobs]
+    paths, known = zip(*jobs)
+    chunksize = max(1, min(64, len(jobs) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as pool:
+        return list(pool.map(parse_file, paths, known, [mmap_min_bytes] * len(jobs), chunksize=chunksize))
+
+
+def load_directory(
+    root: str,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+    index: Optional[FileIndex] = None,
+    force: bool = False,
+) -> LocalLoad:
+    """
+    Load the new and changed files of a directory as documents.
+
+    Nothing is recorded in the file index; pass the returned states to
+    FileIndex.record() once the documents are stored (ingest_directory() does).
+
+    Args:
+        root: Directory of the corpus.
+        include: Glob patterns relative to root (default: LOCAL_CORPUS_INCLUDE).
+        exclude: Glob patterns relative to root (default: LOCAL_CORPUS_EXCLUDE).
+        workers: Parser processes (default: LOCAL_CORPUS_WORKERS, 0 = one per CPU).
+        index: File index of the last run (default: the one at LOCAL_CORPUS_INDEX_PATH).
+        force: Load every file, even if unchanged.
+
+    Returns:
+        Documents with source, title and sha256 metadata, plus file states and counts.
+    """
+    started = time.perf_counter()
+    root = str(Path(root).resolve())
+    index = index or FileIndex(settings.LOCAL_CORPUS_INDEX_PATH)
+    workers = workers if workers is not None else settings.LOCAL_CORPUS_WORKERS
+    workers = workers or os.cpu_count() or 1
+    known = index.states(root)
+
+    load = LocalLoad()
+    jobs: List[Tuple[str, Optional[str]]] = []
+    stats: Dict[str, os.stat_result] = {}
+    seen = set()
+    for path in scan(root, include, exclude):
+        name = str(path)
+        seen.add(name)
+        load.files += 1
+        stat = path.stat()
+        previous = known.get(name)
+        if previous is not None and not force:
+            if previous.mtime_ns == stat.st_mtime_ns and previous.size == stat.st_size:
+                load.unchanged += 1
+                continue
+        stats[name] = stat
+        jobs.append((name, previous.sha256 if previous and not force else None))
+
+    for parsed in _parse_all(jobs, workers, settings.LOCAL_CORPUS_MMAP_MIN_KB * 1024):
+        stat = stats[parsed.path]
+        previous = known.get(parsed.path)
+        state = FileState(parsed.path, stat.st_mtime_ns, stat.st_size, parsed.sha256)
+        if parsed.text is None:
+            # Touched but not edited: keep its chunks, remember the new mtime
+            state.chunks = previous.chunks
+            load.rehashed += 1
+        else:
+            if previous is not None and previous.sha256 != parsed.sha256:
+                load.previous[parsed.path] = previous
+            load.documents.append(Document(
+                page_content=parsed.text,
+                metadata={"source": parsed.path, "title": parsed.title, "sha256": parsed.sha256},
+            ))
+        load.states.append(state)
+
+    load.removed = [state for path, state in known.items() if path not in seen]
+    load.seconds = time.perf_counter() - started
+    logger.info(
+        f"Scanned {load.files} files in {root} ({load.files_per_sec:.0f} files/sec): "
+        f"{len(load.documents)} new or changed, {load.unchanged + load.rehashed} unchanged, {len(load.removed)} removed"
+    )
+    return load
+
+
+def _delete_chunks(stores: Sequence[Chroma], states: Iterable[FileState]) -> int:
+    """Delete the chunks stored for earlier versions of files."""
+    ids = [chunk_id(state.source_id, i) for state in states for i in range(state.chunks)]
+    if ids:
+        for store in stores:
+            store.delete(ids=ids)
+            bump_version(store)
+    return len(ids)
+
+
+def ingest_directory(
+    root: str,
+    include: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+    force: bool = False,
+    split: Optional[Splitter] = None,
+    index: Optional[FileIndex] = None,
+    manifest: Optional[IngestManifest] = None,
+    vectorstore: Optional[Chroma] = None,
+) -> Tuple[LocalLoad, IngestionSummary]:
+    """
+    Ingest the new and changed files of a directory and drop the chunks of edited and removed files.
+
+    Each file version is an ingest_sources() source ("<path>@<hash prefix>"),
+    so an interrupted run resumes like a web ingestion, and the chunks of
+    the previous version are deleted once the new one is written.
+
+    Args:
+        root: Directory of the corpus.
+        include: Glob patterns relative to root (default: LOCAL_CORPUS_INCLUDE).
+        exclude: Glob patterns relative to root (default: LOCAL_CORPUS_EXCLUDE).
+        workers: Parser processes (default: LOCAL_CORPUS_WORKERS, 0 = one per CPU).
+        force: Re-ingest every file, even if unchanged.
+        split: Chunks a file's document (default: split_documents()).
+        index: File index (default: the one at LOCAL_CORPUS_INDEX_PATH).
+        manifest: Progress manifest (default: the one at LOCAL_CORPUS_MANIFEST_PATH).
+        vectorstore: Target collection (default: the shared one, or the shards if CHROMA_SHARDS > 1).
+
+    Returns:
+        The directory load and the ingestion summary.
+    """
+    index = index or FileIndex(settings.LOCAL_CORPUS_INDEX_PATH)
+    manifest = manifest or IngestManifest(settings.LOCAL_CORPUS_MANIFEST_PATH)
+    load = load_directory(root, include, exclude, workers, index, force)
+    states = {state.path: state for state in load.states}
+    documents = {states[doc.metadata["source"]].source_id: doc for doc in load.documents}
+
+    summary = ingest_sources(
+        list(documents), load=lambda source: [documents[source]], split=split,
+        manifest=manifest, vectorstore=vectorstore, max_load_retries=0,
+    )
+
+    # Touched files keep their chunks; edited files are recorded once written
+    changed = {doc.metadata["source"] for doc in load.documents}
+    written = [state for state in load.states if state.path not in changed]
+    for source_id, doc in documents.items():
+        if source_id not in summary.failed:
+            state = states[doc.metadata["source"]]
+            state.chunks = manifest.get(source_id).chunks or 0
+            written.append(state)
+
+    stale = [load.previous[state.path] for state in written if state.path in load.previous]
+    deleted = _delete_chunks(target_stores(vectorstore), stale + load.removed)
+    index.record(written)
+    index.forget(state.path for state in load.removed)
+    if deleted:
+        logger.info(f"Deleted {deleted} chunks of edited or removed files")
+    return load, summary
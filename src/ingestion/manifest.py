@@ -0,0 +1,202 @@
+"""Durable progress manifest of an ingestion run.
+
+A SQLite file (INGEST_MANIFEST_PATH) records each source's stage:
+
+- pending: reached, but fetching it failed
+- loaded: fetched; its documents are kept in the manifest, so a resumed run
+  doesn't fetch it again
+- split: chunked (with the number of chunks)
+- written: every chunk embedded and stored; the kept documents are dropped
+
+Failures are recorded with the stage they happened in. A run that doesn't
+finish (an exception, Ctrl-C, or sources that failed) leaves the manifest in
+place, and the next run resumes from it; after a run that finished, the next
+one starts over.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from langchain_core.documents import Document
+
+STAGES = ("pending", "loaded", "split", "written")
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        started REAL NOT NULL,
+        finished REAL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS sources (
+        source TEXT PRIMARY KEY,
+        stage TEXT NOT NULL,
+        chunks INTEGER,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        error TEXT,
+        failed_stage TEXT,
+        updated REAL NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS documents (
+        source TEXT NOT NULL,
+        idx INTEGER NOT NULL,
+        content TEXT NOT NULL,
+        metadata TEXT NOT NULL,
+        PRIMARY KEY (source, idx)
+    )
+    """,
+)
+
+
+@dataclass
+class SourceState:
+    """Manifest entry of one source."""
+
+    source: str
+    stage: str
+    chunks: Optional[int] = None
+    attempts: int = 0
+    error: Optional[str] = None
+    failed_stage: Optional[str] = None
+
+
+class IngestManifest:
+    """
+    Per-source ingestion progress in a SQLite file.
+
+    Every update is committed at once, so the manifest reflects all work
+    completed before an interruption.
+
+    Args:
+        path: Database file (created with its directory).
+        busy_timeout: Seconds to wait for another writer's lock.
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 10.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        conn = self._connection()
+        for statement in _SCHEMA:
+            conn.execute(statement)
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection (reopened after a fork)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def start_run(self, fresh: bool = False) -> bool:
+        """
+        Begin a run, resuming the previous one if it didn't finish.
+
+        Args:
+            fresh: Discard the progress of an unfinished run.
+
+        Returns:
+            Whether the run resumes an unfinished one.
+        """
+        conn = self._connection()
+        last = conn.execute("SELECT finished FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+        resumed = last is not None and last[0] is None and not fresh
+        if not resumed:
+            conn.execute("DELETE FROM sources")
+            conn.execute("DELETE FROM documents")
+        conn.execute("INSERT INTO runs (started) VALUES (?)", (time.time(),))
+        return resumed
+
+    def finish_run(self) -> None:
+        """Mark the current run as finished (the next run starts over)."""
+        self._connection().execute(
+            "UPDATE runs SET finished = ? WHERE id = (SELECT MAX(id) FROM runs)", (time.time(),)
+        )
+
+    def get(self, source: str) -> Optional[SourceState]:
+        """Manifest entry of a source, or None if it wasn't reached yet."""
+        row = self._connection().execute(
+            "SELECT source, stage, chunks, attempts, error, failed_stage FROM sources WHERE source = ?", (source,)
+        ).fetchone()
+        return SourceState(*row) if row else None
+
+    def save_loaded(self, source: str, documents: Sequence[Document], attempts: int) -> None:
+        """Record a fetched source and keep its documents."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM documents WHERE source = ?", (source,))
+            conn.executemany(
+                "INSERT INTO documents (source, idx, content, metadata) VALUES (?, ?, ?, ?)",
+                [(source, i, doc.page_content, json.dumps(doc.metadata, default=str)) for i, doc in enumerate(documents)],
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO sources (source, stage, attempts, updated) VALUES (?, 'loaded', ?, ?)",
+                (source, attempts, time.time()),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def documents(self, source: str) -> List[Document]:
+        """Documents kept for a loaded (not yet written) source."""
+        rows = self._connection().execute(
+            "SELECT content, metadata FROM documents WHERE source = ? ORDER BY idx", (source,)
+        ).fetchall()
+        return [Document(page_content=content, metadata=json.loads(metadata)) for content, metadata in rows]
+
+    def mark_split(self, source: str, chunks: int) -> None:
+        """Record the number of chunks of a source."""
+        self._connection().execute(
+            "UPDATE sources SET stage = 'split', chunks = ?, error = NULL, failed_stage = NULL, updated = ? "
+            "WHERE source = ?",
+            (chunks, time.time(), source),
+        )
+
+    def mark_written(self, sources: Sequence[str]) -> None:
+        """Record sources whose chunks are all stored, dropping their kept documents."""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            for source in sources:
+                conn.execute(
+                    "UPDATE sources SET stage = 'written', error = NULL, failed_stage = NULL, updated = ? "
+                    "WHERE source = ?",
+                    (now, source),
+                )
+                conn.execute("DELETE FROM documents WHERE source = ?", (source,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def mark_failed(self, source: str, stage: str, error: str, attempts: int = 0) -> None:
+        """Record a failure in `stage` ("load", "split" or "embed"); the source keeps its last completed stage."""
+        self._connection().execute(
+            "INSERT INTO sources (source, stage, attempts, error, failed_stage, updated) VALUES (?, 'pending', ?, ?, ?, ?) "
+            "ON CONFLICT (source) DO UPDATE SET attempts = attempts + excluded.attempts, error = excluded.error, "
+            "failed_stage = excluded.failed_stage, updated = excluded.updated",
+            (source, attempts, error, stage, time.time()),
+        )
+
+    def progress(self) -> Dict[str, int]:
+        """Number of sources per stage, plus "failed"."""
+        conn = self._connection()
+        counts = dict(conn.execute("SELECT stage, COUNT(*) FROM sources GROUP BY stage").fetchall())
+        counts["failed"] = conn.execute("SELECT COUNT(*) FROM sources WHERE error IS NOT NULL").fetchone()[0]
+        return counts
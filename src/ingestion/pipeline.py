@@ -0,0 +1,244 @@
+"""Resumable ingestion: load, split, embed and write sources, recording progress in the manifest.
+
+Sources are processed in order. Each is fetched (retried up to
+INGEST_LOAD_MAX_RETRIES times) and split. Once enough chunks have been
+collected for a full round of concurrent embedding batches, they are
+embedded and written together. Chunk IDs are derived from the source and
+the chunk's position, so writing a chunk again overwrites it. A resumed run:
+
+- skips sources already written
+- reuses the kept documents of sources already fetched
+- embeds only the chunks of a half-written source that are not stored yet
+
+Near-duplicate chunks (across all sources of the run) are removed before
+embedding (see dedup.py); a resumed run only compares against the chunks
+it has seen itself.
+
+A source that fails is recorded and skipped, and the run goes on with the
+others. The run is then left unfinished, so the next one retries the
+failed sources.
+"""
+
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+
+from src.config import logger_ingestion as logger
+from src.config.settings import settings
+from src.ingestion.dedup import Deduplicator
+from src.ingestion.embedding import embed_and_store
+from src.ingestion.manifest import IngestManifest
+from src.ingestion.shards import get_shards, ingest_shards
+
+Loader = Callable[[str], List[Document]]
+Splitter = Callable[[List[Document]], List[Document]]
+
+
+@dataclass
+class IngestionSummary:
+    """Outcome of an ingest_sources() run."""
+
+    sources: int = 0
+    written: int = 0
+    skipped: int = 0  # Written by an earlier run
+    reused: int = 0  # Fetched by an earlier run, not fetched again
+    retried: int = 0  # Fetch retries
+    failed: Dict[str, str] = field(default_factory=dict)  # Source -> "<stage>: <error>"
+    chunks: int = 0  # Embedded and written by this run
+    chunks_skipped: int = 0  # Already stored by an earlier run
+    duplicates: int = 0  # Near-duplicate chunks not embedded
+    resumed: bool = False
+    stage_seconds: Dict[str, float] = field(default_factory=lambda: {"load": 0.0, "split": 0.0, "embed": 0.0})
+
+
+def chunk_id(source: str, index: int) -> str:
+    """Stable vector store ID of a source's index-th chunk."""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{source}#{index}"))
+
+
+def load_url(url: str) -> List[Document]:
+    """Fetch a web page (the default loader)."""
+    from src.ingestion.vectorstore import load_documents
+
+    return load_documents([url])
+
+
+def _load(source: str, load: Loader, max_retries: int, backoff: float) -> Tuple[List[Document], int]:
+    """Fetch a source, retrying with exponential backoff. Returns the documents and the retries used."""
+    for attempt in range(max_retries + 1):
+        try:
+            return load(source), attempt
+        except Exception as e:
+            if attempt == max_retries:
+                raise
+            logger.warning(f"Loading {source} failed ({e}), retry {attempt + 1}/{max_retries}")
+            time.sleep(backoff * 2 ** attempt)
+    raise AssertionError("unreachable")
+
+
+def _stored_ids(stores: Sequence[Chroma], ids: List[str]) -> set:
+    """Which of the IDs are already in the collection (or shards)."""
+    stored: set = set()
+    for store in stores:
+        stored.update(store.get(ids=ids, include=[])["ids"])
+    return stored
+
+
+def _update_metadata(stores: Sequence[Chroma], documents: Sequence[Document]) -> None:
+    """Rewrite the metadata of stored chunks (chunks not stored are ignored)."""
+    by_id = {doc.id: doc for doc in documents if doc.id}
+    for store in stores:
+        ids = store.get(ids=list(by_id), include=[])["ids"]
+        if ids:
+            store._collection.update(ids=ids, metadatas=[by_id[i].metadata for i in ids])
+
+
+def target_stores(vectorstore: Optional[Chroma] = None) -> List[Chroma]:
+    """The given collection, else the shards if CHROMA_SHARDS > 1, else the shared collection."""
+    from src.ingestion.vectorstore import get_vectorstore
+
+    if vectorstore is not None:
+        return [vectorstore]
+    return get_shards() if settings.CHROMA_SHARDS > 1 else [get_vectorstore()]
+
+
+def format_summary(summary: IngestionSummary) -> str:
+    """Human-readable ingestion summary."""
+    lines = [
+        f"Ingestion {'resumed' if summary.resumed else 'run'}: {summary.sources} sources, "
+        f"{summary.written} written, {summary.skipped} already done, {summary.reused} reused, "
+        f"{len(summary.failed)} failed, {summary.retried} fetch retries",
+        f"Chunks: {summary.chunks} embedded, {summary.chunks_skipped} already stored, "
+        f"{summary.duplicates} near-duplicates not embedded",
+        "Time per stage: " + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in summary.stage_seconds.items()),
+    ]
+    lines += [f"  failed {source}: {error}" for source, error in summary.failed.items()]
+    return "\n".join(lines)
+
+
+def ingest_sources(
+    sources: Sequence[str],
+    load: Optional[Loader] = None,
+    split: Optional[Splitter] = None,
+    manifest: Optional[IngestManifest] = None,
+    vectorstore: Optional[Chroma] = None,
+    fresh: bool = False,
+    max_load_retries: Optional[int] = None,
+    backoff: float = 0.5,
+    dedup: Optional[Deduplicator] = None,
+) -> IngestionSummary:
+    """
+    Ingest sources, resuming an unfinished earlier run from the manifest.
+
+    Args:
+        sources: Source identifiers (URLs for the default loader).
+        load: Returns the documents of a source (default: fetch the URL).
+        split: Chunks a source's documents (default: split_documents()).
+        manifest: Progress manifest (default: the one at INGEST_MANIFEST_PATH).
+        vectorstore: Target collection (default: the shared one, or the shards if CHROMA_SHARDS > 1).
+        fresh: Start over even if the previous run didn't finish.
+        max_load_retries: Retries per failed fetch (default: INGEST_LOAD_MAX_RETRIES).
+        backoff: Seconds before the first fetch retry, doubled for each further one.
+        dedup: Near-duplicate filter for the run (default: a new one with the INGEST_DEDUP settings).
+
+    Returns:
+        Sources written, skipped, reused, retried and failed, chunks, and time per stage.
+    """
+    from src.ingestion.vectorstore import split_documents
+
+    load = load or load_url
+    split = split or split_documents
+    dedup = dedup or Deduplicator()
+    manifest = manifest or IngestManifest(settings.INGEST_MANIFEST_PATH)
+    max_load_retries = settings.INGEST_LOAD_MAX_RETRIES if max_load_retries is None else max_load_retries
+    stores = target_stores(vectorstore)
+
+    summary = IngestionSummary(sources=len(sources), resumed=manifest.start_run(fresh))
+    if summary.resumed:
+        logger.info(f"Resuming unfinished ingestion ({manifest.progress()})")
+
+    # Chunks for one full round of concurrent embedding batches are written together
+    window = settings.INGEST_EMBED_BATCH_SIZE * settings.INGEST_EMBED_CONCURRENCY
+    pending: List[Tuple[str, List[Document]]] = []
+
+    def flush() -> None:
+        chunks = [chunk for _, source_chunks in pending for chunk in source_chunks]
+        names = [source for source, _ in pending]
+        pending.clear()
+        stored = _stored_ids(stores, [chunk.id for chunk in chunks]) if summary.resumed else set()
+        missing = [chunk for chunk in chunks if chunk.id not in stored]
+        summary.chunks_skipped += len(chunks) - len(missing)
+
+        started = time.perf_counter()
+        try:
+            if missing:
+                if len(stores) > 1:
+                    ingest_shards(missing, stores)
+                else:
+                    embed_and_store(stores[0], missing)
+        except Exception as e:
+            # Batches that succeeded are stored; a rerun embeds only the rest
+            for source in names:
+                manifest.mark_failed(source, "embed", str(e))
+                summary.failed[source] = f"embed: {e}"
+            return
+        finally:
+            summary.stage_seconds["embed"] += time.perf_counter() - started
+        manifest.mark_written(names)
+        summary.written += len(names)
+        summary.chunks += len(missing)
+
+    for source in sources:
+        state = manifest.get(source)
+        if state is not None and state.stage == "written":
+            summary.skipped += 1
+            continue
+
+        started = time.perf_counter()
+        if state is not None and state.stage in ("loaded", "split"):
+            documents = manifest.documents(source)
+            summary.reused += 1
+        else:
+            try:
+                documents, retries = _load(source, load, max_load_retries, backoff)
+            except Exception as e:
+                manifest.mark_failed(source, "load", str(e), attempts=max_load_retries + 1)
+                summary.failed[source] = f"load: {e}"
+                summary.retried += max_load_retries
+                logger.error(f"Loading {source} failed after {max_load_retries} retries: {e}")
+                continue
+            finally:
+                summary.stage_seconds["load"] += time.perf_counter() - started
+            summary.retried += retries
+            manifest.save_loaded(source, documents, attempts=retries + 1)
+
+        started = time.perf_counter()
+        try:
+            chunks = split(documents)
+        except Exception as e:
+            manifest.mark_failed(source, "split", str(e))
+            summary.failed[source] = f"split: {e}"
+            continue
+        finally:
+            summary.stage_seconds["split"] += time.perf_counter() - started
+        for index, chunk in enumerate(chunks):
+            chunk.id = chunk_id(source, index)
+        manifest.mark_split(source, len(chunks))
+
+        pending.append((source, dedup.filter(chunks)))
+        if sum(len(source_chunks) for _, source_chunks in pending) >= window:
+            flush()
+
+    if pending:
+        flush()
+    if dedup.merged:
+        _update_metadata(stores, list(dedup.merged.values()))
+    summary.duplicates = dedup.stats.duplicates
+    if not summary.failed:
+        manifest.finish_run()
+    logger.info(format_summary(summary))
+    return summary
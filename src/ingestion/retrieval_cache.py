@@ -0,0 +1,237 @@
+"""In-process cache of retrieval results, invalidated by ingestion.
+
+retrieve_node looks up the normalized question together with every
+retrieval parameter (search type, k, fetch_k, lambda_mult, score threshold,
+adaptive bounds). A hit skips embedding the question, the vector query and
+MMR; the cached document IDs are resolved with a single lookup by ID.
+
+Entries hold document IDs only and are tagged with the ingestion version of
+the collections they were read from. Every write through embed_and_store(),
+a shard rebuild or the fake seeding calls bump_version(), which stores a new
+version in the collection's metadata. The current process drops its entries
+at once; other processes (e.g. scripts/ingest.py next to the API) see the
+new version within VERSION_CHECK_SECONDS. Least recently used entries are
+evicted above RETRIEVAL_CACHE_MAX_MB.
+"""
+
+import hashlib
+import json
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+
+from src.config import logger_ingestion as logger
+from src.config.settings import settings
+from src.core.lazy import Lazy
+from src.observability.metrics import registry
+
+RETRIEVAL_CACHE_LOOKUPS = registry.counter("rag_retrieval_cache_lookups_total", "Retrieval cache lookups by result")
+RETRIEVAL_CACHE_EVICTIONS = registry.counter("rag_retrieval_cache_evictions_total", "Retrieval cache entries evicted")
+
+# Collection metadata key holding the ingestion version
+VERSION_KEY = "ingest_version"
+
+# Versions written by other processes are re-read at most this often (seconds)
+VERSION_CHECK_SECONDS = 1.0
+
+# Collection ID -> (version, time it was read)
+_versions: Dict[str, Tuple[str, float]] = {}
+_versions_lock = threading.Lock()
+
+
+def bump_version(vectorstore: Chroma) -> str:
+    """
+    Record that a collection's contents changed, invalidating cached results read from it.
+
+    Returns:
+        The new version.
+    """
+    collection = vectorstore._collection
+    version = uuid.uuid4().hex[:12]
+    # The distance function can't be changed after creation, so its keys are left out
+    metadata = {key: value for key, value in (collection.metadata or {}).items() if not key.startswith("hnsw:")}
+    try:
+        collection.modify(metadata={**metadata, VERSION_KEY: version})
+    except Exception as e:
+        logger.warning(f"Could not store the ingestion version of {collection.name}: {e}")
+    with _versions_lock:
+        _versions[str(collection.id)] = (version, time.monotonic())
+    if get_retrieval_cache.initialized and get_retrieval_cache() is not None:
+        get_retrieval_cache().clear()
+    return version
+
+
+def collection_version(vectorstore: Chroma) -> str:
+    """Ingestion version of a collection ("" if it was never bumped)."""
+    collection = vectorstore._collection
+    collection_id = str(collection.id)
+    now = time.monotonic()
+    with _versions_lock:
+        known = _versions.get(collection_id)
+    if known is not None and now - known[1] < VERSION_CHECK_SECONDS:
+        return known[0]
+
+    try:
+        metadata = vectorstore._client.get_collection(collection.name).metadata or {}
+        version = str(metadata.get(VERSION_KEY, ""))
+    except Exception as e:
+        logger.warning(f"Could not read the ingestion version of {collection.name}: {e}")
+        version = known[0] if known else ""
+    with _versions_lock:
+        _versions[collection_id] = (version, now)
+    if known is not None and known[0] != version:
+        logger.info(f"{collection.name} changed (version {known[0] or '-'} -> {version}); dropping cached retrievals")
+        if get_retrieval_cache() is not None:
+            get_retrieval_cache().clear()
+    return version
+
+
+def normalize_question(question: str) -> str:
+    """Case- and whitespace-insensitive form of a question."""
+    return " ".join(question.split()).casefold()
+
+
+def retrieval_key(question: str, params: Dict[str, Any], stores: Sequence[Chroma]) -> str:
+    """Cache key of a retrieval: normalized question, retrieval parameters and collections."""
+    payload = json.dumps(
+        [normalize_question(question), params, [str(store._collection.id) for store in stores]],
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class RetrievalCache:
+    """
+    LRU map of retrieval keys to (version, document IDs), capped in bytes.
+
+    Thread-safe. Sizes are estimated from the key and ID strings, which make
+    up nearly all of an entry.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Tuple[str, ...], Tuple[str, ...], int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: Tuple[str, ...]) -> Optional[List[str]]:
+        """Cached document IDs, or None if missing or read from an older version."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != version:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return list(entry[1])
+
+    def put(self, key: str, version: Tuple[str, ...], ids: Sequence[str]) -> None:
+        """Store document IDs, evicting least recently used entries above the cap."""
+        ids = tuple(ids)
+        size = sys.getsizeof(key) + sys.getsizeof(ids) + sum(sys.getsizeof(doc_id) for doc_id in ids)
+        if size > self.max_bytes:
+            return
+        evicted = 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (version, ids, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                evicted += 1
+        if evicted:
+            RETRIEVAL_CACHE_EVICTIONS.inc(evicted)
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Entries and estimated bytes."""
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes}
+
+
+def _build_retrieval_cache() -> Optional[RetrievalCache]:
+    """Create the retrieval cache (None when disabled)."""
+    if not settings.RETRIEVAL_CACHE_ENABLED:
+        return None
+    return RetrievalCache(int(settings.RETRIEVAL_CACHE_MAX_MB * 1024 * 1024))
+
+
+get_retrieval_cache = Lazy("retrieval_cache", _build_retrieval_cache)
+
+
+def default_stores() -> List[Chroma]:
+    """The collections get_retriever() reads when no vector store is passed."""
+    from src.ingestion.shards import get_shards
+    from src.ingestion.vectorstore import get_vectorstore
+
+    return get_shards() if settings.CHROMA_SHARDS > 1 else [get_vectorstore()]
+
+
+def documents_by_id(stores: Sequence[Chroma], ids: List[str]) -> Optional[List[Document]]:
+    """Load documents by ID, in the given order (None if any of them is gone)."""
+    found: Dict[str, Document] = {}
+    for store in stores:
+        results = store.get(ids=[doc_id for doc_id in ids if doc_id not in found], include=["documents", "metadatas"])
+        for doc_id, text, metadata in zip(results["ids"], results["documents"], results["metadatas"]):
+            found[doc_id] = Document(page_content=text, metadata=metadata or {}, id=doc_id)
+        if len(found) == len(set(ids)):
+            return [found[doc_id] for doc_id in ids]
+    return None
+
+
+def cached_retrieve(
+    question: str,
+    params: Dict[str, Any],
+    retrieve: Callable[[], List[Document]],
+    stores: Optional[Sequence[Chroma]] = None,
+) -> Tuple[List[Document], bool]:
+    """
+    Return the cached documents for a question and retrieval parameters, or retrieve and cache them.
+
+    Args:
+        question: The user's question.
+        params: Every retrieval parameter that affects the result.
+        retrieve: Runs the retrieval on a miss.
+        stores: Collections the retriever reads (default: those of get_retriever()).
+
+    Returns:
+        The documents, and whether they came from the cache.
+    """
+    cache = get_retrieval_cache()
+    if cache is None:
+        return retrieve(), False
+
+    stores = list(stores) if stores is not None else default_stores()
+    key = retrieval_key(question, params, stores)
+    # Read before retrieving: a concurrent ingestion leaves the entry tagged with the older version
+    version = tuple(collection_version(store) for store in stores)
+
+    ids = cache.get(key, version)
+    if ids is not None:
+        documents = documents_by_id(stores, ids) if ids else []
+        if documents is not None:
+            RETRIEVAL_CACHE_LOOKUPS.inc(result="hit")
+            return documents, True
+
+    RETRIEVAL_CACHE_LOOKUPS.inc(result="miss")
+    documents = retrieve()
+    if all(doc.id for doc in documents):
+        cache.put(key, version, [doc.id for doc in documents])
+    return documents, False
@@ -0,0 +1,230 @@
+"""Sharded knowledge base with scatter-gather retrieval.
+
+With CHROMA_SHARDS > 1 chunks are spread over that many Chroma collections
+("<CHROMA_COLLECTION_NAME>-shard-<i>"), by a stable hash of their source
+URL (CHROMA_SHARD_BY=source, a source's chunks stay together) or of their
+content (CHROMA_SHARD_BY=hash, even spread). Each shard's index stays small,
+and one shard can be rebuilt without touching the others.
+
+ShardedRetriever embeds the question once, queries every shard in parallel
+and merges the candidates into a global top-k by distance. MMR and the score
+threshold then run on the merged set, so results match a single collection
+holding the same chunks.
+"""
+
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_chroma import Chroma
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.vectorstores.utils import maximal_marginal_relevance
+from pydantic import ConfigDict
+
+from src.config import logger_ingestion as logger
+from src.config.settings import settings
+from src.core.lazy import Lazy
+from src.core.llm import get_embeddings
+from src.ingestion.embedding import EmbeddingStats, embed_and_store
+from src.ingestion.retrieval_cache import bump_version
+from src.observability.metrics import registry
+
+SHARD_QUERY_SECONDS = registry.histogram("rag_shard_query_seconds", "Query time of individual shards")
+
+SHARD_BY = ("source", "hash")
+
+
+def shard_name(index: int, collection_name: Optional[str] = None) -> str:
+    """Collection name of a shard."""
+    return f"{collection_name or settings.CHROMA_COLLECTION_NAME}-shard-{index}"
+
+
+def shard_of(document: Document, num_shards: int, shard_by: Optional[str] = None) -> int:
+    """
+    Shard index of a chunk (stable across processes and runs).
+
+    Args:
+        document: The chunk.
+        num_shards: Number of shards.
+        shard_by: "source" (default: CHROMA_SHARD_BY) or "hash" (of the content).
+
+    Raises:
+        ValueError: If shard_by is unknown.
+    """
+    shard_by = shard_by or settings.CHROMA_SHARD_BY
+    if shard_by == "source":
+        key = str(document.metadata.get("source", ""))
+    elif shard_by == "hash":
+        key = document.page_content
+    else:
+        raise ValueError(f"Unknown shard_by {shard_by!r} (expected one of {', '.join(SHARD_BY)})")
+    digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % num_shards
+
+
+def partition(documents: Sequence[Document], num_shards: int, shard_by: Optional[str] = None) -> List[List[Document]]:
+    """Split chunks into one list per shard."""
+    parts: List[List[Document]] = [[] for _ in range(num_shards)]
+    for document in documents:
+        parts[shard_of(document, num_shards, shard_by)].append(document)
+    return parts
+
+
+def open_shards(
+    num_shards: Optional[int] = None,
+    persist_directory: Optional[str] = None,
+    collection_name: Optional[str] = None,
+    embeddings: Optional[Embeddings] = None,
+) -> List[Chroma]:
+    """Open (creating if needed) the shard collections."""
+    embeddings = embeddings or get_embeddings()
+    return [
+        Chroma(
+            collection_name=shard_name(index, collection_name),
+            embedding_function=embeddings,
+            persist_directory=persist_directory or settings.CHROMA_PERSIST_DIR,
+        )
+        for index in range(num_shards or settings.CHROMA_SHARDS)
+    ]
+
+
+# Shared shard connections of this process (see get_vectorstore()); none without sharding
+get_shards = Lazy("vectorstore_shards", lambda: open_shards() if settings.CHROMA_SHARDS > 1 else [])
+
+# Shard queries of concurrent requests share one pool
+_executor = Lazy(
+    "shard_executor",
+    lambda: ThreadPoolExecutor(max_workers=max(4, settings.CHROMA_SHARDS * 4), thread_name_prefix="shard-query"),
+)
+
+
+def ingest_shards(
+    documents: Sequence[Document],
+    shards: Optional[List[Chroma]] = None,
+    shard_by: Optional[str] = None,
+) -> Dict[int, EmbeddingStats]:
+    """
+    Embed chunks into their shards.
+
+    Args:
+        documents: Chunks to store.
+        shards: Shard collections (default: get_shards()).
+        shard_by: "source" or "hash" (default: CHROMA_SHARD_BY).
+
+    Returns:
+        Embedding stats per shard index.
+    """
+    shards = shards or get_shards()
+    stats = {}
+    for index, part in enumerate(partition(documents, len(shards), shard_by)):
+        if part:
+            stats[index] = embed_and_store(shards[index], part)
+    logger.info(
+        f"Ingested {len(documents)} chunks into {len(shards)} shards "
+        f"({', '.join(f'{shard_name(i)}: {s.chunks}' for i, s in stats.items())})"
+    )
+    return stats
+
+
+def rebuild_shard(
+    index: int,
+    documents: Sequence[Document],
+    shards: Optional[List[Chroma]] = None,
+    shard_by: Optional[str] = None,
+) -> EmbeddingStats:
+    """
+    Replace the contents of one shard, leaving the others untouched.
+
+    Args:
+        index: Shard to rebuild.
+        documents: Chunks of the knowledge base; only those belonging to the shard are embedded.
+        shards: Shard collections (default: get_shards()).
+        shard_by: "source" or "hash" (default: CHROMA_SHARD_BY).
+
+    Returns:
+        Embedding stats of the rebuilt shard.
+    """
+    shards = shards or get_shards()
+    shard = shards[index]
+    part = [doc for doc in documents if shard_of(doc, len(shards), shard_by) == index]
+    shard.reset_collection()
+    bump_version(shard)
+    logger.info(f"Rebuilding {shard._collection.name} with {len(part)} of {len(documents)} chunks")
+    return embed_and_store(shard, part)
+
+
+def _query_shard(shard: Chroma, embedding: List[float], n_results: int, include_embeddings: bool) -> List[Tuple]:
+    """(distance, document, embedding) candidates of one shard."""
+    started = time.perf_counter()
+    include = ["metadatas", "documents", "distances"] + (["embeddings"] if include_embeddings else [])
+    results = shard._collection.query(query_embeddings=[embedding], n_results=n_results, include=include)
+    SHARD_QUERY_SECONDS.observe(time.perf_counter() - started, shard=shard._collection.name)
+
+    vectors = results["embeddings"][0] if include_embeddings else [None] * len(results["ids"][0])
+    return [
+        (distance, Document(page_content=text, metadata=metadata or {}, id=doc_id), vector)
+        for doc_id, text, metadata, distance, vector in zip(
+            results["ids"][0], results["documents"][0], results["metadatas"][0], results["distances"][0], vectors
+        )
+        if text is not None
+    ]
+
+
+class ShardedRetriever(BaseRetriever):
+    """Scatter-gather retriever over shard collections (same search types as get_retriever())."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    shards: List[Chroma]
+    search_type: str = "mmr"
+    k: int = 6
+    fetch_k: int = 20
+    lambda_mult: float = 0.5
+    score_threshold: float = 0.3
+
+    def _gather(self, embedding: List[float], n_results: int, include_embeddings: bool) -> List[Tuple]:
+        """Query all shards in parallel and return the global top n_results by distance."""
+        if len(self.shards) == 1:
+            candidates = _query_shard(self.shards[0], embedding, n_results, include_embeddings)
+        else:
+            futures = [
+                _executor().submit(_query_shard, shard, embedding, n_results, include_embeddings)
+                for shard in self.shards
+            ]
+            candidates = [candidate for future in futures for candidate in future.result()]
+        candidates.sort(key=lambda candidate: candidate[0])
+        return candidates[:n_results]
+
+    def similarity_search_with_score(self, query: str, k: int) -> List[Tuple[Document, float]]:
+        """Global top k (document, distance) pairs, nearest first."""
+        embedding = self.shards[0].embeddings.embed_query(query)
+        return [(doc, distance) for distance, doc, _ in self._gather(embedding, k, include_embeddings=False)]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun, **kwargs: Any
+    ) -> List[Document]:
+        embedding = self.shards[0].embeddings.embed_query(query)
+
+        if self.search_type == "mmr":
+            candidates = self._gather(embedding, self.fetch_k, include_embeddings=True)
+            if not candidates:
+                return []
+            selected = maximal_marginal_relevance(
+                np.array(embedding, dtype=np.float32),
+                [candidate[2] for candidate in candidates],
+                k=self.k,
+                lambda_mult=self.lambda_mult,
+            )
+            # In candidate order, as Chroma's own MMR search returns them
+            return [candidate[1] for i, candidate in enumerate(candidates) if i in selected]
+
+        candidates = self._gather(embedding, self.k, include_embeddings=False)
+        if self.search_type == "similarity_score_threshold":
+            relevance = self.shards[0]._select_relevance_score_fn()
+            return [doc for distance, doc, _ in candidates if relevance(distance) >= self.score_threshold]
+        return [doc for _, doc, _ in candidates]
@@ -1,18 +1,23 @@
 """Vector store ingestion and retrieval logic."""
 
 import os
-from functools import lru_cache
+import threading
 from typing import List, Optional
 
 from langchain_chroma import Chroma
 from langchain_community.document_loaders import WebBaseLoader
 from langchain_core.documents import Document
-from langchain_core.vectorstores import VectorStoreRetriever
+from langchain_core.retrievers import BaseRetriever
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from src.config.settings import settings
 from src.config import logger_ingestion as logger
+from src.core.http import get_requests_session
 from src.core.llm import get_embeddings
+from src.ingestion.adaptive import AdaptiveRetriever
+from src.ingestion.dedup import deduplicate
+from src.ingestion.embedding import embed_and_store
+from src.ingestion.shards import ShardedRetriever, get_shards, ingest_shards
 
 # Set USER_AGENT environment variable to avoid warnings
 os.environ.setdefault("USER_AGENT", "LangGraph-Agentic-RAG/1.0")
@@ -31,7 +36,7 @@ def load_documents(urls: List[str] | None = None) -> List[Document]:
     all_docs = []
     
     for url in urls:
-        loader = WebBaseLoader(url)
+        loader = WebBaseLoader(url, session=get_requests_session())
         docs = loader.load()
         
         # Ensure source metadata is set for each document
@@ -58,18 +63,21 @@ def split_documents(
     return splitter.split_documents(docs)
 
 
-def ingest_documents(urls: List[str] | None = None) -> Chroma:
+def ingest_documents(
+    urls: List[str] | None = None, documents: List[Document] | None = None
+) -> Chroma | List[Chroma]:
     """
     Load, split, and store documents in ChromaDB.
     
     Args:
         urls: List of URLs to ingest. Uses DEFAULT_URLS if not provided.
+        documents: Already loaded documents (e.g. from load_directory()); urls are then ignored.
         
     Returns:
-        The ChromaDB vector store instance.
+        The ChromaDB vector store instance (the shard collections if CHROMA_SHARDS > 1).
     """
-    docs = load_documents(urls)
-    logger.info(f"Loaded {len(docs)} documents from URLs")
+    docs = documents if documents is not None else load_documents(urls)
+    logger.info(f"Loaded {len(docs)} documents")
     
     # Log metadata info before splitting
     for i, doc in enumerate(docs[:3], 1):  # Log first 3 docs
@@ -77,48 +85,102 @@ def ingest_documents(urls: List[str] | None = None) -> Chroma:
     
     docs_split = split_documents(docs)
     logger.info(f"Split into {len(docs_split)} chunks")
+    docs_split, dedup_stats = deduplicate(docs_split)
+    if dedup_stats.duplicates:
+        logger.info(f"Removed {dedup_stats.duplicates} near-duplicate chunks ({dedup_stats.reduction:.0%})")
 
     # Verify metadata is preserved after splitting
     for i, doc in enumerate(docs_split[:3], 1):  # Log first 3 chunks
         logger.info(f"Chunk {i} metadata: {doc.metadata}")
 
-    vectorstore = Chroma.from_documents(
-        documents=docs_split,
+    if settings.CHROMA_SHARDS > 1:
+        ingest_shards(docs_split)
+        return get_shards()
+
+    vectorstore = Chroma(
         collection_name=settings.CHROMA_COLLECTION_NAME,
-        embedding=get_embeddings(),
+        embedding_function=get_embeddings(),
         persist_directory=settings.CHROMA_PERSIST_DIR,
     )
+    embed_and_store(vectorstore, docs_split)
     return vectorstore
 
 
+_vectorstore: Optional[Chroma] = None
+_vectorstore_lock = threading.Lock()
+
+
+def get_vectorstore() -> Chroma:
+    """
+    Get the shared persistent vector store connection (created once per process).
+    
+    Opening several Chroma clients on the same directory concurrently fails,
+    so concurrent graph runs share this instance.
+    """
+    global _vectorstore
+    if _vectorstore is None:
+        with _vectorstore_lock:
+            if _vectorstore is None:
+                _vectorstore = Chroma(
+                    collection_name=settings.CHROMA_COLLECTION_NAME,
+                    embedding_function=get_embeddings(),
+                    persist_directory=settings.CHROMA_PERSIST_DIR,
+                )
+    return _vectorstore
+
+
 def get_retriever(
     search_type: str = "mmr",
     k: int = 6,
     fetch_k: int = 20,
     lambda_mult: float = 0.5,
     score_threshold: float = 0.3,
-    vectorstore: Optional[Chroma] = None
-) -> VectorStoreRetriever:
+    vectorstore: Optional[Chroma] = None,
+    min_k: int = 2,
+    adaptive_method: str = "gap",
+) -> BaseRetriever:
     """
     Get the retriever for similarity search with configurable settings.
+
+    With CHROMA_SHARDS > 1 (and no vectorstore given) this is a scatter-gather
+    retriever over the shard collections, with the same settings.
     
     Args:
-        search_type: "mmr" for diverse results, "similarity" for top-k similar
-        k: Number of documents to retrieve (default: 6)
+        search_type: "mmr" for diverse results, "similarity" for top-k similar,
+            "adaptive" for between min_k and k documents depending on the score distribution
+        k: Number of documents to retrieve (default: 6); the maximum for "adaptive"
         fetch_k: Number of candidates to fetch before MMR selection (default: 20)
         lambda_mult: Balance between relevance (1.0) and diversity (0.0) for MMR (default: 0.5)
         score_threshold: Minimum relevance score threshold (default: 0.3)
-        vectorstore: Optional pre-initialized vectorstore. If None, creates new connection.
+        vectorstore: Optional pre-initialized vectorstore. If None, uses the shared connection.
+        min_k: Minimum number of documents for "adaptive" (default: 2)
+        adaptive_method: "gap" or "knee" cut for "adaptive" (see src/ingestion/adaptive.py)
     
     Returns:
-        Configured VectorStoreRetriever instance
+        Configured retriever instance
     """
-    if vectorstore is None:
-        vectorstore = Chroma(
-            collection_name=settings.CHROMA_COLLECTION_NAME,
-            embedding_function=get_embeddings(),
-            persist_directory=settings.CHROMA_PERSIST_DIR,
+    if vectorstore is None and settings.CHROMA_SHARDS > 1:
+        logger.info(f"Created sharded {search_type} retriever over {settings.CHROMA_SHARDS} shards: k={k}")
+        sharded = ShardedRetriever(
+            shards=get_shards(),
+            search_type=search_type,
+            k=k,
+            fetch_k=fetch_k,
+            lambda_mult=lambda_mult,
+            score_threshold=score_threshold,
         )
+        if search_type != "adaptive":
+            return sharded
+        search = sharded.similarity_search_with_score
+    else:
+        if vectorstore is None:
+            vectorstore = get_vectorstore()
+        search = lambda query, n: vectorstore.similarity_search_with_score(query, k=n)  # noqa: E731
+
+    if search_type == "adaptive":
+        # Between min_k and k documents, cut where the scores fall off
+        logger.info(f"Created adaptive retriever: k={min_k}..{k}, method={adaptive_method}")
+        return AdaptiveRetriever(search=search, min_k=min_k, max_k=k, method=adaptive_method)
     
     if search_type == "mmr":
         # MMR provides diverse results
@@ -1,6 +1,6 @@
 from src.nodes.generate import generate_node
 from src.nodes.retrieve import retrieve_node
 from src.nodes.grade_documents import grade_documents_node
-from src.nodes.websearch import web_search_node
+from src.nodes.websearch import prefetch_web_search_node, web_search_node
 
-__all__ = ["generate_node", "retrieve_node", "grade_documents_node", "web_search_node"]
+__all__ = ["generate_node", "retrieve_node", "grade_documents_node", "web_search_node", "prefetch_web_search_node"]
@@ -4,8 +4,9 @@ from typing import Any, Dict, List
 
 from langchain_core.documents import Document
 
-from src.chains import generation_chain
-from src.core import logger
+from src.chains import get_generation_chain
+from src.config import logger_nodes as logger
+from src.core.document_store import resolve_documents
 from src.core.state import GraphState
 
 
@@ -52,14 +53,14 @@ def generate_node(state: GraphState) -> Dict[str, Any]:
     logger.debug("Generating answer...")
 
     question = state["question"]
-    documents = state["documents"]
+    documents = resolve_documents(state["documents"])
     
     # Format documents with sources for better context
     context = format_documents_for_context(documents)
     logger.debug(f"Formatted {len(documents)} documents into context")
 
-    generation = generation_chain.invoke({"question": question, "context": context})
+    generation = get_generation_chain().invoke({"question": question, "context": context})
 
     logger.info(f"Generated response ({len(generation)} chars)")
 
-    return {"generation": generation, "documents": documents}
+    return {"generation": generation}
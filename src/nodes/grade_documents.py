@@ -2,8 +2,9 @@
 
 from typing import Any, Dict
 
-from src.chains import retrieval_grader
-from src.core import logger
+from src.chains import get_retrieval_grader
+from src.config import logger_nodes as logger
+from src.core.document_store import resolve_documents, to_state
 from src.core.state import GraphState
 
 
@@ -17,16 +18,18 @@ def grade_documents_node(state: GraphState) -> Dict[str, Any]:
         state: Current graph state with question and documents.
 
     Returns:
-        Updated state with filtered documents and web_search flag.
+        Updated state with filtered documents, web_search flag and the share of
+        documents graded relevant.
     """
     logger.debug("Grading document relevance...")
 
     question = state["question"]
-    documents = state["documents"]
+    documents = resolve_documents(state["documents"])
 
     filtered_docs = []
     irrelevant_count = 0
 
+    retrieval_grader = get_retrieval_grader()
     for i, doc in enumerate(documents, 1):
         score = retrieval_grader.invoke(
             {"question": question, "document": doc.page_content}
@@ -45,4 +48,5 @@ def grade_documents_node(state: GraphState) -> Dict[str, Any]:
 
     logger.info(f"Graded {len(documents)} docs → {len(filtered_docs)} relevant (web_search: {web_search})")
 
-    return {"documents": filtered_docs, "web_search": web_search}
+    relevance = len(filtered_docs) / len(documents) if documents else 0.0
+    return {"documents": to_state(filtered_docs), "web_search": web_search, "relevance": relevance}
@@ -2,9 +2,10 @@
 
 from typing import Any, Dict
 
-from src.core import logger
+from src.config import logger_nodes as logger
+from src.core.document_store import to_state
 from src.core.state import GraphState
-from src.ingestion import get_retriever
+from src.ingestion import cached_retrieve, get_retriever
 
 
 def retrieve_node(state: GraphState) -> Dict[str, Any]:
@@ -26,6 +27,8 @@ def retrieve_node(state: GraphState) -> Dict[str, Any]:
     fetch_k = retrieval_config.get("fetch_k", 20)
     lambda_mult = retrieval_config.get("lambda_mult", 0.5)
     score_threshold = retrieval_config.get("score_threshold", 0.3)
+    min_k = retrieval_config.get("min_k", 2)
+    adaptive_method = retrieval_config.get("adaptive_method", "gap")
     
     logger.info("=" * 60)
     logger.info("RETRIEVE NODE - Configuration")
@@ -35,23 +38,31 @@ def retrieve_node(state: GraphState) -> Dict[str, Any]:
     logger.info(f"fetch_k (candidates): {fetch_k}")
     logger.info(f"lambda_mult (diversity): {lambda_mult}")
     logger.info(f"score_threshold: {score_threshold}")
+    if search_type == "adaptive":
+        logger.info(f"adaptive: min_k={min_k}, method={adaptive_method}")
     logger.info(f"Question: {question[:50]}...")
     logger.info("=" * 60)
     
-    # Get retriever with specified configuration
-    retriever = get_retriever(
-        search_type=search_type,
-        k=k,
-        fetch_k=fetch_k,
-        lambda_mult=lambda_mult,
-        score_threshold=score_threshold
-    )
+    params = {
+        "search_type": search_type,
+        "k": k,
+        "fetch_k": fetch_k,
+        "lambda_mult": lambda_mult,
+        "score_threshold": score_threshold,
+        "min_k": min_k,
+        "adaptive_method": adaptive_method,
+    }
+    # Repeated questions with the same settings are served from the retrieval cache
+    documents, cached = cached_retrieve(question, params, lambda: get_retriever(**params).invoke(question))
+    if cached:
+        logger.info("✓ Retrieval cache hit")
     
-    documents = retriever.invoke(question)
-    
-    logger.info(f"✓ Retrieved {len(documents)} documents (requested k={k})")
+    if search_type == "adaptive":
+        logger.info(f"✓ Retrieved {len(documents)} documents (adaptive k in {min_k}..{k})")
+    else:
+        logger.info(f"✓ Retrieved {len(documents)} documents (requested k={k})")
     for i, doc in enumerate(documents, 1):
         source = doc.metadata.get("source", "unknown")
         logger.info(f"  Doc {i}: {source[:60]}...")
     
-    return {"documents": documents}
+    return {"documents": to_state(documents), "retrieval_k": len(documents)}
@@ -1,34 +1,30 @@
 """Web search node - searches the web for additional information."""
 
+import time
 from typing import Any, Dict
 
 from langchain_core.documents import Document
-from langchain_tavily import TavilySearch
 
+from src.config import logger_nodes as logger
 from src.config.settings import settings
-from src.core import logger
+from src.core import get_web_search_tool
+from src.core.document_store import to_state
 from src.core.state import GraphState
+from src.observability.metrics import registry
 
-# Initialize web search tool
-_web_search_tool = TavilySearch(
-    max_results=settings.TAVILY_MAX_RESULTS,
-    api_key=settings.TAVILY_API_KEY,
+FANOUT_WEB_RESULTS = registry.counter(
+    "rag_router_fanout_web_results_total", "Web results fetched in parallel with retrieval that were used"
+)
+FANOUT_SAVED_SECONDS = registry.counter(
+    "rag_router_fanout_saved_seconds_total",
+    "Web search time overlapped with retrieval and grading by router fan-out (when the results were used)",
 )
 
 
-def web_search_node(state: GraphState) -> Dict[str, Any]:
-    """
-    Search the web for information related to the question.
-
-    Args:
-        state: Current graph state with question and optionally documents.
-
-    Returns:
-        Updated state with web search results appended to documents.
-    """
+def _search(state: GraphState) -> Document:
+    """Run the web search for the question and combine the results into one document."""
     question = state["question"]
-    documents = state.get("documents") or []
-    
+
     # Get retrieval config to check web search settings
     retrieval_config = state.get("retrieval_config", {})
     max_web_results = retrieval_config.get("max_web_results", settings.TAVILY_MAX_RESULTS)
@@ -36,22 +32,61 @@ def web_search_node(state: GraphState) -> Dict[str, Any]:
     logger.debug(f"Web searching: {question[:50]}...")
     logger.info(f"Web search configured for max {max_web_results} results")
 
-    # Perform web search with configured max results
-    web_search_tool = TavilySearch(
-        max_results=max_web_results,
-        api_key=settings.TAVILY_API_KEY,
-    )
+    # Perform web search with configured max results (tool instances are cached per value)
+    web_search_tool = get_web_search_tool(int(max_web_results))
     tavily_results = web_search_tool.invoke({"query": question})["results"]
 
     # Combine search results into a single document
     joined_content = "\n".join(result["content"] for result in tavily_results)
-    web_doc = Document(
+    logger.info(f"Web search returned {len(tavily_results)} results (added as 1 document)")
+    return Document(
         page_content=joined_content,
         metadata={"source": "web_search", "title": "Web Search Results"}
     )
 
-    documents.append(web_doc)
 
-    logger.info(f"Web search returned {len(tavily_results)} results (added as 1 document)")
+def web_search_node(state: GraphState) -> Dict[str, Any]:
+    """
+    Search the web for information related to the question.
 
-    return {"documents": [web_doc]}  # Return as list to use operator.add properly
+    If the router fanned out, the results fetched in parallel with retrieval
+    are used instead of searching again.
+
+    Args:
+        state: Current graph state with question and optionally documents.
+
+    Returns:
+        Updated state with web search results appended to documents.
+    """
+    documents = state.get("documents") or []
+
+    prefetched = state.get("web_documents")
+    if prefetched:
+        # The branches start together, so the search ran alongside (at most) all of retrieval and grading
+        saved = min(state.get("web_search_seconds") or 0.0, state.get("retrieval_seconds") or 0.0)
+        FANOUT_WEB_RESULTS.inc()
+        FANOUT_SAVED_SECONDS.inc(saved)
+        logger.info(f"Using web results fetched in parallel with retrieval ({saved * 1000:.0f} ms saved)")
+        # Consumed: a later web search (unsupported generation) searches again
+        return {"documents": list(documents) + list(prefetched), "web_documents": []}
+
+    # Added to the graded documents (if any); the state's list is replaced, not mutated
+    return {"documents": list(documents) + to_state([_search(state)])}
+
+
+def prefetch_web_search_node(state: GraphState) -> Dict[str, Any]:
+    """
+    Search the web in parallel with retrieval (router fan-out on a low-confidence route).
+
+    The results are held in web_documents until grading decides whether web
+    search is needed.
+
+    Args:
+        state: Current graph state with question.
+
+    Returns:
+        Updated state with web_documents and web_search_seconds.
+    """
+    started = time.perf_counter()
+    web_doc = _search(state)
+    return {"web_documents": to_state([web_doc]), "web_search_seconds": time.perf_counter() - started}
@@ -0,0 +1,30 @@
+from src.observability.instrumentation import (
+    InstrumentationHandler,
+    RequestMetrics,
+    instrument_edge,
+    instrument_node,
+    name_chain,
+    record_cache_hit,
+    request_from_config,
+    track_request,
+)
+from src.observability.metrics import MetricsRegistry, registry
+from src.observability.tracing import JsonlSpanExporter, Span, TracingHandler, get_span_exporter, new_trace_id
+
+__all__ = [
+    "InstrumentationHandler",
+    "RequestMetrics",
+    "instrument_edge",
+    "instrument_node",
+    "name_chain",
+    "record_cache_hit",
+    "request_from_config",
+    "track_request",
+    "MetricsRegistry",
+    "registry",
+    "JsonlSpanExporter",
+    "Span",
+    "TracingHandler",
+    "get_span_exporter",
+    "new_trace_id",
+]
@@ -0,0 +1,276 @@
+"""Per-node and per-chain instrumentation: wall time, LLM calls, tokens and cache hits.
+
+Two pieces work together:
+
+- InstrumentationHandler, a LangChain callback handler attached to a run,
+  times the application's chains (marked with name_chain) and records LLM
+  calls, prompt/completion tokens and cache hits per chain.
+- instrument_node / instrument_edge wrap graph nodes and conditional edges
+  to record their wall time.
+
+Everything is aggregated into the process-wide metrics registry and, for the
+current request, into a RequestMetrics whose summary the runner attaches to
+the final state.
+"""
+
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Set
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import ChatGeneration, LLMResult
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from src.config.settings import settings
+from src.observability.metrics import registry
+
+# Metadata key marking the runs (and, by inheritance, the LLM calls) of a chain
+CHAIN_METADATA_KEY = "rag_chain"
+
+NODE_SECONDS = registry.histogram("rag_node_duration_seconds", "Wall time of graph nodes")
+EDGE_SECONDS = registry.histogram("rag_edge_duration_seconds", "Wall time of conditional edges (routing)")
+CHAIN_SECONDS = registry.histogram("rag_chain_duration_seconds", "Wall time of chain invocations")
+REQUEST_SECONDS = registry.histogram("rag_request_duration_seconds", "Wall time of whole graph runs")
+REQUESTS = registry.counter("rag_requests_total", "Graph runs by outcome")
+LLM_CALLS = registry.counter("rag_llm_calls_total", "LLM calls by chain")
+LLM_TOKENS = registry.counter("rag_llm_tokens_total", "LLM tokens by chain and type (prompt/completion)")
+CACHE_HITS = registry.counter("rag_llm_cache_hits_total", "LLM cache hits by chain and cache")
+
+# Names of the instrumented conditional edge functions (their runs are edges, not chains)
+EDGE_NAMES: Set[str] = set()
+
+
+def name_chain(chain: Runnable, name: str) -> Runnable:
+    """Give a chain a run name and mark its runs for instrumentation."""
+    return chain.with_config(run_name=name, metadata={CHAIN_METADATA_KEY: name})
+
+
+def _empty_chain_stats() -> Dict[str, float]:
+    return {"calls": 0, "ms": 0.0, "llm_calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "cache_hits": 0}
+
+
+class RequestMetrics:
+    """Collects the instrumentation of a single graph run."""
+
+    def __init__(self, trace_id: Optional[str] = None):
+        self.trace_id = trace_id
+        self.started = time.perf_counter()
+        self.nodes: Dict[str, Dict[str, float]] = {}
+        self.edges: Dict[str, Dict[str, float]] = {}
+        self.chains: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def record_step(self, kind: str, name: str, seconds: float) -> None:
+        """Record the wall time of a node ("node") or conditional edge ("edge")."""
+        target = self.nodes if kind == "node" else self.edges
+        with self._lock:
+            stats = target.setdefault(name, {"calls": 0, "ms": 0.0})
+            stats["calls"] += 1
+            stats["ms"] += seconds * 1000
+
+    def record_chain(self, chain: str, seconds: float) -> None:
+        with self._lock:
+            stats = self.chains.setdefault(chain, _empty_chain_stats())
+            stats["calls"] += 1
+            stats["ms"] += seconds * 1000
+
+    def record_llm(self, chain: str, prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+        with self._lock:
+            stats = self.chains.setdefault(chain, _empty_chain_stats())
+            stats["llm_calls"] += 1
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+
+    def record_cache_hit(self, chain: str) -> None:
+        with self._lock:
+            self.chains.setdefault(chain, _empty_chain_stats())["cache_hits"] += 1
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-request summary: total time, node/edge/chain breakdown and LLM totals."""
+        with self._lock:
+            chains = {name: dict(stats) for name, stats in self.chains.items()}
+            summary = {
+                "trace_id": self.trace_id,
+                "total_ms": (time.perf_counter() - self.started) * 1000,
+                "nodes": {name: dict(stats) for name, stats in self.nodes.items()},
+                "edges": {name: dict(stats) for name, stats in self.edges.items()},
+                "chains": chains,
+            }
+        summary["llm"] = {
+            key: sum(stats[key] for stats in chains.values())
+            for key in ("llm_calls", "prompt_tokens", "completion_tokens", "cache_hits")
+        }
+        return summary
+
+
+class InstrumentationHandler(BaseCallbackHandler):
+    """Callback handler recording chain timings and LLM usage for a request."""
+
+    def __init__(self, request: Optional[RequestMetrics] = None):
+        self.request = request or RequestMetrics()
+        self._chain_runs: Dict[UUID, tuple] = {}
+        self._llm_runs: Dict[UUID, str] = {}
+        self._lock = threading.Lock()
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs) -> None:
+        chain = (metadata or {}).get(CHAIN_METADATA_KEY)
+        if chain and kwargs.get("name") == chain:
+            with self._lock:
+                self._chain_runs[run_id] = (chain, time.perf_counter())
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs) -> None:
+        self._finish_chain(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs) -> None:
+        self._finish_chain(run_id)
+
+    def _finish_chain(self, run_id: UUID) -> None:
+        with self._lock:
+            run = self._chain_runs.pop(run_id, None)
+        if run is None:
+            return
+        chain, started = run
+        elapsed = time.perf_counter() - started
+        CHAIN_SECONDS.observe(elapsed, chain=chain)
+        self.request.record_chain(chain, elapsed)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs) -> None:
+        self._start_llm(run_id, metadata)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs) -> None:
+        self._start_llm(run_id, metadata)
+
+    def _start_llm(self, run_id: UUID, metadata: Optional[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._llm_runs[run_id] = (metadata or {}).get(CHAIN_METADATA_KEY, "other")
+
+    def on_llm_end(self, response: LLMResult, *, run_id, **kwargs) -> None:
+        with self._lock:
+            chain = self._llm_runs.pop(run_id, "other")
+        prompt_tokens, completion_tokens, cached_tokens = token_usage(response)
+
+        LLM_CALLS.inc(chain=chain)
+        LLM_TOKENS.inc(prompt_tokens, chain=chain, type="prompt")
+        LLM_TOKENS.inc(completion_tokens, chain=chain, type="completion")
+        self.request.record_llm(chain, prompt_tokens, completion_tokens)
+        if cached_tokens:
+            record_cache_hit(chain, cache="prompt", request=self.request)
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        with self._lock:
+            self._llm_runs.pop(run_id, None)
+
+
+def token_usage(response: LLMResult) -> tuple:
+    """Extract (prompt, completion, cached prompt) token counts from an LLM result."""
+    for generations in response.generations:
+        for generation in generations:
+            if isinstance(generation, ChatGeneration):
+                usage = getattr(generation.message, "usage_metadata", None)
+                if usage:
+                    cached = (usage.get("input_token_details") or {}).get("cache_read", 0)
+                    return usage.get("input_tokens", 0), usage.get("output_tokens", 0), cached or 0
+    usage = (response.llm_output or {}).get("token_usage") or {}
+    return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0), 0
+
+
+def record_cache_hit(chain: str, cache: str = "response", request: Optional[RequestMetrics] = None) -> None:
+    """Count a cache hit for a chain (prompt cache of the provider or a response cache)."""
+    CACHE_HITS.inc(chain=chain, cache=cache)
+    if request is not None:
+        request.record_cache_hit(chain)
+
+
+def request_from_config(config: Optional[RunnableConfig]) -> Optional[RequestMetrics]:
+    """Find the RequestMetrics of the InstrumentationHandler attached to a run config."""
+    callbacks = (config or {}).get("callbacks")
+    handlers = getattr(callbacks, "handlers", callbacks) or []
+    for handler in handlers:
+        if isinstance(handler, InstrumentationHandler):
+            return handler.request
+    return None
+
+
+def _instrument(kind: str, name: str, fn: Callable, histogram) -> Callable:
+    """Wrap a node or edge function, passing `config` through if it accepts one."""
+    accepts_config = "config" in inspect.signature(fn).parameters
+
+    def wrapper(state: Dict[str, Any], config: RunnableConfig) -> Any:
+        started = time.perf_counter()
+        try:
+            return fn(state, config=config) if accepts_config else fn(state)
+        finally:
+            elapsed = time.perf_counter() - started
+            histogram.observe(elapsed, **{kind: name})
+            request = request_from_config(config)
+            if request is not None:
+                request.record_step(kind, name, elapsed)
+
+    wrapper.__name__ = fn.__name__
+    wrapper.__qualname__ = fn.__qualname__
+    wrapper.__doc__ = fn.__doc__
+    return wrapper
+
+
+def instrument_node(name: str, fn: Callable) -> Callable:
+    """Wrap a graph node to record its wall time."""
+    return _instrument("node", name, fn, NODE_SECONDS)
+
+
+def instrument_edge(fn: Callable) -> Callable:
+    """Wrap a conditional edge function to record its wall time."""
+    EDGE_NAMES.add(fn.__name__)
+    return _instrument("edge", fn.__name__, fn, EDGE_SECONDS)
+
+
+def with_handlers(config: Optional[RunnableConfig], *handlers: BaseCallbackHandler) -> RunnableConfig:
+    """Return a copy of config with the handlers added to its callbacks."""
+    config = dict(config or {})
+    callbacks = config.get("callbacks")
+    if callbacks is None:
+        config["callbacks"] = list(handlers)
+    elif isinstance(callbacks, list):
+        config["callbacks"] = [*callbacks, *handlers]
+    else:
+        manager = callbacks.copy()
+        for handler in handlers:
+            manager.add_handler(handler, inherit=True)
+        config["callbacks"] = manager
+    return config
+
+
+@contextmanager
+def track_request(config: Optional[RunnableConfig] = None, trace_id: Optional[str] = None) -> Iterator[tuple]:
+    """
+    Instrument (and, if TRACE_ENABLED, trace) one graph run.
+
+    Args:
+        config: Optional RunnableConfig of the run.
+        trace_id: Trace ID to use instead of a generated one.
+
+    Yields:
+        (RequestMetrics, config with the instrumentation handlers attached).
+    """
+    # Imported here because tracing builds on this module
+    from src.observability.tracing import TracingHandler, new_trace_id
+
+    handler = InstrumentationHandler(RequestMetrics(trace_id or new_trace_id()))
+    handlers = [handler]
+    if settings.TRACE_ENABLED:
+        handlers.append(TracingHandler(handler.request.trace_id))
+    status = "ok"
+    try:
+        yield handler.request, with_handlers(config, *handlers)
+    except GeneratorExit:
+        # A streaming consumer stopped early
+        status = "cancelled"
+        raise
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        REQUEST_SECONDS.observe(time.perf_counter() - handler.request.started)
+        REQUESTS.inc(status=status)
@@ -0,0 +1,166 @@
+"""Reading exported traces and rendering them as a waterfall with critical-path hotspots."""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+Span = Dict[str, Any]
+
+
+def load_traces(paths: Iterable[str | Path]) -> Dict[str, List[Span]]:
+    """
+    Read spans from JSONL trace files and group them by trace ID.
+
+    Malformed lines (e.g. a line cut by a crash) are skipped.
+    """
+    traces: Dict[str, List[Span]] = {}
+    for path in paths:
+        with Path(path).open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    span = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                traces.setdefault(span["trace_id"], []).append(span)
+    return traces
+
+
+def _root(spans: List[Span]) -> Span:
+    ids = {span["span_id"] for span in spans}
+    roots = [span for span in spans if span.get("parent_id") not in ids]
+    return min(roots, key=lambda span: span["start"])
+
+
+def _end(span: Span) -> float:
+    return span["start"] + span["duration_ms"] / 1000
+
+
+def list_traces(traces: Dict[str, List[Span]]) -> List[Dict[str, Any]]:
+    """One line of summary per trace (root name, question, start, duration, span count), newest first."""
+    rows = []
+    for trace_id, spans in traces.items():
+        root = _root(spans)
+        rows.append({
+            "trace_id": trace_id,
+            "start": root["start"],
+            "duration_ms": root["duration_ms"],
+            "question": root.get("attributes", {}).get("question", ""),
+            "spans": len(spans),
+            "errors": sum(span.get("status") == "error" for span in spans),
+        })
+    return sorted(rows, key=lambda row: row["start"], reverse=True)
+
+
+def _children(spans: List[Span]) -> Dict[Optional[str], List[Span]]:
+    children: Dict[Optional[str], List[Span]] = {}
+    for span in sorted(spans, key=lambda span: span["start"]):
+        children.setdefault(span.get("parent_id"), []).append(span)
+    return children
+
+
+def self_time_ms(span: Span, children: List[Span]) -> float:
+    """Time spent in a span outside its children (overlapping children are counted once)."""
+    intervals = sorted((child["start"], _end(child)) for child in children)
+    covered = 0.0
+    current_start = current_end = None
+    for start, end in intervals:
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                covered += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        covered += current_end - current_start
+    return max(0.0, span["duration_ms"] - covered * 1000)
+
+
+def critical_path(spans: List[Span]) -> List[Span]:
+    """
+    Find the spans on the critical path of a trace (depth-first order).
+
+    Starting at the end of a span, the child that finishes last is what the
+    span was waiting for; before that child started, the span was waiting
+    for the child finishing last before that start, and so on. Applied
+    recursively from the root, this yields the spans that determined the
+    trace's end-to-end latency.
+    """
+    children = _children(spans)
+    path: List[Span] = []
+
+    def walk(span: Span) -> None:
+        path.append(span)
+        waited_on = []
+        cursor = _end(span)
+        for child in sorted(children.get(span["span_id"], []), key=_end, reverse=True):
+            if _end(child) <= cursor + 1e-6:
+                waited_on.append(child)
+                cursor = child["start"]
+        for child in reversed(waited_on):
+            walk(child)
+
+    walk(_root(spans))
+    return path
+
+
+def hotspots(spans: List[Span], top: int = 10, critical_only: bool = True) -> List[Tuple[str, str, int, float]]:
+    """
+    Aggregate self time by (kind, name): (kind, name, count, self ms), largest first.
+
+    With critical_only, only spans on the critical path are counted.
+    """
+    children = _children(spans)
+    selected = critical_path(spans) if critical_only else spans
+    totals: Dict[Tuple[str, str], List[float]] = {}
+    for span in selected:
+        entry = totals.setdefault((span["kind"], span["name"]), [0, 0.0])
+        entry[0] += 1
+        entry[1] += self_time_ms(span, children.get(span["span_id"], []))
+    rows = [(kind, name, int(count), ms) for (kind, name), (count, ms) in totals.items()]
+    return sorted(rows, key=lambda row: row[3], reverse=True)[:top]
+
+
+def render_waterfall(spans: List[Span], width: int = 40) -> List[str]:
+    """Render spans as an indented waterfall with bars on a shared time axis."""
+    children = _children(spans)
+    root = _root(spans)
+    origin = root["start"]
+    total_ms = max(root["duration_ms"], 1e-6)
+    on_path = {span["span_id"] for span in critical_path(spans)}
+
+    lines = []
+
+    def visit(span: Span, depth: int) -> None:
+        offset_ms = (span["start"] - origin) * 1000
+        begin = min(width - 1, int(offset_ms / total_ms * width))
+        length = max(1, round(span["duration_ms"] / total_ms * width))
+        bar = " " * begin + "█" * min(length, width - begin)
+        label = f"{'  ' * depth}{span['name']} [{span['kind']}]"
+        marker = "*" if span["span_id"] in on_path else " "
+        error = "  ERROR" if span.get("status") == "error" else ""
+        lines.append(f"{marker} {label:<44.44} {offset_ms:>8.1f} {span['duration_ms']:>9.1f}  |{bar:<{width}}|{error}")
+        for child in children.get(span["span_id"], []):
+            visit(child, depth + 1)
+
+    visit(root, 0)
+    return lines
+
+
+def format_trace_report(spans: List[Span], width: int = 40, top: int = 10) -> str:
+    """Format the waterfall, critical path and self-time hotspots of one trace."""
+    root = _root(spans)
+    question = root.get("attributes", {}).get("question", "")
+    lines = [f"Trace {root['trace_id']}  {root['duration_ms']:.1f} ms  {len(spans)} spans"]
+    if question:
+        lines.append(f"Question: {question}")
+    lines += [
+        "",
+        f"  {'span':<44} {'start ms':>8} {'dur ms':>9}  (* = critical path)",
+        *render_waterfall(spans, width),
+        "",
+        "Critical-path hotspots (self time on the critical path):",
+    ]
+    for kind, name, count, ms in hotspots(spans, top):
+        share = ms / root["duration_ms"] if root["duration_ms"] else 0.0
+        lines.append(f"  {name:<28} [{kind:<9}] x{count:<3} {ms:>9.1f} ms  {share:6.1%}")
+    return "\n".join(lines)
@@ -0,0 +1,295 @@
+"""Local request tracing: one trace per question, spans exported to a rotated JSONL file.
+
+TracingHandler is a LangChain callback handler attached to a graph run. It
+turns the runs LangChain reports into spans - the graph itself, nodes,
+conditional edges, the application's chains, LLM calls, retriever queries
+and tool calls (web search) - and drops framework-internal runs such as
+prompts and output parsers, re-parenting their children to the nearest
+recorded span. When the graph run ends, the trace is written as one JSON
+line per span by JsonlSpanExporter, from a background thread so requests
+never wait on file writes or rotation. Everything stays on the local disk.
+
+Render a trace with: uv run python scripts/trace_report.py
+"""
+
+import atexit
+import json
+import queue
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.config import logger_core as logger
+from src.config.settings import settings
+from src.core.lazy import Lazy
+from src.observability.instrumentation import CHAIN_METADATA_KEY, EDGE_NAMES, token_usage
+from src.observability.metrics import registry
+
+# Longest attribute string kept on a span (queries, tool inputs, decisions)
+MAX_ATTRIBUTE_CHARS = 200
+# Finished traces waiting for the writer thread; beyond this new traces are dropped
+MAX_PENDING_TRACES = 1000
+
+TRACES_DROPPED = registry.counter("rag_traces_dropped_total", "Traces dropped because the span writer fell behind")
+
+
+def new_trace_id() -> str:
+    """Generate a trace ID."""
+    return uuid.uuid4().hex
+
+
+@dataclass
+class Span:
+    """A timed operation within a trace."""
+
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    name: str
+    kind: str  # graph, node, edge, chain, llm, retriever, tool
+    start: float  # Epoch seconds
+    duration_ms: float = 0.0
+    status: str = "ok"
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _truncate(value: Any) -> str:
+    text = str(value)
+    return text if len(text) <= MAX_ATTRIBUTE_CHARS else text[:MAX_ATTRIBUTE_CHARS] + "..."
+
+
+class JsonlSpanExporter:
+    """
+    Append spans to a JSONL file from a background thread, rotating it by size.
+
+    export() only queues the spans of a finished trace; a writer thread
+    (started on the first export) appends them. When the file would exceed
+    max_bytes it is renamed to <file>.1 (older files shift to .2, .3, ...)
+    and at most backup_count old files are kept. If max_pending traces are
+    already waiting, new ones are dropped and counted in
+    rag_traces_dropped_total instead of slowing requests down.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        max_pending: int = MAX_PENDING_TRACES,
+    ):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._writer: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]) -> None:
+        """Queue the spans of a finished trace for writing."""
+        if not spans:
+            return
+        self._start_writer()
+        try:
+            self._queue.put_nowait(list(spans))
+        except queue.Full:
+            TRACES_DROPPED.inc()
+            logger.warning(f"Span writer is behind, dropped trace {spans[0].trace_id}")
+
+    def flush(self) -> None:
+        """Wait until every queued trace has been written."""
+        if self._writer is not None:
+            self._queue.join()
+
+    def _start_writer(self) -> None:
+        if self._writer is not None:
+            return
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_queued, name="span-writer", daemon=True)
+                self._writer.start()
+                # Traces finished just before exit are still written
+                atexit.register(self.flush)
+
+    def _write_queued(self) -> None:
+        while True:
+            spans = self._queue.get()
+            try:
+                self._write(spans)
+            except Exception as e:
+                logger.error(f"Failed to write trace {spans[0].trace_id} to {self.path}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write(self, spans: List[Span]) -> None:
+        payload = "".join(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n" for span in spans)
+        data = payload.encode("utf-8")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        size = self.path.stat().st_size if self.path.exists() else 0
+        if size and self.max_bytes and size + len(data) > self.max_bytes:
+            self._rotate()
+        with self.path.open("ab") as f:
+            f.write(data)
+
+    def _rotate(self) -> None:
+        if self.backup_count <= 0:
+            self.path.unlink(missing_ok=True)
+            return
+        for index in range(self.backup_count - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{index}")
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+        self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+
+    def files(self) -> List[Path]:
+        """The current file followed by the rotated ones, newest first."""
+        rotated = [self.path.with_name(f"{self.path.name}.{index}") for index in range(1, self.backup_count + 1)]
+        return [path for path in [self.path, *rotated] if path.exists()]
+
+
+# Process-wide span exporter configured in settings
+get_span_exporter = Lazy(
+    "span_exporter",
+    lambda: JsonlSpanExporter(settings.TRACE_FILE, settings.TRACE_MAX_BYTES, settings.TRACE_BACKUP_COUNT),
+)
+
+
+class TracingHandler(BaseCallbackHandler):
+    """Callback handler recording the spans of one graph run."""
+
+    def __init__(self, trace_id: Optional[str] = None, exporter: Optional[JsonlSpanExporter] = None):
+        self.trace_id = trace_id or new_trace_id()
+        self.exporter = exporter or get_span_exporter()
+        self.spans: List[Span] = []
+        self._open: Dict[UUID, tuple] = {}  # run_id -> (span, perf_counter start)
+        self._nearest: Dict[UUID, Optional[str]] = {}  # run_id -> nearest recorded span id
+        self._lock = threading.Lock()
+
+    # Span bookkeeping
+
+    def _start(self, run_id: UUID, parent_run_id: Optional[UUID], name: str, kind: str, **attributes) -> None:
+        with self._lock:
+            parent_id = self._nearest.get(parent_run_id) if parent_run_id else None
+            span = Span(
+                trace_id=self.trace_id,
+                span_id=run_id.hex,
+                parent_id=parent_id,
+                name=name,
+                kind=kind,
+                start=time.time(),
+                attributes={key: value for key, value in attributes.items() if value is not None},
+            )
+            self._open[run_id] = (span, time.perf_counter())
+            self._nearest[run_id] = span.span_id
+
+    def _skip(self, run_id: UUID, parent_run_id: Optional[UUID]) -> None:
+        with self._lock:
+            self._nearest[run_id] = self._nearest.get(parent_run_id) if parent_run_id else None
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None, **attributes) -> None:
+        with self._lock:
+            self._nearest.pop(run_id, None)
+            entry = self._open.pop(run_id, None)
+            if entry is None:
+                return
+            span, started = entry
+            span.duration_ms = (time.perf_counter() - started) * 1000
+            span.attributes.update({key: value for key, value in attributes.items() if value is not None})
+            if error is not None:
+                span.status = "error"
+                span.error = _truncate(f"{type(error).__name__}: {error}")
+            self.spans.append(span)
+            finished = span.kind == "graph"
+            spans = list(self.spans) if finished else None
+
+        if finished:
+            self.exporter.export(spans)
+
+    # Chains: graph, nodes, edges and the application's chains
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs) -> None:
+        metadata = metadata or {}
+        name = kwargs.get("name") or ""
+        node = metadata.get("langgraph_node")
+
+        if parent_run_id is None:
+            question = inputs.get("question") if isinstance(inputs, dict) else None
+            self._start(run_id, None, name or "graph", "graph", question=_truncate(question) if question else None)
+        elif name in EDGE_NAMES:
+            self._start(run_id, parent_run_id, name, "edge")
+        elif name and name == node and name != "__start__":
+            self._start(run_id, parent_run_id, name, "node", step=metadata.get("langgraph_step"))
+        elif name and name == metadata.get(CHAIN_METADATA_KEY):
+            self._start(run_id, parent_run_id, name, "chain")
+        else:
+            self._skip(run_id, parent_run_id)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs) -> None:
+        entry = self._open.get(run_id)
+        is_edge = entry is not None and entry[0].kind == "edge"
+        self._end(run_id, decision=_truncate(outputs) if is_edge else None)
+
+    def on_chain_error(self, error, *, run_id, **kwargs) -> None:
+        self._end(run_id, error=error)
+
+    # LLM calls
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, metadata=None, **kwargs) -> None:
+        self._start_llm(run_id, parent_run_id, serialized, metadata, kwargs.get("name"))
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, metadata=None, **kwargs) -> None:
+        self._start_llm(run_id, parent_run_id, serialized, metadata, kwargs.get("name"))
+
+    def _start_llm(self, run_id, parent_run_id, serialized, metadata, name) -> None:
+        metadata = metadata or {}
+        name = name or (serialized or {}).get("name") or "llm"
+        self._start(run_id, parent_run_id, name, "llm", model=metadata.get("ls_model_name"))
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        prompt_tokens, completion_tokens, cached_tokens = token_usage(response)
+        self._end(
+            run_id,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            cached_tokens=cached_tokens or None,
+        )
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        self._end(run_id, error=error)
+
+    # Retriever queries
+
+    def on_retriever_start(self, serialized, query, *, run_id, parent_run_id=None, metadata=None, **kwargs) -> None:
+        metadata = metadata or {}
+        self._start(
+            run_id, parent_run_id, kwargs.get("name") or "retriever", "retriever",
+            query=_truncate(query), vectorstore=metadata.get("ls_vector_store_provider"),
+        )
+
+    def on_retriever_end(self, documents, *, run_id, **kwargs) -> None:
+        self._end(run_id, documents=len(documents))
+
+    def on_retriever_error(self, error, *, run_id, **kwargs) -> None:
+        self._end(run_id, error=error)
+
+    # Tools (web search)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "tool"
+        self._start(run_id, parent_run_id, name, "tool", input=_truncate(input_str))
+
+    def on_tool_end(self, output, *, run_id, **kwargs) -> None:
+        results = output.get("results") if isinstance(output, dict) else None
+        self._end(run_id, results=len(results) if isinstance(results, list) else None)
+
+    def on_tool_error(self, error, *, run_id, **kwargs) -> None:
+        self._end(run_id, error=error)
@@ -0,0 +1,51 @@
+"""
+Shared test setup: the provider default, throwaway state files and the fake_backends marker.
+
+Settings are read from the environment when src.config.settings is first
+imported, so this runs before any test module imports from `src`. Without an
+LLM_PROVIDER (in the environment or .env) the tests use the bundled offline
+stand-ins (src/core/fakes.py); a configured real provider is left alone. Tests
+never touch the repository's caches, checkpoints, manifests, traces or logs,
+and with the fake backends not its vector store either.
+"""
+
+import os
+import tempfile
+
+import pytest
+from dotenv import load_dotenv
+
+_STATE_DIR = tempfile.mkdtemp(prefix="rag-tests-")
+
+load_dotenv()
+os.environ.setdefault("LLM_PROVIDER", "fake")
+FAKE_BACKENDS = os.environ["LLM_PROVIDER"] == "fake"
+
+if FAKE_BACKENDS:
+    # The fake backends seed their own synthetic collection
+    os.environ["CHROMA_PERSIST_DIR"] = os.path.join(_STATE_DIR, "chroma")
+os.environ.update({
+    "LLM_CACHE_PATH": os.path.join(_STATE_DIR, "llm_responses.sqlite"),
+    "CHECKPOINT_PATH": os.path.join(_STATE_DIR, "checkpoints.sqlite"),
+    "INGEST_MANIFEST_PATH": os.path.join(_STATE_DIR, "ingest_manifest.sqlite"),
+    "LOCAL_CORPUS_INDEX_PATH": os.path.join(_STATE_DIR, "local_corpus.sqlite"),
+    "LOCAL_CORPUS_MANIFEST_PATH": os.path.join(_STATE_DIR, "local_corpus_manifest.sqlite"),
+    "TRACE_FILE": os.path.join(_STATE_DIR, "traces.jsonl"),
+    "LOG_FILE": os.path.join(_STATE_DIR, "app.log"),
+    "USER_AGENT": os.environ.get("USER_AGENT", "LangGraph-Agentic-RAG-Tests/1.0"),
+})
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "fake_backends: written against the fake model's deterministic rules (needs LLM_PROVIDER=fake)"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if FAKE_BACKENDS:
+        return
+    skip = pytest.mark.skip(reason="needs LLM_PROVIDER=fake")
+    for item in items:
+        if "fake_backends" in item.keywords:
+            item.add_marker(skip)
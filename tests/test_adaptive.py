@@ -0,0 +1,54 @@
+"""
+Tests for adaptive k selection (fake embeddings, no API keys).
+
+Run from project root:
+    pytest -s -v tests/test_adaptive.py
+"""
+
+import uuid
+
+import pytest
+from langchain_chroma import Chroma
+
+from src.core.fakes import FakeEmbeddings, synthetic_corpus
+from src.ingestion.adaptive import select_k
+from src.ingestion.embedding import embed_and_store
+from src.ingestion.vectorstore import get_retriever
+
+QUESTION = "What is agent memory?"
+
+
+class TestSelectK:
+    @pytest.mark.parametrize("method", ["gap", "knee"])
+    def test_cuts_after_clear_drop(self, method):
+        assert select_k([0.9, 0.88, 0.85, 0.4, 0.38, 0.35, 0.3], min_k=1, max_k=7, method=method) == 3
+
+    @pytest.mark.parametrize("method", ["gap", "knee"])
+    def test_even_decline_keeps_max_k(self, method):
+        assert select_k([1.0, 0.9, 0.8, 0.7, 0.6, 0.5], min_k=1, max_k=6, method=method) == 6
+
+    def test_bounded_by_min_and_max_k(self):
+        scores = [1.0, 0.2, 0.19, 0.18, 0.17, 0.16]
+        assert select_k(scores, min_k=1, max_k=6) == 1
+        assert select_k(scores, min_k=3, max_k=6) >= 3
+        assert select_k(scores, min_k=1, max_k=4) <= 4
+        assert select_k(scores[:2], min_k=3, max_k=6) == 2
+
+    def test_unknown_method(self):
+        with pytest.raises(ValueError):
+            select_k([1.0, 0.5], method="elbow")
+
+
+def test_adaptive_retriever_returns_nearest_prefix(tmp_path):
+    vectorstore = Chroma(
+        collection_name=f"test-{uuid.uuid4().hex[:8]}",
+        embedding_function=FakeEmbeddings(),
+        persist_directory=str(tmp_path),
+    )
+    embed_and_store(vectorstore, synthetic_corpus(40, words_per_doc=30))
+
+    adaptive = get_retriever(search_type="adaptive", k=10, min_k=2, vectorstore=vectorstore).invoke(QUESTION)
+    nearest = get_retriever(search_type="similarity", k=10, vectorstore=vectorstore).invoke(QUESTION)
+
+    assert 2 <= len(adaptive) <= 10
+    assert [doc.page_content for doc in adaptive] == [doc.page_content for doc in nearest[:len(adaptive)]]
@@ -0,0 +1,158 @@
+"""
+Tests for the HTTP API: queries, server-sent events, batches and readiness (fake backends, no API keys).
+
+Run from project root:
+    pytest -s -v tests/test_api.py
+"""
+
+import asyncio
+import dataclasses
+import json
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api import server
+from src.config.settings import settings
+from src.graph import warmup
+
+pytestmark = pytest.mark.fake_backends
+
+KNOWLEDGE_QUESTION = "What is agent memory?"
+WEB_QUESTION = "What are the best places to visit in Indonesia?"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """A client of a fresh app, ready without warming up (the lifespan runs on enter)."""
+    monkeypatch.setattr(server, "settings", dataclasses.replace(
+        settings, WARM_UP_ON_START=False, API_MAX_BATCH_SIZE=3
+    ))
+    with TestClient(server.create_app()) as client:
+        yield client
+
+
+def _parse_sse(body: str):
+    """Split a server-sent event stream into (event, data) pairs, checking the framing of each."""
+    assert body.endswith("\n\n")
+    events = []
+    for frame in body[:-2].split("\n\n"):
+        event_line, data_line = frame.split("\n")
+        assert event_line.startswith("event: ") and data_line.startswith("data: ")
+        name, data = event_line[len("event: "):], json.loads(data_line[len("data: "):])
+        assert data["event"] == name
+        events.append((name, data))
+    return events
+
+
+def test_query(client):
+    response = client.post("/query", json={"question": KNOWLEDGE_QUESTION, "retrieval_config": {"k": 3}})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["question"] == KNOWLEDGE_QUESTION
+    assert body["generation"] and not body["web_search"]
+    assert 0 < len(body["documents"]) <= 3
+    assert {"source", "title", "content", "metadata"} <= set(body["documents"][0])
+    assert body["latency_ms"] > 0 and body["metrics"]["chains"]
+    assert "X-Process-Time-Ms" in response.headers
+
+
+def test_query_is_validated(client):
+    assert client.post("/query", json={"question": ""}).status_code == 422
+    assert client.post("/query", json={}).status_code == 422
+
+
+def test_stream(client):
+    response = client.post("/stream", json={"question": KNOWLEDGE_QUESTION})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.headers["cache-control"] == "no-cache"
+    events = _parse_sse(response.text)
+    names = [name for name, _ in events]
+    assert names[-1] == "end" and names.count("end") == 1
+    assert "error" not in names
+    assert len(events) > 1
+
+
+def test_stream_stops_when_the_client_disconnects(monkeypatch):
+    import anyio
+
+    produced = []
+    closed = threading.Event()
+
+    def endless_stream(question, retrieval_config, request_id=None):
+        try:
+            while True:
+                produced.append(len(produced))
+                yield {"event": "token", "content": "word "}
+                time.sleep(0.01)
+        finally:
+            closed.set()
+
+    monkeypatch.setattr(server, "stream_question", endless_stream)
+    limiter = anyio.CapacityLimiter(1)
+
+    async def read_one_event():
+        events = server._stream_events(server.QueryRequest(question=KNOWLEDGE_QUESTION), limiter)
+        first = await events.__anext__()
+        await events.aclose()  # What the server does when the client goes away
+        return first
+
+    assert asyncio.run(read_one_event()).startswith("event: token")
+    # The run was stopped and closed, and its limiter slot is free again
+    assert closed.is_set() and limiter.borrowed_tokens == 0
+    count = len(produced)
+    time.sleep(0.05)
+    assert len(produced) == count < 50
+
+
+def test_batch_keeps_request_order(client):
+    questions = [KNOWLEDGE_QUESTION, WEB_QUESTION, KNOWLEDGE_QUESTION]
+    response = client.post("/batch", json={"questions": [{"question": q} for q in questions]})
+
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["question"] for item in results] == questions
+    assert all(item["generation"] and item["error"] is None for item in results)
+    # The router sends the travel question straight to web search
+    sources = [{doc["source"] for doc in item["documents"]} for item in results]
+    assert sources[1] == {"web_search"} and "web_search" not in sources[0] | sources[2]
+
+
+def test_batch_size_is_limited(client):
+    questions = [{"question": KNOWLEDGE_QUESTION}] * 4
+    response = client.post("/batch", json={"questions": questions})
+    assert response.status_code == 413
+    assert client.post("/batch", json={"questions": []}).status_code == 422
+
+
+def test_readyz_turns_ready_after_warm_up(monkeypatch):
+    # Not ready yet in this process, and warm-up held until the first /readyz answered
+    monkeypatch.setattr(warmup, "_ready", threading.Event())
+    monkeypatch.setattr(warmup, "_status", {"state": "starting", "steps_ms": {}, "errors": {}})
+    monkeypatch.setattr(server, "settings", dataclasses.replace(settings, WARM_UP_ON_START=True))
+    release = threading.Event()
+
+    def held_warm_up():
+        assert release.wait(timeout=30)
+        return warmup.warm_up()
+
+    monkeypatch.setattr(server, "warm_up", held_warm_up)
+
+    with TestClient(server.create_app()) as client:
+        assert client.get("/healthz").status_code == 200
+        response = client.get("/readyz")
+        assert response.status_code == 503
+        assert response.json()["ready"] is False
+
+        release.set()
+        deadline = time.monotonic() + 30
+        while (response := client.get("/readyz")).status_code == 503:
+            assert time.monotonic() < deadline, response.json()
+            time.sleep(0.05)
+        assert response.status_code == 200
+        assert response.json()["ready"] and response.json()["state"] == "ready"
@@ -0,0 +1,117 @@
+"""
+Tests for the batch runner: reading questions, resuming a partial output file and bounded concurrency.
+
+Run from project root:
+    pytest -s -v tests/test_batch.py
+"""
+
+import json
+import threading
+import time
+
+import pytest
+
+from src.batch import runner
+from src.batch.runner import load_completed_ids, read_questions, run_batch
+
+pytestmark = pytest.mark.fake_backends
+
+KNOWLEDGE_QUESTION = "What is agent memory?"
+
+
+@pytest.fixture(autouse=True)
+def seeded():
+    from src.core.fakes import seed_synthetic_vectorstore
+
+    seed_synthetic_vectorstore()
+
+
+def test_read_questions_jsonl(tmp_path):
+    path = tmp_path / "questions.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"id": "a", "question": " What is agent memory? ", "retrieval_config": {"k": 2}}),
+        "",
+        json.dumps({"question": "What is prompt engineering?"}),
+        json.dumps({"id": "c", "question": ""}),
+    ]), encoding="utf-8")
+
+    assert read_questions(path) == [
+        {"id": "a", "question": "What is agent memory?", "retrieval_config": {"k": 2}},
+        # Rows without an id get their row number (blank lines are not rows)
+        {"id": "2", "question": "What is prompt engineering?", "retrieval_config": {}},
+    ]
+
+
+def test_read_questions_csv(tmp_path):
+    path = tmp_path / "questions.csv"
+    path.write_text(
+        'id,question,retrieval_config\n'
+        'a,What is agent memory?,"{""k"": 2}"\n'
+        ',What is prompt engineering?,\n'
+        'c,,\n',
+        encoding="utf-8",
+    )
+
+    assert read_questions(path) == [
+        {"id": "a", "question": "What is agent memory?", "retrieval_config": {"k": 2}},
+        {"id": "2", "question": "What is prompt engineering?", "retrieval_config": {}},
+    ]
+
+
+def test_completed_ids_skip_unreadable_lines(tmp_path):
+    path = tmp_path / "results.jsonl"
+    path.write_text("\n".join([
+        json.dumps({"id": 1, "generation": "...", "error": None}),
+        json.dumps({"id": "2", "error": "TimeoutError: slow"}),
+        json.dumps({"question": "no id", "error": None}),
+        json.dumps(["not", "a", "record"]),
+        '{"id": "3", "generat',
+    ]), encoding="utf-8")
+
+    assert load_completed_ids(path) == {"1"}
+    assert load_completed_ids(tmp_path / "missing.jsonl") == set()
+
+
+def test_resume_runs_only_missing_and_failed_rows(tmp_path):
+    output = tmp_path / "results.jsonl"
+    output.write_text("\n".join([
+        json.dumps({"id": "1", "generation": "...", "error": None}),
+        json.dumps({"id": "2", "error": "TimeoutError: slow"}),
+        json.dumps({"question": "no id", "error": None}),
+        '{"id": "3", "generat',  # Interrupted mid-write, no newline
+    ]), encoding="utf-8")
+    rows = [{"id": str(i), "question": KNOWLEDGE_QUESTION, "retrieval_config": {}} for i in (1, 2, 3)]
+
+    summary = run_batch(rows, output, concurrency=2)
+
+    assert (summary.total, summary.skipped, summary.completed, summary.failed) == (3, 1, 2, 0)
+    assert summary.llm_calls_per_question > 0
+    lines = output.read_text(encoding="utf-8").splitlines()
+    appended = [json.loads(line) for line in lines[4:]]
+    assert lines[3] == '{"id": "3", "generat'
+    assert sorted(record["id"] for record in appended) == ["2", "3"]
+    assert all(record["generation"] and record["llm_calls"] > 0 for record in appended)
+    assert load_completed_ids(output) == {"1", "2", "3"}
+
+    # Nothing left to do
+    assert run_batch(rows, output).skipped == 3
+
+
+def test_bounded_map_limits_questions_in_flight(monkeypatch):
+    lock = threading.Lock()
+    in_flight = {"now": 0, "max": 0}
+
+    def run_row(row):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.01 * (1 + row["id"] % 3))
+        with lock:
+            in_flight["now"] -= 1
+        return {"id": row["id"]}
+
+    monkeypatch.setattr(runner, "_run_row", run_row)
+    records = list(runner._bounded_map(({"id": i} for i in range(20)), concurrency=3))
+
+    assert sorted(record["id"] for record in records) == list(range(20))
+    assert in_flight["max"] == 3
@@ -0,0 +1,119 @@
+"""
+Tests for the SQLite checkpoint saver: resuming failed runs and pruning (no API keys).
+
+Run from project root:
+    pytest -s -v tests/test_checkpoint.py
+"""
+
+import operator
+import time
+from typing import Annotated, List, TypedDict
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+
+from src.graph.checkpoint import SqliteCheckpointSaver
+
+
+class _State(TypedDict):
+    question: str
+    steps: Annotated[List[str], operator.add]
+
+
+def _build(saver, calls, fail_times=1):
+    """retrieve -> grade -> generate, where generate fails its first `fail_times` calls."""
+
+    def node(name):
+        def run(state):
+            calls.append(name)
+            if name == "generate" and calls.count("generate") <= fail_times:
+                raise RuntimeError("generation failed")
+            return {"steps": [name]}
+
+        return run
+
+    graph = StateGraph(_State)
+    for name in ("retrieve", "grade", "generate"):
+        graph.add_node(name, node(name))
+    graph.add_edge(START, "retrieve")
+    graph.add_edge("retrieve", "grade")
+    graph.add_edge("grade", "generate")
+    graph.add_edge("generate", END)
+    return graph.compile(checkpointer=saver)
+
+
+@pytest.fixture
+def saver(tmp_path):
+    return SqliteCheckpointSaver(str(tmp_path / "checkpoints.sqlite"))
+
+
+class TestResume:
+    """A failed run resumes from its last completed node."""
+
+    def test_resumes_after_failure(self, saver):
+        calls = []
+        app = _build(saver, calls)
+        config = {"configurable": {"thread_id": "req-1"}}
+
+        with pytest.raises(RuntimeError):
+            app.invoke({"question": "q", "steps": []}, config)
+        assert app.get_state(config).next == ("generate",)
+        saver.pop_stats("req-1")
+
+        state = app.invoke(None, config)
+
+        assert state["steps"] == ["retrieve", "grade", "generate"]
+        assert calls == ["retrieve", "grade", "generate", "generate"]
+        assert set(saver.pop_stats("req-1")) == {"generate"}
+
+    def test_resumes_from_another_saver_instance(self, saver):
+        """Checkpoints survive a restart (a new saver on the same file)."""
+        calls = []
+        config = {"configurable": {"thread_id": "req-2"}}
+        with pytest.raises(RuntimeError):
+            _build(saver, calls).invoke({"question": "q", "steps": []}, config)
+
+        state = _build(SqliteCheckpointSaver(str(saver.path)), calls).invoke(None, config)
+
+        assert state["steps"] == ["retrieve", "grade", "generate"]
+        assert calls.count("retrieve") == 1
+
+    def test_threads_are_independent(self, saver):
+        calls = []
+        app = _build(saver, calls, fail_times=0)
+        for thread_id in ("a", "b"):
+            app.invoke({"question": thread_id, "steps": []}, {"configurable": {"thread_id": thread_id}})
+
+        assert app.get_state({"configurable": {"thread_id": "a"}}).values["question"] == "a"
+        assert len(list(saver.list({"configurable": {"thread_id": "b"}}))) == 5
+
+
+class TestOverheadAndPruning:
+    """Write overhead is recorded per node; old threads are deleted."""
+
+    def test_write_stats_per_node(self, saver):
+        app = _build(saver, [], fail_times=0)
+        app.invoke({"question": "q", "steps": []}, {"configurable": {"thread_id": "stats"}})
+
+        stats = saver.pop_stats("stats")
+        assert {"retrieve", "grade", "generate"} <= set(stats)
+        assert all(node["writes"] >= 1 and node["bytes"] > 0 for node in stats.values())
+        assert saver.pop_stats("stats") == {}
+
+    def test_prune_expired_threads(self, saver):
+        app = _build(saver, [], fail_times=0)
+        app.invoke({"question": "old", "steps": []}, {"configurable": {"thread_id": "old"}})
+        time.sleep(0.05)
+        app.invoke({"question": "new", "steps": []}, {"configurable": {"thread_id": "new"}})
+
+        assert saver.prune_expired(max_age=0.04) == 1
+        assert saver.get_tuple({"configurable": {"thread_id": "old"}}) is None
+        assert saver.get_tuple({"configurable": {"thread_id": "new"}}) is not None
+
+    def test_delete_thread(self, saver):
+        app = _build(saver, [], fail_times=0)
+        config = {"configurable": {"thread_id": "done"}}
+        app.invoke({"question": "q", "steps": []}, config)
+
+        saver.delete_thread("done")
+        assert saver.get_tuple(config) is None
@@ -0,0 +1,126 @@
+"""
+Tests for near-duplicate chunk elimination at ingestion (fake embeddings, no API keys).
+
+Run from project root:
+    pytest -s -v tests/test_dedup.py
+"""
+
+import dataclasses
+import itertools
+import uuid
+
+import numpy as np
+import pytest
+from langchain_chroma import Chroma
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from src.config.settings import settings
+from src.core.fakes import FakeEmbeddings, synthetic_corpus, synthetic_site
+from src.ingestion import pipeline
+from src.ingestion.dedup import Deduplicator, deduplicate, minhash
+from src.ingestion.embedding import embed_and_store
+from src.ingestion.manifest import IngestManifest
+
+# Paragraph-sized chunks, so every navigation / citation / footer block is a chunk of its own
+_split = RecursiveCharacterTextSplitter(chunk_size=500, chunk_overlap=0).split_documents
+
+
+@pytest.fixture(scope="module")
+def pages():
+    return synthetic_site(30)
+
+
+@pytest.fixture(scope="module")
+def chunks(pages):
+    return _split(pages)
+
+
+def _similarity(a: str, b: str) -> float:
+    return float(np.mean(minhash(a) == minhash(b)))
+
+
+def _redundant_pairs(documents, threshold=0.85) -> int:
+    return sum(_similarity(a.page_content, b.page_content) >= threshold for a, b in itertools.combinations(documents, 2))
+
+
+def _store(tmp_path, documents, embeddings=None):
+    store = Chroma(
+        collection_name=f"test-{uuid.uuid4().hex[:8]}",
+        embedding_function=embeddings or FakeEmbeddings(),
+        persist_directory=str(tmp_path),
+    )
+    embed_and_store(store, [doc.model_copy(deep=True) for doc in documents])
+    return store
+
+
+def test_minhash_estimates_similarity():
+    text = synthetic_corpus(1, words_per_doc=200)[0].page_content
+    edited = text.replace("relates to", "is related to", 1)
+    other = synthetic_corpus(4, words_per_doc=200)[3].page_content
+    assert _similarity(text, text) == 1.0
+    assert _similarity(text, edited) > 0.9
+    assert _similarity(text, other) < 0.5
+
+
+def test_boilerplate_chunks_are_dropped(chunks):
+    kept, stats = deduplicate(chunks, threshold=0.85, mode="drop")
+
+    # 30 pages x 3 boilerplate blocks, of which one navigation, one footer and a citation per topic remain
+    assert stats.chunks == len(chunks) and stats.duplicates == len(chunks) - len(kept) >= 80
+    assert _redundant_pairs(kept) == 0
+    assert deduplicate(synthetic_corpus(60), threshold=0.85)[1].duplicates == 0
+    assert deduplicate(chunks, mode="off")[0] == chunks
+    with pytest.raises(ValueError):
+        deduplicate(chunks, mode="squash")
+
+
+def test_merge_records_duplicate_sources(pages):
+    kept, stats = deduplicate(_split([page.model_copy(deep=True) for page in pages]), threshold=0.85, mode="merge")
+
+    footer = next(doc for doc in kept if doc.page_content.startswith("Copyright"))
+    sources = footer.metadata["duplicate_sources"].split(",")
+    assert footer.metadata["duplicates"] == len(sources) == len(pages) - 1
+    assert footer.metadata["source"] not in sources
+    assert sum(doc.metadata.get("duplicates", 0) for doc in kept) == stats.duplicates
+
+
+def test_ingestion_embeds_fewer_chunks(tmp_path, pages, monkeypatch):
+    # Small write windows, so kept chunks are stored before their duplicates turn up
+    monkeypatch.setattr(pipeline, "settings", dataclasses.replace(settings, INGEST_EMBED_BATCH_SIZE=8, INGEST_EMBED_CONCURRENCY=1))
+    by_source = {page.metadata["source"]: page for page in pages}
+    runs = {}
+    for mode in ("off", "drop", "merge"):
+        embeddings = FakeEmbeddings()
+        store = Chroma(
+            collection_name=f"test-{uuid.uuid4().hex[:8]}", embedding_function=embeddings,
+            persist_directory=str(tmp_path),
+        )
+        summary = pipeline.ingest_sources(
+            list(by_source), load=lambda source: [by_source[source].model_copy()], split=_split,
+            manifest=IngestManifest(str(tmp_path / f"{mode}.sqlite")), vectorstore=store,
+            dedup=Deduplicator(mode=mode),
+        )
+        runs[mode] = (summary, store._collection.count(), embeddings.call_count)
+        if mode == "merge":
+            stored = store.get(where={"duplicates": {"$gt": 0}})["metadatas"]
+            assert sum(metadata["duplicates"] for metadata in stored) == summary.duplicates
+
+    (off, off_count, off_calls), (drop, drop_count, drop_calls) = runs["off"], runs["drop"]
+    assert off.duplicates == 0 and drop.duplicates >= 80
+    assert drop_count == drop.chunks == off_count - drop.duplicates
+    assert drop_calls < off_calls
+
+
+def test_retrieval_returns_no_redundant_chunks(tmp_path, chunks):
+    full = _store(tmp_path, chunks)
+    deduplicated = _store(tmp_path, deduplicate(chunks, threshold=0.85)[0])
+
+    # Boilerplate questions: the full index answers with copies of the same block
+    question = "How should I cite the notes on agents?"
+    assert _redundant_pairs(full.similarity_search(question, k=6)) > 0
+    assert _redundant_pairs(deduplicated.similarity_search(question, k=6)) == 0
+
+    # Topical questions: content chunks are never removed, so results don't change
+    for question in ["What is agent memory and planning?", "How do jailbreak attacks use suffixes?"]:
+        expected = [doc.page_content for doc in full.similarity_search(question, k=6)]
+        assert [doc.page_content for doc in deduplicated.similarity_search(question, k=6)] == expected
@@ -0,0 +1,100 @@
+"""
+Tests for document references in graph state and the shared document store (fake backends, no API keys).
+
+Run from project root:
+    pytest -s -v tests/test_document_refs.py
+"""
+
+import dataclasses
+
+import pytest
+from langchain_core.documents import Document
+
+from src.config.settings import settings
+from src.core import document_store
+from src.core.document_store import DocumentRef, DocumentStore, resolve_documents, to_state
+
+pytestmark = pytest.mark.fake_backends
+
+KNOWLEDGE_QUESTION = "What is agent memory?"
+WEB_QUESTION = "What are the best places to visit in Indonesia?"
+CONFIG = {"search_type": "similarity", "k": 6}
+
+
+@pytest.fixture(autouse=True)
+def seeded():
+    from src.core.fakes import seed_synthetic_vectorstore
+
+    seed_synthetic_vectorstore()
+
+
+@pytest.fixture
+def refs(monkeypatch):
+    """STATE_DOCUMENT_REFS=true with an empty document store."""
+    store = DocumentStore(1000)
+    monkeypatch.setattr(document_store, "settings", dataclasses.replace(settings, STATE_DOCUMENT_REFS=True))
+    monkeypatch.setattr(document_store, "get_document_store", lambda: store)
+    return store
+
+
+def _run(question):
+    from src.graph.runner import run_question
+
+    return run_question(question, CONFIG)
+
+
+def test_each_document_is_in_the_final_state_once():
+    state = _run(KNOWLEDGE_QUESTION)
+    assert 0 < len(state["documents"]) <= CONFIG["k"]
+    assert len({doc.page_content for doc in state["documents"]}) == len(state["documents"])
+
+    state = _run(WEB_QUESTION)
+    assert [doc.metadata["source"] for doc in state["documents"]] == ["web_search"]
+
+
+def test_state_holds_references_with_the_same_results(refs, monkeypatch):
+    from src.graph import get_rag_app
+
+    updates = list(get_rag_app().stream({"question": KNOWLEDGE_QUESTION, "retrieval_config": CONFIG}))
+    retrieved = next(update["retrieve"]["documents"] for update in updates if "retrieve" in update)
+    assert retrieved and all(isinstance(doc, DocumentRef) for doc in retrieved)
+
+    first, second = _run(KNOWLEDGE_QUESTION), _run(KNOWLEDGE_QUESTION)
+    assert all(isinstance(doc, Document) for doc in first["documents"])
+    # Both requests share the stored copies
+    assert all(a is b for a, b in zip(first["documents"], second["documents"]))
+
+    monkeypatch.setattr(document_store, "settings", settings)
+    full = _run(KNOWLEDGE_QUESTION)
+    assert full["generation"] == first["generation"]
+    assert [doc.page_content for doc in full["documents"]] == [doc.page_content for doc in first["documents"]]
+
+
+def test_evicted_chunks_are_reloaded(refs):
+    from src.ingestion import get_vectorstore
+
+    chunks = get_vectorstore().similarity_search(KNOWLEDGE_QUESTION, k=3)
+    web = Document(page_content="Bali and Komodo.", metadata={"source": "web_search"})
+    state = to_state(chunks + [web])
+    assert state[-1].id.startswith("content:")
+
+    refs.clear()
+    resolved = resolve_documents(state)
+
+    # Chunks come back from the vectorstore; the web result can't be recovered
+    assert [doc.page_content for doc in resolved] == [doc.page_content for doc in chunks]
+    assert len(refs) == 3
+
+
+def test_references_shrink_checkpoints(refs, tmp_path):
+    from src.graph.checkpoint import SqliteCheckpointSaver
+    from src.ingestion import get_vectorstore
+
+    serde = SqliteCheckpointSaver(str(tmp_path / "checkpoints.sqlite")).serde
+    documents = get_vectorstore().similarity_search(KNOWLEDGE_QUESTION, k=6)
+
+    full = serde.dumps_typed({"documents": documents})
+    compact = serde.dumps_typed({"documents": to_state(documents)})
+
+    assert len(compact[1]) * 5 < len(full[1])
+    assert resolve_documents(serde.loads_typed(compact)["documents"]) == documents
@@ -0,0 +1,153 @@
+"""
+Tests for concurrent, batched ingestion embedding with the latency-injecting fake model (no API keys).
+
+Run from project root:
+    pytest -s -v tests/test_embedding.py
+"""
+
+import time
+import uuid
+from typing import List
+
+import pytest
+from langchain_chroma import Chroma
+from langchain_core.embeddings import Embeddings
+
+from src.core.fakes import FakeEmbeddings, FakeRateLimitError, synthetic_corpus
+from src.core.rate_limit import AdaptiveLimiter, RateLimitedEmbeddings
+from src.ingestion.embedding import embed_and_store
+
+
+class _FlakyEmbeddings(Embeddings):
+    """Fails the first calls for any batch containing `poison` text."""
+
+    def __init__(self, poison: str, failures: int = 1, error: Exception = ConnectionError("connection reset")):
+        self.inner = FakeEmbeddings()
+        self.poison = poison
+        self.failures = failures
+        self.error = error
+        self.calls: List[int] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(len(texts))
+        if any(self.poison in text for text in texts) and self.failures > 0:
+            self.failures -= 1
+            raise self.error
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.inner.embed_query(text)
+
+
+class _ServerError(Exception):
+    """A transient provider error (HTTP 503)."""
+
+    status_code = 503
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Create a collection embedding with the given model."""
+
+    def store(embeddings: Embeddings = None) -> Chroma:
+        return Chroma(
+            collection_name=f"test-{uuid.uuid4().hex[:8]}",
+            embedding_function=embeddings or FakeEmbeddings(),
+            persist_directory=str(tmp_path),
+        )
+
+    return store
+
+
+@pytest.fixture
+def vectorstore(store):
+    return store()
+
+
+class TestThroughput:
+    """Batches are embedded concurrently and all stored."""
+
+    def test_concurrent_batches_are_faster(self, store):
+        docs = synthetic_corpus(32, words_per_doc=20)
+        embeddings = FakeEmbeddings(latency=0.05)
+        vectorstore = store(embeddings)
+
+        started = time.perf_counter()
+        stats = embed_and_store(vectorstore, docs, batch_size=4, max_concurrency=4)
+        elapsed = time.perf_counter() - started
+
+        assert stats.chunks == 32
+        assert stats.batches == 8
+        assert embeddings.call_count == 8
+        assert elapsed < 8 * 0.05 * 0.75  # Sequential batches would take 0.4 s
+        assert stats.embeddings_per_sec > 0
+        assert len(vectorstore.get()["ids"]) == 32
+
+    def test_stored_chunks_are_searchable(self, vectorstore):
+        docs = synthetic_corpus(12, words_per_doc=20)
+        embed_and_store(vectorstore, docs, batch_size=5, max_concurrency=2)
+
+        results = vectorstore.similarity_search(docs[3].page_content, k=1)
+        assert results[0].metadata["source"] == docs[3].metadata["source"]
+
+
+class TestRetries:
+    """Only the failed batch is retried."""
+
+    def test_failed_batch_is_retried_alone(self, store):
+        docs = synthetic_corpus(12, words_per_doc=20)
+        embeddings = _FlakyEmbeddings(poison=docs[5].page_content)
+        vectorstore = store(embeddings)
+
+        stats = embed_and_store(vectorstore, docs, batch_size=4, backoff=0.01)
+
+        assert stats.retries == 1
+        assert len(embeddings.calls) == 4  # 3 batches + 1 retry
+        assert len(vectorstore.get()["ids"]) == 12
+
+    def test_gives_up_but_keeps_other_batches(self, store):
+        docs = synthetic_corpus(12, words_per_doc=20)
+        embeddings = _FlakyEmbeddings(poison=docs[0].page_content, failures=10)
+        vectorstore = store(embeddings)
+
+        with pytest.raises(RuntimeError, match="1 of 3 embedding batches failed"):
+            embed_and_store(vectorstore, docs, batch_size=4, max_retries=2, backoff=0.01)
+
+        assert len(vectorstore.get()["ids"]) == 8
+        assert len(embeddings.calls) == 5  # 3 batches + 2 retries
+
+    def test_rate_limit_errors_are_not_retried_again(self, store):
+        # Already retried (and backed off) by the rate limiter or the provider client
+        docs = synthetic_corpus(12, words_per_doc=20)
+        embeddings = _FlakyEmbeddings(poison=docs[0].page_content, error=FakeRateLimitError())
+        vectorstore = store(embeddings)
+
+        with pytest.raises(RuntimeError, match="1 of 3 embedding batches failed") as raised:
+            embed_and_store(vectorstore, docs, batch_size=4, backoff=0.01)
+
+        assert isinstance(raised.value.__cause__, FakeRateLimitError)
+        assert len(embeddings.calls) == 3
+
+    def test_limiter_retries_are_not_stacked(self, store):
+        docs = synthetic_corpus(12, words_per_doc=20)
+        flaky = _FlakyEmbeddings(poison=docs[0].page_content, failures=10, error=_ServerError("unavailable"))
+        limiter = AdaptiveLimiter("test_ingest_embed", max_retries=2, backoff=0.001)
+        vectorstore = store(RateLimitedEmbeddings(flaky, limiter))
+
+        with pytest.raises(RuntimeError, match="1 of 3 embedding batches failed"):
+            embed_and_store(vectorstore, docs, batch_size=4, max_retries=3, backoff=0.01)
+
+        # 2 clean batches + the limiter's 3 attempts at the failing one (stacked retries would make it 3 * 4)
+        assert len(flaky.calls) == 2 + 3
+
+    def test_retries_keep_chunk_ids(self, store):
+        docs = synthetic_corpus(8, words_per_doc=20)
+        for i, doc in enumerate(docs):
+            doc.id = f"chunk-{i}"
+        embeddings = _FlakyEmbeddings(poison=docs[0].page_content)
+        vectorstore = store(embeddings)
+
+        embed_and_store(vectorstore, docs, batch_size=4, backoff=0.01)
+        embed_and_store(vectorstore, docs, batch_size=4)  # Ingesting again overwrites
+
+        assert sorted(vectorstore.get()["ids"]) == [f"chunk-{i}" for i in range(8)]
@@ -0,0 +1,127 @@
+"""
+Tests for the Gradio frontend's incremental rendering, document previews and full document viewer.
+
+Run from project root:
+    pytest -s -v tests/test_frontend.py
+"""
+
+import pytest
+
+from src.frontend.app import (
+    DOC_PREVIEW_CHARS,
+    _IncrementalRenderer,
+    _is_skip,
+    document_choices,
+    format_documents_html,
+    render_document_html,
+    show_full_document,
+    stream_response,
+)
+
+KNOWLEDGE_QUESTION = "What is agent memory?"
+
+
+def _doc(number: int, content: str = "Agents plan with memory.") -> dict:
+    return {"source": f"https://example.com/{number}", "title": f"Doc {number}", "content": content}
+
+
+def _skipped(outputs) -> list:
+    """Positions of the outputs sent as gr.skip()."""
+    return [i for i, out in enumerate(outputs) if _is_skip(out)]
+
+
+class TestIncrementalRenderer:
+    """Only changed outputs are sent; the final render sends everything."""
+
+    def test_unchanged_update_is_dropped(self):
+        renderer = _IncrementalRenderer()
+        chat = [{"role": "user", "content": "q"}]
+
+        assert _skipped(renderer.render(chat, "routing", [])) == []
+        assert renderer.render(chat, "routing", []) is None
+        assert renderer.stats.updates == 1 and renderer.stats.skipped == 1
+
+    def test_only_changed_outputs_are_sent(self):
+        renderer = _IncrementalRenderer()
+        chat = [{"role": "user", "content": "q"}]
+        renderer.render(chat, "routing", [])
+
+        # A status change leaves the chat and all document outputs alone
+        chat_out, status_out, docs_out, selector_out, state_out = renderer.render(chat, "retrieving", [])
+        assert status_out == "retrieving"
+        assert _skipped((chat_out, status_out, docs_out, selector_out, state_out)) == [0, 2, 3, 4]
+
+        # New documents update the panel, the viewer choices and the session state
+        docs = [_doc(1), _doc(2)]
+        chat_out, status_out, docs_out, selector_out, state_out = renderer.render(chat, "retrieving", docs)
+        assert _is_skip(chat_out) and _is_skip(status_out)
+        assert docs_out == format_documents_html(docs)
+        assert selector_out["choices"] == document_choices(docs) and selector_out["value"] is None
+        assert state_out == docs
+
+    def test_final_render_sends_all_outputs(self):
+        renderer = _IncrementalRenderer()
+        chat = [{"role": "user", "content": "q"}, {"role": "assistant", "content": "a"}]
+        docs = [_doc(1)]
+        renderer.render(chat, "done", docs)
+
+        outputs = renderer.render(chat, "done", docs, final=True)
+
+        assert outputs is not None and _skipped(outputs) == []
+        chat_out, status_out, docs_out, selector_out, state_out = outputs
+        assert chat_out == chat and status_out == "done" and state_out == docs
+        assert docs_out == format_documents_html(docs)
+        assert selector_out["choices"] == document_choices(docs)
+        assert "value" not in selector_out  # An open document stays selected
+
+
+class TestDocumentPanel:
+    """The panel shows escaped, truncated previews; the viewer shows the full text."""
+
+    def test_preview_is_truncated_and_escaped(self):
+        content = "<script>alert(1)</script> & " + "x" * (2 * DOC_PREVIEW_CHARS)
+        html = render_document_html(1, _doc(1, content))
+
+        assert "<script>" not in html
+        assert "&lt;script&gt;alert(1)&lt;/script&gt; &amp; " in html
+        assert "x" * (DOC_PREVIEW_CHARS - 40) in html and "x" * DOC_PREVIEW_CHARS not in html
+        assert f"{len(content) - DOC_PREVIEW_CHARS} more characters" in html
+
+    def test_short_content_is_not_truncated(self):
+        html = render_document_html(1, _doc(1))
+        assert "Agents plan with memory." in html and "more characters" not in html
+
+    def test_fragments_are_rendered_once(self):
+        docs = [_doc(1), _doc(2)]
+        html = format_documents_html(docs)
+        docs[0]["html"] = "<p>cached</p>"
+
+        assert "Total documents retrieved: 2" in html
+        assert "<p>cached</p>" in format_documents_html(docs)
+
+    def test_viewer_shows_the_full_text(self):
+        content = "y" * (3 * DOC_PREVIEW_CHARS)
+        docs = [_doc(1), _doc(2, content)]
+
+        assert show_full_document(document_choices(docs)[1], docs) == content
+        assert show_full_document(None, docs) == ""
+        assert show_full_document("Document 3: missing", docs) == ""
+        assert show_full_document("not a document", docs) == ""
+
+
+@pytest.mark.fake_backends
+def test_stream_response_ends_with_the_full_state():
+    from src.core.fakes import seed_synthetic_vectorstore
+
+    seed_synthetic_vectorstore()
+    updates = list(stream_response(KNOWLEDGE_QUESTION, "similarity", 4, 20, 0.5, 0.0, 2))
+
+    assert all(update is not None for update in updates)
+    assert _skipped(updates[0]) == [] and _skipped(updates[-1]) == []
+    # Intermediate updates only carry what changed
+    assert any(_skipped(update) for update in updates[1:-1])
+    chat, _, docs_html, selector, documents = updates[-1]
+    assert [message["role"] for message in chat] == ["user", "assistant"]
+    assert documents and f"Total documents retrieved: {len(documents)}" in docs_html
+    assert selector["choices"] == document_choices(documents)
+    assert show_full_document(selector["choices"][0], documents) == documents[0]["content"]
@@ -0,0 +1,151 @@
+"""
+Tests for the full / balanced / fast graph variants and their tiered generation checks (fake backends, no API keys).
+
+Run from project root:
+    pytest -s -v tests/test_graph_variants.py
+"""
+
+import dataclasses
+
+import pytest
+
+from src.config.settings import settings
+from src.graph.constants import GRAPH_VARIANTS
+
+pytestmark = pytest.mark.fake_backends
+
+KNOWLEDGE_QUESTION = "What is agent memory?"
+WEB_QUESTION = "What are the best places to visit in Indonesia?"
+
+
+@pytest.fixture(autouse=True)
+def seeded():
+    from src.core.fakes import seed_synthetic_vectorstore
+
+    seed_synthetic_vectorstore()
+
+
+@pytest.fixture(autouse=True)
+def response_cache(tmp_path, monkeypatch):
+    """A fresh response cache per test, so no grader verdict carries over between tests."""
+    from src.core import response_cache
+    from src.core.response_cache import ResponseCache
+
+    store = ResponseCache(str(tmp_path / "responses.sqlite"), max_bytes=1024 * 1024)
+    monkeypatch.setattr(response_cache, "get_response_cache", lambda: store)
+    return store
+
+
+@pytest.fixture
+def cached_chains(monkeypatch):
+    """Router and graders rebuilt with the response cache enabled (as outside the fake backends)."""
+    from src.chains import get_answer_grader, get_hallucination_grader, get_question_router, get_retrieval_grader
+    from src.core import response_cache
+
+    chains = (get_question_router, get_retrieval_grader, get_hallucination_grader, get_answer_grader)
+    monkeypatch.setattr(response_cache, "settings", dataclasses.replace(settings, LLM_CACHE_ENABLED=True))
+    for chain in chains:
+        chain.reset()
+    yield
+    monkeypatch.undo()
+    for chain in chains:
+        chain.reset()
+
+
+@pytest.fixture
+def answer_grader():
+    """The fake answer grader, rejecting the first answer to each question (until reset)."""
+    from src.core import get_llm
+
+    llm = get_llm("answer_grader")
+    llm.reset()
+    llm.answer_failures = 1
+    yield llm
+    llm.answer_failures = 0
+    llm.reset()
+
+
+def _chain_calls(question, variant):
+    from src.graph.runner import run_question
+
+    state = run_question(question, {"variant": variant})
+    return state, {chain: stats["calls"] for chain, stats in state["metrics"]["chains"].items()}
+
+
+def test_variants_skip_generation_graders():
+    from src.graph.edges import GRADERS_SKIPPED
+
+    skipped = GRADERS_SKIPPED.value(variant="fast", grader="hallucination_grader")
+    answers = {}
+    for variant in GRAPH_VARIANTS:
+        state, calls = _chain_calls(KNOWLEDGE_QUESTION, variant)
+        answers[variant] = state["generation"]
+        assert state["relevance"] == 1.0
+        assert ("answer_grader" in calls) == (variant == "full")
+        assert ("hallucination_grader" in calls) == (variant != "fast")
+    assert len(set(answers.values())) == 1
+    assert GRADERS_SKIPPED.value(variant="fast", grader="hallucination_grader") == skipped + 1
+
+
+def test_fast_grades_web_search_answers():
+    _, calls = _chain_calls(WEB_QUESTION, "fast")
+    assert calls["hallucination_grader"] == 1 and "answer_grader" not in calls
+
+
+def test_thresholds_fall_back_to_the_full_checks(answer_grader, monkeypatch):
+    from src.graph import edges
+
+    # Unreachable thresholds: every variant grades like "full", including the retry
+    monkeypatch.setattr(edges, "settings", dataclasses.replace(
+        settings, BALANCED_MIN_GROUNDED_CONFIDENCE=1.01, FAST_MIN_RELEVANCE=1.01
+    ))
+    for variant in GRAPH_VARIANTS:
+        answer_grader.reset()
+        _, calls = _chain_calls(KNOWLEDGE_QUESTION, variant)
+        assert calls["generation"] == 2 and calls["answer_grader"] == 2
+
+
+def test_grounded_confidence_is_required():
+    from pydantic import ValidationError
+
+    from src.chains import HallucinationGrader
+
+    # A verdict without a confidence would pass as certain and skip the answer grader in "balanced"
+    assert "confidence" in HallucinationGrader.model_json_schema()["required"]
+    with pytest.raises(ValidationError):
+        HallucinationGrader(binary_score=True)
+
+
+def test_variants_with_the_response_cache(cached_chains, answer_grader, response_cache):
+    expected = {"full": (2, 2), "balanced": (1, 0), "fast": (1, 0)}  # (generations, answer grader calls)
+    for variant in GRAPH_VARIANTS:
+        response_cache.clear()
+        answer_grader.reset()
+        _, calls = _chain_calls(KNOWLEDGE_QUESTION, variant)
+        assert (calls["generation"], calls.get("answer_grader", 0)) == expected[variant]
+
+    # Asked again: the accepted verdict is served from the cache, the model is not asked again
+    response_cache.clear()
+    _chain_calls(KNOWLEDGE_QUESTION, "full")
+    answer_grader.reset()
+    state, calls = _chain_calls(KNOWLEDGE_QUESTION, "full")
+    assert calls["generation"] == 1 and state["metrics"]["llm"]["cache_hits"]
+    assert answer_grader.call_count == 0
+
+
+def test_default_variant_comes_from_settings(monkeypatch):
+    from src.graph import builder
+
+    assert builder.select_variant({}) == settings.GRAPH_VARIANT
+    monkeypatch.setattr(builder, "settings", dataclasses.replace(settings, GRAPH_VARIANT="balanced"))
+    assert builder.select_variant({}) == "balanced"
+    assert builder.select_variant({"variant": "fast"}) == "fast"
+
+
+def test_unknown_variant_is_rejected():
+    from src.graph import build_graph
+
+    with pytest.raises(ValueError):
+        _chain_calls(KNOWLEDGE_QUESTION, "fastest")
+    with pytest.raises(ValueError):
+        build_graph(variant="fastest")
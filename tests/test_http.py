@@ -0,0 +1,150 @@
+"""
+Tests for the shared HTTP clients against a local mock server (no network, no API keys).
+
+Run from project root:
+    pytest -s -v tests/test_http.py
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from langchain_openai import ChatOpenAI
+
+from src.core.http import (
+    HTTP_CONNECTIONS,
+    HTTP_REQUESTS,
+    build_http_client,
+    build_requests_session,
+    tavily_api_wrapper,
+)
+
+CHAT_COMPLETION = {
+    "id": "chatcmpl-test",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-test",
+    "choices": [{"index": 0, "message": {"role": "assistant", "content": "pong"}, "finish_reason": "stop"}],
+    "usage": {"prompt_tokens": 3, "completion_tokens": 1, "total_tokens": 4},
+}
+
+SEARCH_RESULTS = {"query": "q", "results": [{"url": "https://example.com", "title": "t", "content": "c", "score": 1}]}
+
+
+class _MockAPI(BaseHTTPRequestHandler):
+    """Keep-alive JSON server standing in for the OpenAI and Tavily APIs."""
+
+    protocol_version = "HTTP/1.1"
+    connections = set()
+    posts = []
+
+    def _reply(self, payload):
+        _MockAPI.connections.add(self.client_address)
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply({"ok": True})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        _MockAPI.posts.append((self.path, dict(self.headers), json.loads(body or b"null")))
+        if self.path.endswith("/chat/completions"):
+            self._reply(CHAT_COMPLETION)
+        elif self.path.endswith("/search"):
+            self._reply(SEARCH_RESULTS)
+        else:
+            self._reply({"ok": True})
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def mock_server():
+    """Start the mock API on a free local port."""
+    _MockAPI.connections = set()
+    _MockAPI.posts = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _MockAPI)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+class TestPooledClients:
+    """Connections are reused across calls and counted."""
+
+    def test_httpx_client_reuses_connection(self, mock_server):
+        client = build_http_client(name="test_httpx")
+        for _ in range(5):
+            assert client.get(f"{mock_server}/ping").json() == {"ok": True}
+
+        assert HTTP_REQUESTS.value(client="test_httpx") == 5
+        assert HTTP_CONNECTIONS.value(client="test_httpx") == 1
+        assert len(_MockAPI.connections) == 1
+
+    def test_requests_session_reuses_connection(self, mock_server):
+        session = build_requests_session(name="test_requests")
+        for _ in range(5):
+            assert session.get(f"{mock_server}/ping").json() == {"ok": True}
+
+        assert HTTP_REQUESTS.value(client="test_requests") == 5
+        assert HTTP_CONNECTIONS.value(client="test_requests") == 1
+
+
+class TestInjection:
+    """The OpenAI and Tavily clients send through the shared pool."""
+
+    def test_chat_openai_uses_shared_client(self, mock_server):
+        client = build_http_client(name="test_openai")
+        llm = ChatOpenAI(model="gpt-test", api_key="test", base_url=f"{mock_server}/v1", http_client=client)
+
+        for _ in range(3):
+            assert llm.invoke("ping").content == "pong"
+
+        assert HTTP_REQUESTS.value(client="test_openai") == 3
+        assert HTTP_CONNECTIONS.value(client="test_openai") == 1
+
+    def test_tavily_wrapper_uses_shared_client(self, mock_server):
+        from src.core.http import get_http_client
+
+        before = HTTP_REQUESTS.value(client="httpx")
+        wrapper = tavily_api_wrapper("test-key", api_base_url=mock_server)
+
+        for _ in range(3):
+            assert wrapper.raw_results(query="q", max_results=2, topic=None) == SEARCH_RESULTS
+
+        assert get_http_client() is get_http_client()
+        assert HTTP_REQUESTS.value(client="httpx") - before == 3
+        assert len(_MockAPI.connections) == 1
+
+    def test_tavily_wrapper_sends_what_langchain_tavily_sends(self, mock_server):
+        """The pooled wrapper rebuilds langchain-tavily's private request; fails if a release changes it."""
+        import inspect
+
+        from langchain_tavily._utilities import TavilySearchAPIWrapper
+
+        assert {"raw_results", "raw_results_async"} <= set(vars(TavilySearchAPIWrapper))
+        params = inspect.signature(TavilySearchAPIWrapper.raw_results).parameters
+        kwargs = {name: None for name in params if name not in ("self", "query", "kwargs")}
+        kwargs.update(max_results=2, topic="news")
+
+        upstream = TavilySearchAPIWrapper(tavily_api_key="test-key", api_base_url=mock_server)
+        assert upstream.raw_results(query="q", **kwargs) == SEARCH_RESULTS
+        pooled = tavily_api_wrapper("test-key", api_base_url=mock_server)
+        assert pooled.raw_results(query="q", **kwargs) == SEARCH_RESULTS
+
+        # Same path, body and API headers (transport headers differ between requests and httpx)
+        transport = {"host", "user-agent", "accept", "accept-encoding", "connection", "content-length"}
+        (upstream_path, upstream_headers, upstream_body), (path, headers, body) = _MockAPI.posts
+        assert (path, body) == (upstream_path, upstream_body)
+        assert {k.lower(): v for k, v in headers.items() if k.lower() not in transport} == {
+            k.lower(): v for k, v in upstream_headers.items() if k.lower() not in transport
+        }
@@ -0,0 +1,132 @@
+"""
+Tests for resumable ingestion with the progress manifest (fake loaders and embeddings, no API keys).
+
+Run from project root:
+    pytest -s -v tests/test_ingest_resume.py
+"""
+
+import functools
+import uuid
+from typing import Dict, List
+
+import pytest
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from src.core.fakes import FakeEmbeddings, synthetic_corpus
+from src.ingestion import pipeline
+from src.ingestion.embedding import embed_and_store
+from src.ingestion.manifest import IngestManifest
+from src.ingestion.pipeline import ingest_sources
+
+CORPUS = {doc.metadata["source"]: doc for doc in synthetic_corpus(12, words_per_doc=150)}
+SOURCES = list(CORPUS)
+
+# Character-based, so the tests don't need tiktoken's downloaded encoding
+_split = RecursiveCharacterTextSplitter(chunk_size=300, chunk_overlap=0).split_documents
+
+
+class _Loader:
+    """Returns a source's synthetic document; fails as configured and counts fetches."""
+
+    def __init__(self, fail_times: Dict[str, int] = None, interrupt_at: str = None):
+        self.fail_times = dict(fail_times or {})
+        self.interrupt_at = interrupt_at
+        self.fetched: List[str] = []
+
+    def __call__(self, source: str) -> List[Document]:
+        if source == self.interrupt_at:
+            raise KeyboardInterrupt
+        self.fetched.append(source)
+        if self.fail_times.get(source, 0) > 0:
+            self.fail_times[source] -= 1
+            raise ConnectionError(f"cannot fetch {source}")
+        return [CORPUS[source].model_copy()]
+
+
+class _BrokenEmbeddings(Embeddings):
+    """Fails every batch containing `poison` while `broken` is set."""
+
+    def __init__(self, poison: str):
+        self.inner = FakeEmbeddings()
+        self.poison = poison
+        self.broken = True
+        self.embedded = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.broken and any(self.poison in text for text in texts):
+            raise ConnectionError("embedding service unavailable")
+        self.embedded += len(texts)
+        return self.inner.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.inner.embed_query(text)
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    return IngestManifest(str(tmp_path / "manifest.sqlite"))
+
+
+def _store(tmp_path, embeddings=None):
+    return Chroma(
+        collection_name=f"test-{uuid.uuid4().hex[:8]}",
+        embedding_function=embeddings or FakeEmbeddings(),
+        persist_directory=str(tmp_path),
+    )
+
+
+def test_interrupted_run_resumes_without_refetching(tmp_path, manifest):
+    store = _store(tmp_path)
+    first = _Loader(interrupt_at=SOURCES[5])
+    with pytest.raises(KeyboardInterrupt):
+        ingest_sources(SOURCES, split=_split, load=first, manifest=manifest, vectorstore=store)
+    assert first.fetched == SOURCES[:5]
+    assert manifest.progress()["split"] == 5
+
+    second = _Loader()
+    summary = ingest_sources(SOURCES, split=_split, load=second, manifest=manifest, vectorstore=store)
+
+    assert summary.resumed and summary.reused == 5 and summary.written == len(SOURCES)
+    assert second.fetched == SOURCES[5:]
+    assert store._collection.count() == summary.chunks
+
+    # The run finished, so the next one starts over (and overwrites the same chunk IDs)
+    third = ingest_sources(SOURCES, split=_split, load=_Loader(), manifest=manifest, vectorstore=store)
+    assert not third.resumed and store._collection.count() == summary.chunks
+
+
+def test_half_written_sources_embed_only_missing_chunks(tmp_path, manifest, monkeypatch):
+    monkeypatch.setattr(pipeline, "embed_and_store", functools.partial(embed_and_store, batch_size=4, max_retries=0))
+    embeddings = _BrokenEmbeddings(poison=CORPUS[SOURCES[-1]].page_content[:40])
+    store = _store(tmp_path, embeddings)
+
+    failed = ingest_sources(SOURCES, split=_split, load=_Loader(), manifest=manifest, vectorstore=store)
+    assert failed.failed and all(error.startswith("embed") for error in failed.failed.values())
+    stored = store._collection.count()
+    assert 0 < stored
+
+    embeddings.broken = False
+    embeddings.embedded = 0
+    resumed = ingest_sources(SOURCES, split=_split, load=_Loader(), manifest=manifest, vectorstore=store)
+
+    assert resumed.resumed and not resumed.failed
+    assert resumed.chunks_skipped == stored and embeddings.embedded == resumed.chunks
+    assert store._collection.count() == stored + resumed.chunks
+
+
+def test_fetch_retries_and_failures_are_summarized(tmp_path, manifest):
+    store = _store(tmp_path)
+    loader = _Loader(fail_times={SOURCES[0]: 1, SOURCES[1]: 10})
+
+    summary = ingest_sources(SOURCES, split=_split, load=loader, manifest=manifest, vectorstore=store, max_load_retries=2, backoff=0)
+
+    assert summary.retried == 1 + 2
+    assert list(summary.failed) == [SOURCES[1]] and summary.written == len(SOURCES) - 1
+    assert manifest.get(SOURCES[1]).failed_stage == "load"
+
+    retry = _Loader()
+    summary = ingest_sources(SOURCES, split=_split, load=retry, manifest=manifest, vectorstore=store, backoff=0)
+    assert retry.fetched == [SOURCES[1]] and summary.skipped == len(SOURCES) - 1 and not summary.failed
@@ -0,0 +1,121 @@
+"""
+Tests for the per-node / per-chain instrumentation and the /metrics Prometheus exposition (fake backends).
+
+Run from project root:
+    pytest -s -v tests/test_instrumentation.py
+"""
+
+import dataclasses
+import re
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.config.settings import MODEL_ROLES, settings
+from src.observability.instrumentation import CHAIN_SECONDS, EDGE_SECONDS, LLM_CALLS, LLM_TOKENS, NODE_SECONDS
+from src.observability.metrics import MetricsRegistry
+
+pytestmark = pytest.mark.fake_backends
+
+KNOWLEDGE_QUESTION = "What is agent memory?"
+WEB_QUESTION = "What are the best places to visit in Indonesia?"
+
+
+@pytest.fixture(autouse=True)
+def seeded():
+    from src.core.fakes import seed_synthetic_vectorstore
+
+    seed_synthetic_vectorstore()
+
+
+def _model_calls() -> int:
+    from src.core import get_llm
+
+    return sum(get_llm(role).call_count for role in MODEL_ROLES)
+
+
+def test_knowledge_question_counts():
+    from src.graph.runner import run_question
+
+    nodes = {node: NODE_SECONDS.count(node=node) for node in ("retrieve", "grade_documents", "generate")}
+    llm_calls = {chain: LLM_CALLS.value(chain=chain) for chain in ("question_router", "retrieval_grader")}
+    model_calls = _model_calls()
+
+    metrics = run_question(KNOWLEDGE_QUESTION, {"variant": "full", "k": 3})["metrics"]
+
+    assert {node: stats["calls"] for node, stats in metrics["nodes"].items()} == {
+        "retrieve": 1, "grade_documents": 1, "generate": 1,
+    }
+    assert set(metrics["edges"]) == {"route_question", "decide_to_generate", "grade_generation"}
+    # One grader call per retrieved document
+    assert {chain: stats["llm_calls"] for chain, stats in metrics["chains"].items()} == {
+        "question_router": 1, "retrieval_grader": 3, "generation": 1,
+        "hallucination_grader": 1, "answer_grader": 1,
+    }
+    assert metrics["chains"]["retrieval_grader"]["calls"] == 3
+    assert metrics["llm"]["llm_calls"] == 7 == _model_calls() - model_calls
+    assert metrics["llm"]["prompt_tokens"] > 0 and metrics["llm"]["completion_tokens"] > 0
+
+    # The same run in the process-wide registry
+    assert all(NODE_SECONDS.count(node=node) == count + 1 for node, count in nodes.items())
+    assert LLM_CALLS.value(chain="question_router") == llm_calls["question_router"] + 1
+    assert LLM_CALLS.value(chain="retrieval_grader") == llm_calls["retrieval_grader"] + 3
+
+
+def test_web_question_counts():
+    from src.graph.runner import run_question
+
+    metrics = run_question(WEB_QUESTION, {"variant": "full"})["metrics"]
+
+    assert {node: stats["calls"] for node, stats in metrics["nodes"].items()} == {"web_search": 1, "generate": 1}
+    assert {chain: stats["llm_calls"] for chain, stats in metrics["chains"].items()} == {
+        "question_router": 1, "generation": 1, "hallucination_grader": 1, "answer_grader": 1,
+    }
+
+
+def test_prometheus_text_format():
+    registry = MetricsRegistry()
+    registry.counter("test_calls_total", "Calls").inc(2, chain="router")
+    registry.counter("test_calls_total", "Calls").inc(chain='say "hi"\n')
+    registry.histogram("test_seconds", "Durations", buckets=(0.1, 1.0)).observe(0.5, node="retrieve")
+
+    assert registry.render_prometheus().splitlines() == [
+        "# HELP test_calls_total Calls",
+        "# TYPE test_calls_total counter",
+        'test_calls_total{chain="router"} 2',
+        'test_calls_total{chain="say \\"hi\\"\\n"} 1',
+        "# HELP test_seconds Durations",
+        "# TYPE test_seconds histogram",
+        'test_seconds_bucket{node="retrieve",le="0.1"} 0',
+        'test_seconds_bucket{node="retrieve",le="1"} 1',
+        'test_seconds_bucket{node="retrieve",le="+Inf"} 1',
+        'test_seconds_sum{node="retrieve"} 0.5',
+        'test_seconds_count{node="retrieve"} 1',
+    ]
+
+
+def test_metrics_endpoint(monkeypatch):
+    from src.api import server
+
+    monkeypatch.setattr(server, "settings", dataclasses.replace(settings, WARM_UP_ON_START=False))
+    with TestClient(server.create_app()) as client:
+        assert client.post("/query", json={"question": KNOWLEDGE_QUESTION}).status_code == 200
+        response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+
+    for name, kind in [
+        (NODE_SECONDS.name, "histogram"), (EDGE_SECONDS.name, "histogram"), (CHAIN_SECONDS.name, "histogram"),
+        (LLM_CALLS.name, "counter"), (LLM_TOKENS.name, "counter"),
+    ]:
+        assert f"# TYPE {name} {kind}" in text
+
+    # Labelled series agree with the registry
+    retrieves = NODE_SECONDS.count(node="retrieve")
+    assert f'rag_node_duration_seconds_bucket{{node="retrieve",le="+Inf"}} {retrieves}' in text
+    assert f'rag_node_duration_seconds_count{{node="retrieve"}} {retrieves}' in text
+    assert f'rag_llm_calls_total{{chain="generation"}} {LLM_CALLS.value(chain="generation"):g}' in text
+    assert re.search(r'^rag_llm_tokens_total\{chain="generation",type="prompt"\} [1-9]', text, re.M)
+    assert re.search(r'^rag_edge_duration_seconds_sum\{edge="route_question"\} \S+$', text, re.M)
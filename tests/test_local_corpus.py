@@ -0,0 +1,135 @@
+"""
+Tests for local-directory ingestion (fake embeddings, no API keys).
+
+Run from project root:
+    pytest -s -v tests/test_local_corpus.py
+"""
+
+import os
+import uuid
+
+import pytest
+from langchain_chroma import Chroma
+from langchain_core.documents import Document
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from src.config.settings import settings
+from src.core.fakes import FakeEmbeddings, synthetic_corpus
+from src.ingestion.local import FileIndex, ingest_directory, load_directory, parse_file, scan
+from src.ingestion.manifest import IngestManifest
+from src.ingestion.pipeline import chunk_id
+
+# Character-based, so the tests don't need tiktoken's downloaded encoding
+_split = RecursiveCharacterTextSplitter(chunk_size=300, chunk_overlap=0).split_documents
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    """Markdown, text and HTML files in nested directories, plus files the default globs ignore."""
+    root = tmp_path / "kb"
+    texts = [doc.page_content for doc in synthetic_corpus(6, words_per_doc=120)]
+    (root / "guides" / "drafts").mkdir(parents=True)
+    (root / "agents.md").write_text(f"# Agents\n\n{texts[0]}")
+    (root / "guides" / "prompting.md").write_text(f"# Prompting\n\n{texts[1]}")
+    (root / "guides" / "notes.txt").write_text(texts[2])
+    (root / "guides" / "attacks.html").write_text(
+        f"<html><head><title>Attacks</title><style>p {{}}</style></head><body><p>{texts[3]}</p>"
+        "<script>var hidden = 1;</script></body></html>"
+    )
+    (root / "guides" / "drafts" / "wip.md").write_text(texts[4])
+    (root / "image.png").write_bytes(b"\x89PNG")
+    return root
+
+
+@pytest.fixture
+def index(tmp_path):
+    return FileIndex(str(tmp_path / "files.sqlite"))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return Chroma(
+        collection_name=f"test-{uuid.uuid4().hex[:8]}",
+        embedding_function=FakeEmbeddings(),
+        persist_directory=str(tmp_path / "chroma"),
+    )
+
+
+def _touch(path, seconds=5):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 10**9))
+
+
+def test_glob_filters(corpus):
+    names = [path.relative_to(corpus).as_posix() for path in scan(str(corpus), exclude=["guides/drafts/*"])]
+    assert names == ["agents.md", "guides/attacks.html", "guides/notes.txt", "guides/prompting.md"]
+    assert [path.name for path in scan(str(corpus), include=["guides/*.md"])] == ["prompting.md"]
+
+
+def test_documents_parsed_in_process_pool(corpus, index):
+    load = load_directory(str(corpus), workers=2, index=index)
+
+    assert load.files == 5 and len(load.documents) == 5
+    by_name = {os.path.basename(doc.metadata["source"]): doc for doc in load.documents}
+    assert by_name["agents.md"].metadata["title"] == "Agents"
+    html = by_name["attacks.html"]
+    assert html.metadata["title"] == "Attacks" and "hidden" not in html.page_content
+    assert "<p>" not in html.page_content and html.page_content.startswith("Attacks")
+    assert by_name["notes.txt"].metadata["title"] == "notes"
+    assert _split(load.documents)
+
+
+def test_memory_mapped_read_matches(corpus):
+    path = str(corpus / "agents.md")
+    assert parse_file(path, mmap_min_bytes=1) == parse_file(path, mmap_min_bytes=1 << 30)
+
+
+def test_unchanged_files_are_skipped_and_edits_replace_chunks(tmp_path, corpus, index, store):
+    manifest = IngestManifest(str(tmp_path / "manifest.sqlite"))
+
+    def ingest(**kwargs):
+        return ingest_directory(
+            str(corpus), workers=1, split=_split, index=index, manifest=manifest, vectorstore=store, **kwargs
+        )
+
+    load, summary = ingest()
+    total = store._collection.count()
+    assert summary.written == 5 and total == summary.chunks > 5
+
+    # Nothing changed, then only the mtime changed: nothing is parsed or embedded
+    load, summary = ingest()
+    assert load.unchanged == 5 and not load.documents and summary.chunks == 0
+    _touch(corpus / "agents.md")
+    load, summary = ingest()
+    assert load.rehashed == 1 and not load.documents and summary.chunks == 0
+    load, _ = ingest()
+    assert load.unchanged == 5
+
+    # An edit to a shorter version replaces all of the file's chunks; a removed file's chunks are deleted
+    notes = corpus / "guides" / "notes.txt"
+    before = index.states()[str(notes.resolve())]
+    notes.write_text("Short notes about agent memory.")
+    (corpus / "guides" / "prompting.md").unlink()
+    removed = index.states()[str((corpus / "guides" / "prompting.md").resolve())]
+    load, summary = ingest()
+
+    assert [doc.metadata["source"] for doc in load.documents] == [str(notes.resolve())]
+    assert summary.chunks == 1 and len(load.removed) == 1
+    assert not store.get(ids=[chunk_id(before.source_id, i) for i in range(before.chunks)])["ids"]
+    assert store._collection.count() == total - before.chunks - removed.chunks + 1
+    assert str((corpus / "guides" / "prompting.md").resolve()) not in index.states()
+
+
+def test_directory_runs_leave_url_progress_alone(corpus, index, store):
+    # An unfinished URL ingestion, to be resumed later
+    urls = IngestManifest(settings.INGEST_MANIFEST_PATH)
+    urls.start_run(fresh=True)
+    urls.save_loaded("https://example.com/agents", [Document(page_content="Agents plan.")], attempts=1)
+
+    load, summary = ingest_directory(str(corpus), workers=1, split=_split, index=index, vectorstore=store)
+
+    assert summary.written == 5
+    assert urls.get("https://example.com/agents").stage == "loaded"
+    assert urls.documents("https://example.com/agents")[0].page_content == "Agents plan."
+    local = IngestManifest(settings.LOCAL_CORPUS_MANIFEST_PATH)
+    assert local.get(load.states[0].source_id).stage == "written"
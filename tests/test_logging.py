@@ -0,0 +1,107 @@
+"""
+Tests for the queue-based logging: JSON lines, sampling, flush on shutdown and one listener per logger.
+
+Run from project root:
+    pytest -s -v tests/test_logging.py
+"""
+
+import dataclasses
+import io
+import json
+import logging
+
+import pytest
+
+from src.config import logging_config
+from src.config.logging_config import setup_logger, stop_logging
+from src.config.settings import settings
+
+
+@pytest.fixture
+def configure(tmp_path, monkeypatch):
+    """Set up test loggers writing to temporary files; their listeners are stopped afterwards."""
+    # Long enough that nothing is written before shutdown unless the listener flushes
+    monkeypatch.setattr(logging_config, "settings", dataclasses.replace(settings, LOG_BATCH_INTERVAL=0.2))
+    names = []
+
+    def configure(name, **kwargs):
+        names.append(name)
+        logger = setup_logger(name, log_file=str(tmp_path / f"{name}.log"), stream=io.StringIO(), **kwargs)
+        logger.propagate = False
+        return logger, tmp_path / f"{name}.log"
+
+    yield configure
+    for name in names:
+        stop_logging(name)
+        logging.getLogger(name).handlers.clear()
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_records_are_json_lines(configure):
+    logger, path = configure("test_logging.json", level=logging.DEBUG, sampling={})
+
+    logger.info("Graded %d docs", 4, extra={"trace_id": "abc"})
+    try:
+        raise ValueError("bad score")
+    except ValueError:
+        logger.exception("Grading failed")
+    stop_logging("test_logging.json")
+
+    info, error = _lines(path)
+    assert info["message"] == "Graded 4 docs" and info["level"] == "INFO"
+    assert info["logger"] == "test_logging.json" and info["trace_id"] == "abc"
+    assert info["function"] == "test_records_are_json_lines" and info["time"].endswith("Z")
+    # The traceback has its own field instead of being appended to the message
+    assert error["message"] == "Grading failed" and error["level"] == "ERROR"
+    assert "ValueError: bad score" in error["exception"]
+
+
+def test_sampling_keeps_a_share_of_info_records(configure):
+    logger, path = configure("test_logging.sampled", sampling={"test_logging.sampled.nodes": 0.25})
+    nodes = logging.getLogger("test_logging.sampled.nodes")
+
+    for i in range(8):
+        nodes.info(f"node {i}")
+        nodes.warning(f"warning {i}")
+    logger.info("unsampled")
+    stop_logging("test_logging.sampled")
+
+    messages = [line["message"] for line in _lines(path)]
+    # The first record passes, then every fourth
+    assert [m for m in messages if m.startswith("node")] == ["node 0", "node 3", "node 7"]
+    assert len([m for m in messages if m.startswith("warning")]) == 8
+    assert "unsampled" in messages
+
+
+def test_shutdown_flushes_queued_records(configure):
+    logger, path = configure("test_logging.flush", sampling={})
+
+    for i in range(500):
+        logger.info(f"record {i}")
+    assert len(path.read_text(encoding="utf-8").splitlines()) < 500  # Still queued
+    stop_logging("test_logging.flush")
+
+    assert [line["message"] for line in _lines(path)] == [f"record {i}" for i in range(500)]
+
+
+def test_each_logger_keeps_its_listener(configure):
+    first, first_path = configure("test_logging.first", sampling={})
+    first_listener = logging_config._listeners["test_logging.first"]
+    second, second_path = configure("test_logging.second", sampling={})
+
+    # Setting up a second logger leaves the first one's listener running
+    assert logging_config._listeners["test_logging.first"] is first_listener
+    first.info("to the first")
+    second.info("to the second")
+    stop_logging("test_logging.first")
+    stop_logging("test_logging.second")
+
+    assert [line["message"] for line in _lines(first_path)] == ["to the first"]
+    assert [line["message"] for line in _lines(second_path)] == ["to the second"]
+
+    # Setting up the same logger again replaces its listener
+    configure("test_logging.first", sampling={})
+    assert logging_config._listeners["test_logging.first"] is not first_listener
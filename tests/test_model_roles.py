@@ -0,0 +1,138 @@
+"""
+Tests for the per-role model settings and the per-role concurrency limit of model calls.
+
+Run from project root:
+    pytest -s -v tests/test_model_roles.py
+"""
+
+import asyncio
+import dataclasses
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.config.settings import MODEL_ROLES, ModelRoleConfig, _load_model_roles, settings
+from src.core import llm
+from src.core.fakes import FakeChatModel, FakeRateLimitError
+from src.core.llm import limit_calls
+
+ROLE_ENV = {
+    "LLM_MODEL": "gpt-base",
+    "ROUTER_MODEL": "gpt-router",
+    "ROUTER_TIMEOUT": "3",
+    "ROUTER_MAX_TOKENS": "64",
+    "ROUTER_PRIORITY": "5",
+    "GENERATOR_MAX_CONCURRENCY": "2",
+}
+
+
+@pytest.fixture
+def roles(monkeypatch):
+    """Role settings read from ROLE_ENV (other role variables unset)."""
+    for role in MODEL_ROLES:
+        for suffix in ("MODEL", "TIMEOUT", "MAX_TOKENS", "MAX_CONCURRENCY", "PRIORITY"):
+            monkeypatch.delenv(f"{role.upper()}_{suffix}", raising=False)
+    for name in ("LLM_TIMEOUT", "LLM_MAX_TOKENS", "LLM_MAX_CONCURRENCY"):
+        monkeypatch.delenv(name, raising=False)
+    for name, value in ROLE_ENV.items():
+        monkeypatch.setenv(name, value)
+    return _load_model_roles()
+
+
+def test_role_settings_fall_back_to_the_defaults(roles):
+    assert roles["router"] == ModelRoleConfig(
+        model="gpt-router", timeout=3.0, max_tokens=64, max_concurrency=0, priority=5
+    )
+    # Graders: short structured outputs, shorter timeout and a token cap
+    grader = roles["retrieval_grader"]
+    assert (grader.model, grader.timeout, grader.max_tokens, grader.priority) == ("gpt-base", 20.0, 256, 2)
+    generator = roles["generator"]
+    assert (generator.model, generator.timeout, generator.max_tokens) == ("gpt-base", 60.0, 0)
+    assert (generator.max_concurrency, generator.priority) == (2, 0)
+
+
+def test_role_settings_reach_the_clients(roles, monkeypatch):
+    monkeypatch.setattr(llm, "settings", dataclasses.replace(
+        settings, LLM_PROVIDER="openai", OPENAI_API_KEY="sk-test", LLM_ROLES=roles
+    ))
+
+    router = llm._build_llm("router")
+    assert (router.model_name, router.request_timeout, router.max_tokens) == ("gpt-router", 3.0, 64)
+    generator = llm._build_llm("generator")
+    # 0 means the provider's default
+    assert (generator.model_name, generator.request_timeout, generator.max_tokens) == ("gpt-base", 60.0, None)
+
+    limited = limit_calls(router, "router")
+    assert limited.config is roles["router"] and limited.semaphore is None
+
+
+@pytest.mark.fake_backends
+def test_each_chain_calls_its_roles_client():
+    from src.chains import get_retrieval_grader
+    from src.core import get_llm
+
+    calls = {role: get_llm(role).call_count for role in MODEL_ROLES}
+    get_retrieval_grader().invoke({"document": "Agents use memory to plan.", "question": "agent memory"})
+
+    assert {role: get_llm(role).call_count - calls[role] for role in MODEL_ROLES} == {
+        role: int(role == "retrieval_grader") for role in MODEL_ROLES
+    }
+
+
+@pytest.fixture
+def limited_generator(roles, monkeypatch):
+    """The generator role limited to two calls at once, without the rate limiter (no retries hide overlaps)."""
+    monkeypatch.setattr(llm, "settings", dataclasses.replace(settings, LLM_ROLES=roles))
+    monkeypatch.setattr(llm, "_semaphores", llm._build_semaphores(roles))
+    monkeypatch.setattr(llm, "get_llm_limiter", lambda: None)
+
+    def limited(model):
+        return limit_calls(model, "generator")
+
+    return limited
+
+
+def _calls_at_once(run, calls=6):
+    """Start `calls` calls at once from separate threads and wait for them."""
+    with ThreadPoolExecutor(max_workers=calls) as pool:
+        list(pool.map(lambda _: run(), range(calls)))
+
+
+def test_max_concurrency_is_enforced(limited_generator):
+    # The fake model raises a rate-limit error for a third overlapping call
+    unlimited = FakeChatModel(latency=0.05, max_concurrent=2)
+    with pytest.raises(FakeRateLimitError):
+        _calls_at_once(lambda: unlimited.invoke("hello"))
+
+    model = FakeChatModel(latency=0.05, max_concurrent=2)
+    chain = limited_generator(model)
+    _calls_at_once(lambda: chain.invoke("hello"))
+    assert model.rate_limited_count == 0 and model.call_count == 6
+
+
+def test_max_concurrency_covers_streams(limited_generator):
+    model = FakeChatModel(latency=0.05, max_concurrent=2)
+    chain = limited_generator(model)
+    chunks = []
+    lock = threading.Lock()
+
+    def stream():
+        pieces = list(chain.stream("Context: agents plan with memory. Question: what do agents use?"))
+        with lock:
+            chunks.append(len(pieces))
+
+    _calls_at_once(stream)
+    assert model.rate_limited_count == 0 and model.call_count == 6
+    assert all(count > 1 for count in chunks)  # Streamed piece by piece, not as one result
+
+
+def test_max_concurrency_covers_async_calls(limited_generator):
+    model = FakeChatModel(latency=0.05, max_concurrent=2)
+    chain = limited_generator(model)
+
+    async def run():
+        return await asyncio.gather(*(chain.ainvoke("hello") for _ in range(6)))
+
+    assert len(asyncio.run(run())) == 6
+    assert model.rate_limited_count == 0
@@ -0,0 +1,124 @@
+"""
+Tests for the process-wide rate limiter, using the fake LLM's rate-limit errors.
+
+Run from project root:
+    pytest -s -v tests/test_rate_limit.py
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.core.fakes import FakeChatModel, FakeRateLimitError
+from src.core.rate_limit import QUEUE_WAIT, AdaptiveLimiter, TokenBucket
+
+
+class TestRetries:
+    """Rate-limited calls are retried and shrink the concurrency limit."""
+
+    def test_retries_rate_limit_errors(self):
+        """A call survives a few 429s and the limit is halved once per burst."""
+        llm = FakeChatModel(rate_limit_errors=2, retry_after=0.01)
+        limiter = AdaptiveLimiter("test_retry", max_concurrency=8, max_retries=3)
+
+        result = limiter.call(lambda: llm.invoke("hello"), lane="generator")
+
+        assert result.content
+        assert llm.rate_limited_count == 2
+        assert limiter.limit == 4
+
+    def test_gives_up_after_max_retries(self):
+        """The error is raised once the retries are used up."""
+        llm = FakeChatModel(rate_limit_errors=10, retry_after=0.01)
+        limiter = AdaptiveLimiter("test_give_up", max_retries=2)
+
+        with pytest.raises(FakeRateLimitError):
+            limiter.call(lambda: llm.invoke("hello"))
+        assert llm.rate_limited_count == 3
+
+    def test_other_errors_are_not_retried(self):
+        """Errors that are not overload signals propagate at once."""
+        calls = []
+
+        def fail():
+            calls.append(1)
+            raise ValueError("bad request")
+
+        limiter = AdaptiveLimiter("test_no_retry", max_concurrency=8)
+        with pytest.raises(ValueError):
+            limiter.call(fail)
+        assert len(calls) == 1
+        assert limiter.limit == 8
+        assert limiter.in_flight == 0
+
+
+class TestAdaptiveConcurrency:
+    """AIMD settles near the provider's concurrency limit."""
+
+    def test_converges_below_provider_limit(self):
+        """With a provider accepting 4 concurrent calls every call eventually succeeds."""
+        llm = FakeChatModel(max_concurrent=4, latency=0.01, retry_after=0.01)
+        limiter = AdaptiveLimiter("test_aimd", max_concurrency=32, max_retries=20, decrease_cooldown=0.02)
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(lambda i: limiter.call(lambda: llm.invoke(f"q{i}")), range(80)))
+
+        assert len(results) == 80
+        assert llm.rate_limited_count > 0
+        assert limiter.limit < 32
+        assert limiter.in_flight == 0
+
+
+class TestPriorityLanes:
+    """Waiting calls are served by priority, then in arrival order."""
+
+    def test_high_priority_goes_first(self):
+        limiter = AdaptiveLimiter("test_priority", max_concurrency=1)
+        limiter.acquire()  # Occupy the only slot
+        order = []
+
+        def wait(name, priority):
+            limiter.acquire(priority=priority, lane=name)
+            order.append(name)
+            limiter.release(0.0)
+
+        threads = [threading.Thread(target=wait, args=("grader", 2))]
+        threads[0].start()
+        time.sleep(0.05)
+        threads.append(threading.Thread(target=wait, args=("generator", 0)))
+        threads[1].start()
+        time.sleep(0.05)
+
+        limiter.release(0.0)
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert order == ["generator", "grader"]
+
+    def test_queue_wait_is_recorded(self):
+        limiter = AdaptiveLimiter("test_wait_metric")
+        limiter.call(lambda: None, lane="router")
+        assert QUEUE_WAIT.count(limiter="test_wait_metric", lane="router") == 1
+
+
+class TestTokenBucket:
+    """Requests and tokens per minute."""
+
+    def test_waits_for_refill(self):
+        bucket = TokenBucket(per_minute=60)
+        now = time.monotonic()
+        bucket.consume(60, now)
+        assert bucket.wait_time(1, now) == pytest.approx(1.0, rel=0.05)
+        assert bucket.wait_time(1, now + 1.0) == pytest.approx(0.0, abs=1e-6)
+
+    def test_rpm_budget_spaces_calls(self):
+        """With the bucket drained, calls are spaced at the refill rate."""
+        limiter = AdaptiveLimiter("test_rpm", rpm=1200)  # 20 per second
+        limiter.requests.consume(1200, time.monotonic())
+
+        started = time.monotonic()
+        for _ in range(3):
+            limiter.call(lambda: None)
+        assert time.monotonic() - started >= 0.1
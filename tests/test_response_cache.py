@@ -0,0 +1,123 @@
+"""
+Tests for the persistent response cache: hits, per-chain enablement, LRU eviction and multi-process writes.
+
+Run from project root:
+    pytest -s -v tests/test_response_cache.py
+"""
+
+import dataclasses
+import multiprocessing
+import sqlite3
+
+import pytest
+from langchain_core.prompts import ChatPromptTemplate
+
+from src.chains.graders.answer import AnswerGrader
+from src.chains.graders.retrieval import GradeDocuments
+from src.config.settings import settings
+from src.core import response_cache
+from src.core.fakes import FakeChatModel
+from src.core.response_cache import CACHE_LOOKUPS, ResponseCache, _CachedChain, cached_structured_chain
+
+PROMPT = ChatPromptTemplate.from_messages([("human", "Retrieved document: \n\n {document} \n\n User question: {question}")])
+INPUT = {"document": "Agents use memory to plan.", "question": "agent memory"}
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    """An enabled response cache in a temporary file, for the chain "test_grader" only."""
+    store = ResponseCache(str(tmp_path / "responses.sqlite"), max_bytes=1024 * 1024)
+    monkeypatch.setattr(response_cache, "settings", dataclasses.replace(
+        settings, LLM_CACHE_ENABLED=True, LLM_CACHE_CHAINS="test_grader"
+    ))
+    monkeypatch.setattr(response_cache, "get_response_cache", lambda: store)
+    return store
+
+
+def _chain(name, schema=GradeDocuments, **kwargs):
+    llm = FakeChatModel()
+    structured = llm.with_structured_output(schema)
+    return llm, cached_structured_chain(PROMPT, structured, schema, name, "retrieval_grader", **kwargs)
+
+
+def test_hits_skip_the_model_call(cache):
+    llm, chain = _chain("test_grader")
+    hits = CACHE_LOOKUPS.value(chain="test_grader", result="hit")
+    misses = CACHE_LOOKUPS.value(chain="test_grader", result="miss")
+
+    first, second = chain.invoke(INPUT), chain.invoke(INPUT)
+
+    assert isinstance(chain, _CachedChain)
+    assert first == second and first.binary_score == "yes"
+    assert llm.call_count == 1
+    assert CACHE_LOOKUPS.value(chain="test_grader", result="hit") == hits + 1
+    assert CACHE_LOOKUPS.value(chain="test_grader", result="miss") == misses + 1
+    assert cache.stats()["chains"]["test_grader"]["entries"] == 1
+
+
+def test_chains_not_listed_bypass_the_cache(cache):
+    llm, chain = _chain("other_grader")
+    lookups = sum(value for _, value in CACHE_LOOKUPS.samples())
+
+    chain.invoke(INPUT)
+    chain.invoke(INPUT)
+
+    assert not isinstance(chain, _CachedChain)
+    assert llm.call_count == 2
+    assert sum(value for _, value in CACHE_LOOKUPS.samples()) == lookups
+    assert cache.stats()["entries"] == 0
+
+
+def test_results_can_be_left_unstored(cache):
+    # The answer grader stores only accepted answers, so a retried answer is graded again
+    llm, chain = _chain("test_grader", AnswerGrader, store_if=lambda score: score.binary_score)
+    llm.answer_failures = 1
+
+    assert chain.invoke(INPUT).binary_score is False
+    assert chain.invoke(INPUT).binary_score is True
+    assert chain.invoke(INPUT).binary_score is True
+    assert llm.call_count == 2
+
+
+def test_eviction_keeps_the_cache_under_its_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(response_cache, "ACCESS_RESOLUTION", 0.0)
+    store = ResponseCache(str(tmp_path / "responses.sqlite"), max_bytes=4000)
+    store.put("first", "test_grader", "x" * 100)
+
+    evictions = response_cache.CACHE_EVICTIONS.value()
+    for i in range(199):
+        store.get("first")  # Recently used: survives eviction
+        store.put(f"key-{i}", "test_grader", "x" * 100)
+    assert response_cache.CACHE_EVICTIONS.value() > evictions
+
+    # Checked every EVICT_CHECK_EVERY writes, the last time at the 200th
+    assert store.stats()["bytes"] <= store.max_bytes
+    assert store.get("first") is not None
+    assert store.get("key-0") is None and store.get("key-198") is not None
+
+
+def _write_entries(path: str, worker: int, count: int) -> None:
+    """Write entries from a separate process, with a small cap so eviction runs concurrently too."""
+    store = ResponseCache(path, max_bytes=20_000, busy_timeout=30.0)
+    for i in range(count):
+        store.put(f"{worker}-{i}", "test_grader", f"value {worker} {i} " * 10)
+        store.get(f"{worker}-{i // 2}")
+    # Failed writes are only logged: the latest one must be readable (nothing has been used since)
+    assert store.get(f"{worker}-{count - 1}") == f"value {worker} {count - 1} " * 10
+
+
+def test_processes_share_one_file(tmp_path):
+    path = str(tmp_path / "responses.sqlite")
+    ResponseCache(path, max_bytes=20_000)
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=_write_entries, args=(path, worker, 300)) for worker in range(3)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(timeout=120)
+
+    assert [process.exitcode for process in workers] == [0, 0, 0]
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+    store = ResponseCache(path, max_bytes=20_000)
+    assert 0 < store.stats()["entries"] < 900
@@ -0,0 +1,95 @@
+"""
+Tests for the retrieval result cache and its invalidation by ingestion (fake embeddings, no API keys).
+
+Run from project root:
+    pytest -s -v tests/test_retrieval_cache.py
+"""
+
+import uuid
+
+import pytest
+from langchain_chroma import Chroma
+
+from src.core.fakes import FakeEmbeddings, synthetic_corpus
+from src.ingestion import retrieval_cache
+from src.ingestion.embedding import embed_and_store
+from src.ingestion.retrieval_cache import RetrievalCache, cached_retrieve, get_retrieval_cache
+from src.ingestion.vectorstore import get_retriever
+
+QUESTION = "What is agent memory?"
+PARAMS = {"search_type": "mmr", "k": 4, "fetch_k": 20, "lambda_mult": 0.5}
+
+
+@pytest.fixture
+def store(tmp_path):
+    if get_retrieval_cache() is None:
+        pytest.skip("RETRIEVAL_CACHE_ENABLED=false")
+    get_retrieval_cache().clear()
+    vectorstore = Chroma(
+        collection_name=f"test-{uuid.uuid4().hex[:8]}",
+        embedding_function=FakeEmbeddings(),
+        persist_directory=str(tmp_path),
+    )
+    embed_and_store(vectorstore, synthetic_corpus(40, words_per_doc=30))
+    return vectorstore
+
+
+def _retrieve(store, question=QUESTION, params=PARAMS):
+    """cached_retrieve() over `store`, counting the retrievals that actually ran."""
+    calls = []
+
+    def retrieve():
+        calls.append(question)
+        return get_retriever(vectorstore=store, **params).invoke(question)
+
+    documents, cached = cached_retrieve(question, params, retrieve, stores=[store])
+    return documents, cached, len(calls)
+
+
+class TestLookup:
+    def test_hit_returns_same_documents(self, store):
+        first, cached, calls = _retrieve(store)
+        assert not cached and calls == 1
+
+        second, cached, calls = _retrieve(store, question="  what is AGENT memory? ")
+        assert cached and calls == 0
+        assert [(doc.id, doc.page_content, doc.metadata) for doc in second] == [
+            (doc.id, doc.page_content, doc.metadata) for doc in first
+        ]
+
+    def test_parameters_are_part_of_the_key(self, store):
+        _retrieve(store)
+        _, cached, _ = _retrieve(store, params={**PARAMS, "k": 5})
+        assert not cached
+
+
+class TestInvalidation:
+    def test_ingestion_invalidates(self, store):
+        _retrieve(store)
+        embed_and_store(store, synthetic_corpus(5, words_per_doc=30, seed=1))
+
+        _, cached, calls = _retrieve(store)
+        assert not cached and calls == 1
+
+    def test_version_written_by_another_process(self, store, monkeypatch):
+        monkeypatch.setattr(retrieval_cache, "VERSION_CHECK_SECONDS", 0.0)
+        _retrieve(store)
+        # As another process's bump_version() would leave it
+        store._collection.modify(metadata={retrieval_cache.VERSION_KEY: "other-process"})
+
+        _, cached, _ = _retrieve(store)
+        assert not cached
+
+
+def test_lru_eviction_under_memory_cap():
+    cache = RetrievalCache(max_bytes=2000)
+    ids = [uuid.uuid4().hex for _ in range(5)]
+    for i in range(20):
+        cache.put(f"key-{i}", ("v1",), ids)
+        cache.get("key-0", ("v1",))  # Keep the first entry recently used
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 2000 and 0 < stats["entries"] < 20
+    assert cache.get("key-0", ("v1",)) == ids
+    assert cache.get("key-1", ("v1",)) is None
+    assert cache.get("key-0", ("v2",)) is None
@@ -0,0 +1,89 @@
+"""
+Tests for the router's confidence and the parallel retrieval + web search fan-out (fake backends, no API keys).
+
+Run from project root:
+    pytest -s -v tests/test_router_fanout.py
+"""
+
+import pytest
+
+from src.config.settings import settings
+from src.graph.constants import PREFETCH_WEB_SEARCH, RETRIEVE_AND_GRADE, WEB_SEARCH
+
+pytestmark = pytest.mark.fake_backends
+
+# One knowledge-base word ("tools"), but nothing in the knowledge base answers it
+AMBIGUOUS_QUESTION = "What tools do I need to fix a bike?"
+KNOWLEDGE_QUESTION = "What is agent memory and planning?"
+WEB_QUESTION = "What are the best places to visit in Indonesia?"
+
+
+@pytest.fixture(autouse=True)
+def seeded():
+    from src.core.fakes import seed_synthetic_vectorstore
+
+    seed_synthetic_vectorstore()
+
+
+def _run(question, fanout):
+    """Node of each streamed update (parallel nodes in the order they finish), and the final state."""
+    from src.graph import get_rag_app
+    from src.graph.runner import build_inputs, run_question
+
+    steps = [sorted(update) for update in get_rag_app().stream(build_inputs(question, {"fanout": fanout}))]
+    return steps, run_question(question, {"fanout": fanout})
+
+
+def test_router_reports_confidence():
+    from src.chains import get_question_router
+
+    confident = get_question_router().invoke({"question": KNOWLEDGE_QUESTION})
+    unsure = get_question_router().invoke({"question": AMBIGUOUS_QUESTION})
+    assert confident.datasource == unsure.datasource == "vectorstore"
+    assert unsure.confidence < settings.ROUTER_FANOUT_THRESHOLD <= confident.confidence
+
+
+def test_router_confidence_is_required():
+    from pydantic import ValidationError
+
+    from src.chains import RouterQuery
+
+    # A route without a confidence would pass as certain and never fan out
+    assert "confidence" in RouterQuery.model_json_schema()["required"]
+    with pytest.raises(ValidationError):
+        RouterQuery(datasource="vectorstore")
+
+
+def test_low_confidence_route_fans_out():
+    from src.nodes.websearch import FANOUT_SAVED_SECONDS, FANOUT_WEB_RESULTS
+
+    used, saved = FANOUT_WEB_RESULTS.value(), FANOUT_SAVED_SECONDS.value()
+    steps, state = _run(AMBIGUOUS_QUESTION, "auto")
+    sequential_steps, sequential = _run(AMBIGUOUS_QUESTION, "off")
+
+    # Retrieval + grading and the web search run first, side by side; web search then reuses the results
+    assert sorted(steps[:2]) == [[PREFETCH_WEB_SEARCH], [RETRIEVE_AND_GRADE]] and [WEB_SEARCH] in steps
+    assert len(steps) == len(sequential_steps)  # The same number of updates, in one step fewer
+    assert state["generation"] == sequential["generation"]
+    assert [doc.page_content for doc in state["documents"]] == [doc.page_content for doc in sequential["documents"]]
+    assert not state["web_documents"]
+    assert FANOUT_WEB_RESULTS.value() == used + 2 and FANOUT_SAVED_SECONDS.value() > saved
+
+
+@pytest.mark.parametrize("question", [KNOWLEDGE_QUESTION, WEB_QUESTION])
+def test_confident_routes_are_unchanged(question):
+    steps, state = _run(question, "auto")
+    assert [RETRIEVE_AND_GRADE] not in steps and [PREFETCH_WEB_SEARCH] not in steps
+    assert state["generation"] == _run(question, "off")[1]["generation"]
+
+
+def test_unused_web_results_are_left_out():
+    steps, state = _run(KNOWLEDGE_QUESTION, "always")
+    assert sorted(steps[:2]) == [[PREFETCH_WEB_SEARCH], [RETRIEVE_AND_GRADE]] and [WEB_SEARCH] not in steps
+    assert state["generation"] == _run(KNOWLEDGE_QUESTION, "off")[1]["generation"]
+    assert all(doc.metadata.get("source") != "web_search" for doc in state["documents"])
+
+
+def test_unknown_fanout_mode_is_rejected():
+    with pytest.raises(ValueError):
+        _run(KNOWLEDGE_QUESTION, "sometimes")
@@ -0,0 +1,75 @@
+"""
+Tests for sharded collections and the scatter-gather retriever (fake embeddings, no API keys).
+
+Run from project root:
+    pytest -s -v tests/test_shards.py
+"""
+
+import uuid
+
+import pytest
+from langchain_chroma import Chroma
+
+from src.core.fakes import FakeEmbeddings, synthetic_corpus
+from src.ingestion.embedding import embed_and_store
+from src.ingestion.shards import ShardedRetriever, ingest_shards, open_shards, partition, rebuild_shard
+
+QUESTION = "What is agent memory?"
+
+
+@pytest.fixture
+def corpus():
+    return synthetic_corpus(48, words_per_doc=30)
+
+
+@pytest.fixture
+def stores(tmp_path, corpus):
+    """The corpus in 4 shards and in a single reference collection."""
+    embeddings = FakeEmbeddings()
+    name = f"test-{uuid.uuid4().hex[:8]}"
+    shards = open_shards(4, persist_directory=str(tmp_path), collection_name=name, embeddings=embeddings)
+    ingest_shards(corpus, shards, shard_by="hash")
+    single = Chroma(collection_name=f"{name}-single", embedding_function=embeddings, persist_directory=str(tmp_path))
+    embed_and_store(single, corpus)
+    return shards, single
+
+
+def _sources(documents):
+    return [doc.metadata["source"] for doc in documents]
+
+
+class TestPartition:
+    def test_source_sharding_keeps_sources_together(self, corpus):
+        chunks = corpus + [doc.model_copy(update={"page_content": doc.page_content[:50]}) for doc in corpus]
+        for part in partition(chunks, 4, shard_by="source"):
+            for doc in part:
+                assert all(other in part for other in chunks if other.metadata["source"] == doc.metadata["source"])
+
+    def test_unknown_shard_by(self, corpus):
+        with pytest.raises(ValueError):
+            partition(corpus, 2, shard_by="random")
+
+
+class TestScatterGather:
+    """Merged results match a single collection with the same chunks."""
+
+    @pytest.mark.parametrize("search_type", ["similarity", "mmr"])
+    def test_matches_single_collection(self, stores, search_type):
+        shards, single = stores
+        # fetch_k stays below the candidates tied at distance 2.0 (orthogonal fake vectors), whose order is arbitrary
+        sharded = ShardedRetriever(shards=shards, search_type=search_type, k=6, fetch_k=12)
+        expected = single.as_retriever(
+            search_type=search_type, search_kwargs={"k": 6, "fetch_k": 12} if search_type == "mmr" else {"k": 6}
+        )
+
+        assert _sources(sharded.invoke(QUESTION)) == _sources(expected.invoke(QUESTION))
+
+    def test_rebuild_leaves_other_shards_untouched(self, stores, corpus):
+        shards, _ = stores
+        before = [sorted(shard.get()["ids"]) for shard in shards]
+
+        stats = rebuild_shard(2, corpus, shards, shard_by="hash")
+
+        after = [sorted(shard.get()["ids"]) for shard in shards]
+        assert after[:2] == before[:2] and after[3] == before[3]
+        assert after[2] != before[2] and len(after[2]) == len(before[2]) == stats.chunks
@@ -0,0 +1,108 @@
+"""
+Tests for the span exporter (background writes, rotation, dropped traces) and the lazy tool / exporter singletons.
+
+Run from project root:
+    pytest -s -v tests/test_tracing.py
+"""
+
+import json
+import threading
+
+import pytest
+
+from src.observability.tracing import TRACES_DROPPED, JsonlSpanExporter, Span
+
+
+def _trace(number: int, spans: int = 3):
+    """A finished trace whose spans are numbered in the order they were recorded."""
+    return [
+        Span(trace_id=f"trace-{number}", span_id=f"{number}-{i}", parent_id=None, name="node", kind="node",
+             start=float(number), attributes={"padding": "x" * 100})
+        for i in range(spans)
+    ]
+
+
+def _span_ids(exporter: JsonlSpanExporter):
+    """Span ids across the current and rotated files, oldest first."""
+    ids = []
+    for path in reversed(exporter.files()):
+        ids += [json.loads(line)["span_id"] for line in path.read_text(encoding="utf-8").splitlines()]
+    return ids
+
+
+class _BlockedWriter(JsonlSpanExporter):
+    """An exporter whose writer thread waits for `release` before each write."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writing = threading.Event()
+        self.release = threading.Event()
+
+    def _write(self, spans):
+        self.writing.set()
+        assert self.release.wait(timeout=30)
+        super()._write(spans)
+
+
+def test_export_does_not_wait_for_the_write(tmp_path):
+    exporter = _BlockedWriter(tmp_path / "traces.jsonl")
+
+    exporter.export(_trace(1))
+    assert exporter.writing.wait(timeout=30)
+    assert not exporter.path.exists()  # export() returned while the write is still pending
+
+    exporter.release.set()
+    exporter.flush()
+    assert _span_ids(exporter) == ["1-0", "1-1", "1-2"]
+
+
+def test_rotation_keeps_the_newest_spans(tmp_path):
+    exporter = JsonlSpanExporter(tmp_path / "traces.jsonl", max_bytes=2000, backup_count=2)
+    for number in range(20):
+        exporter.export(_trace(number))
+    exporter.flush()
+
+    files = exporter.files()
+    assert [path.name for path in files] == ["traces.jsonl", "traces.jsonl.1", "traces.jsonl.2"]
+    assert all(path.stat().st_size <= exporter.max_bytes for path in files)
+    # Whole traces, in order, ending with the last one: only the oldest were rotated away
+    ids = _span_ids(exporter)
+    first = int(ids[0].split("-")[0])
+    assert first > 0
+    assert ids == [f"{number}-{i}" for number in range(first, 20) for i in range(3)]
+
+
+def test_traces_are_dropped_when_the_writer_falls_behind(tmp_path):
+    exporter = _BlockedWriter(tmp_path / "traces.jsonl", max_pending=1)
+    dropped = TRACES_DROPPED.value()
+
+    exporter.export(_trace(1))
+    assert exporter.writing.wait(timeout=30)  # Taken off the queue, being written
+    exporter.export(_trace(2))  # Waits in the queue
+    exporter.export(_trace(3))  # Queue full: dropped
+    exporter.release.set()
+    exporter.flush()
+
+    assert TRACES_DROPPED.value() == dropped + 1
+    assert [span_id.split("-")[0] for span_id in _span_ids(exporter)] == ["1"] * 3 + ["2"] * 3
+
+
+@pytest.mark.fake_backends
+def test_exporter_and_tools_are_lazy_singletons():
+    from src.config.settings import settings
+    from src.core import get_web_search_tool
+    from src.core.lazy import registered
+    from src.observability import get_span_exporter
+
+    lazies = registered()
+    assert lazies["span_exporter"] is get_span_exporter
+    assert get_span_exporter() is get_span_exporter()
+
+    assert "web_search_tool" in lazies
+    assert get_web_search_tool() is lazies["web_search_tool"]()
+    assert get_web_search_tool().max_results == settings.TAVILY_MAX_RESULTS
+
+    other = settings.TAVILY_MAX_RESULTS + 1
+    assert get_web_search_tool(other) is get_web_search_tool(other)
+    assert get_web_search_tool(other).max_results == other
+    assert registered()[f"web_search_tool.{other}"].initialized
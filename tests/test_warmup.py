@@ -0,0 +1,83 @@
+"""
+Tests for the startup warm-up, readiness reporting and lazy imports (fake backends, no API keys).
+
+Run from project root:
+    pytest -s -v tests/test_warmup.py
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+from src.graph import warmup
+
+pytestmark = pytest.mark.fake_backends
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(autouse=True)
+def seeded():
+    from src.core.fakes import seed_synthetic_vectorstore
+
+    seed_synthetic_vectorstore()
+
+
+def test_steps_are_timed_and_process_becomes_ready(tmp_path):
+    questions = tmp_path / "popular.jsonl"
+    questions.write_text("\n".join(json.dumps({"question": q}) for q in ["What is agent memory?", "What is few-shot prompting?"]))
+
+    timings = warmup.warm_up(str(questions))
+
+    for step in ("singletons", "vectorstore", "index", "connections", "retriever", "popular_questions", "web_search_tool"):
+        assert step in timings
+    status = warmup.readiness()
+    assert warmup.is_ready() and status["state"] == "ready" and not status["errors"]
+
+
+def test_failed_required_step_is_not_ready(monkeypatch):
+    def broken():
+        raise RuntimeError("index unavailable")
+
+    monkeypatch.setattr(warmup, "_load_index", broken)
+    warmup.warm_up()
+    status = warmup.readiness()
+    assert not warmup.is_ready() and status["state"] == "failed" and "index" in status["errors"]
+
+    monkeypatch.undo()
+    warmup.warm_up()
+    assert warmup.is_ready()
+
+
+def test_readyz_answers_while_warming_up():
+    from fastapi.testclient import TestClient
+
+    from src.api.server import create_app
+
+    with TestClient(create_app()) as client:
+        assert client.get("/healthz").status_code == 200
+        deadline = time.monotonic() + 30
+        while client.get("/readyz").status_code != 200:
+            assert time.monotonic() < deadline, client.get("/readyz").json()
+            time.sleep(0.05)
+        assert client.get("/readyz").json()["ready"]
+
+
+def test_ingestion_does_not_import_the_chat_side():
+    # A fresh interpreter: this test process has imported everything already
+    code = (
+        "import json, sys; import src.ingestion; "
+        "print(json.dumps(sorted(name for name in sys.modules if name.split('.')[0] in "
+        "('gradio', 'fastapi', 'langgraph') or name.startswith(('src.chains', 'src.graph', 'src.nodes', 'src.api')))))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, env=os.environ.copy(),
+        capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.splitlines()[-1]) == []